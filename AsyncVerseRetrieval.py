@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# AsyncVerseRetrieval.py
+#
+# Module for fetching the same verse from many Bible sources concurrently
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for fetching the same verse from many Bible sources concurrently
+    (e.g., to display a verse in twenty-five versions at once).
+
+A source can be:
+    an InternalBible (or anything else with a getContextVerseData( key ) method,
+        e.g., a SwordBibleModule, a DBPBible, or an SQLite-backed Bible),
+    a (SwordInterface, module) 2-tuple,
+    or any function that takes a key and returns the same as getContextVerseData.
+
+The (blocking) lookups are run in a thread pool
+    and each one gets its own timeout (which starts when a worker thread starts the lookup,
+        so time spent waiting for a free worker thread doesn't count),
+    so one slow source (network, or loading a book for the first time)
+    doesn't hold up all the others.
+
+Results are returned as an OrderedDict (in the order of the sources) of 4-tuples:
+    (status, verseData, context, errorText)
+    where status is one of RETRIEVAL_STATUSES.
+"""
+
+from gettext import gettext as _
+
+LastModifiedDate = '2018-03-18' # by RJH
+ShortProgName = "AsyncVerseRetrieval"
+ProgName = "Async verse retrieval"
+ProgVersion = '0.03'
+ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
+ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
+
+debuggingThisModule = False
+
+
+import logging
+import time
+import threading
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import BibleOrgSysGlobals
+
+
+DEFAULT_SOURCE_TIMEOUT = 10.0 # seconds for each source
+MAX_WORKER_THREADS = 8
+
+RETRIEVAL_STATUSES = ( 'OK', 'NoBook', 'NoVerse', 'Timeout', 'Busy', 'Error' ) # Busy if the last lookup in that source is still running
+
+
+
+def getLookupFunction( source ):
+    """
+    Given a source (see the module docstring),
+        return a function that takes a key and returns the contextVerseData.
+    """
+    if isinstance( source, tuple ):
+        swordInterface, module = source
+        return lambda key: swordInterface.getContextVerseData( module, key )
+    if hasattr( source, 'getContextVerseData' ):
+        return source.getContextVerseData
+    if callable( source ): return source
+    raise TypeError( _("Unable to use {!r} as a verse source").format( source ) )
+# end of getLookupFunction
+
+
+
+class AsyncVerseRetriever:
+    """
+    Class for looking up a verse in a number of Bible sources at once.
+
+    Each source only ever has one lookup running at a time
+        (because the loaders aren't written to be thread-safe),
+        but lookups in different sources run concurrently.
+
+    Note that a lookup that times out can't be cancelled (it's in another thread)
+        so it keeps running -- if it was loading a book, that book is then ready for next time.
+        Until it finishes, any new lookup in that source immediately returns 'Busy'
+        (rather than tying up another worker thread waiting for it).
+    """
+    def __init__( self, sources=None, defaultTimeout=DEFAULT_SOURCE_TIMEOUT, maxWorkers=MAX_WORKER_THREADS, executor=None ):
+        """
+        sources is a dictionary (or list of 2-tuples) of source names to sources.
+
+        If an executor isn't given, a ThreadPoolExecutor is made (and owned) by this object.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "AsyncVerseRetriever.__init__( {}, {}, {}, {} )".format( sources, defaultTimeout, maxWorkers, executor ) )
+        self.defaultTimeout = defaultTimeout
+        self.sources, self.lookupFunctions, self.timeouts, self.sourceLocks = OrderedDict(), {}, {}, {}
+        if sources is not None:
+            for name,source in (sources.items() if isinstance( sources, dict ) else sources):
+                self.addSource( name, source )
+        self.ownExecutorFlag = executor is None
+        self.executor = ThreadPoolExecutor( max_workers=maxWorkers ) if executor is None else executor
+    # end of AsyncVerseRetriever.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the retriever.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Async verse retriever object"
+        result += ('\n' if result else '') + "  " + _("Number of sources = {}").format( len(self.sources) )
+        result += ('\n' if result else '') + "  " + _("Default timeout = {}s").format( self.defaultTimeout )
+        return result
+    # end of AsyncVerseRetriever.__str__
+
+    def __len__( self ): return len( self.sources )
+
+
+    def addSource( self, name, source, timeout=None ):
+        """
+        Add (or replace) a named source.
+
+        timeout (in seconds) overrides the default one for this source.
+        """
+        self.lookupFunctions[name] = getLookupFunction( source )
+        self.sources[name] = source
+        if timeout is None: self.timeouts.pop( name, None )
+        else: self.timeouts[name] = timeout
+        if name not in self.sourceLocks: self.sourceLocks[name] = threading.Lock()
+    # end of AsyncVerseRetriever.addSource
+
+
+    def removeSource( self, name ):
+        """
+        Remove a named source.
+        """
+        del self.sources[name]
+        del self.lookupFunctions[name]
+        self.timeouts.pop( name, None )
+    # end of AsyncVerseRetriever.removeSource
+
+
+    def __lookup( self, name, key, startedCallback ):
+        """
+        Runs in a worker thread.
+
+        The source lock must already be acquired (by __timedLookup) -- it's released when the lookup finishes.
+        startedCallback is called first (to start the timeout).
+
+        Returns a 4-tuple (status, verseData, context, errorText).
+        """
+        startedCallback()
+        lookupFunction = self.lookupFunctions[name]
+        try: contextVerseData = lookupFunction( key )
+        except KeyError: return 'NoVerse', None, None, None
+        except Exception as err:
+            logging.error( _("AsyncVerseRetriever: {} lookup failed for {}: {}").format( name, key, err ) )
+            if BibleOrgSysGlobals.strictCheckingFlag: raise
+            return 'Error', None, None, str(err)
+        if contextVerseData is None: return 'NoBook', None, None, None
+        verseData, context = contextVerseData
+        return 'OK', verseData, context, None
+    # end of AsyncVerseRetriever.__lookup
+
+
+    async def __timedLookup( self, name, key, timeout ):
+        """
+        Offload one (blocking) lookup to the thread pool
+            and wait for it (but not longer than timeout seconds after a worker thread started it).
+
+        If the previous lookup in this source is still running (e.g., it timed out),
+            returns 'Busy' straight away without queueing another one.
+        """
+        sourceLock = self.sourceLocks[name]
+        if not sourceLock.acquire( blocking=False ):
+            if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+                print( "  {} is still busy with a previous lookup".format( name ) )
+            return 'Busy', None, None, None
+        loop = asyncio.get_event_loop()
+        startedEvent = asyncio.Event()
+        def startedCallback():
+            try: loop.call_soon_threadsafe( startedEvent.set )
+            except RuntimeError: pass # The event loop has already been closed
+        try: concurrentFuture = self.executor.submit( self.__lookup, name, key, startedCallback )
+        except Exception as err: # e.g., the executor has been shut down
+            sourceLock.release()
+            return 'Error', None, None, str(err)
+        # Release the lock when the lookup finishes (or is cancelled before it started)
+        concurrentFuture.add_done_callback( lambda future: sourceLock.release() )
+        lookupFuture = asyncio.wrap_future( concurrentFuture )
+        startedWaiter = asyncio.ensure_future( startedEvent.wait() )
+        await asyncio.wait( [lookupFuture, startedWaiter], return_when=asyncio.FIRST_COMPLETED ) # Waiting for a free worker thread
+        startedWaiter.cancel()
+        startTime = time.time()
+        try: result = await asyncio.wait_for( lookupFuture, timeout )
+        except asyncio.TimeoutError:
+            logging.warning( _("AsyncVerseRetriever: {} timed out after {}s for {}").format( name, timeout, key ) )
+            result = 'Timeout', None, None, None
+        except Exception as err: # only if strictCheckingFlag is set
+            result = 'Error', None, None, str(err)
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "  {} {} took {:.3f}s".format( name, result[0], time.time()-startTime ) )
+        return result
+    # end of AsyncVerseRetriever.__timedLookup
+
+
+    async def getContextVerseData( self, key, sourceNames=None, timeout=None ):
+        """
+        Coroutine to look up the key (e.g., a SimpleVerseKey) in all of the sources concurrently
+            (or just in the given sourceNames).
+
+        timeout (if given) overrides both the default and per-source timeouts.
+
+        Returns an OrderedDict of source names to 4-tuples (status, verseData, context, errorText).
+            Sources that failed, timed out, or were busy are still included (with verseData=None).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "AsyncVerseRetriever.getContextVerseData( {}, {}, {} )".format( key, sourceNames, timeout ) )
+        if sourceNames is None: sourceNames = list( self.sources.keys() )
+        coroutines = [self.__timedLookup( name, key,
+                                timeout if timeout is not None else self.timeouts.get( name, self.defaultTimeout ) )
+                            for name in sourceNames]
+        results = await asyncio.gather( *coroutines )
+        return OrderedDict( zip( sourceNames, results ) )
+    # end of AsyncVerseRetriever.getContextVerseData
+
+
+    async def getVerseDataLists( self, key, sourceNames=None, timeout=None ):
+        """
+        Coroutine like getContextVerseData above,
+            but just returns an OrderedDict of source names to verseData
+            (None for sources that didn't succeed).
+        """
+        results = await self.getContextVerseData( key, sourceNames, timeout )
+        return OrderedDict( (name,result[1]) for name,result in results.items() )
+    # end of AsyncVerseRetriever.getVerseDataLists
+
+
+    def getContextVerseDataSync( self, key, sourceNames=None, timeout=None ):
+        """
+        For callers that aren't using asyncio:
+            runs getContextVerseData (above) in a new event loop and returns the results.
+        """
+        loop = asyncio.new_event_loop()
+        try: return loop.run_until_complete( self.getContextVerseData( key, sourceNames, timeout ) )
+        finally: loop.close()
+    # end of AsyncVerseRetriever.getContextVerseDataSync
+
+
+    def close( self ):
+        """
+        Shut down the thread pool (if we made it)
+            without waiting for any lookups which are still running.
+        """
+        if self.ownExecutorFlag and self.executor is not None:
+            self.executor.shutdown( wait=False )
+            self.executor = None
+    # end of AsyncVerseRetriever.close
+# end of AsyncVerseRetriever class
+
+
+
+def demo():
+    """
+    Main program to handle command line parameters and then run what they want.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    from VerseReferences import SimpleVerseKey
+
+    def slowSource( key ):
+        time.sleep( 0.5 )
+        return ['(slow) {}'.format( key.getShortText() )], []
+    def missingSource( key ): raise KeyError
+    def brokenSource( key ): raise ValueError( "Something went wrong" )
+
+    retriever = AsyncVerseRetriever( (('Fast',lambda key: (['(fast) {}'.format( key.getShortText() )], [])),
+                                      ('Slow',slowSource), ('Missing',missingSource),
+                                      ('NoBook',lambda key: None), ('Broken',brokenSource),), defaultTimeout=2 )
+    retriever.addSource( 'TooSlow', slowSource, timeout=0.1 )
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( retriever )
+
+    key = SimpleVerseKey( 'JHN', '3', '16' )
+    startTime = time.time()
+    results = retriever.getContextVerseDataSync( key )
+    if BibleOrgSysGlobals.verbosityLevel > 0:
+        print( "Got {} results in {:.2f}s".format( len(results), time.time()-startTime ) )
+        for name,(status,verseData,context,errorText) in results.items():
+            print( "  {}: {} {} {}".format( name, status, verseData, errorText if errorText else '' ) )
+    retriever.close()
+# end of demo
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    demo()
+
+    BibleOrgSysGlobals.closedown( ProgName, ProgVersion )
+# end of AsyncVerseRetrieval.py
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# BatchBibleConverter.py
+#
+# Module for detecting and exporting whole folder trees of Bibles
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for converting a whole collection of Bibles,
+    i.e., for each folder in a tree,
+        use UnknownBible to detect and load any Bible in it,
+        then use BibleWriter.doAllExports to export it.
+
+Each folder is run as a separate job in its own process so that
+    one Bible that hangs or crashes (or uses up all the memory)
+    doesn't stall or kill the whole run.
+    Each job gets a timeout and (on systems with the resource module) a memory limit.
+
+The status of each job is saved (after every job) to a JSON manifest file
+    so that if the run is stopped, running it again resumes where it left off
+    (only retrying jobs that failed, timed-out, etc.)
+
+Can be run from the command line, e.g.,
+    BatchBibleConverter.py ../../Bibles/ OutputFiles/BatchConversion/ --timeout 1800
+"""
+
+from gettext import gettext as _
+
+LastModifiedDate = '2018-03-18' # by RJH
+ShortProgName = "BatchBibleConverter"
+ProgName = "Batch Bible converter"
+ProgVersion = '0.01'
+ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
+ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
+
+debuggingThisModule = False
+
+
+import os, sys, logging
+import time, json, signal
+from datetime import datetime
+from collections import deque, OrderedDict
+import multiprocessing, multiprocessing.connection
+try: import resource # For the job memory limits (not available on Windows)
+except ImportError: resource = None
+
+import BibleOrgSysGlobals
+
+
+DEFAULT_JOB_TIMEOUT = 3600 # seconds for detecting, loading, and exporting one Bible
+DEFAULT_MEMORY_LIMIT = 4096 # MB for each job
+
+# Jobs with these statuses are skipped when a run is resumed
+#   (the others, i.e., 'Error', 'Timeout', 'MemoryLimit', 'Crashed', 'Interrupted', are tried again)
+FINISHED_JOB_STATUSES = ( 'OK', 'NoBible', )
+JOB_STATUSES = FINISHED_JOB_STATUSES + ( 'Error', 'Timeout', 'MemoryLimit', 'Crashed', 'Interrupted', )
+
+# The job processes rely on inheriting our already loaded BibleOrgSysGlobals data
+#   (as does the other multiprocessing in BOS) so use fork where it's available
+JOB_CONTEXT = multiprocessing.get_context( 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None )
+
+
+
+def findBibleFolders( sourceFolderpath, excludeFolderpath=None ):
+    """
+    Walk the folder tree and return a sorted list of the (relative) paths
+        of all the folders which contain at least one (non-hidden) file,
+        i.e., the ones worth asking UnknownBible about.
+
+    Hidden folders (and the excludeFolderpath, e.g., if the output is inside the tree) are skipped.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( "findBibleFolders( {}, {} )".format( sourceFolderpath, excludeFolderpath ) )
+    excludeFolderpath = os.path.abspath( excludeFolderpath ) if excludeFolderpath else None
+    relativeFolderpaths = []
+    for folderpath, subfolderNames, filenames in os.walk( sourceFolderpath ):
+        subfolderNames[:] = [subfolderName for subfolderName in subfolderNames
+                                if not subfolderName.startswith( '.' )
+                                and os.path.abspath( os.path.join( folderpath, subfolderName ) ) != excludeFolderpath]
+        if any( not filename.startswith( '.' ) for filename in filenames ):
+            relativeFolderpaths.append( os.path.relpath( folderpath, sourceFolderpath ) )
+    return sorted( relativeFolderpaths )
+# end of findBibleFolders
+
+
+def convertOneBible( folderpath, outputFolderpath, memoryLimitMB, maxProcesses, exportOptions, resultConnection ):
+    """
+    Runs in a job process:
+        detect and load the Bible in the folder and then export it.
+
+    Sends a dictionary of results (including the 'status') back through the connection.
+        If the process dies, nothing is sent.
+    """
+    if hasattr( os, 'setpgrp' ): os.setpgrp() # So that a timeout can also kill any processes that we start
+    if resource is not None and memoryLimitMB:
+        memoryLimit = memoryLimitMB * 1024 * 1024
+        resource.setrlimit( resource.RLIMIT_AS, (memoryLimit,memoryLimit) )
+    BibleOrgSysGlobals.maxProcesses = maxProcesses # Don't let each job use all the processors
+
+    result = { 'pid':os.getpid() }
+    try:
+        from UnknownBible import UnknownBible
+        searchResult = UnknownBible( folderpath ).search( autoLoad=True, autoLoadBooks=True )
+        if searchResult is None or isinstance( searchResult, str ): # No (single) Bible found
+            result['status'], result['detail'] = 'NoBible', searchResult
+        else:
+            result['BibleType'] = searchResult.objectTypeString
+            result['BibleName'] = searchResult.getAName()
+            result['numBooks'] = len( searchResult )
+            if not os.path.isdir( outputFolderpath ): os.makedirs( outputFolderpath )
+            exportResults = searchResult.doAllExports( outputFolderpath, **exportOptions )
+            if exportResults:
+                result['status'] = 'OK'
+                result['failedExports'] = sorted( exportName for exportName,exportResult in exportResults.items()
+                                                    if exportResult is False )
+            else: result['status'], result['detail'] = 'Error', "doAllExports failed"
+    except MemoryError:
+        result['status'], result['detail'] = 'MemoryLimit', "Exceeded {}MB".format( memoryLimitMB )
+    except Exception as err:
+        result['status'], result['detail'] = 'Error', "{}: {}".format( type(err).__name__, err )
+    resultConnection.send( result )
+    resultConnection.close()
+# end of convertOneBible
+
+
+
+class BatchBibleConverter:
+    """
+    Class for converting all of the Bibles in a folder tree.
+
+    Jobs (one per folder) are run in separate processes, up to maxWorkers at once.
+    """
+    def __init__( self, sourceFolderpath, outputFolderpath, manifestFilepath=None, maxWorkers=None,
+                        timeout=DEFAULT_JOB_TIMEOUT, memoryLimitMB=DEFAULT_MEMORY_LIMIT,
+                        wantPhotoBible=False, wantODFs=False, wantPDFs=False ):
+        """
+        The manifest defaults to BatchConversionManifest.json in the output folder.
+
+        maxWorkers defaults to BibleOrgSysGlobals.maxProcesses.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BatchBibleConverter.__init__( {}, {}, {}, {}, {}, {} )".format( sourceFolderpath, outputFolderpath, manifestFilepath, maxWorkers, timeout, memoryLimitMB ) )
+        self.sourceFolderpath, self.outputFolderpath = sourceFolderpath, outputFolderpath
+        self.manifestFilepath = manifestFilepath if manifestFilepath else os.path.join( outputFolderpath, 'BatchConversionManifest.json' )
+        self.maxWorkers = maxWorkers if maxWorkers else max( 1, BibleOrgSysGlobals.maxProcesses )
+        self.timeout, self.memoryLimitMB = timeout, memoryLimitMB
+        self.exportOptions = { 'wantPhotoBible':wantPhotoBible, 'wantODFs':wantODFs, 'wantPDFs':wantPDFs }
+        self.loadManifest()
+    # end of BatchBibleConverter.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the converter.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Batch Bible converter object"
+        result += ('\n' if result else '') + "  " + _("Source folder: {}").format( self.sourceFolderpath )
+        result += ('\n' if result else '') + "  " + _("Output folder: {}").format( self.outputFolderpath )
+        result += ('\n' if result else '') + "  " + _("Manifest: {}").format( self.manifestFilepath )
+        result += ('\n' if result else '') + "  " + _("Workers = {}, timeout = {}s, memory limit = {}MB").format( self.maxWorkers, self.timeout, self.memoryLimitMB )
+        if self.manifest['jobs']:
+            statusCounts = self.getStatusCounts()
+            result += ('\n' if result else '') + "  " + _("Jobs: {}").format( ', '.join( '{}={}'.format( status, count ) for status,count in statusCounts.items() ) )
+        return result
+    # end of BatchBibleConverter.__str__
+
+
+    def loadManifest( self ):
+        """
+        Load the manifest from a previous run (if there is one).
+
+        Any jobs which were still 'Running' (because the run was killed) are marked as 'Interrupted'.
+        """
+        self.manifest = { 'sourceFolder':self.sourceFolderpath, 'jobs':OrderedDict(), 'runs':[] }
+        if os.path.isfile( self.manifestFilepath ):
+            with open( self.manifestFilepath, 'rt', encoding='utf-8' ) as manifestFile:
+                self.manifest = json.load( manifestFile, object_pairs_hook=OrderedDict )
+            if self.manifest.get( 'sourceFolder' ) != self.sourceFolderpath:
+                logging.warning( _("BatchBibleConverter: Manifest {} was for {!r} not {!r}").format( self.manifestFilepath, self.manifest.get( 'sourceFolder' ), self.sourceFolderpath ) )
+            for job in self.manifest['jobs'].values():
+                if job['status'] == 'Running': job['status'] = 'Interrupted'
+            if BibleOrgSysGlobals.verbosityLevel > 1:
+                print( _("Loaded manifest with {} jobs from {}").format( len(self.manifest['jobs']), self.manifestFilepath ) )
+    # end of BatchBibleConverter.loadManifest
+
+
+    def saveManifest( self ):
+        """
+        Write the manifest (via a temporary file so that a crash can't leave half a manifest).
+        """
+        manifestFolderpath = os.path.dirname( self.manifestFilepath )
+        if manifestFolderpath and not os.path.isdir( manifestFolderpath ): os.makedirs( manifestFolderpath )
+        temporaryFilepath = self.manifestFilepath + '.tmp'
+        with open( temporaryFilepath, 'wt', encoding='utf-8' ) as manifestFile:
+            json.dump( self.manifest, manifestFile, ensure_ascii=False, indent=2 )
+        os.replace( temporaryFilepath, self.manifestFilepath )
+    # end of BatchBibleConverter.saveManifest
+
+
+    def getStatusCounts( self ):
+        """
+        Returns an OrderedDict of job statuses to counts.
+        """
+        statusCounts = OrderedDict()
+        for job in self.manifest['jobs'].values():
+            statusCounts[job['status']] = statusCounts.get( job['status'], 0 ) + 1
+        return statusCounts
+    # end of BatchBibleConverter.getStatusCounts
+
+
+    def getPendingJobs( self, retryFailed=True ):
+        """
+        Find the folders in the source tree (adding any new ones to the manifest)
+            and return a list of the ones that still need to be done.
+        """
+        jobs = self.manifest['jobs']
+        pendingJobs = []
+        for relativeFolderpath in findBibleFolders( self.sourceFolderpath, excludeFolderpath=self.outputFolderpath ):
+            if relativeFolderpath not in jobs:
+                jobs[relativeFolderpath] = { 'status':'Pending', 'attempts':0 }
+            status = jobs[relativeFolderpath]['status']
+            if status in FINISHED_JOB_STATUSES: continue
+            if status == 'Pending' or status == 'Interrupted' or retryFailed:
+                pendingJobs.append( relativeFolderpath )
+        return pendingJobs
+    # end of BatchBibleConverter.getPendingJobs
+
+
+    def __startJob( self, relativeFolderpath, jobMaxProcesses ):
+        """
+        Start a job process.
+
+        Returns a 4-tuple (process, resultConnection, startTime, deadline).
+        """
+        folderpath = os.path.join( self.sourceFolderpath, relativeFolderpath )
+        outputFolderpath = os.path.join( self.outputFolderpath,
+                    relativeFolderpath if relativeFolderpath != os.curdir else os.path.basename( os.path.abspath( self.sourceFolderpath ) ) )
+        receiveConnection, sendConnection = JOB_CONTEXT.Pipe( duplex=False )
+        process = JOB_CONTEXT.Process( target=convertOneBible, name=relativeFolderpath,
+                    args=(folderpath, outputFolderpath, self.memoryLimitMB, jobMaxProcesses, self.exportOptions, sendConnection) )
+        process.start()
+        sendConnection.close() # Only the job process needs this end now
+        job = self.manifest['jobs'][relativeFolderpath]
+        job['status'], job['attempts'] = 'Running', job.get( 'attempts', 0 ) + 1
+        job['outputFolder'] = outputFolderpath
+        job['started'] = datetime.now().isoformat( ' ', 'seconds' )
+        startTime = time.time()
+        return process, receiveConnection, startTime, startTime + self.timeout
+    # end of BatchBibleConverter.__startJob
+
+
+    def __killJob( self, process ):
+        """
+        Kill the job process (and anything that it started).
+        """
+        try: os.killpg( process.pid, signal.SIGKILL )
+        except (AttributeError, OSError): process.terminate()
+        process.join()
+    # end of BatchBibleConverter.__killJob
+
+
+    def __finishJob( self, relativeFolderpath, process, resultConnection, startTime, timedOut ):
+        """
+        Record the result of a job in the manifest.
+        """
+        if timedOut:
+            self.__killJob( process )
+            result = { 'status':'Timeout', 'detail':"Exceeded {}s".format( self.timeout ) }
+        elif resultConnection.poll():
+            result = resultConnection.recv()
+            process.join()
+        else: # The job process died without sending anything
+            process.join()
+            result = { 'status':'Crashed', 'detail':"Exit code {}".format( process.exitcode ) }
+        resultConnection.close()
+        result.pop( 'pid', None )
+
+        job = self.manifest['jobs'][relativeFolderpath]
+        for key in ('detail','failedExports','BibleType','BibleName','numBooks'): job.pop( key, None ) # from any previous attempt
+        job.update( result )
+        job['seconds'] = round( time.time() - startTime, 1 )
+        if job['status'] not in FINISHED_JOB_STATUSES:
+            logging.error( _("BatchBibleConverter: {} job {} {}").format( job['status'], relativeFolderpath, job.get( 'detail', '' ) ) )
+    # end of BatchBibleConverter.__finishJob
+
+
+    def run( self, retryFailed=True ):
+        """
+        Run all of the jobs that still need to be done.
+
+        Returns a dictionary summarising this run (which is also added to the manifest).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BatchBibleConverter.run( {} )".format( retryFailed ) )
+        pendingJobs = deque( self.getPendingJobs( retryFailed ) )
+        numJobs = len( pendingJobs )
+        if BibleOrgSysGlobals.verbosityLevel > 0:
+            print( _("BatchBibleConverter: {} jobs to do ({} folders) with {} workers…").format( numJobs, len(self.manifest['jobs']), self.maxWorkers ) )
+        self.saveManifest()
+        jobMaxProcesses = max( 1, BibleOrgSysGlobals.maxProcesses // self.maxWorkers )
+        runStartTime = time.time()
+        runStatusCounts = OrderedDict()
+        runningJobs = {} # relativeFolderpath: (process, resultConnection, startTime, deadline)
+
+        def throughput():
+            """ Returns the number of Bibles converted per hour (so far). """
+            elapsedSeconds = time.time() - runStartTime
+            return runStatusCounts.get( 'OK', 0 ) * 3600 / elapsedSeconds if elapsedSeconds else 0.0
+
+        try:
+            while pendingJobs or runningJobs:
+                while pendingJobs and len(runningJobs) < self.maxWorkers:
+                    relativeFolderpath = pendingJobs.popleft()
+                    runningJobs[relativeFolderpath] = self.__startJob( relativeFolderpath, jobMaxProcesses )
+                self.saveManifest() # So a killed run knows which jobs were running
+
+                # Wait until a job finishes or the next deadline comes
+                waitSeconds = max( 0, min( deadline for _process,_connection,_startTime,deadline in runningJobs.values() ) - time.time() )
+                multiprocessing.connection.wait( [process.sentinel for process,_connection,_startTime,_deadline in runningJobs.values()], waitSeconds )
+
+                now = time.time()
+                for relativeFolderpath,(process,resultConnection,startTime,deadline) in list( runningJobs.items() ):
+                    timedOut = now >= deadline and process.is_alive()
+                    if process.is_alive() and not timedOut: continue
+                    self.__finishJob( relativeFolderpath, process, resultConnection, startTime, timedOut )
+                    del runningJobs[relativeFolderpath]
+                    job = self.manifest['jobs'][relativeFolderpath]
+                    runStatusCounts[job['status']] = runStatusCounts.get( job['status'], 0 ) + 1
+                    self.saveManifest()
+                    if BibleOrgSysGlobals.verbosityLevel > 1:
+                        doneCount = sum( runStatusCounts.values() )
+                        print( "  {}/{} {} {} in {}s ({:.1f} Bibles/hour)".format( doneCount, numJobs,
+                                    job['status'], relativeFolderpath, job['seconds'], throughput() ) )
+        except KeyboardInterrupt:
+            for relativeFolderpath,(process,resultConnection,_startTime,_deadline) in runningJobs.items():
+                self.__killJob( process )
+                resultConnection.close()
+                self.manifest['jobs'][relativeFolderpath]['status'] = 'Interrupted'
+            self.saveManifest()
+            raise
+
+        runSeconds = time.time() - runStartTime
+        runSummary = OrderedDict( [ ('started',datetime.fromtimestamp( runStartTime ).isoformat( ' ', 'seconds' )),
+                                    ('seconds',round( runSeconds, 1 )), ('jobs',numJobs), ('workers',self.maxWorkers),
+                                    ('statusCounts',runStatusCounts), ('BiblesPerHour',round( throughput(), 1 )) ] )
+        self.manifest['runs'].append( runSummary )
+        self.saveManifest()
+        if BibleOrgSysGlobals.verbosityLevel > 0:
+            print( _("BatchBibleConverter: Did {} jobs in {:.1f}s ({:.1f} Bibles/hour): {}").format( numJobs, runSeconds, runSummary['BiblesPerHour'],
+                        ', '.join( '{}={}'.format( status, count ) for status,count in runStatusCounts.items() ) ) )
+        return runSummary
+    # end of BatchBibleConverter.run
+# end of BatchBibleConverter class
+
+
+
+def demo():
+    """
+    Convert the Bibles in our test folders.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    testFolder = 'Tests/DataFilesForTests/'
+    outputFolder = 'OutputFiles/BatchBibleConverterTest/'
+    converter = BatchBibleConverter( testFolder, outputFolder, timeout=600 )
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( converter )
+    converter.run()
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( converter )
+# end of demo
+
+
+def main():
+    """
+    Convert the Bibles in the folder tree given on the command line.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    arguments = BibleOrgSysGlobals.commandLineArguments
+    converter = BatchBibleConverter( arguments.sourceFolder, arguments.outputFolder, arguments.manifest,
+                                    maxWorkers=arguments.workers, timeout=arguments.timeout, memoryLimitMB=arguments.memory,
+                                    wantPhotoBible=arguments.photoBible, wantODFs=arguments.ODFs, wantPDFs=arguments.PDFs )
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( converter )
+    converter.run( retryFailed=not arguments.noRetry )
+# end of main
+
+if __name__ == '__main__':
+    demoFlag = len(sys.argv) == 1 # Run the demo if there's no command line parameters
+
+    # Configure basic Bible Organisational System (BOS) set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    if not demoFlag:
+        parser.add_argument( 'sourceFolder', help="folder tree containing the Bibles" )
+        parser.add_argument( 'outputFolder', help="folder for the exports (one subfolder for each Bible)" )
+        parser.add_argument( '-m', '--manifest', dest='manifest', default=None, help="manifest file (default is in the output folder)" )
+        parser.add_argument( '-n', '--workers', type=int, dest='workers', default=None, help="number of Bibles to convert at once" )
+        parser.add_argument( '-t', '--timeout', type=int, dest='timeout', default=DEFAULT_JOB_TIMEOUT, help="seconds allowed for each Bible" )
+        parser.add_argument( '-M', '--memory', type=int, dest='memory', default=DEFAULT_MEMORY_LIMIT, help="megabytes allowed for each Bible (0 for no limit)" )
+        parser.add_argument( '-r', '--noRetry', action='store_true', dest='noRetry', default=False, help="don't retry jobs which failed in a previous run" )
+        parser.add_argument( '--photoBible', action='store_true', dest='photoBible', default=False, help="also do the PhotoBible exports" )
+        parser.add_argument( '--ODFs', action='store_true', dest='ODFs', default=False, help="also do the ODF exports" )
+        parser.add_argument( '--PDFs', action='store_true', dest='PDFs', default=False, help="also do the PDF exports" )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if demoFlag: demo()
+    else: main()
+
+    BibleOrgSysGlobals.closedown( ProgName, ProgVersion )
+# end of BatchBibleConverter.py
@@ -31,7 +31,7 @@ from gettext import gettext as _
 LastModifiedDate = '2017-12-09' # by RJH
 ShortProgName = "BibleBooksNames"
 ProgName = "Bible Books Names Systems handler"
-ProgVersion = '0.39'
+ProgVersion = '0.41'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -46,6 +46,80 @@ from singleton import singleton
 import BibleOrgSysGlobals
 
 
+# These systems get priority (in this order) when a name or abbreviation resolves to different books in different systems
+#   Any other systems follow in alphabetical order
+PRIORITY_SYSTEM_NAMES = ( 'eng_traditional', 'eng_extensive', 'eng_deuterocanon', )
+BOOKS_NAMES_TRIE_FORMAT_VERSION = 2 # Increment this if the trie (or its cached pickle) changes
+
+
+
+def makeBooksNamesTrie( dataDicts ):
+    """
+    Make a single prefix trie over the book names and abbreviations of all of the given books names systems.
+
+    The inputFields of each book are entered in UPPER CASE, along with variants using the bookname leaders
+        (e.g., '1 ' replaced by 'I ' or 'First ') and variants with the internal spaces removed.
+
+    Each trie node is a 2-list containing:
+        a dictionary of single characters to child nodes,
+        a sorted tuple of (variantFlag,systemIndex,bookIndex,BBB) 4-tuples for all input fields which pass through (or end at) this node.
+    The tuples sort into the order that the input fields should be tried in:
+        the actual inputFields before the variants, then systems in priority order (a lower systemIndex has a higher priority),
+        then books in BibleBooksCodes reference number order.
+
+    Returns a 3-tuple containing:
+        the list of system names in priority order (indexed by systemIndex),
+        the root node of the trie,
+        an ambiguity report dictionary with UPPER CASE complete input fields as keys
+            and sorted lists of (BBB,systemNameList) 2-tuples as entries
+            (for fields which resolve to different books in different systems).
+    """
+    systemNames = [systemName for systemName in PRIORITY_SYSTEM_NAMES if systemName in dataDicts] \
+                + sorted( systemName for systemName in dataDicts if systemName not in PRIORITY_SYSTEM_NAMES )
+    getReferenceNumber = BibleOrgSysGlobals.BibleBooksCodes.getReferenceNumber
+
+    fieldDict = {} # Keys are UPPER CASE input fields, entries are sets of (variantFlag,systemIndex,bookIndex,BBB)
+    for systemIndex,systemName in enumerate( systemNames ):
+        divisionsNamesDict, booknameLeadersDict, bookNamesDict = dataDicts[systemName]
+        UCLeaders = [(leader.upper(),[replacement.upper() for replacement in replacements]) \
+                            for leader,replacements in booknameLeadersDict.items()]
+        for BBB,bookNameEntry in bookNamesDict.items():
+            if not isinstance( bookNameEntry, dict ): continue
+            bookIndex = getReferenceNumber( BBB ) # So Old Testament then New Testament then other books
+            for field in bookNameEntry['inputFields']:
+                UCField = field.upper()
+                variants = set()
+                for leader,replacements in UCLeaders: # Note that the leader here includes a trailing space
+                    if UCField.startswith( leader ):
+                        for replacementLeader in replacements:
+                            variants.add( replacementLeader + UCField[len(leader):] )
+                for variant in [UCField] + list( variants ):
+                    if ' ' in variant: variants.add( variant.replace( ' ', '' ) )
+                for variantFlag,thisField in [(0,UCField)] + [(1,variant) for variant in variants if variant != UCField]:
+                    if thisField not in fieldDict: fieldDict[thisField] = set()
+                    fieldDict[thisField].add( (variantFlag,systemIndex,bookIndex,BBB) )
+
+    rootNode = [{}, ()]
+    nodePrefixSets = {} # Temporary sets (indexed by node id) before we convert them to tuples
+    for UCField,entrySet in fieldDict.items():
+        node = rootNode
+        for char in UCField:
+            if char not in node[0]: node[0][char] = [{}, ()]
+            node = node[0][char]
+            if id(node) not in nodePrefixSets: nodePrefixSets[id(node)] = (node, set())
+            nodePrefixSets[id(node)][1].update( entrySet )
+    for node,entrySet in nodePrefixSets.values(): node[1] = tuple( sorted( entrySet ) )
+
+    ambiguityDict = {}
+    for UCField,entrySet in fieldDict.items():
+        BBBSet = { entry[3] for entry in entrySet }
+        if len( BBBSet ) > 1:
+            ambiguityDict[UCField] = sorted( (BBB,[systemNames[systemIndex] for systemIndex in sorted( {entry[1] for entry in entrySet if entry[3]==BBB} )]) \
+                                                for BBB in BBBSet )
+    return systemNames, rootNode, ambiguityDict
+# end of makeBooksNamesTrie
+
+
 
 def expandBibleNamesInputs ( systemName, divisionsNamesDict, booknameLeadersDict, bookNamesDict, bookList ):
     """
@@ -214,6 +288,8 @@ class BibleBooksNamesSystems:
         Constructor:
         """
         self.__DataDicts, self.__ExpandedDicts = None, None # We'll import into this in loadData
+        self.__trieSystemNames = self.__trie = self.__ambiguityDict = None # We'll load or make these in __loadTrie
+        self.__trieCacheable = False # Set in loadData if we loaded the standard pickle file
     # end of BibleBooksNamesSystems.__init__
 
     def loadData( self, XMLFolder=None ):
@@ -242,6 +318,7 @@ class BibleBooksNamesSystems:
                 with open( standardPickleFilepath, 'rb') as pickleFile:
                     self.__DataDicts = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
                     #self.__ExpandedDicts = pickle.load( pickleFile )
+                self.__trieCacheable = True
             else: # We have to load the XML (much slower)
                 from BibleBooksNamesConverter import BibleBooksNamesConverter
                 if XMLFolder is not None:
@@ -312,40 +389,116 @@ class BibleBooksNamesSystems:
     # end of BibleBooksNamesSystems.getAvailableLanguageCodes
 
 
-    def getBBBFromText( self, bookNameOrAbbreviation ):
+    def __loadTrie( self ):
+        """
+        Loads the merged book names trie from the pickle file in DerivedFiles (if it's newer than the tables pickle),
+            otherwise makes it (and tries to save it there for next time).
+
+        A cached trie that can't be loaded (e.g., a truncated file) or is out of date is just made again.
+        """
+        import pickle
+        dataFilepath = os.path.join( os.path.dirname(__file__), "DataFiles/" )
+        standardPickleFilepath = os.path.join( dataFilepath, "DerivedFiles", "BibleBooksNames_Tables.pickle" )
+        standardTriePickleFilepath = os.path.join( dataFilepath, "DerivedFiles", "BibleBooksNames_Tables.trie.pickle" )
+        if self.__trieCacheable \
+        and os.access( standardTriePickleFilepath, os.R_OK ) \
+        and os.stat(standardTriePickleFilepath)[8] > os.stat(standardPickleFilepath)[8] \
+        and os.stat(standardTriePickleFilepath)[9] > os.stat(standardPickleFilepath)[9]: # There's a newer trie file
+            if BibleOrgSysGlobals.verbosityLevel > 2: print( "Loading pickle file {}…".format( standardTriePickleFilepath ) )
+            try:
+                with open( standardTriePickleFilepath, 'rb') as pickleFile:
+                    formatVersion, trieSystemNames, trie, ambiguityDict = pickle.load( pickleFile )
+            except Exception as err: # Could be any of several pickle, OS, or unpacking errors
+                logging.warning( _("Unable to load book names trie from {}: {}").format( standardTriePickleFilepath, err ) )
+            else:
+                if formatVersion == BOOKS_NAMES_TRIE_FORMAT_VERSION and set(trieSystemNames) == set(self.__DataDicts):
+                    self.__trieSystemNames, self.__trie, self.__ambiguityDict = trieSystemNames, trie, ambiguityDict
+                    return
+            # else it doesn't match our systems so make it again
+        if BibleOrgSysGlobals.verbosityLevel > 2: print( _("Making merged book names trie for {} systems…").format( len(self.__DataDicts) ) )
+        self.__trieSystemNames, self.__trie, self.__ambiguityDict = makeBooksNamesTrie( self.__DataDicts )
+        if self.__trieCacheable: # Write it under a temporary name and then rename it so other processes never see a half-written file
+            tempFilepath = '{}.{}.tmp'.format( standardTriePickleFilepath, os.getpid() )
+            try:
+                with open( tempFilepath, 'wb' ) as pickleFile:
+                    pickle.dump( (BOOKS_NAMES_TRIE_FORMAT_VERSION, self.__trieSystemNames, self.__trie, self.__ambiguityDict), pickleFile )
+                os.replace( tempFilepath, standardTriePickleFilepath )
+            except (OSError, pickle.PicklingError) as err: # Not fatal -- we just can't cache it
+                logging.warning( _("Unable to save book names trie to {}: {}").format( standardTriePickleFilepath, err ) )
+    # end of BibleBooksNamesSystems.__loadTrie
+
+
+    def __getTrieEntries( self, bookNameOrAbbreviation, languageCode ):
+        """
+        Returns the sorted (variantFlag,systemIndex,bookIndex,BBB) trie entries
+            for all the input fields starting with the given text (converted to UPPER CASE).
+
+        If a languageCode is given, only the systems for that language are considered (if any of them match).
+        """
+        if self.__trie is None: self.__loadTrie()
+
+        node = self.__trie
+        for char in bookNameOrAbbreviation.upper():
+            try: node = node[0][char]
+            except KeyError: return ()
+        entries = node[1]
+        if languageCode is not None:
+            languageEntries = [entry for entry in entries \
+                                if self.__trieSystemNames[entry[1]].split('_',1)[0] == languageCode]
+            if languageEntries: entries = languageEntries
+        return entries
+    # end of BibleBooksNamesSystems.__getTrieEntries
+
+
+    def getBBBCandidatesFromText( self, bookNameOrAbbreviation, languageCode=None ):
+        """
+        Get all the possible referenceAbbreviations from the given book name or abbreviation (or initial portion of one).
+                (Automatically converts to upper case before comparing strings.)
+
+        If a languageCode is given, only the systems for that language are considered (if any of them match).
+
+        Returns a list of (BBB,systemNameList) 2-tuples in the order that getBBBFromText tries them
+            (so the first one is the result of getBBBFromText), or an empty list.
+        """
+        resultDict = OrderedDict()
+        for variantFlag,systemIndex,bookIndex,BBB in self.__getTrieEntries( bookNameOrAbbreviation, languageCode ):
+            if BBB not in resultDict: resultDict[BBB] = []
+            systemName = self.__trieSystemNames[systemIndex]
+            if systemName not in resultDict[BBB]: resultDict[BBB].append( systemName )
+        return list( resultDict.items() )
+    # end of BibleBooksNamesSystems.getBBBCandidatesFromText
+
+
+    def getBBBFromText( self, bookNameOrAbbreviation, languageCode=None ):
         """
         Get the referenceAbbreviation from the given book name or abbreviation.
                 (Automatically converts to upper case before comparing strings.)
 
-        Tries all the known Bible Books Names systems.
+        Tries the known Bible Books Names systems in priority order (using the merged trie)
+            and returns the first book (in reference number order) in the first system
+            which has an input field starting with the given text,
+            e.g., 'Jud' gives JDG (Judges) rather than JDE (Jude).
+        Only if none of them match are the bookname leader and space-removed variants tried (in the same way),
+            e.g., 'I Jn' or '1Jn' for JN1.
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( "BibleBooksNamesSystems.getBBBFromText( {} )".format( bookNameOrAbbreviation ) )
             assert bookNameOrAbbreviation
 
-        upperCaseBookNameOrAbbreviation = bookNameOrAbbreviation.upper()
+        entries = self.__getTrieEntries( bookNameOrAbbreviation, languageCode )
+        if entries: return entries[0][3]
+    # end of BibleBooksNamesSystems.getBBBFromText
 
-        for systemName in self.__DataDicts:
-            #print( '\n'+repr(systemName) )
-            #print( self.__DataDicts[systemName] )
-            #for j in range( 0, len(self.__DataDicts[systemName]) ):
-                #print( '\nHere1', j, self.__DataDicts[systemName][j] )
-            #for BBB in self.__DataDicts[systemName][2]:
-                #print( 'Here2', BBB, self.__DataDicts[systemName][2][BBB] )
-            divisionsNamesDict, booknameLeadersDict, bookNamesDict, sortedDivisionNamesDict, sortedBookNamesDict = self.getBooksNamesSystem( systemName )
-            #print( '\nHere3 '+systemName, sortedBookNamesDict )
-            if sortedBookNamesDict:
-                if upperCaseBookNameOrAbbreviation in sortedBookNamesDict:
-                    return sortedBookNamesDict[upperCaseBookNameOrAbbreviation]
-            else:
-                for BBB in self.__DataDicts[systemName][2]:
-                    for possibility in self.__DataDicts[systemName][2][BBB]['inputFields']:
-                        #print( possibility )
-                        if possibility.upper().startswith( upperCaseBookNameOrAbbreviation ):
-                            return BBB
 
-            if self.__ExpandedDicts: print( self.__ExpandedDicts[systemName] ); halt # nothing written here yet
-    # end of BibleBooksNamesSystems.getBBBFromText
+    def getAmbiguityReport( self ):
+        """
+        Returns a dictionary with UPPER CASE complete book names or abbreviations as keys
+            and sorted lists of (BBB,systemNameList) 2-tuples as entries
+            for the input fields which resolve to different books in different systems.
+        """
+        if self.__trie is None: self.__loadTrie()
+        return self.__ambiguityDict
+    # end of BibleBooksNamesSystems.getAmbiguityReport
 
 
     def getBooksNamesSystem( self, systemName, bookList=None ):
@@ -568,8 +721,9 @@ def demo():
     print( "Available eng system names are:", bbnss.getAvailableBooksNamesSystemNames( 'eng' ) ) # Just get the ones for this language code
     print( "Available mbt system names are:", bbnss.getAvailableBooksNamesSystemNames( languageCode='mbt' ) )
     print( "Available language codes are:", bbnss.getAvailableLanguageCodes() )
-    for bookName in ( 'Genesis', 'Genèse', 'Génesis', 'Gênesis', '1 John' ):
-        print( "From {!r} got {}".format( bookName, bbnss.getBBBFromText( bookName ) ) )
+    for bookName in ( 'Genesis', 'Genèse', 'Génesis', 'Gênesis', '1 John', 'I Jn', 'Ju' ):
+        print( "From {!r} got {} from {}".format( bookName, bbnss.getBBBFromText( bookName ), bbnss.getBBBCandidatesFromText( bookName ) ) )
+    print( "{} ambiguous book names or abbreviations".format( len(bbnss.getAmbiguityReport()) ) )
 
     # Demo the BibleBooksNamesSystem object
     bbns1 = BibleBooksNamesSystem("eng_traditional") # Doesn't reload the XML unnecessarily :)
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# BibleFingerprints.py
+#
+# Module handling verse-level content fingerprints for comparing Bibles
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module handling verse-level content fingerprints for comparing Bibles,
+    e.g., to find identical or near-identical editions of the same text
+    (revisions, or exports of the same text in USFM, OSIS, e-Sword, etc.)
+    without having to reload and compare all of the text.
+
+A verse fingerprint is a stable 64-bit hash of the normalized clean text of the verse
+    (only the verse text, i.e., not section headings, notes, or formatting, since not all formats have them).
+    InternalBibleBook.getVerseFingerprints makes them (using the C:V index)
+    and InternalBible.getVerseFingerprints collects them into a VerseFingerprints table
+    which is kept with the Bible (and saved with it by the PickledBible export).
+
+A BibleFingerprintCorpus compares the fingerprint tables of any number of Bibles.
+"""
+
+from gettext import gettext as _
+
+LastModifiedDate = '2018-03-18' # by RJH
+ShortProgName = "BibleFingerprints"
+ProgName = "Bible fingerprints handler"
+ProgVersion = '0.01'
+ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
+ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
+
+debuggingThisModule = False
+
+
+import logging
+import hashlib, unicodedata
+from array import array
+from collections import OrderedDict
+from itertools import combinations
+
+import BibleOrgSysGlobals
+
+
+VERSE_FINGERPRINT_VERSION = '1' # Must be changed if the normalization or hashing below ever changes
+VERSE_TEXT_MARKERS = ( 'v~', 'p~', 'vw', ) # The entries in a verse which contain the actual verse text
+IGNORED_CHARACTERS_TABLE = str.maketrans( '', '', '\u00ad\u200b\u200c\u200d\u2060\ufeff' ) # Soft hyphen and zero-width characters
+
+
+
+def normalizeVerseText( verseText ):
+    """
+    Returns the verse text in a standard form so that exports of the same text
+        in different formats give the same fingerprint,
+        i.e., Unicode NFC, without zero-width characters, and with all whitespace runs as a single space.
+    """
+    return ' '.join( unicodedata.normalize( 'NFC', verseText ).translate( IGNORED_CHARACTERS_TABLE ).split() )
+# end of normalizeVerseText
+
+
+def makeVerseFingerprint( normalizedVerseText ):
+    """
+    Returns a stable 64-bit integer hash of the (already normalized) verse text
+        (unlike Python's hash() which changes each time Python is run).
+    """
+    return int.from_bytes( hashlib.blake2b( normalizedVerseText.encode( 'utf-8' ), digest_size=8 ).digest(), 'little' )
+# end of makeVerseFingerprint
+
+
+
+class VerseFingerprints:
+    """
+    Columnar table of the verse fingerprints for one Bible.
+
+    For each book, there's a tuple of the (C,V) keys of the verses which have text,
+        and a parallel array of their 64-bit fingerprints.
+    """
+    def __init__( self, workName ):
+        """
+        Make an empty fingerprint table.
+        """
+        self.workName = workName
+        self.fingerprintVersion = VERSE_FINGERPRINT_VERSION
+        self.books = OrderedDict() # BBB: (CVKeys tuple, fingerprints array)
+        self.bookDigests = {} # Made as required by getBookDigest
+    # end of VerseFingerprints.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the fingerprint table.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Verse fingerprints object for {}".format( self.workName )
+        result += ('\n' if result else '') + "  " + _("Number of books = {}").format( len(self.books) )
+        result += ('\n' if result else '') + "  " + _("Number of verses = {}").format( len(self) )
+        return result
+    # end of VerseFingerprints.__str__
+
+    def __len__( self ): return sum( len(fingerprints) for CVKeys,fingerprints in self.books.values() )
+
+
+    def addBook( self, BBB, CVKeys, fingerprints ):
+        """
+        Add (or replace) the fingerprints for a book.
+        """
+        if BibleOrgSysGlobals.debugFlag: assert len(CVKeys) == len(fingerprints)
+        self.books[BBB] = tuple( CVKeys ), array( 'Q', fingerprints )
+        self.bookDigests.pop( BBB, None )
+    # end of VerseFingerprints.addBook
+
+
+    def removeBook( self, BBB ):
+        """
+        Remove the fingerprints for a book (if we have them).
+        """
+        self.books.pop( BBB, None )
+        self.bookDigests.pop( BBB, None )
+    # end of VerseFingerprints.removeBook
+
+
+    def getBookDigest( self, BBB ):
+        """
+        Returns a digest of all of the verse keys and fingerprints in the book
+            (so that identical books can be found without comparing each verse).
+        """
+        try: return self.bookDigests[BBB]
+        except KeyError: pass
+        CVKeys, fingerprints = self.books[BBB]
+        digester = hashlib.blake2b( digest_size=16 )
+        for (C,V),fingerprint in zip( CVKeys, fingerprints ):
+            digester.update( '{}:{}={:x};'.format( C, V, fingerprint ).encode( 'utf-8' ) )
+        self.bookDigests[BBB] = digester.hexdigest()
+        return self.bookDigests[BBB]
+    # end of VerseFingerprints.getBookDigest
+
+
+    def getBibleDigest( self ):
+        """
+        Returns a digest of the entire table
+            (independent of the order of the books).
+        """
+        digester = hashlib.blake2b( digest_size=16 )
+        for BBB in sorted( self.books ):
+            digester.update( '{}={};'.format( BBB, self.getBookDigest( BBB ) ).encode( 'utf-8' ) )
+        return digester.hexdigest()
+    # end of VerseFingerprints.getBibleDigest
+
+
+    def getVerseFingerprint( self, BBB, C, V ):
+        """
+        Returns the fingerprint for the verse (or None if there's no verse text).
+        """
+        try: CVKeys, fingerprints = self.books[BBB]
+        except KeyError: return None
+        try: return fingerprints[CVKeys.index( (C,V) )]
+        except ValueError: return None
+    # end of VerseFingerprints.getVerseFingerprint
+# end of VerseFingerprints class
+
+
+
+def compareBookFingerprints( BBB, bookFingerprints1, bookFingerprints2, differenceList=None ):
+    """
+    Compare the fingerprints of two versions of a book.
+
+    Each parameter is a 2-tuple (CVKeys, fingerprints) or None if the work doesn't have that book.
+
+    Returns a 4-tuple of counts: same, different, only1, only2.
+        and, if differenceList is given, appends (BBB,C,V,differenceType) 4-tuples to it
+            where differenceType is 'Different', 'Only1', or 'Only2'.
+    """
+    if bookFingerprints1 is None or bookFingerprints2 is None:
+        CVKeys, fingerprints = bookFingerprints1 if bookFingerprints2 is None else bookFingerprints2
+        differenceType = 'Only1' if bookFingerprints2 is None else 'Only2'
+        if differenceList is not None:
+            differenceList.extend( (BBB,C,V,differenceType) for C,V in CVKeys )
+        return (0, 0, len(CVKeys), 0) if bookFingerprints2 is None else (0, 0, 0, len(CVKeys))
+
+    CVKeys1, fingerprints1 = bookFingerprints1
+    CVKeys2, fingerprints2 = bookFingerprints2
+    if CVKeys1 == CVKeys2: # Same verses so we can just compare the arrays
+        if fingerprints1 == fingerprints2: return len(CVKeys1), 0, 0, 0
+        sameCount = 0
+        for CVKey,fingerprint1,fingerprint2 in zip( CVKeys1, fingerprints1, fingerprints2 ):
+            if fingerprint1 == fingerprint2: sameCount += 1
+            elif differenceList is not None: differenceList.append( (BBB,)+CVKey+('Different',) )
+        return sameCount, len(CVKeys1)-sameCount, 0, 0
+
+    # Otherwise the versification must be different
+    sameCount = differentCount = only2Count = 0
+    fingerprintDict1 = dict( zip( CVKeys1, fingerprints1 ) )
+    for CVKey,fingerprint2 in zip( CVKeys2, fingerprints2 ):
+        try: fingerprint1 = fingerprintDict1.pop( CVKey )
+        except KeyError:
+            only2Count += 1
+            if differenceList is not None: differenceList.append( (BBB,)+CVKey+('Only2',) )
+            continue
+        if fingerprint1 == fingerprint2: sameCount += 1
+        else:
+            differentCount += 1
+            if differenceList is not None: differenceList.append( (BBB,)+CVKey+('Different',) )
+    if differenceList is not None: # Put these ones in (with the Only2 ones now out of order)
+        differenceList.extend( (BBB,)+CVKey+('Only1',) for CVKey in fingerprintDict1 )
+    return sameCount, differentCount, len(fingerprintDict1), only2Count
+# end of compareBookFingerprints
+
+
+
+class BibleFingerprintCorpus:
+    """
+    Class for finding identical and near-identical Bibles (and their differences)
+        by comparing their verse fingerprint tables.
+    """
+    def __init__( self ):
+        """
+        Make an empty corpus.
+        """
+        self.works = OrderedDict() # workName: VerseFingerprints
+    # end of BibleFingerprintCorpus.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the corpus.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Bible fingerprint corpus object"
+        result += ('\n' if result else '') + "  " + _("Number of works = {}").format( len(self.works) )
+        return result
+    # end of BibleFingerprintCorpus.__str__
+
+    def __len__( self ): return len( self.works )
+
+
+    def addWork( self, BibleOrFingerprints, workName=None ):
+        """
+        Add a Bible (an InternalBible with its books loaded, or a PickledBible which already has its fingerprints)
+            or a VerseFingerprints table to the corpus.
+
+        Returns the work name used.
+        """
+        verseFingerprints = BibleOrFingerprints if isinstance( BibleOrFingerprints, VerseFingerprints ) \
+                                                else BibleOrFingerprints.getVerseFingerprints()
+        if workName is None: workName = verseFingerprints.workName
+        if workName in self.works:
+            logging.warning( _("BibleFingerprintCorpus.addWork: Replacing {!r}").format( workName ) )
+        self.works[workName] = verseFingerprints
+        return workName
+    # end of BibleFingerprintCorpus.addWork
+
+
+    def findIdenticalWorks( self ):
+        """
+        Returns a list of lists of the names of works which have identical verse text.
+        """
+        worksByDigest = OrderedDict()
+        for workName,verseFingerprints in self.works.items():
+            worksByDigest.setdefault( verseFingerprints.getBibleDigest(), [] ).append( workName )
+        return [workNames for workNames in worksByDigest.values() if len(workNames) > 1]
+    # end of BibleFingerprintCorpus.findIdenticalWorks
+
+
+    def compareWorks( self, workName1, workName2, differenceList=None ):
+        """
+        Compare two works in the corpus (verse by verse).
+
+        Returns a dictionary with the counts of the verses which are 'Same', 'Different', 'Only1', 'Only2'
+            as well as the 'Similarity' (the proportion of all the verses which are the same).
+
+        If differenceList is given, the (BBB,C,V,differenceType) 4-tuples are appended to it.
+        """
+        fingerprints1, fingerprints2 = self.works[workName1], self.works[workName2]
+        counts = [0, 0, 0, 0]
+        for BBB in list(fingerprints1.books) + [BBB for BBB in fingerprints2.books if BBB not in fingerprints1.books]:
+            bookFingerprints1, bookFingerprints2 = fingerprints1.books.get( BBB ), fingerprints2.books.get( BBB )
+            if differenceList is None and bookFingerprints1 is not None and bookFingerprints2 is not None \
+            and fingerprints1.getBookDigest( BBB ) == fingerprints2.getBookDigest( BBB ): # identical books
+                counts[0] += len( bookFingerprints1[0] )
+                continue
+            for j,count in enumerate( compareBookFingerprints( BBB, bookFingerprints1, bookFingerprints2, differenceList ) ):
+                counts[j] += count
+        totalCount = sum( counts )
+        return { 'Same':counts[0], 'Different':counts[1], 'Only1':counts[2], 'Only2':counts[3],
+                    'Similarity':counts[0]/totalCount if totalCount else 1.0 }
+    # end of BibleFingerprintCorpus.compareWorks
+
+
+    def getVerseDifferences( self, workName1, workName2 ):
+        """
+        Returns a list of (BBB,C,V,differenceType) 4-tuples for the verses which differ between the two works
+            where differenceType is 'Different', 'Only1', or 'Only2'.
+        """
+        differenceList = []
+        self.compareWorks( workName1, workName2, differenceList )
+        return differenceList
+    # end of BibleFingerprintCorpus.getVerseDifferences
+
+
+    def findSimilarWorks( self, minimumSimilarity=0.9 ):
+        """
+        Compare every pair of works in the corpus.
+
+        Returns a list of (similarity, workName1, workName2) 3-tuples (most similar first)
+            for the pairs with at least the minimumSimilarity (0.0 to 1.0).
+        """
+        verseCounts = { workName:len(verseFingerprints) for workName,verseFingerprints in self.works.items() }
+        resultList = []
+        for workName1, workName2 in combinations( self.works, 2 ):
+            verseCount1, verseCount2 = verseCounts[workName1], verseCounts[workName2]
+            if max( verseCount1, verseCount2 ) \
+            and min( verseCount1, verseCount2 ) / max( verseCount1, verseCount2 ) < minimumSimilarity:
+                continue # The similarity can't be high enough so don't bother comparing them
+            similarity = self.compareWorks( workName1, workName2 )['Similarity']
+            if similarity >= minimumSimilarity:
+                resultList.append( (similarity, workName1, workName2) )
+        return sorted( resultList, key=lambda r: -r[0] )
+    # end of BibleFingerprintCorpus.findSimilarWorks
+# end of BibleFingerprintCorpus class
+
+
+
+def demo():
+    """
+    Compare the fingerprints of some test Bibles.
+    """
+    import time
+    from USFMBible import USFMBible
+    from USXXMLBible import USXXMLBible
+
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    corpus = BibleFingerprintCorpus()
+    for BibleClass, testFolder in ( (USFMBible,'Tests/DataFilesForTests/USFMTest1/'), (USFMBible,'Tests/DataFilesForTests/USFMTest2/'),
+                                    (USXXMLBible,'Tests/DataFilesForTests/USXTest1/'), (USXXMLBible,'Tests/DataFilesForTests/USXTest2/'), ):
+        testBible = BibleClass( testFolder )
+        testBible.load()
+        startTime = time.time()
+        workName = corpus.addWork( testBible )
+        if BibleOrgSysGlobals.verbosityLevel > 1:
+            print( "  Made {} fingerprints for {} in {:.3f}s".format( len(corpus.works[workName]), workName, time.time()-startTime ) )
+    if BibleOrgSysGlobals.verbosityLevel > 0:
+        print( corpus )
+        print( "  Identical works: {}".format( corpus.findIdenticalWorks() ) )
+        for workName1, workName2 in combinations( corpus.works, 2 ):
+            print( "  {} and {}: {}".format( workName1, workName2, corpus.compareWorks( workName1, workName2 ) ) )
+        print( "  Similar works: {}".format( corpus.findSimilarWorks( minimumSimilarity=0.5 ) ) )
+# end of demo
+
+if __name__ == '__main__':
+    # Configure basic Bible Organisational System (BOS) set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    demo()
+
+    BibleOrgSysGlobals.closedown( ProgName, ProgVersion )
+# end of BibleFingerprints.py
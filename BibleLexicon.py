@@ -31,10 +31,10 @@ Module handling the OpenScriptures Hebrew and morphgnt Greek lexicons.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2016-02-25' # by RJH
+LastModifiedDate = '2018-03-16' # by RJH
 ShortProgName = "BibleLexicon"
 ProgName = "Bible Lexicon format handler"
-ProgVersion = '0.24'
+ProgVersion = '0.25'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -42,11 +42,15 @@ debuggingThisModule = False
 
 
 import logging
+from collections import OrderedDict
 
 import BibleOrgSysGlobals
 import HebrewLexicon, GreekLexicon
 
 
+MAX_CACHED_HTML_ENTRIES = 250 # Rendered HTML entries kept by each BibleLexicon object
+
+
 
 def exp( messageString ):
     """
@@ -202,9 +206,28 @@ class BibleLexicon:
             fnfCount += 1
             self.gLexicon = None
         if fnfCount >= 2: raise FileNotFoundError
+        self.HTMLCache = OrderedDict() # Least recently used entries first
     # end of BibleLexicon.__init__
 
 
+    def _getCachedHTML( self, cacheKey, makeHTMLFunction, key ):
+        """
+        Returns the rendered HTML from our LRU cache
+            or else calls makeHTMLFunction( key ) and caches the result.
+        """
+        try:
+            html = self.HTMLCache[cacheKey]
+            self.HTMLCache.move_to_end( cacheKey )
+            return html
+        except KeyError: pass
+        html = makeHTMLFunction( key )
+        self.HTMLCache[cacheKey] = html
+        if len(self.HTMLCache) > MAX_CACHED_HTML_ENTRIES:
+            self.HTMLCache.popitem( last=False ) # Discard the least recently used entry
+        return html
+    # end of BibleLexicon._getCachedHTML
+
+
     def __str__( self ):
         """
         This method returns the string representation of the Bible lexicon.
@@ -279,8 +302,8 @@ class BibleLexicon:
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( exp("BibleLexicon.getStrongsEntryHTML( {} )").format( repr(key) ) )
-        if key.startswith( 'H' ): return self.hLexicon.getStrongsEntryHTML( key )
-        if key.startswith( 'G' ): return self.gLexicon.getStrongsEntryHTML( key )
+        if key.startswith( 'H' ): return self._getCachedHTML( ('Strongs',key), self.hLexicon.getStrongsEntryHTML, key )
+        if key.startswith( 'G' ): return self._getCachedHTML( ('Strongs',key), self.gLexicon.getStrongsEntryHTML, key )
     # end of BibleLexicon.getStrongsEntryHTML
 
 
@@ -322,7 +345,7 @@ class BibleLexicon:
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( exp("BibleLexicon.getBrDrBrEntryHTML( {} )").format( repr(key) ) )
-        return self.hLexicon.getBrDrBrEntryHTML( key )
+        return self._getCachedHTML( ('BrDrBr',key), self.hLexicon.getBrDrBrEntryHTML, key )
     # end of BibleLexicon.getBrDrBrEntryHTML
 
 
@@ -382,9 +405,8 @@ class BibleLexicon:
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( exp("BibleLexicon.getEntryHTML( {} )").format( repr(key) ) )
         if not key: return
-        if key[0]=='H' and key[1:].isdigit(): return self.hLexicon.getStrongsEntryHTML( key )
-        if key[0]=='G' and key[1:].isdigit(): return self.gLexicon.getStrongsEntryHTML( key )
-        if '.' in key: return self.hLexicon.getBrDrBrEntryHTML( key )
+        if key[0] in 'HG' and key[1:].isdigit(): return self.getStrongsEntryHTML( key )
+        if '.' in key: return self.getBrDrBrEntryHTML( key )
     # end of BibleLexicon.getEntryHTML
 # end of BibleLexicon class
 
@@ -80,10 +80,10 @@ Contains functions:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-26' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "BOSGlobals"
 ProgName = "BibleOrgSys Globals"
-ProgVersion = '0.77'
+ProgVersion = '0.80'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -91,7 +91,7 @@ debuggingThisModule = False
 haltOnXMLWarning = False # Used for XML debugging
 
 
-import sys, logging, os.path, pickle
+import sys, logging, os.path, pickle, re
 import unicodedata
 from argparse import ArgumentParser
 try: import pwd
@@ -394,10 +394,42 @@ ACCENT_DICT = { 'À':'A','Á':'A','Â':'A','Ã':'A','Ä':'A','Å':'A','Ă':'A','
               'ý':'y','ÿ':'y',
               }
 
+ACCENT_FOLDING_SCRIPT_NAMES = ( 'LATIN ', 'GREEK ', ) # Only precomposed letters from these scripts have their accents removed
+
+class _AccentFoldingTable( dict ):
+    """
+    A str.translate table made from ACCENT_DICT
+        which also handles other precomposed Latin and Greek characters (e.g., Greek or Vietnamese letters with accents)
+        by using Unicode decomposition to find the base character.
+
+    Precomposed characters from other scripts are left unchanged,
+        e.g., Hebrew presentation forms with points, Devanagari letters with nukta, or Cyrillic й,
+        because their marks are not accents.
+
+    The result for each new character is cached in the table the first time that character is encountered.
+    """
+    def __missing__( self, charOrdinal ):
+        decomposedString = unicodedata.normalize( 'NFD', chr(charOrdinal) )
+        if len(decomposedString) > 1 and not unicodedata.combining( decomposedString[0] ) \
+        and unicodedata.name( chr(charOrdinal), '' ).startswith( ACCENT_FOLDING_SCRIPT_NAMES ) \
+        and all( unicodedata.combining(someChar) for someChar in decomposedString[1:] ):
+            result = decomposedString[0] # Just keep the base character
+        else: result = charOrdinal # Not a precomposed character so leave it unchanged
+        self[charOrdinal] = result
+        return result
+    # end of _AccentFoldingTable.__missing__
+# end of _AccentFoldingTable class
+
+ACCENT_FOLDING_TABLE = _AccentFoldingTable( str.maketrans( ACCENT_DICT ) )
+
+
 def removeAccents( someString ):
     """
     Remove accents from the string and return it (used for fuzzy matching)
 
+    Uses ACCENT_DICT for the characters in it,
+        otherwise the Unicode decomposition of any precomposed Latin or Greek characters.
+
     Not that this doesn't remove Hebrew vowel pointing.
     """
     # Try 1
@@ -413,7 +445,7 @@ def removeAccents( someString ):
         #resultString += someChar if cutoff==-1 else unicodedata.lookup( desc[:cutoff] )
     #return resultString
 
-    # The next two use our ACCENT_DICT above
+    # The next three use our ACCENT_DICT above
     # Try 3
     #resultString = ''
     #for someChar in someString:
@@ -421,8 +453,12 @@ def removeAccents( someString ):
     #return resultString
 
     # Try 4
-    return ''.join( ACCENT_DICT[someChar] if someChar in ACCENT_DICT else someChar for someChar in someString )
-# end of BibleOrgSysGlobals.makeSafeString
+    #return ''.join( ACCENT_DICT[someChar] if someChar in ACCENT_DICT else someChar for someChar in someString )
+
+    # Try 5 -- uses our precompiled translation table
+    if someString.isascii(): return someString # Nothing to do
+    return someString.translate( ACCENT_FOLDING_TABLE )
+# end of BibleOrgSysGlobals.removeAccents
 
 
 ##########################################################################################################
@@ -838,6 +874,47 @@ def elementStr( element, level=0 ):
 # end of BibleOrgSysGlobals.elementStr
 
 
+def iterparseXMLElements( XMLFilepath, maxDepth=1 ):
+    """
+    Parses an XML file incrementally (rather than building the whole tree first)
+        and yields (event, depth, element, parentElement) 4-tuples
+        for the elements down to maxDepth levels below the root (which is depth 0).
+
+    event is 'start' for elements above maxDepth (only the tag and attributes are available yet)
+        or 'end' for elements down to maxDepth (complete, including their tail,
+            because the end events are only yielded after the tail has been read).
+    parentElement is None for the root element.
+
+    Nothing is removed from the tree here, so after processing an element (e.g., a Bible book)
+        the caller should do parentElement.remove( element ) to release the memory.
+
+    Raises ParseError (from wherever the error is in the file) like ElementTree().parse() does
+        (but only after yielding any element which was already complete).
+    """
+    from xml.etree.ElementTree import iterparse, ParseError
+
+    elementStack = [] # The currently open elements
+    pendingEnd = None # We don't have the tail of the most recently completed element until the next event
+    try:
+        for event, element in iterparse( XMLFilepath, events=('start','end') ):
+            if pendingEnd is not None:
+                yield pendingEnd
+                pendingEnd = None
+            if event == 'start':
+                depth = len( elementStack )
+                elementStack.append( element )
+                if depth < maxDepth: yield 'start', depth, element, elementStack[-2] if depth else None
+            else: # must be 'end'
+                elementStack.pop()
+                depth = len( elementStack )
+                if depth <= maxDepth: pendingEnd = ('end', depth, element, elementStack[-1] if depth else None)
+    except ParseError: # e.g., a truncated file
+        if pendingEnd is not None: yield pendingEnd # It's complete (except perhaps for its tail)
+        raise
+    if pendingEnd is not None: yield pendingEnd # The end of the root element
+# end of BibleOrgSysGlobals.iterparseXMLElements
+
+
 def checkXMLNoAttributes( element, locationString, idString=None, loadErrorsDict=None ):
     """
     Give a warning if the element contains any attributes.
@@ -1020,6 +1097,34 @@ def stripWordPunctuation( wordToken ):
 # end of BibleOrgSysGlobals.stripWordPunctuation
 
 
+WORD_TOKEN_REGEX = re.compile( '[^\\s—–]+' ) # Treat em-dash and en-dash as word break characters (as well as whitespace)
+internalSFMsRegex = None # Compiled (from internal_SFMs_to_remove) the first time that tokenizeWords needs it
+
+def tokenizeWords( text ):
+    """
+    Breaks the text into words
+        (using the same word breaks as text.replace('—',' ').replace('–',' ').split()).
+
+    Returns a list of 3-tuples (startIndex, rawWord, word)
+        where word is rawWord with any internal SFMs removed.
+
+    Note: callers still need to remove punctuation from the words (e.g., with stripWordPunctuation above)
+        and decide what to do with words that are just references or numbers.
+    """
+    global internalSFMsRegex
+    if internalSFMsRegex is None and internal_SFMs_to_remove:
+        internalSFMsRegex = re.compile( '|'.join( re.escape( internalMarker )
+                                for internalMarker in sorted( internal_SFMs_to_remove, key=len, reverse=True ) ) ) # Longest first
+
+    tokens = []
+    for match in WORD_TOKEN_REGEX.finditer( text ):
+        rawWord = word = match.group()
+        if '\\' in word and internalSFMsRegex is not None: word = internalSFMsRegex.sub( '', word )
+        tokens.append( (match.start(), rawWord, word) )
+    return tokens
+# end of BibleOrgSysGlobals.tokenizeWords
+
+
 ##########################################################################################################
 #
 # Reloading a saved Python object from the cache
@@ -1317,8 +1422,9 @@ def demo():
 
     accentedString1 = 'naïve café'
     dan11 = "בִּשְׁנַ֣ת שָׁל֔וֹשׁ לְמַלְכ֖וּת יְהוֹיָקִ֣ים מֶֽלֶךְ־יְהוּדָ֑ה בָּ֣א נְבוּכַדְנֶאצַּ֧ר מֶֽלֶךְ־בָּבֶ֛ל יְרוּשָׁלִַ֖ם וַיָּ֥צַר עָלֶֽיהָ ׃"
+    greekString1 = 'Ἐν ἀρχῇ ἦν ὁ λόγος'
     if verbosityLevel > 0: print( "\nRemoving accents…" )
-    for accentedString in ( accentedString1, dan11, ):
+    for accentedString in ( accentedString1, dan11, greekString1, ):
         for thisAccentedString in ( accentedString, accentedString.lower(), accentedString.upper(), ):
             if verbosityLevel > 0:
                 print( "  Given: {}".format( thisAccentedString ) )
@@ -82,10 +82,10 @@ Technical note: Our Bible reference parsers use state machines rather than regul
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-27' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "BibleReferences"
 ProgName = "Bible References handler"
-ProgVersion = '0.35'
+ProgVersion = '0.37'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -93,11 +93,15 @@ debuggingThisModule = False
 
 
 import logging
+from collections import OrderedDict
 
 import BibleOrgSysGlobals
 from BibleOrganizationalSystems import BibleOrganizationalSystem
 
 
+MAX_CACHED_REFERENCE_PARSES = 5000 # Most recently used reference strings remembered by BibleReferenceList
+
+
 # This is a hack because it's language dependant :-(
 ignoredSuffixes = (' (LXX)',) # A hack to cope with these suffixes in cross-references and footnotes :(
 
@@ -635,7 +639,8 @@ class BibleReferenceList( BibleReferenceBase ):
     __init__ creates the object
     __str__ gives a brief prose description of the object
     makeReferenceString makes a reference string out of a tuple
-    parseReferenceString makes a tuple out of a reference string
+    parseReferenceString makes a tuple out of a reference string (and remembers the result)
+    parseBookReferenceStrings parses (and remembers) a batch of reference strings from one book
     parseOSISReferenceString makes a tuple out of an OSIS reference string
     getReferenceList returns our internal reference list of tuples, optionally expanded across ranges
     getOSISRefList converts our internal reference list of tuples to an OSIS reference string
@@ -659,6 +664,8 @@ class BibleReferenceList( BibleReferenceBase ):
         self.objectNameString = 'Bible reference list object'
         self.objectTypeString = 'BibleReferenceList'
         self.referenceList = []
+        self.parseCache = OrderedDict() # Recently parsed (referenceString,contextBBB) results
+        self.bookParseResults = {} # Results from parseBookReferenceStrings (by contextBBB)
     # end of BibleReferenceList.__init__
 
     def __str__( self ):
@@ -702,7 +709,69 @@ class BibleReferenceList( BibleReferenceBase ):
         return resultString
     # end of BibleReferenceList.makeReferenceString
 
-    def parseReferenceString( self, referenceString, location=None ):
+    def parseReferenceString( self, referenceString, location=None, contextBBB=None ):
+        """
+        Returns a tuple with True/False result, haveWarnings, list of (BBB, C, V, S) tuples.
+            A range is expressed as a tuple containing a pair of (BBB, C, V, S) tuples.
+
+        The same reference strings (especially in footnotes and cross-references) occur again and again
+            and the exporters parse them all again for each export format,
+            so the results are remembered, keyed by the reference string and the optional contextBBB
+            (the book that the reference string came from).
+        NOTE: contextBBB is only used as part of the cache key (to find the parseBookReferenceStrings results)
+            -- it's not used to help parse the reference string, e.g., to supply a missing book name.
+        Note that any warnings and errors are only logged the first time that a string is parsed.
+        """
+        cacheKey = (referenceString, contextBBB)
+        try: result = self.bookParseResults[contextBBB][referenceString]
+        except KeyError:
+            try:
+                result = self.parseCache[cacheKey]
+                self.parseCache.move_to_end( cacheKey )
+            except KeyError:
+                successFlag, haveWarnings, referenceList = self.__parseReferenceString( referenceString, location )
+                result = successFlag, haveWarnings, tuple( referenceList )
+                self.parseCache[cacheKey] = result
+                if len(self.parseCache) > MAX_CACHED_REFERENCE_PARSES:
+                    self.parseCache.popitem( last=False ) # Forget the least recently used one
+        successFlag, haveWarnings, referenceTuple = result
+        self.referenceList = list( referenceTuple ) # Other methods (e.g., getOSISRefList, containsReference) use this
+        return successFlag, haveWarnings, self.referenceList
+    # end of BibleReferenceList.parseReferenceString
+
+
+    def parseBookReferenceStrings( self, contextBBB, referenceStrings, location=None ):
+        """
+        Parses a batch of reference strings from the given book (e.g., from all of its footnotes and cross-references)
+            and remembers the results (unlike the parseReferenceString cache, these are never discarded)
+            so that later parseReferenceString calls (e.g., from each exporter) with that contextBBB
+            don't need to parse them again.
+
+        Returns the number of different reference strings.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BibleReferences.parseBookReferenceStrings( {}, {}, {} )".format( contextBBB, len(referenceStrings), location ) )
+        bookResults = self.bookParseResults.get( contextBBB, {} )
+        for referenceString in referenceStrings:
+            if referenceString and referenceString not in bookResults:
+                successFlag, haveWarnings, referenceList = self.__parseReferenceString( referenceString,
+                                                                location if location else "{} notes".format( contextBBB ) )
+                bookResults[referenceString] = successFlag, haveWarnings, tuple( referenceList )
+        self.bookParseResults[contextBBB] = bookResults
+        return len( bookResults )
+    # end of BibleReferenceList.parseBookReferenceStrings
+
+
+    def clearParseCache( self ):
+        """
+        Forget all remembered parse results (e.g., if the Bible book names have changed).
+        """
+        self.parseCache.clear()
+        self.bookParseResults = {}
+    # end of BibleReferenceList.clearParseCache
+
+
+    def __parseReferenceString( self, referenceString, location=None ):
         """
         A complex state machine that
         returns a tuple with True/False result, haveWarnings, list of (BBB, C, V, S) tuples.
@@ -1225,17 +1294,17 @@ class BibleReferenceList( BibleReferenceBase ):
                     logging.warning( _("Have duplicate or overlapping range at {} in Bible references {!r}").format( self.makeReferenceString(entry), referenceString ) )
             haveWarnings = True
         return status==9 and not haveErrors, haveWarnings, self.referenceList
-    # end of BibleReferenceList.parseReferenceString
+    # end of BibleReferenceList.__parseReferenceString
 
 
-    def getFirstReference( self, referenceString, location=None ):
+    def getFirstReference( self, referenceString, location=None, contextBBB=None ):
         """
         Just return the first reference, even if given a range.
 
         Basically just returns the first result (if any) from parseReferenceString.
         """
-        if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( "BibleReferences.getFirstReference( {}, {} )".format( repr(referenceString), location ) )
-        hE, hW, refList = self.parseReferenceString( referenceString, location )
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( "BibleReferences.getFirstReference( {}, {}, {} )".format( repr(referenceString), location, contextBBB ) )
+        hE, hW, refList = self.parseReferenceString( referenceString, location, contextBBB )
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( "gFR", hE, hW, refList )
         for something in refList: # Just return the first one
             if isinstance( something, tuple ):
@@ -1259,8 +1328,8 @@ class BibleReferenceList( BibleReferenceBase ):
         #self.getBBBFromText = lambda s: BibleOrgSysGlobals.BibleBooksCodes.getBBBFromOSISAbbreviation(s)
         self.getBBBFromText = BibleOrgSysGlobals.BibleBooksCodes.getBBBFromOSISAbbreviation
 
-        # Now do the actual parsing using the standard routine
-        sucessFlag, haveWarnings, resultList = self.parseReferenceString( referenceString )
+        # Now do the actual parsing using the standard routine (but not remembering the result since the settings are different)
+        sucessFlag, haveWarnings, resultList = self.__parseReferenceString( referenceString )
 
         # Set things up again how they were
         self.punctuationDict = self._BibleOrganizationalSystem.getPunctuationDict()
@@ -1318,12 +1387,12 @@ class BibleReferenceList( BibleReferenceBase ):
         return result
     # end of BibleReferenceList.getOSISRefList
 
-    def parseToOSIS( self, referenceString, location=None ):
+    def parseToOSIS( self, referenceString, location=None, contextBBB=None ):
         """ Just combines the two above routines.
                 Parses a vernacular reference string and returns an OSIS reference string
                     or None if a valid reference cannot be parsed. """
         #print( "parseToOSIS:", "'"+referenceString+"'", "'"+location+"'" )
-        successFlag, haveWarnings, refList = self.parseReferenceString( referenceString, location )
+        successFlag, haveWarnings, refList = self.parseReferenceString( referenceString, location, contextBBB )
         if successFlag: return self.getOSISRefList()
         #logging.error( "You should already have an error above for {!r}".format( referenceString ) ) # temp
     # end of BibleReferenceList.parseToOSIS
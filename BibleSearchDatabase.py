@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# BibleSearchDatabase.py
+#
+# Module for exporting Bibles to, and searching them in, an SQLite full-text-search database
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for exporting Bibles to, and searching them in, an SQLite full-text-search database.
+
+InternalBible.findText has to load and scan every book for every search.
+    createSearchDatabase (called by BibleWriter.toSearchDatabase) writes the clean text
+    of each searchable line (along with the BBB, C, V, and marker) into an SQLite FTS5 table,
+    optionally with a diacritic-folded copy of the text.
+    Any number of Bibles (works) can be written into the same database.
+
+BibleSearchDatabase then answers findText-style searches (with the same options
+    and the same results) from the database without loading any of the Bibles.
+    The FTS5 index (using the trigram tokenizer if this SQLite has it) finds the candidate lines,
+    then the same line matching code as findText is used (for the word modes, case, context, etc.).
+
+Not handled: the includeExtrasFlag option (because only the clean text is saved).
+"""
+
+from gettext import gettext as _
+
+LastModifiedDate = '2018-03-18' # by RJH
+ShortProgName = "BibleSearchDatabase"
+ProgName = "Bible search database handler"
+ProgVersion = '0.02'
+ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
+ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
+
+debuggingThisModule = False
+
+
+import os.path
+import logging
+import sqlite3
+from datetime import datetime
+from collections import OrderedDict
+
+import BibleOrgSysGlobals
+from InternalBible import prepareFindTextOptions, findTextInLine
+
+
+SEARCH_DATABASE_FORMAT_VERSION = '1'
+DEFAULT_SEARCH_DATABASE_FILENAME = 'BOSSearch.sqlite'
+
+# The trigram tokenizer (SQLite 3.34 and later) can find any substring of three or more characters
+#   otherwise the candidate lines are found by scanning the table
+FTS5_TOKENIZERS = ( 'trigram', 'unicode61 remove_diacritics 0', )
+MINIMUM_TRIGRAM_QUERY_LENGTH = 3
+
+
+
+def createSearchDatabase( BibleObject, databaseFilepath, foldDiacritics=True ):
+    """
+    Write the searchable lines of the Bible into the database
+        (which is created if necessary).
+
+    If the database already contains a work with this name, it is replaced.
+
+    If foldDiacritics is set, a copy of the text with the diacritics removed
+        (by BibleOrgSysGlobals.removeAccents) is also saved to speed up ignoreDiacriticsFlag searches.
+
+    Returns True if successful.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( "createSearchDatabase( {}, {!r}, {} )".format( BibleObject.getAName(), databaseFilepath, foldDiacritics ) )
+    workName = BibleObject.getAName( abbrevFirst=True ) # Same as the findText default
+    if BibleOrgSysGlobals.verbosityLevel > 2: print( "  " + _("Writing {} to search database {}…").format( workName, databaseFilepath ) )
+
+    connection = sqlite3.connect( databaseFilepath )
+    try:
+        cursor = connection.cursor()
+        cursor.execute( 'CREATE TABLE IF NOT EXISTS header ( name TEXT PRIMARY KEY, value TEXT )' )
+        header = dict( cursor.execute( 'SELECT name,value FROM header' ).fetchall() )
+        if header.get( 'formatVersion', SEARCH_DATABASE_FORMAT_VERSION ) != SEARCH_DATABASE_FORMAT_VERSION:
+            logging.critical( _("createSearchDatabase: {} is in the wrong format ({})").format( databaseFilepath, header['formatVersion'] ) )
+            return False
+        if 'tokenizer' not in header: # It's a new database
+            for tokenizer in FTS5_TOKENIZERS:
+                try:
+                    cursor.execute( 'CREATE VIRTUAL TABLE lines USING fts5( text, foldedText, workID UNINDEXED, BBB UNINDEXED,'
+                                    ' C UNINDEXED, V UNINDEXED, marker UNINDEXED, originalMarker UNINDEXED, paragraphMarker UNINDEXED,'
+                                    ' tokenize="{}" )'.format( tokenizer ) )
+                    break
+                except sqlite3.OperationalError as err: lastError = err
+            else:
+                logging.critical( _("createSearchDatabase: Unable to make an FTS5 table (needs SQLite {} or later): {}").format( '3.9', lastError ) )
+                return False
+            cursor.execute( 'CREATE TABLE works ( workID INTEGER PRIMARY KEY, workName TEXT UNIQUE,'
+                                    ' abbreviation TEXT, BibleType TEXT, sourceFolder TEXT, foldedFlag INTEGER, exported TEXT )' )
+            cursor.execute( 'CREATE TABLE books ( workID INTEGER, bookIndex INTEGER, BBB TEXT, PRIMARY KEY( workID, bookIndex ) )' )
+            cursor.executemany( 'INSERT INTO header VALUES(?,?)',
+                                (('formatVersion',SEARCH_DATABASE_FORMAT_VERSION), ('tokenizer',tokenizer), ('program',ProgNameVersion)) )
+
+        # Remove any previous export of this work
+        row = cursor.execute( 'SELECT workID FROM works WHERE workName=?', (workName,) ).fetchone()
+        if row is not None:
+            for tableName in ( 'lines', 'books', 'works', ):
+                cursor.execute( 'DELETE FROM {} WHERE workID=?'.format( tableName ), row )
+
+        cursor.execute( 'INSERT INTO works(workName,abbreviation,BibleType,sourceFolder,foldedFlag,exported) VALUES(?,?,?,?,?,?)',
+                    (workName, BibleObject.abbreviation, BibleObject.objectTypeString, getattr( BibleObject, 'sourceFolder', None ),
+                        1 if foldDiacritics else 0, datetime.now().isoformat( ' ', 'seconds' )) )
+        workID = cursor.lastrowid
+
+        for bookIndex,(BBB,bookObject) in enumerate( BibleObject.books.items() ):
+            cursor.execute( 'INSERT INTO books VALUES(?,?,?)', (workID,bookIndex,BBB) )
+            lineRows = []
+            # This must match the way that InternalBible.findText goes through the book
+            C, V = '-1', '-1' # So first/id line starts at -1:0
+            marker = lastParagraphMarker = None
+            for lineEntry in bookObject:
+                if marker in BibleOrgSysGlobals.USFMParagraphMarkers:
+                    lastParagraphMarker = marker
+                marker, cleanText = lineEntry.getMarker(), lineEntry.getCleanText()
+                if marker[0] == '¬': continue # we'll always ignore these added lines
+                if marker in ('intro','chapters'): continue # we'll always ignore these added lines
+                if marker == 'c': C, V = cleanText, '0'
+                elif marker == 'v': V = cleanText
+                elif C == '-1': V = str( int(V) + 1 )
+                lineRows.append( (cleanText, BibleOrgSysGlobals.removeAccents( cleanText ) if foldDiacritics else None,
+                                    workID, BBB, C, V, marker, lineEntry.getOriginalMarker(), lastParagraphMarker) )
+            cursor.executemany( 'INSERT INTO lines VALUES(?,?,?,?,?,?,?,?,?)', lineRows )
+        cursor.execute( "INSERT INTO lines(lines) VALUES('optimize')" ) # Merge the index b-trees for faster searches
+        connection.commit()
+    finally: connection.close()
+    return True
+# end of createSearchDatabase
+
+
+
+class BibleSearchDatabase:
+    """
+    Class for searching the works in a search database (made by createSearchDatabase above).
+    """
+    def __init__( self, databaseFilepath ):
+        """
+        Open the database (read-only).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BibleSearchDatabase.__init__( {!r} )".format( databaseFilepath ) )
+        self.databaseFilepath = databaseFilepath
+        self.connection = sqlite3.connect( 'file:{}?mode=ro'.format( os.path.abspath( databaseFilepath ) ), uri=True )
+        self.header = dict( self.connection.execute( 'SELECT name,value FROM header' ).fetchall() )
+        if self.header['formatVersion'] != SEARCH_DATABASE_FORMAT_VERSION:
+            logging.critical( _("BibleSearchDatabase: {} is in the wrong format ({})").format( databaseFilepath, self.header['formatVersion'] ) )
+        self.trigramFlag = self.header['tokenizer'] == 'trigram'
+        self.works = OrderedDict() # workName: (workID, foldedFlag, bookList)
+        for workID,workName,foldedFlag in self.connection.execute( 'SELECT workID,workName,foldedFlag FROM works ORDER BY workID' ).fetchall():
+            bookList = [BBB for (BBB,) in self.connection.execute( 'SELECT BBB FROM books WHERE workID=? ORDER BY bookIndex', (workID,) ).fetchall()]
+            self.works[workName] = workID, bool(foldedFlag), bookList
+    # end of BibleSearchDatabase.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the search database.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Bible search database object"
+        result += ('\n' if result else '') + "  " + _("Filepath: {}").format( self.databaseFilepath )
+        result += ('\n' if result else '') + "  " + _("Tokenizer: {}").format( self.header['tokenizer'] )
+        result += ('\n' if result else '') + "  " + _("Number of works = {}").format( len(self.works) )
+        for workName,(workID,foldedFlag,bookList) in self.works.items():
+            result += ('\n' if result else '') + "    " + _("{} ({} books)").format( workName, len(bookList) )
+        return result
+    # end of BibleSearchDatabase.__str__
+
+    def __len__( self ): return len( self.works )
+
+
+    def getWorkNames( self ):
+        """
+        Returns a list of the names of the works in the database.
+        """
+        return list( self.works.keys() )
+    # end of BibleSearchDatabase.getWorkNames
+
+
+    def getBookList( self, workName ):
+        """
+        Returns a list of the BBB codes of the books in the work.
+        """
+        return list( self.works[workName][2] )
+    # end of BibleSearchDatabase.getBookList
+
+
+    def __getCandidateRows( self, workID, optionsDict, ourFindText, columnName ):
+        """
+        Returns a cursor for the lines of the work which might contain the text,
+            i.e., the lines found by the FTS5 index if possible,
+            otherwise all of the lines.
+
+        Note that the trigram tokenizer doesn't remove accents,
+            so the index can't be used to ignore diacritics in the (unfolded) text column.
+        """
+        selectString = 'SELECT text,foldedText,BBB,C,V,marker,originalMarker,paragraphMarker FROM lines WHERE workID=?'
+        if self.trigramFlag and not optionsDict['regexFlag'] and not optionsDict['includeMarkerTextFlag'] \
+        and (not optionsDict['ignoreDiacriticsFlag'] or columnName=='foldedText') \
+        and len(ourFindText) >= MINIMUM_TRIGRAM_QUERY_LENGTH: # the index can be used
+            return self.connection.execute( selectString + ' AND lines MATCH ? ORDER BY rowid',
+                    (workID, '{} : "{}"'.format( columnName, ourFindText.replace( '"', '""' ) )) )
+        return self.connection.execute( selectString + ' ORDER BY rowid', (workID,) )
+    # end of BibleSearchDatabase.__getCandidateRows
+
+
+    def __findTextInWork( self, workName, optionsDict, ourFindText, compiledFindText, ourMarkerList ):
+        """
+        Search the given work.
+
+        Returns the result summary dict and the result list (as for InternalBible.findText).
+        """
+        workID, foldedFlag, bookList = self.works[workName]
+        resultSummaryDict = { 'searchedBookList':[], 'foundBookList':[], }
+        resultList = [] # Contains 4-tuples or 5-tuples -- first entry is the SimpleVerseKey
+        for BBB in bookList:
+            if optionsDict['bookList'] is None or optionsDict['bookList']=='ALL' or BBB in optionsDict['bookList']:
+                resultSummaryDict['searchedBookList'].append( BBB )
+        if not resultSummaryDict['searchedBookList']: return resultSummaryDict, resultList
+
+        useFoldedColumnFlag = optionsDict['ignoreDiacriticsFlag'] and foldedFlag
+        for text, foldedText, BBB, C, V, marker, originalMarker, lastParagraphMarker \
+        in self.__getCandidateRows( workID, optionsDict, ourFindText, 'foldedText' if useFoldedColumnFlag else 'text' ):
+            # These checks must match the ones in InternalBible.findText
+            if BBB not in resultSummaryDict['searchedBookList']: continue
+            if ourMarkerList:
+                if marker not in ourMarkerList and not (marker in ('v~','p~') and lastParagraphMarker in ourMarkerList):
+                    continue
+            elif C=='-1' and not optionsDict['includeIntroFlag']: continue
+            if optionsDict['chapterList'] is None \
+            or C in optionsDict['chapterList'] \
+            or int(C) in optionsDict['chapterList']:
+                if C != '0' and not optionsDict['includeMainTextFlag'] \
+                and (marker in ('v~','p~') or marker in BibleOrgSysGlobals.USFMParagraphMarkers):
+                    continue # We don't have the extras so there's nothing left to search
+                if optionsDict['includeMarkerTextFlag']:
+                    text = '\\{} {}'.format( marker, text )
+                    foldedText = None
+                if not text: continue
+                if optionsDict['ignoreDiacriticsFlag']:
+                    textToBeSearched = foldedText if useFoldedColumnFlag and foldedText is not None \
+                                        else BibleOrgSysGlobals.removeAccents( text )
+                else: textToBeSearched = text
+                if optionsDict['caselessFlag']: textToBeSearched = textToBeSearched.lower()
+                lineResultList = findTextInLine( optionsDict, ourFindText, compiledFindText,
+                                                        textToBeSearched, text, BBB, C, V, originalMarker )
+                if lineResultList:
+                    resultList.extend( lineResultList )
+                    if BBB not in resultSummaryDict['foundBookList']: resultSummaryDict['foundBookList'].append( BBB )
+        return resultSummaryDict, resultList
+    # end of BibleSearchDatabase.__findTextInWork
+
+
+    def findText( self, optionsDict ):
+        """
+        Search a work in the database for the given text which is contained in a dictionary of options
+            (see InternalBible.findText -- the options and the results are the same).
+
+        The work is optionsDict['workName'] (defaulting to the first work in the database).
+
+        Always returns three values:.
+            1/ The updated dictionary of all parameters, i.e., updated optionsDict
+            2/ The result summary dict, containing the following entries:
+                searchedBookList, foundBookList
+            3/ A list with (zero or more) search results
+                being 4-tuples or 5-tuples for caseless searches.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BibleSearchDatabase.findText( {} )".format( optionsDict ) )
+        if not self.works: raise KeyError( _("No works in {}").format( self.databaseFilepath ) )
+
+        ourFindText, compiledFindText, ourMarkerList = prepareFindTextOptions( optionsDict, self.getWorkNames()[0] )
+        if optionsDict['includeExtrasFlag']:
+            logging.warning( _("BibleSearchDatabase.findText: includeExtrasFlag is not handled (only clean text is searched)") )
+        resultSummaryDict, resultList = self.__findTextInWork( optionsDict['workName'], optionsDict, ourFindText, compiledFindText, ourMarkerList )
+        return optionsDict, resultSummaryDict, resultList
+    # end of BibleSearchDatabase.findText
+
+
+    def findTextInWorks( self, optionsDict, workNames=None ):
+        """
+        Search all of the works in the database (or just the given workNames)
+            using the options in optionsDict (as for findText above).
+
+        Returns the updated optionsDict
+            and an OrderedDict of work names to 2-tuples (resultSummaryDict, resultList).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "BibleSearchDatabase.findTextInWorks( {}, {} )".format( optionsDict, workNames ) )
+        ourFindText, compiledFindText, ourMarkerList = prepareFindTextOptions( optionsDict, None )
+        if optionsDict['includeExtrasFlag']:
+            logging.warning( _("BibleSearchDatabase.findTextInWorks: includeExtrasFlag is not handled (only clean text is searched)") )
+        results = OrderedDict()
+        for workName in (workNames if workNames is not None else self.works):
+            results[workName] = self.__findTextInWork( workName, optionsDict, ourFindText, compiledFindText, ourMarkerList )
+        return optionsDict, results
+    # end of BibleSearchDatabase.findTextInWorks
+
+
+    def close( self ):
+        """
+        Close the database connection.
+        """
+        self.connection.close()
+    # end of BibleSearchDatabase.close
+# end of BibleSearchDatabase class
+
+
+
+def demo():
+    """
+    Export a couple of test Bibles to a search database and then search them.
+    """
+    import time
+    from USFMBible import USFMBible
+
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    outputFolder = 'OutputFiles/BOS_SearchDatabase_Test/'
+    if not os.access( outputFolder, os.F_OK ): os.makedirs( outputFolder ) # Make the empty folder if there wasn't already one there
+    databaseFilepath = os.path.join( outputFolder, DEFAULT_SEARCH_DATABASE_FILENAME )
+    for testFolder in ( 'Tests/DataFilesForTests/USFMTest1/', 'Tests/DataFilesForTests/USFMTest2/', ):
+        if os.access( testFolder, os.R_OK ):
+            UB = USFMBible( testFolder )
+            UB.load()
+            createSearchDatabase( UB, databaseFilepath )
+        else: print( "Sorry, test folder {!r} is not readable on this computer.".format( testFolder ) )
+
+    searchDatabase = BibleSearchDatabase( databaseFilepath )
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( searchDatabase )
+    for findText, wordMode in ( ('lord','Any'), ('the','Whole'), ('regex:[Gg]od\\b','Any'), ):
+        startTime = time.time()
+        optionsDict, results = searchDatabase.findTextInWorks( { 'findText':findText, 'wordMode':wordMode } )
+        if BibleOrgSysGlobals.verbosityLevel > 0:
+            print( "  Searching for {!r} ({}) took {:.3f}s".format( findText, wordMode, time.time()-startTime ) )
+            for workName,(resultSummaryDict,resultList) in results.items():
+                print( "    {}: {} found in {}".format( workName, len(resultList), resultSummaryDict['foundBookList'] ) )
+    searchDatabase.close()
+# end of demo
+
+if __name__ == '__main__':
+    # Configure basic Bible Organisational System (BOS) set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    demo()
+
+    BibleOrgSysGlobals.closedown( ProgName, ProgVersion )
+# end of BibleSearchDatabase.py
@@ -61,6 +61,7 @@ Contains functions:
     toMySword( outputFolder=None )
     toESword( outputFolder=None )
     toMyBible( outputFolder=None )
+    toSearchDatabase( outputFolder=None, databaseFilename=None, foldDiacritics=True ) -- SQLite FTS5 database for BibleSearchDatabase
     toSwordSearcher( outputFolder=None )
     toDrupalBible( outputFolder=None )
     toPhotoBible( outputFolder=None )
@@ -74,10 +75,10 @@ Note that not all exports export all books.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-03-09' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "BibleWriter"
 ProgName = "Bible writer"
-ProgVersion = '0.96'
+ProgVersion = '0.99'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -165,6 +166,54 @@ def killLibreOfficeServiceManager():
 # end of killLibreOfficeServiceManager
 
 
+
+NOTE_SUFFIX_LETTERS = ('b','c','d','e','f','g','h',) # for the second and later parts of a cross-reference
+
+def getNoteAnchorText( anchorText, removeSuffixLetterFlag=True ):
+    """
+    Given the text after a \\xo or \\fr marker in a cross-reference or footnote, e.g., '2:2: a',
+        returns the reference part, e.g., '2:2'
+        (without any final colon or ' a' suffix letter from a cross-reference with multiple (a and b) parts).
+    """
+    adjText = anchorText.strip()
+    if removeSuffixLetterFlag and len(adjText)>2 and adjText[-2]==' ' and adjText[-1]=='a': adjText = adjText[:-2]
+    if adjText.endswith(':'): adjText = adjText[:-1] # Remove any final colon (this is a language dependent hack)
+    return adjText
+# end of getNoteAnchorText
+
+def splitXrefText( xrefText ):
+    """
+    Given the text after a \\xt marker in a cross-reference, e.g., 'Lib 19:9-10; Diy 24:19. ',
+        returns the references and the final punctuation separately, e.g., ('Lib 19:9-10; Diy 24:19', '. ').
+    """
+    referencesText = xrefText.rstrip( ' ,;.' )
+    return referencesText, xrefText[len(referencesText):]
+# end of splitXrefText
+
+def getNoteReferenceStrings( extraType, noteText, bookAbbreviation ):
+    """
+    Given a footnote ('fn') or cross-reference ('xr') note text, e.g., '+ \\xo 2:2: \\xt Lib 19:9-10; Diy 24:19.',
+        returns a list of the reference strings in it, e.g., ['Rut 2:2', 'Lib 19:9-10; Diy 24:19'],
+        i.e., the same strings that the exporters pass to BibleReferenceList.parseToOSIS.
+
+    The bookAbbreviation is prepended to the \\xo and \\fr anchor references.
+    """
+    referenceStrings = []
+    anchorMarker = 'xo ' if extraType=='xr' else 'fr '
+    for j,token in enumerate( noteText.split( '\\' ) ):
+        if j==0: continue # The + or - or whatever
+        lcToken = token.lower()
+        if lcToken.startswith( anchorMarker ): # The reference for the anchor
+            if extraType=='xr' and token[3:].strip() in NOTE_SUFFIX_LETTERS: continue # Just a suffix letter
+            adjToken = getNoteAnchorText( token[3:], removeSuffixLetterFlag=extraType=='xr' )
+            if adjToken: referenceStrings.append( bookAbbreviation + ' ' + adjToken )
+        elif extraType=='xr' and lcToken.startswith('xt '): # The cross-reference text
+            xrefText = splitXrefText( token[3:] )[0]
+            if xrefText: referenceStrings.append( xrefText )
+    return referenceStrings
+# end of getNoteReferenceStrings
+
+
 class BibleWriter( InternalBible ):
     """
     Class to export Bibles.
@@ -359,6 +408,41 @@ class BibleWriter( InternalBible ):
     # end of BibleWriter.__setupWriter
 
 
+    def __parseNoteReferences( self ):
+        """
+        Parse the reference strings in the footnotes and cross-references of each book once
+            so that the results can be reused by all of the exporters
+            (including those running in other processes with multiprocessing).
+
+        getNoteReferenceStrings finds the same strings that the exporters pass to BRL.parseToOSIS
+            (any others just get parsed when they're needed).
+        """
+        if BibleOrgSysGlobals.verbosityLevel > 2: print( "Running BibleWriter:parseNoteReferences…" )
+        if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert self.doneSetupGeneric
+
+        booksNamesSystemName = self.genericBOS.getOrganizationalSystemValue( 'booksNamesSystem' )
+        if booksNamesSystemName and booksNamesSystemName!='None' and booksNamesSystemName!='Unknown': # default (if we know the book names system)
+            getBookAbbreviationFunction = self.genericBOS.getBookAbbreviation
+        else: # else use our local functions from our deduced book names
+            getBookAbbreviationFunction = BibleOrgSysGlobals.BibleBooksCodes.getOSISAbbreviation
+
+        referenceCount = 0
+        for BBB,bookObject in self.books.items():
+            referenceStrings = []
+            for entry in bookObject._processedLines:
+                extras = entry.getExtras()
+                if not extras: continue
+                for extra in extras:
+                    extraType = extra.getType()
+                    if extraType in ('fn','xr'):
+                        referenceStrings.extend( getNoteReferenceStrings( extraType, extra.getText(), getBookAbbreviationFunction(BBB) ) )
+            if referenceStrings:
+                referenceCount += self.genericBRL.parseBookReferenceStrings( BBB, referenceStrings )
+        if BibleOrgSysGlobals.verbosityLevel > 2:
+            print( "  BibleWriter.parseNoteReferences parsed {} different references".format( referenceCount ) )
+    # end of BibleWriter.__parseNoteReferences
+
+
     def __adjustControlDict( self, existingControlDict ):
         """
         Do some global name replacements in the given control dictionary.
@@ -1767,21 +1851,16 @@ class BibleWriter( InternalBible ):
                             if rest != '+':
                                 logging.warning( _("toDoor43a: We got something else here other than plus (probably need to do something with it): {} {!r} from {!r}").format( chapterRef, token, text ) )
                         elif token.startswith('xo '): # xref reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(' a'): adjToken = adjToken[:-2] # Remove any 'a' suffix (occurs when a cross-reference has multiple (a and b) parts
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend the vernacular book abbreviation
-                            osisRef = BRL.parseToOSIS( adjToken, toWikiMediaGlobals['verseRef'] )
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:] ) # Prepend the vernacular book abbreviation
+                            osisRef = BRL.parseToOSIS( adjToken, toWikiMediaGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format( osisRef,token[3:] )
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
                                     logging.error( _("toDoor43: Cross-reference at {} {}:{} seems to contain the wrong self-reference {!r}").format( BBB, currentChapterNumberString, verseNumberString, token ) )
                         elif token.startswith('xt '): # xref text follows
-                            xrefText = token[3:]
-                            finalPunct = ''
-                            while xrefText[-1] in ' ,;.': finalPunct = xrefText[-1] + finalPunct; xrefText = xrefText[:-1]
+                            xrefText, finalPunct = splitXrefText( token[3:] )
                             #adjString = xrefText[:-6] if xrefText.endswith( ' (LXX)' ) else xrefText # Sorry, this is a crude hack to avoid unnecessary error messages
-                            osisRef = BRL.parseToOSIS( xrefText, toWikiMediaGlobals['verseRef'] )
+                            osisRef = BRL.parseToOSIS( xrefText, toWikiMediaGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format( osisRef, xrefText+finalPunct )
                         elif token.startswith('x '): # another whole xref entry follows
@@ -1813,10 +1892,8 @@ class BibleWriter( InternalBible ):
                         #print( "processFootnote", j, token, USFMfootnote )
                         if j==0: continue # ignore the + for now
                         elif token.startswith('fr '): # footnote reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend the vernacular book abbreviation
-                            osisRef = BRL.parseToOSIS( adjToken, toWikiMediaGlobals['verseRef'] )
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:], removeSuffixLetterFlag=False ) # Prepend the vernacular book abbreviation
+                            osisRef = BRL.parseToOSIS( adjToken, toWikiMediaGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 OSISfootnote += '<reference osisRef="{}" type="source">{}</reference>'.format( osisRef, token[3:] )
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
@@ -5295,37 +5372,20 @@ class BibleWriter( InternalBible ):
                         elif lcToken.startswith('xo '): # xref reference follows
                             adjToken = token[3:].strip()
                             #print( "toOSIS:processXRef(xo)", j, "'"+token+"'", "'"+adjToken+"'", "from", '"'+USFMxref+'"' )
-                            if j==1:
-                                if len(adjToken)>2 and adjToken[-2]==' ' and adjToken[-1]=='a':
-                                    suffixLetter = adjToken[-1]
-                                    adjToken = adjToken[:-2] # Remove any suffix (occurs when a cross-reference has multiple (a and b) parts
-                                if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                                adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
-                                selfReference = adjToken
-                            else: # j > 1 -- this xo field may possibly only contain a letter suffix
-                                if len(adjToken)==1 and adjToken in ('b','c','d','e','f','g','h',):
-                                    adjToken = selfReference
-                                else: # Could be another complete reference
-                                    #print( "<<< Programming error here in toOSIS:processXRef for {!r} at {} {}:{}".format( USFMxref, BBB, currentChapterNumberString, verseNumberString )  )
-                                    #print( "  '"+lcToken+"'", len(adjToken), "'"+adjToken+"'" )
-                                    if len(adjToken)>2 and adjToken[-2]==' ' and adjToken[-1]=='a':
-                                        suffixLetter = adjToken[-1]
-                                        adjToken = adjToken[:-2] # Remove any suffix (occurs when a cross-reference has multiple (a and b) parts
-                                    if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                                    adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
-                                    selfReference = adjToken
-                            osisRef = BRL.parseToOSIS( adjToken, toOSISGlobals['verseRef'] )
+                            if j>1 and len(adjToken)==1 and adjToken in NOTE_SUFFIX_LETTERS: # this xo field only contains a letter suffix
+                                adjToken = selfReference
+                            else: # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
+                                adjToken = selfReference = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( adjToken )
+                            osisRef = BRL.parseToOSIS( adjToken, toOSISGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 #print( "  osisRef = {}".format( osisRef ) )
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format(osisRef,token[3:])
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
                                     logging.error( _("toOSIS: Cross-reference at {} {}:{} seems to contain the wrong self-reference anchor {!r}").format(BBB,currentChapterNumberString,verseNumberString, token[3:].rstrip()) )
                         elif lcToken.startswith('xt '): # xref text follows
-                            xrefText = token[3:]
-                            finalPunct = ''
-                            while xrefText[-1] in ' ,;.': finalPunct = xrefText[-1] + finalPunct; xrefText = xrefText[:-1]
+                            xrefText, finalPunct = splitXrefText( token[3:] )
                             #adjString = xrefText[:-6] if xrefText.endswith( ' (LXX)' ) else xrefText # Sorry, this is a crude hack to avoid unnecessary error messages
-                            osisRef = BRL.parseToOSIS( xrefText, toOSISGlobals['verseRef'] )
+                            osisRef = BRL.parseToOSIS( xrefText, toOSISGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format(osisRef,xrefText+finalPunct)
                         elif lcToken.startswith('x '): # another whole xref entry follows
@@ -5358,10 +5418,8 @@ class BibleWriter( InternalBible ):
                         lcToken = token.lower()
                         if j==0: continue # ignore the + for now
                         elif lcToken.startswith('fr '): # footnote reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
-                            osisRef = BRL.parseToOSIS( adjToken, toOSISGlobals['verseRef'] ) # Note that this may return None
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:], removeSuffixLetterFlag=False ) # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
+                            osisRef = BRL.parseToOSIS( adjToken, toOSISGlobals['verseRef'], BBB ) # Note that this may return None
                             if osisRef is not None:
                                 OSISfootnote += '<reference type="source" osisRef="{}">{}</reference>'.format(osisRef,token[3:])
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
@@ -6062,26 +6120,11 @@ class BibleWriter( InternalBible ):
                         elif lcToken.startswith('xo '): # xref reference follows
                             adjToken = token[3:].strip()
                             #print( "toZefania:processXRef(xo)", j, "'"+token+"'", "'"+adjToken+"'", "from", '"'+USFMxref+'"' )
-                            if j==1:
-                                if len(adjToken)>2 and adjToken[-2]==' ' and adjToken[-1]=='a':
-                                    suffixLetter = adjToken[-1]
-                                    adjToken = adjToken[:-2] # Remove any suffix (occurs when a cross-reference has multiple (a and b) parts
-                                if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                                adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
-                                selfReference = adjToken
-                            else: # j > 1 -- this xo field may possibly only contain a letter suffix
-                                if len(adjToken)==1 and adjToken in ('b','c','d','e','f','g','h',):
-                                    adjToken = selfReference
-                                else: # Could be another complete reference
-                                    #print( "<<< Programming error here in toZefaniaXML:processXRef for {!r} at {} {}:{}".format( USFMxref, BBB, currentChapterNumberString, verseNumberString )  )
-                                    #print( "  '"+lcToken+"'", len(adjToken), "'"+adjToken+"'" )
-                                    if len(adjToken)>2 and adjToken[-2]==' ' and adjToken[-1]=='a':
-                                        suffixLetter = adjToken[-1]
-                                        adjToken = adjToken[:-2] # Remove any suffix (occurs when a cross-reference has multiple (a and b) parts
-                                    if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                                    adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
-                                    selfReference = adjToken
-                            osisRef = BRL.parseToOSIS( adjToken, toZefGlobals['verseRef'] )
+                            if j>1 and len(adjToken)==1 and adjToken in NOTE_SUFFIX_LETTERS: # this xo field only contains a letter suffix
+                                adjToken = selfReference
+                            else: # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
+                                adjToken = selfReference = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( adjToken )
+                            osisRef = BRL.parseToOSIS( adjToken, toZefGlobals['verseRef'], BBB )
                             if osisRef is not None:
                                 #print( "  osisRef = {}".format( osisRef ) )
                                 if not ZefXref: ZefXref = '<XREF '
@@ -6090,9 +6133,7 @@ class BibleWriter( InternalBible ):
 #                                if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
 #                                    logging.error( _("toZefania: Cross-reference at {} {}:{} seems to contain the wrong self-reference anchor {!r}").format(BBB,currentChapterNumberString,verseNumberString, token[3:].rstrip()) )
                         elif lcToken.startswith('xt '): # xref text follows
-                            xrefText = token[3:]
-                            finalPunct = ''
-                            while xrefText[-1] in ' ,;.': finalPunct = xrefText[-1] + finalPunct; xrefText = xrefText[:-1]
+                            xrefText, finalPunct = splitXrefText( token[3:] )
                             #adjString = xrefText[:-6] if xrefText.endswith( ' (LXX)' ) else xrefText # Sorry, this is a crude hack to avoid unnecessary error messages
                             #osisRef = BRL.parseToOSIS( xrefText, toZefGlobals['verseRef'] )
                             if not ZefXref: ZefXref = '<XREF>'
@@ -6130,11 +6171,9 @@ class BibleWriter( InternalBible ):
                         lcToken = token.lower()
                         if j==0: continue # ignore the + for now
                         elif lcToken.startswith('fr '): # footnote reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:], removeSuffixLetterFlag=False ) # Prepend a book abbreviation for the anchor (will be processed to an OSIS reference later)
                             #print( "  adjToken", repr(adjToken) )
-                            osisRef = BRL.parseToOSIS( adjToken, toZefGlobals['verseRef'] ) # Note that this may return None
+                            osisRef = BRL.parseToOSIS( adjToken, toZefGlobals['verseRef'], BBB ) # Note that this may return None
                             #print( "  osisRef", repr(osisRef) )
                             if osisRef is None: # something's wrong, but do our best
                                 if not ZefFootnote: ZefFootnote = '<NOTE>'
@@ -6799,21 +6838,16 @@ class BibleWriter( InternalBible ):
                             if rest != '+':
                                 logging.warning( _("toSwordModule1: We got something else here other than plus (probably need to do something with it): {} {!r} from {!r}").format(chapterRef, token, text) )
                         elif token.startswith('xo '): # xref reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(' a'): adjToken = adjToken[:-2] # Remove any 'a' suffix (occurs when a cross-reference has multiple (a and b) parts
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend the vernacular book abbreviation
-                            osisRef = BRL.parseToOSIS( adjToken )
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:] ) # Prepend the vernacular book abbreviation
+                            osisRef = BRL.parseToOSIS( adjToken, contextBBB=BBB )
                             if osisRef is not None:
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format(osisRef,token[3:])
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
                                     logging.error( _("toSwordModule: Cross-reference at {} {}:{} seems to contain the wrong self-reference {!r}").format(BBB,currentChapterNumberString,verseNumberString, token) )
                         elif token.startswith('xt '): # xref text follows
-                            xrefText = token[3:]
-                            finalPunct = ''
-                            while xrefText[-1] in ' ,;.': finalPunct = xrefText[-1] + finalPunct; xrefText = xrefText[:-1]
+                            xrefText, finalPunct = splitXrefText( token[3:] )
                             #adjString = xrefText[:-6] if xrefText.endswith( ' (LXX)' ) else xrefText # Sorry, this is a crude hack to avoid unnecessary error messages
-                            osisRef = BRL.parseToOSIS( xrefText )
+                            osisRef = BRL.parseToOSIS( xrefText, contextBBB=BBB )
                             if osisRef is not None:
                                 OSISxref += '<reference type="source" osisRef="{}">{}</reference>'.format(osisRef,xrefText+finalPunct)
                         elif token.startswith('x '): # another whole xref entry follows
@@ -6845,10 +6879,8 @@ class BibleWriter( InternalBible ):
                         #print( "processFootnote", j, token, USFMfootnote )
                         if j==0: continue # ignore the + for now
                         elif token.startswith('fr '): # footnote reference follows
-                            adjToken = token[3:].strip()
-                            if adjToken.endswith(':'): adjToken = adjToken[:-1] # Remove any final colon (this is a language dependent hack)
-                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + adjToken # Prepend the vernacular book abbreviation
-                            osisRef = BRL.parseToOSIS( adjToken )
+                            adjToken = getBookAbbreviationFunction(BBB) + ' ' + getNoteAnchorText( token[3:], removeSuffixLetterFlag=False ) # Prepend the vernacular book abbreviation
+                            osisRef = BRL.parseToOSIS( adjToken, contextBBB=BBB )
                             if osisRef is not None:
                                 OSISfootnote += '<reference osisRef="{}" type="source">{}</reference>'.format(osisRef,token[3:])
                                 if not BRL.containsReference( BBB, currentChapterNumberString, verseNumberString ):
@@ -7421,6 +7453,34 @@ class BibleWriter( InternalBible ):
 
 
 
+    def toSearchDatabase( self, outputFolder=None, databaseFilename=None, foldDiacritics=True ):
+        """
+        Writes the clean text of the Bible into an SQLite full-text-search database
+            which can then be searched (without loading the Bible) by BibleSearchDatabase.
+
+        If the database file already exists (e.g., containing other Bibles), this Bible is added to it
+            (or replaced if it was already in there).
+
+        NOTE: Not (yet) included in doAllExports.
+        """
+        from BibleSearchDatabase import createSearchDatabase, DEFAULT_SEARCH_DATABASE_FILENAME
+
+        if BibleOrgSysGlobals.verbosityLevel > 1: print( "Running BibleWriter:toSearchDatabase…" )
+        if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert self.books
+
+        if not self.doneSetupGeneric: self.__setupWriter()
+        if not outputFolder: outputFolder = 'OutputFiles/BOS_SearchDatabase_Export/'
+        if not os.access( outputFolder, os.F_OK ): os.makedirs( outputFolder ) # Make the empty folder if there wasn't already one there
+
+        result = createSearchDatabase( self, os.path.join( outputFolder, databaseFilename if databaseFilename else DEFAULT_SEARCH_DATABASE_FILENAME ),
+                                        foldDiacritics=foldDiacritics )
+        if result and BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
+            print( "  BibleWriter.toSearchDatabase finished successfully." )
+        return result
+    # end of BibleWriter.toSearchDatabase
+
+
+
     def toSwordSearcher( self, outputFolder=None ):
         """
         Write the pseudo USFM out into the SwordSearcher pre-Forge format.
@@ -10059,6 +10119,7 @@ class BibleWriter( InternalBible ):
                 print( "BibleWriter.doAllExports: pickle( {} ) failed.".format( pickleOutputFolder ) )
         if not self.doneSetupGeneric: self.__setupWriter()
         if 'discoveryResults' not in dir(self): self.discover()
+        self.__parseNoteReferences() # Once for all the exports
 
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag:
             # no try/except calls so it halts on errors rather than continuing
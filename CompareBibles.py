@@ -44,9 +44,13 @@ Includes:
                         illegalCompleteLineRegexes2=DEFAULT_ILLEGAL_COMPLETE_LINE_REGEXES_BACK_TRANSLATION, # For book2
                         breakOnOne=False )
     _doCompare( parameters ) # for multiprocessing
+    _doSegmentize( parameters ) # for multiprocessing
     segmentizeLine( line, segmentEndPunctuation='.?!;' )
     segmentizeBooks( book1, book2 )
     analyzeWords( segmentList, dict12=None, dict21=None )
+    makeTermSegmentArrays( segmentList, caselessFlag=True )
+    findWordAlignments( segmentList, caselessFlag=True, minimumCount=DEFAULT_MINIMUM_ALIGNMENT_COUNT,
+                        minimumDice=DEFAULT_MINIMUM_ALIGNMENT_DICE, maxCandidates=DEFAULT_MAX_ALIGNMENT_CANDIDATES )
     analyzeBibles( Bible1, Bible2 )
     compareBibles( Bible1, Bible2,
                         compareQuotes=DEFAULT_COMPARE_QUOTES,
@@ -68,10 +72,10 @@ Includes:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "CompareBibles"
 ProgName = "Bible compare analyzer"
-ProgVersion = '0.24'
+ProgVersion = '0.26'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -79,10 +83,13 @@ debuggingThisModule = False
 
 
 import os.path, logging
-import re
+import re, math
 import unicodedata
 import multiprocessing
-from collections import OrderedDict
+from array import array
+from collections import OrderedDict, Counter
+try: import numpy # Used (if available) to count word co-occurrences in findWordAlignments
+except ImportError: numpy = None
 
 import BibleOrgSysGlobals
 from Bible import Bible
@@ -95,6 +102,10 @@ DEFAULT_COMPARE_PUNCTUATION = '.,:;—?!–…' # Doesn't include illegal punctu
 DEFAULT_COMPARE_DIGITS = '0123456789'
 DEFAULT_MATCHING_PAIRS = ( ('[',']'), ('(',')'), ('_ ',' _'), )
 
+DEFAULT_MINIMUM_ALIGNMENT_COUNT = 2 # Number of segments that the two words must occur together in
+DEFAULT_MINIMUM_ALIGNMENT_DICE = 0.1
+DEFAULT_MAX_ALIGNMENT_CANDIDATES = 3 # for each word
+
 DEFAULT_ILLEGAL_CLEAN_TEXT_ONLY_STRINGS_COMMON = ( '  ','"',"''", "‘‘","’’", '““','””',
                                   '“ ', ' ”', '‘ ', ' ’',
                                   '""', "''", # straight quotes (doubled)
@@ -630,8 +641,14 @@ def _doCompare( parameters ): # for multiprocessing
     BBB, Bible1, Bible2 = parameters
     return compareBooksPedantic( Bible1[BBB], Bible2[BBB] )
 
+def _doSegmentize( parameters ): # for multiprocessing
+    BBB, Bible1, Bible2 = parameters
+    return segmentizeBooks( Bible1[BBB], Bible2[BBB] )
+
 
-def segmentizeLine( line, segmentEndPunctuation='.?!;:' ):
+segmentEndRegexes = {} # Compiled regexes for splitting lines, indexed by segmentEndPunctuation
+
+def segmentizeLine( line, segmentEndPunctuation='.?!;:', tokenizeFunction=None ):
     """
     Break the line into segments (like sentences that should match across the translations)
         and then break each segment into words.
@@ -640,24 +657,27 @@ def segmentizeLine( line, segmentEndPunctuation='.?!;:' ):
 
     Set segmentEndPunctuation to None if you don't want the lines further divided.
 
+    tokenizeFunction defaults to BibleOrgSysGlobals.tokenizeWords
+        but can be a book's getWordTokens (so that the tokens are cached with the book).
+
     Returns a list of lists of words.
     """
     if BibleOrgSysGlobals.debugFlag:
         if debuggingThisModule:
             print( exp("segmentizeLine( {!r} )").format( line ) )
 
+    if tokenizeFunction is None: tokenizeFunction = BibleOrgSysGlobals.tokenizeWords
     if segmentEndPunctuation:
-        for segmentEndChar in segmentEndPunctuation:
-            line = line.replace( segmentEndChar, 'SsSsSsS' )
-    line = line.replace('—',' ').replace('–',' ') # Treat em-dash and en-dash as word break characters
-
+        try: segmentEndRegex = segmentEndRegexes[segmentEndPunctuation]
+        except KeyError:
+            segmentEndRegex = segmentEndRegexes[segmentEndPunctuation] = re.compile( '[{}]'.format( re.escape( segmentEndPunctuation ) ) )
+        segments = segmentEndRegex.split( line )
+    else: segments = [line]
 
     lineList = []
-    for segment in line.split( 'SsSsSsS' ):
+    for segment in segments:
         segmentList = []
-        for rawWord in segment.split():
-            word = rawWord
-            for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
+        for ix,rawWord,word in tokenizeFunction( segment ): # Internal markers already removed
             word = BibleOrgSysGlobals.stripWordPunctuation( word )
             if word and not word[0].isalnum():
                 #print( "not alnum", repr(rawWord), repr(word) )
@@ -744,8 +764,8 @@ def segmentizeBooks( book1, book2 ):
         if marker1 == marker2:
             numMismatchedMarkers = 0
             if (line1 or line2) and marker1 not in ( 'id','ide','rem', 'c','v', ): # Don't count these non-Bible-text fields
-                wordList1 = segmentizeLine( line1 )
-                wordList2 = segmentizeLine( line2 )
+                wordList1 = segmentizeLine( line1, tokenizeFunction=book1.getWordTokens )
+                wordList2 = segmentizeLine( line2, tokenizeFunction=book2.getWordTokens )
                 if len(wordList1) == len(wordList2): # both had the same number of segments
                     for segment1List,segment2List in zip( wordList1, wordList2 ):
                         if segment1List and segment2List:
@@ -885,6 +905,8 @@ def analyzeWords( segmentList, dict12=None, dict21=None ):
     Given a list of segments (mostly sentences) from two different but closely related versions,
         use the given dictionaries to check that the corresponding word(s) are in the related version.
 
+    (See findWordAlignments below for finding the likely corresponding words without dictionaries.)
+
     Returns a list of results.
     """
     if BibleOrgSysGlobals.debugFlag:
@@ -901,37 +923,160 @@ def analyzeWords( segmentList, dict12=None, dict21=None ):
 
     #print( '\nawResults', len(awResults), awResults )
     return awResults
-
-    wordDict1, wordDict2 = {}, {}
-    for j,(segment1,segment2) in enumerate( segmentList ):
-        for word1 in segment1:
-            if word1 not in wordDict1:
-                print( "Processing {} {!r}…".format( j, word1 ) )
-                #wordDict1[word1] = []
-                options = {}
-                wordSet = set( segment2 )
-                for segment1b,segment2b in segmentList[j+1:]:
-                    if word1 in segment1b:
-                        wordSet = wordSet.intersection( segment2b )
-                        if len(wordSet) == 1:
-                            print( word1, wordSet )
-                            wordDict1[word1] = wordSet.pop()
-                            break
-        #if j > 5: break
-    print( len(wordDict1), wordDict1 )
-    halt
 # end of analyzeWords
 
 
+def makeTermSegmentArrays( segmentList, caselessFlag=True ):
+    """
+    Given a list of segments from segmentizeBooks (or the lists for a number of books joined together),
+        number the different words in each version
+        and make sparse term/segment arrays (in compressed sparse row form) for each version.
+
+    Returns a 2-tuple (for the two versions) of 3-tuples:
+        1/ list of the words (indexed by word number)
+        2/ array of the start index (into 3/) of each segment (plus the end index at the end)
+        3/ array of the word numbers in each segment (each word only once per segment)
+    """
+    results = []
+    for version in (1,2):
+        wordNumbers, words = {}, []
+        segmentStarts, segmentWordNumbers = array( 'l', [0] ), array( 'l' )
+        for segmentTuple in segmentList:
+            segmentNumbers = {} # Used as an ordered set
+            for word in segmentTuple[version]:
+                if caselessFlag: word = word.lower()
+                try: segmentNumbers[wordNumbers[word]] = None
+                except KeyError:
+                    wordNumbers[word] = len( words )
+                    words.append( word )
+                    segmentNumbers[wordNumbers[word]] = None
+            segmentWordNumbers.extend( segmentNumbers )
+            segmentStarts.append( len(segmentWordNumbers) )
+        results.append( (words, segmentStarts, segmentWordNumbers) )
+    return tuple( results )
+# end of makeTermSegmentArrays
+
+
+def _findCoOccurrencesNumpy( segmentArrays1, segmentArrays2, minimumCount, minimumDice ):
+    """
+    Count (in one vectorized pass) the number of segments that each pair of words occurs in.
+
+    Returns the word frequencies (number of segments each word occurs in) for each version,
+        and the word number pairs with at least minimumCount and minimumDice
+        as parallel lists of word numbers, co-occurrence counts, and Dice coefficients.
+    """
+    words1, segmentStarts1, segmentWordNumbers1 = segmentArrays1
+    words2, segmentStarts2, segmentWordNumbers2 = segmentArrays2
+    segmentStarts1, segmentWordNumbers1 = numpy.asarray( segmentStarts1, dtype=numpy.int64 ), numpy.asarray( segmentWordNumbers1, dtype=numpy.int64 )
+    segmentStarts2, segmentWordNumbers2 = numpy.asarray( segmentStarts2, dtype=numpy.int64 ), numpy.asarray( segmentWordNumbers2, dtype=numpy.int64 )
+    frequencies1 = numpy.bincount( segmentWordNumbers1, minlength=len(words1) )
+    frequencies2 = numpy.bincount( segmentWordNumbers2, minlength=len(words2) )
+
+    # Make every (word1,word2) pair in every segment
+    segmentLengths1, segmentLengths2 = numpy.diff( segmentStarts1 ), numpy.diff( segmentStarts2 )
+    pairsPerSegment = segmentLengths1 * segmentLengths2
+    pairSegments = numpy.repeat( numpy.arange( len(pairsPerSegment) ), pairsPerSegment )
+    pairOffsets = numpy.arange( len(pairSegments) ) - (numpy.cumsum( pairsPerSegment ) - pairsPerSegment)[pairSegments]
+    pairSegmentLengths2 = segmentLengths2[pairSegments]
+    pairWordNumbers1 = segmentWordNumbers1[segmentStarts1[pairSegments] + pairOffsets // pairSegmentLengths2]
+    pairWordNumbers2 = segmentWordNumbers2[segmentStarts2[pairSegments] + pairOffsets % pairSegmentLengths2]
+
+    # Now count them
+    pairCodes, counts = numpy.unique( pairWordNumbers1 * len(words2) + pairWordNumbers2, return_counts=True )
+    wordNumbers1, wordNumbers2 = pairCodes // len(words2), pairCodes % len(words2)
+    dices = 2 * counts / (frequencies1[wordNumbers1] + frequencies2[wordNumbers2])
+    wanted = (counts >= minimumCount) & (dices >= minimumDice)
+    return frequencies1.tolist(), frequencies2.tolist(), \
+            wordNumbers1[wanted].tolist(), wordNumbers2[wanted].tolist(), counts[wanted].tolist(), dices[wanted].tolist()
+# end of _findCoOccurrencesNumpy
+
+
+def _findCoOccurrences( segmentArrays1, segmentArrays2, minimumCount, minimumDice ):
+    """
+    Same as _findCoOccurrencesNumpy above, but without NumPy.
+    """
+    words1, segmentStarts1, segmentWordNumbers1 = segmentArrays1
+    words2, segmentStarts2, segmentWordNumbers2 = segmentArrays2
+    frequencies1, frequencies2 = [0] * len(words1), [0] * len(words2)
+    for wordNumber1 in segmentWordNumbers1: frequencies1[wordNumber1] += 1
+    for wordNumber2 in segmentWordNumbers2: frequencies2[wordNumber2] += 1
+
+    pairCounter = Counter()
+    for s in range( len(segmentStarts1) - 1 ):
+        segment2Numbers = segmentWordNumbers2[segmentStarts2[s]:segmentStarts2[s+1]]
+        for wordNumber1 in segmentWordNumbers1[segmentStarts1[s]:segmentStarts1[s+1]]:
+            pairCounter.update( [(wordNumber1,wordNumber2) for wordNumber2 in segment2Numbers] )
+
+    wordNumbers1, wordNumbers2, counts, dices = [], [], [], []
+    for (wordNumber1,wordNumber2),count in sorted( pairCounter.items() ):
+        dice = 2 * count / (frequencies1[wordNumber1] + frequencies2[wordNumber2])
+        if count >= minimumCount and dice >= minimumDice:
+            wordNumbers1.append( wordNumber1 ); wordNumbers2.append( wordNumber2 )
+            counts.append( count ); dices.append( dice )
+    return frequencies1, frequencies2, wordNumbers1, wordNumbers2, counts, dices
+# end of _findCoOccurrences
+
+
+def findWordAlignments( segmentList, caselessFlag=True, minimumCount=DEFAULT_MINIMUM_ALIGNMENT_COUNT,
+                        minimumDice=DEFAULT_MINIMUM_ALIGNMENT_DICE, maxCandidates=DEFAULT_MAX_ALIGNMENT_CANDIDATES ):
+    """
+    Given a list of segments from segmentizeBooks (usually for the whole Bible),
+        find the words in the other version which occur in the same segments as each word,
+        i.e., the likely translations (and inconsistencies between a translation and its back-translation).
+
+    Each word pair is scored by the Dice coefficient
+            (2 * number of segments with both words / (number of segments with word1 + number with word2))
+        and the PMI (pointwise mutual information, i.e., the log of how much more often
+            they occur in the same segment than would be expected by chance).
+
+    Uses NumPy (if it's installed) to count all the word pairs in one vectorized pass.
+
+    Returns two OrderedDicts (for the words of version1 and version2, the most frequent words first)
+        each containing a list of up to maxCandidates (word, dice, PMI, count) 4-tuples (best first).
+    """
+    if BibleOrgSysGlobals.debugFlag:
+        if debuggingThisModule:
+            print( exp("findWordAlignments( {}, {}, {}, {}, {} )").format( len(segmentList), caselessFlag, minimumCount, minimumDice, maxCandidates ) )
+        assert isinstance( segmentList, list )
+
+    segmentArrays1, segmentArrays2 = makeTermSegmentArrays( segmentList, caselessFlag )
+    words1, words2 = segmentArrays1[0], segmentArrays2[0]
+    if not words1 or not words2: return OrderedDict(), OrderedDict()
+    frequencies1, frequencies2, wordNumbers1, wordNumbers2, counts, dices \
+        = (_findCoOccurrencesNumpy if numpy is not None else _findCoOccurrences)( segmentArrays1, segmentArrays2, minimumCount, minimumDice )
+    if BibleOrgSysGlobals.verbosityLevel > 2:
+        print( "  findWordAlignments: {:,} segments with {:,} and {:,} words gave {:,} candidate pairs" \
+                .format( len(segmentList), len(words1), len(words2), len(counts) ) )
+
+    numSegments = len( segmentList )
+    candidates1, candidates2 = {}, {}
+    for wordNumber1, wordNumber2, count, dice in zip( wordNumbers1, wordNumbers2, counts, dices ):
+        PMI = math.log( count * numSegments / (frequencies1[wordNumber1] * frequencies2[wordNumber2]) )
+        candidates1.setdefault( wordNumber1, [] ).append( (-dice, -count, wordNumber2, PMI) )
+        candidates2.setdefault( wordNumber2, [] ).append( (-dice, -count, wordNumber1, PMI) )
+
+    results = []
+    for candidates, frequencies, ourWords, otherWords in ( (candidates1,frequencies1,words1,words2), (candidates2,frequencies2,words2,words1) ):
+        alignments = OrderedDict()
+        for wordNumber in sorted( candidates, key=lambda n: (-frequencies[n], n) ):
+            alignments[ourWords[wordNumber]] = [(otherWords[otherNumber], -negativeDice, PMI, -negativeCount)
+                        for negativeDice, negativeCount, otherNumber, PMI in sorted( candidates[wordNumber] )[:maxCandidates]]
+        results.append( alignments )
+    return tuple( results )
+# end of findWordAlignments
+
+
 def analyzeBibles( Bible1, Bible2 ):
     """
-    Given two Bible objects, break the two into words
-        and return a dictionary.
+    Given two Bible objects, break the two into segments and words
+        and find the likely corresponding words (see findWordAlignments).
 
     This is typically used to compare a translation and a matching back-translation.
 
-    The returned list is sorted by C:V
-    Each list entry is a 2-tuple, being BCV and error message.
+    Returns a 2-tuple:
+        1/ a dictionary (by BBB) of the segmentizeBooks results
+            where each list entry is a 2-tuple, being C:V reference and error message
+        2/ the 2-tuple of word alignment dictionaries from findWordAlignments (for the segments of all the books)
     """
     if BibleOrgSysGlobals.debugFlag:
         if debuggingThisModule:
@@ -954,22 +1099,27 @@ def analyzeBibles( Bible1, Bible2 ):
     if BibleOrgSysGlobals.verbosityLevel > 2: print( exp("Running segmentizeBooks on both Bibles…") )
     if BibleOrgSysGlobals.maxProcesses > 1: # Check all the books as quickly as possible
         if BibleOrgSysGlobals.verbosityLevel > 1:
-            print( exp("Comparing {} books using {} processes…").format( numBooks, BibleOrgSysGlobals.maxProcesses ) )
+            print( exp("Segmentizing {} books using {} processes…").format( numBooks, BibleOrgSysGlobals.maxProcesses ) )
             print( "  NOTE: Outputs (including error and warning messages) from scanning various books may be interspersed." )
         BibleOrgSysGlobals.alreadyMultiprocessing = True
         with multiprocessing.Pool( processes=BibleOrgSysGlobals.maxProcesses ) as pool: # start worker processes
-            results = pool.map( _doCompare, [(BBB,Bible1,Bible2) for BBB in commonBooks] ) # have the pool do our loads
+            results = pool.map( _doSegmentize, [(BBB,Bible1,Bible2) for BBB in commonBooks] ) # have the pool do our loads
             assert len(results) == numBooks
             for j,BBB in enumerate( commonBooks ):
-                bResults[BBB] = results[j] # Saves them in the correct order
+                bSegmentList[BBB], bResults[BBB] = results[j] # Saves them in the correct order
         BibleOrgSysGlobals.alreadyMultiprocessing = False
     else: # Just single threaded
         for BBB in commonBooks: # Do individual book prechecks
-            if BibleOrgSysGlobals.verbosityLevel > 3: print( "  " + exp("Comparing {}…").format( BBB ) )
+            if BibleOrgSysGlobals.verbosityLevel > 3: print( "  " + exp("Segmentizing {}…").format( BBB ) )
             bSegmentList[BBB], bResults[BBB] = segmentizeBooks( Bible1[BBB], Bible2[BBB] ) #, abResults1, abResults2 )
-            print( BBB, bSegmentList[BBB] )
-            print( BBB, bResults[BBB] )
-    return bResults
+            if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+                print( BBB, bSegmentList[BBB] )
+                print( BBB, bResults[BBB] )
+
+    # Now find the word alignments for the whole Bible at once
+    allSegments = []
+    for BBB in commonBooks: allSegments.extend( bSegmentList[BBB] )
+    return bResults, findWordAlignments( allSegments )
 # end of analyzeBibles
 
 
@@ -1140,6 +1290,14 @@ def demo():
                 print( "  {:,} results in {}".format( len(awResult), BBB ) )
         if BibleOrgSysGlobals.verbosityLevel > 0:
             print( "{:,} total results in {} books ({:,} segments)".format( totalCount, len(UB1), totalSegments ) )
+
+    if 0: # Find the word alignments for the whole Bibles
+        if BibleOrgSysGlobals.verbosityLevel > 0: print( "\nFinding word alignments for whole Bible…" )
+        segmentizeResults, (alignments12, alignments21) = analyzeBibles( UB1, UB2 )
+        if BibleOrgSysGlobals.verbosityLevel > 0:
+            for word,candidates in list( alignments12.items() )[:50]: # Just the most frequent words
+                print( '  {!r} = {}'.format( word, ', '.join( '{!r} ({:.2f})'.format( candidate[0], candidate[1] ) for candidate in candidates ) ) )
+            print( "{:,} {} words and {:,} {} words aligned".format( len(alignments12), name1, len(alignments21), name2 ) )
 # end of demo
 
 
@@ -60,14 +60,18 @@ In this module, we use:
 We currently use version 2 of the DBP.
 
 More details are available from http://www.DigitalBiblePlatform.com.
+
+Verse text is fetched a chapter at a time (and whole books can be prefetched),
+    the HTTP connection to the server is kept open and reused,
+    and responses are saved in a persistent on-disk cache (see DBPResponseCache).
 """
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "DigitalBiblePlatform"
 ProgName = "Digital Bible Platform onliner handler"
-ProgVersion = '0.19'
+ProgVersion = '0.21'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -76,7 +80,12 @@ debuggingThisModule = False
 
 from singleton import singleton
 import os, logging
-import urllib.request, json
+import json
+import http.client
+from urllib.parse import urlsplit
+import threading, time
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait
 from collections import OrderedDict
 
 import BibleOrgSysGlobals
@@ -87,7 +96,11 @@ URL_BASE = 'http://dbt.io/'
 DPB_VERSION = '2'
 KEY_FILENAME = "DBPKey.txt"
 KEY_SEARCH_PATHS = ( KEY_FILENAME, os.path.join( "../BibleOrgSys/DataFiles", KEY_FILENAME ) )
-MAX_CACHED_VERSES = 100 # Per Bible version in use
+MAX_CACHED_CHAPTERS = 200 # Per Bible version in use (in memory -- enough for the longest book)
+MAX_CONCURRENT_REQUESTS = 4 # Per Bible version in use (so that we don't overload the server)
+HTTP_TIMEOUT = 30 # seconds
+RESPONSE_CACHE_FILENAME = 'DBPResponses.sqlite' # in the default cache folder
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60 # seconds (set to zero to not use the on-disk cache)
 
 
 
@@ -124,6 +137,152 @@ def getSecurityKey():
 
 
 
+connectionData = threading.local() # Each thread keeps its own HTTP connection open for reuse
+CLOSED_CONNECTION_ERRORS = ( http.client.RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError, ) # but not timeouts
+
+def fetchOnlineString( requestPath ):
+    """
+    Does an HTTP GET of requestPath (relative to URL_BASE) and returns the response string.
+        (Reuses this thread's connection to the server if it's still open.
+        If the server has closed that connection, the request is retried once on a new connection,
+        but a request that times out isn't retried.)
+
+    Returns None if the data cannot be fetched.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( exp("fetchOnlineString( {!r} )").format( requestPath ) )
+
+    URLBits = urlsplit( URL_BASE )
+    try: connections = connectionData.connections
+    except AttributeError: connections = connectionData.connections = {}
+    connectionKey = URLBits.scheme, URLBits.netloc
+    while True:
+        try: connection, reusedFlag = connections[connectionKey], True
+        except KeyError:
+            connectionClass = http.client.HTTPSConnection if URLBits.scheme=='https' else http.client.HTTPConnection
+            connection, reusedFlag = connectionClass( URLBits.netloc, timeout=HTTP_TIMEOUT ), False
+            connections[connectionKey] = connection
+        try:
+            connection.request( 'GET', URLBits.path + requestPath )
+            HTTPResponseObject = connection.getresponse()
+            responseBytes = HTTPResponseObject.read()
+        except (http.client.HTTPException, OSError) as err:
+            connection.close()
+            del connections[connectionKey]
+            if reusedFlag and isinstance( err, CLOSED_CONNECTION_ERRORS ):
+                continue # The server has closed our saved connection so try again with a new one
+            logging.error( "DBP connection error '{}' from {}{}".format( err, URL_BASE, requestPath ) )
+            return None
+        break
+    if HTTPResponseObject.status != 200:
+        logging.error( "DBP HTTP error {} {} from {}{}".format( HTTPResponseObject.status, HTTPResponseObject.reason, URL_BASE, requestPath ) )
+        return None
+    contentType = HTTPResponseObject.headers.get_content_type()
+    if contentType != 'application/json':
+        logging.warning( "DBP returned unexpected {!r} content type from {}{}".format( contentType, URL_BASE, requestPath ) )
+    return responseBytes.decode( HTTPResponseObject.headers.get_content_charset( 'utf-8' ) )
+# end of fetchOnlineString
+
+
+
+class DBPResponseCache:
+    """
+    Persistent on-disk (SQLite) cache of Digital Bible Platform responses
+        so that we don't keep asking for the same things (even in later runs).
+
+    Responses older than timeToLive seconds aren't used
+        (and are deleted when the cache is opened or when they're next asked for).
+    """
+    def __init__( self, cacheFilepath, timeToLive=RESPONSE_CACHE_TTL ):
+        """
+        Opens (or creates) the cache database.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("DBPResponseCache.__init__( {!r}, {} )").format( cacheFilepath, timeToLive ) )
+
+        self.cacheFilepath, self.timeToLive = cacheFilepath, timeToLive
+        self.lock = threading.Lock() # The connection is shared by our fetching threads
+        try:
+            if os.path.dirname( cacheFilepath ): os.makedirs( os.path.dirname( cacheFilepath ), exist_ok=True )
+            self.connection = sqlite3.connect( cacheFilepath, check_same_thread=False )
+            with self.connection:
+                self.connection.execute( 'CREATE TABLE IF NOT EXISTS responses ( request TEXT PRIMARY KEY, fetchTime REAL NOT NULL, response TEXT NOT NULL )' )
+                self.connection.execute( 'DELETE FROM responses WHERE fetchTime<=?', (time.time()-timeToLive,) ) # Remove expired responses
+        except (OSError, sqlite3.Error) as err:
+            logging.warning( "Unable to open DBP response cache {}: {}".format( cacheFilepath, err ) )
+            self.connection = None
+    # end of DBPResponseCache.__init__
+
+
+    def get( self, request ):
+        """
+        Returns the saved response string, or None if there isn't a recent enough one.
+        """
+        if self.connection is None: return None
+        with self.lock, self.connection:
+            row = self.connection.execute( 'SELECT fetchTime, response FROM responses WHERE request=?', (request,) ).fetchone()
+            if row is None: return None
+            if time.time() - row[0] < self.timeToLive: return row[1]
+            self.connection.execute( 'DELETE FROM responses WHERE request=?', (request,) ) # It's expired
+    # end of DBPResponseCache.get
+
+
+    def put( self, request, responseString ):
+        """
+        Save the response string.
+        """
+        if self.connection is None: return
+        with self.lock, self.connection:
+            self.connection.execute( 'INSERT OR REPLACE INTO responses VALUES (?,?,?)', (request,time.time(),responseString) )
+    # end of DBPResponseCache.put
+
+
+    def clear( self ):
+        """
+        Delete all saved responses.
+        """
+        if self.connection is None: return
+        with self.lock, self.connection:
+            self.connection.execute( 'DELETE FROM responses' )
+    # end of DBPResponseCache.clear
+# end of class DBPResponseCache
+
+
+responseCache = None # Shared by all of our objects
+
+def getOnlineData( fieldREST, URLFixedData, additionalParameters=None, useCacheFlag=True ):
+    """
+    Given a string, e.g., "api/apiversion"
+        Gets the JSON result from the on-disk cache or from our site
+        and loads it into a Python container.
+        Returns the container.
+
+    Returns None if the data cannot be fetched.
+    """
+    global responseCache
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( exp("getOnlineData( {!r} {!r} {} )").format( fieldREST, additionalParameters, useCacheFlag ) )
+
+    useCacheFlag = useCacheFlag and RESPONSE_CACHE_TTL
+    if useCacheFlag:
+        if responseCache is None:
+            responseCache = DBPResponseCache( os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, RESPONSE_CACHE_FILENAME ) )
+        cacheRequestString = '{}{}?{}'.format( URL_BASE, fieldREST, additionalParameters if additionalParameters else '' ) # Doesn't include our key
+        responseSTR = responseCache.get( cacheRequestString )
+        if responseSTR is not None: return json.loads( responseSTR )
+
+    responseSTR = fetchOnlineString( '{}{}{}'.format( fieldREST, URLFixedData, '&'+additionalParameters if additionalParameters else '' ) )
+    if responseSTR is None: return None
+    try: result = json.loads( responseSTR )
+    except ValueError:
+        logging.error( "DBP returned invalid JSON for {!r} {!r}".format( fieldREST, additionalParameters ) )
+        return None
+    if useCacheFlag: responseCache.put( cacheRequestString, responseSTR )
+    return result
+# end of getOnlineData
+
+
+
 @singleton # Can only ever have one instance
 class DBPBibles:
     """
@@ -440,7 +599,7 @@ class DBPBibles:
     def getOnlineData( self, fieldREST, additionalParameters=None ):
         """
         Given a string, e.g., "api/apiversion"
-            Does an HTTP GET to our site.
+            Does an HTTP GET to our site (unless we have a recent copy in the on-disk cache).
             Receives the JSON result (hopefully)
             Converts the JSON bytes to a JSON string
             Loads the JSON string into a Python container.
@@ -451,28 +610,7 @@ class DBPBibles:
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( exp("DBPBibles.getOnlineData( {!r} {!r} )").format( fieldREST, additionalParameters ) )
 
-        requestString = '{}{}{}{}'.format( URL_BASE, fieldREST, self.URLFixedData, '&'+additionalParameters if additionalParameters else '' )
-        #print( "Request string is", repr(requestString) )
-        try: HTTPResponseObject = urllib.request.urlopen( requestString )
-        except urllib.error.URLError as err:
-            #errorClass, exceptionInstance, traceback = sys.exc_info()
-            #print( '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-            logging.error( "DBL URLError '{}' from {}".format( err, requestString ) )
-            return None
-        #print( "HTTPResponseObject", HTTPResponseObject )
-        contentType = HTTPResponseObject.info().get( 'content-type' )
-        #print( "contentType", contentType )
-        if contentType == 'application/json':
-            responseJSON = HTTPResponseObject.read()
-            #print( "responseJSON", len(responseJSON), responseJSON )
-            responseJSONencoding = HTTPResponseObject.info().get_content_charset( 'utf-8' )
-            #print( "responseJSONencoding", responseJSONencoding )
-            responseSTR = responseJSON.decode( responseJSONencoding )
-            #print( "responseSTR", len(responseSTR), repr(responseSTR) )
-            return json.loads( responseSTR )
-        else:
-            print( "contentType", contentType )
-            halt # Haven't had this contentType before
+        return getOnlineData( fieldREST, self.URLFixedData, additionalParameters, useCacheFlag=fieldREST!=self.URLTest )
     # end of DBPBibles.getOnlineData
 
 
@@ -520,17 +658,19 @@ class DBPBible:
     Note that this Bible class is NOT based on the Bible class
         because it's so unlike most Bibles which are local.
     """
-    def __init__( self, damRoot ):
+    def __init__( self, damRoot, maxConcurrentRequests=MAX_CONCURRENT_REQUESTS ):
         """
         Create the Digital Bible Platform Bible object.
             Accepts a 6-character code which is the initial part of the DAM:
                 1-3: Language code, e.g., ENG
                 4-6: Version code, e.g., ESV
+
+        maxConcurrentRequests limits the number of chapters that are fetched at the same time when prefetching.
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-            print( exp("DBPBible.__init__( {!r} )").format( damRoot ) )
+            print( exp("DBPBible.__init__( {!r}, {} )").format( damRoot, maxConcurrentRequests ) )
             assert damRoot and isinstance( damRoot, str ) and len(damRoot)==6
-        self.damRoot = damRoot
+        self.damRoot, self.maxConcurrentRequests = damRoot, maxConcurrentRequests
 
          # Setup and initialise the base class first
         #InternalBible.__init__( self, givenFolderName, givenName, encoding )
@@ -573,7 +713,11 @@ class DBPBible:
                 self.books[BBB] = bookDict
             del bookList
 
-        self.cache = OrderedDict()
+        self.cache = OrderedDict() # Key is (BBB,C), value is a dictionary with V keys and verse data list values
+        self.cacheLock = threading.RLock()
+        self.prefetchExecutor = None # Started when first needed
+        self.pendingFetches = {} # Key is (BBB,C), value is the Future for a prefetch that's still running
+        self.prefetchNextChapterFlag = True # Gets the next chapter in the background (because the user will probably move on to it)
     # end of DBPBible.__init__
 
 
@@ -624,7 +768,7 @@ class DBPBible:
     def getOnlineData( self, fieldREST, additionalParameters=None ):
         """
         Given a string, e.g., "api/apiversion"
-            Does an HTTP GET to our site.
+            Does an HTTP GET to our site (unless we have a recent copy in the on-disk cache).
             Receives the JSON result (hopefully)
             Converts the JSON bytes to a JSON string
             Loads the JSON string into a dictionary
@@ -635,46 +779,123 @@ class DBPBible:
             print( exp("DBPBible.getOnlineData( {!r} {!r} )").format( fieldREST, additionalParameters ) )
 
         if BibleOrgSysGlobals.verbosityLevel > 2: print( "Requesting data from {} for {}…".format( URL_BASE, self.damRoot ) )
-        requestString = "{}{}{}{}".format( URL_BASE, fieldREST, self.URLFixedData, '&'+additionalParameters if additionalParameters else '' )
-        #print( "Request string is", repr(requestString) )
-        try: responseJSON = urllib.request.urlopen( requestString )
-        except urllib.error.URLError:
-            if BibleOrgSysGlobals.debugFlag: logging.critical( "DBPBible.getOnlineData: error fetching {!r} {!r}".format( fieldREST, additionalParameters ) )
-            return None
-        responseSTR = responseJSON.read().decode('utf-8')
-        return json.loads( responseSTR )
+        return getOnlineData( fieldREST, self.URLFixedData, additionalParameters, useCacheFlag=fieldREST!=self.URLTest )
     # end of DBPBible.getOnlineData
 
 
-    def getVerseDataList( self, key ):
+    def __fetchChapter( self, BBB, C ):
         """
-        Equivalent to the one in InternalBible, except we may have to fetch the data (if it's not already cached).
+        Fetch all the verses for the chapter in one request
+            and save them in our memory cache.
+
+        Returns a dictionary with V keys and verse data list values.
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-            print( exp("DBPBible.getVerseDataList( {!r} ) for {!r}").format( key, self.damRoot ) )
+            print( exp("DBPBible.__fetchChapter( {}, {} ) for {!r}").format( BBB, C, self.damRoot ) )
 
-        if str(key) in self.cache:
-            if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( "  " + exp("Retrieved from cache") )
-            self.cache.move_to_end( str(key) )
-            return self.cache[str(key)]
-        BBB = key.getBBB()
-        if BBB in self.books:
-            info = self.books[BBB]
-            rawData = self.getOnlineData( 'text/verse', 'dam_id={}&book_id={}&chapter_id={}&verse_start={}'.format( info['dam_id']+'2ET', info['book_id'], key.getChapterNumber(), key.getVerseNumber() ) )
-            resultList = []
-            if isinstance( rawData, list ) and len(rawData)==1:
-                rawDataDict = rawData[0]
+        info = self.books[BBB]
+        rawData = self.getOnlineData( 'text/verse', 'dam_id={}&book_id={}&chapter_id={}'.format( info['dam_id']+'2ET', info['book_id'], C ) )
+        chapterDict = {}
+        if isinstance( rawData, list ):
+            for rawDataDict in rawData:
                 #print( len(rawDataDict), rawDataDict )
                 assert len(rawDataDict)==8 and isinstance( rawDataDict, dict )
+                V = str( rawDataDict['verse_id'] )
+                resultList = []
                 resultList.append( ('p#','p#',rawDataDict['paragraph_number'],rawDataDict['paragraph_number'],[]) ) # Must be first for Biblelator
-                if key.getVerseNumber()=='1': resultList.append( ('c#','c#',rawDataDict['chapter_id'],rawDataDict['chapter_id'],[]) )
+                if V=='1': resultList.append( ('c#','c#',rawDataDict['chapter_id'],rawDataDict['chapter_id'],[]) )
                 resultList.append( ('v','v',rawDataDict['verse_id'],rawDataDict['verse_id'],[]) )
                 resultList.append( ('v~','v~',rawDataDict['verse_text'].strip(),rawDataDict['verse_text'].strip(),[]) )
-                self.cache[str(key)] = resultList
-                if len(self.cache) > MAX_CACHED_VERSES:
+                chapterDict[V] = resultList
+        if chapterDict: # Don't remember failures
+            with self.cacheLock:
+                self.cache[(BBB,C)] = chapterDict
+                if len(self.cache) > MAX_CACHED_CHAPTERS:
                     #print( "Removing oldest cached entry", len(self.cache) )
                     self.cache.popitem( last=False )
-            return resultList
+        return chapterDict
+    # end of DBPBible.__fetchChapter
+
+
+    def getChapterData( self, BBB, C ):
+        """
+        Returns a dictionary with V keys and verse data list values
+            (fetching the chapter if it's not already cached).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("DBPBible.getChapterData( {}, {} ) for {!r}").format( BBB, C, self.damRoot ) )
+
+        with self.cacheLock:
+            if (BBB,C) in self.cache:
+                if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( "  " + exp("Retrieved from cache") )
+                self.cache.move_to_end( (BBB,C) )
+                return self.cache[(BBB,C)]
+            pendingFetch = self.pendingFetches.get( (BBB,C) )
+        if pendingFetch is not None: return pendingFetch.result() # It's already on its way
+        chapterDict = self.__fetchChapter( BBB, C )
+        if self.prefetchNextChapterFlag and C.isdigit():
+            self.prefetch( BBB, str( int(C) + 1 ), waitFlag=False )
+        return chapterDict
+    # end of DBPBible.getChapterData
+
+
+    def prefetch( self, BBB, C=None, waitFlag=True ):
+        """
+        Fetch the chapter (or the whole book if C is None) into our cache
+            using up to self.maxConcurrentRequests requests at once.
+
+        If waitFlag is False, returns immediately (while the fetching continues in the background).
+
+        Returns the number of chapters requested.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("DBPBible.prefetch( {}, {}, {} ) for {!r}").format( BBB, C, waitFlag, self.damRoot ) )
+
+        if BBB not in self.books: return 0
+        if C is None: # Get the list of chapters for the book
+            chapterList = [chapterString.strip() for chapterString in str( self.books[BBB].get( 'chapters', '' ) ).split( ',' ) if chapterString.strip()]
+        else:
+            chapterList = [C] if C in str( self.books[BBB].get( 'chapters', C ) ).split( ',' ) else []
+        if self.prefetchExecutor is None:
+            self.prefetchExecutor = ThreadPoolExecutor( max_workers=self.maxConcurrentRequests )
+        with self.cacheLock:
+            chapterList = [C for C in chapterList if (BBB,C) not in self.cache and (BBB,C) not in self.pendingFetches]
+            futures = []
+            for C in chapterList:
+                future = self.pendingFetches[(BBB,C)] = self.prefetchExecutor.submit( self.__fetchChapter, BBB, C )
+                future.add_done_callback( lambda future, BCkey=(BBB,C): self.__removePendingFetch( BCkey ) )
+                futures.append( future )
+        if waitFlag: wait( futures )
+        return len(chapterList)
+    # end of DBPBible.prefetch
+
+    def __removePendingFetch( self, BCkey ):
+        with self.cacheLock: del self.pendingFetches[BCkey]
+    # end of DBPBible.__removePendingFetch
+
+
+    def close( self ):
+        """
+        Stop any prefetching threads.
+        """
+        if self.prefetchExecutor is not None:
+            self.prefetchExecutor.shutdown( wait=False )
+            self.prefetchExecutor = None
+    # end of DBPBible.close
+
+
+    def getVerseDataList( self, key ):
+        """
+        Equivalent to the one in InternalBible, except we may have to fetch the data (if it's not already cached).
+
+        The whole chapter is fetched (and cached) at once.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("DBPBible.getVerseDataList( {!r} ) for {!r}").format( key, self.damRoot ) )
+
+        BBB = key.getBBB()
+        if BBB in self.books:
+            return self.getChapterData( BBB, key.getChapterNumber() ).get( key.getVerseNumber(), [] )
         else: # This version doesn't have this book
             if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
                 print( "  getVerseDataList: {} not in {} {}".format( BBB, self.damRoot, self.books.keys() ) )
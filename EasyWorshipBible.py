@@ -34,17 +34,17 @@ Seems that some non-UTF8 versions can't be read yet. :(
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "EasyWorshipBible"
 ProgName = "EasyWorship Bible format handler"
-ProgVersion = '0.13'
+ProgVersion = '0.14'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import logging, os.path
+import logging, os.path, re, time
 import struct, zlib
 from binascii import hexlify
 import multiprocessing
@@ -58,6 +58,35 @@ from BibleOrganizationalSystems import BibleOrganizationalSystem
 
 FILENAME_ENDING = '.EWB' # Must be UPPERCASE
 
+# The fixed-length binary blocks at the start of the file (all little-endian)
+INTRO_BLOCK_BYTES = b'EasyWorship Bible Text\x1a\x02<\x00\x00\x00\xe0\x00\x00\x00' # 32 bytes
+MODULE_NAME_BLOCK_START, MODULE_NAME_BLOCK_LENGTH = 32, 56
+BOOK_INFO_BLOCK_START = MODULE_NAME_BLOCK_START + MODULE_NAME_BLOCK_LENGTH
+BOOK_INFO_STRUCT = struct.Struct( '<51s157sIIII' ) # bookName, numChapters+numVerses, bookStart, zero, bookLength, zero (224 bytes)
+BOOK_EXTRA_STRUCT = struct.Struct( '<4sI2s' ) # b'QK\x03\x04', uncompressedBookLength, b'\x08\x00' (10 bytes at the end of each book)
+CSTRING_RE = re.compile( b'[^\x00-\x1f]{0,32}' ) # 8-bit characters up to the first control character
+
+
+
+def getCString( byteBuffer, startIndex=0 ):
+    """
+    Decodes the 8-bit characters starting at startIndex (up to 32 of them)
+        until the first control character (usually a null).
+
+    Returns the string and the index of the character that stopped it.
+    """
+    match = CSTRING_RE.match( byteBuffer, startIndex )
+    return match.group().decode( 'latin-1' ), match.end()
+# end of getCString
+
+
+def isZeroes( byteBuffer ):
+    """
+    Returns True if the bytes (or memoryview) only contain nulls.
+    """
+    return not bytes( byteBuffer ).strip( b'\x00' )
+# end of isZeroes
+
 
 
 def EasyWorshipBibleFileCheck( givenFolderName, strictCheck=True, autoLoad=False, autoLoadBooks=False ):
@@ -404,91 +433,65 @@ class EasyWorshipBible( Bible ):
             print( "  {:,} bytes read".format( len(fileBytes) ) )
 
         keep = OrderedDict()
+        fileView = memoryview( fileBytes ) # So that we can slice out the blocks without copying them
         index = 0
 
         # Block 1 is 32-bytes long and always the same for EW2009 Bibles
         #if debuggingThisModule: print( 'introBlock', hexlify( fileBytes[index:index+32] ), fileBytes[index:index+32] )
         keep['introBlock'] = (index,fileBytes[index:index+32])
-        hString = ''
-        for j in range( 0, 32 ):
-            char8 = fileBytes[index+j]
-            #print( char8, repr(char8) )
-            if char8 < 0x20: break
-            hString += chr( char8 )
+        hString, j = getCString( fileView, index )
         #if debuggingThisModule or BibleOrgSysGlobals.debugFlag: print( 'hString', repr(hString), index )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert hString == 'EasyWorship Bible Text'
-        introBlockb = fileBytes[index+j:index+32]
+        introBlockb = fileView[j:index+32]
         #if BibleOrgSysGlobals.debugFlag: print( 'introBlockb', hexlify( introBlockb ), introBlockb )
-        assert introBlockb == b'\x1a\x02<\x00\x00\x00\xe0\x00\x00\x00' # b'1a023c000000e0000000'
+        assert introBlockb == INTRO_BLOCK_BYTES[j:] # b'1a023c000000e0000000'
         # Skipped some (important?) binary here??? but it's the same for every module
         index += 32
 
         # Block 2 is 56-bytes long
-        moduleNameBlock = fileBytes[index:index+56]
+        assert index == MODULE_NAME_BLOCK_START
+        moduleNameBlock = fileBytes[index:index+MODULE_NAME_BLOCK_LENGTH]
         keep['moduleNameBlock'] = (index,moduleNameBlock)
         #if debuggingThisModule: print( 'moduleNameBlock', hexlify( moduleNameBlock ), moduleNameBlock )
-        nString = ''
-        for j in range( 0, 32 ):
-            char8 = fileBytes[index+j]
-            #print( char8, repr(char8) )
-            if char8 < 0x20: break
-            nString += chr( char8 )
+        nString, j = getCString( fileView, index )
         #if BibleOrgSysGlobals.debugFlag or debuggingThisModule: print( 'nString', repr(nString), index )
         if BibleOrgSysGlobals.verbosityLevel > 1:
             print( "EasyWorshipBible.load: " + _("Setting module name to {!r}").format( self.name ) )
         self.name = nString
         #assert self.name # Not there for amp and gkm
-        moduleNameBlockb = fileBytes[index+j:index+56]
-        #if BibleOrgSysGlobals.debugFlag: print( 'moduleNameBlockb', len(moduleNameBlockb), hexlify( moduleNameBlockb ), moduleNameBlockb )
-        #assert moduleNameBlockb.endswith( b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00\x00\x00' ) # b'000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001000000'
-        for ix in range( index+j, index+56 ): # Mostly zeroes remaining
-            if ix == 84: # What does this mean???
-                value = fileBytes[ix]
-                assert value in (0,1,2,3,4,5) # bbe=0, alb=1, esv2=2, esv=3, asv=4 nasb=5 Revision number???
-                keep['byte84'] = (index,value)
-            else: assert fileBytes[ix] == 0
-        index += 56
+        # Mostly zeroes remaining
+        value = fileView[84] # What does this mean???
+        assert value in (0,1,2,3,4,5) # bbe=0, alb=1, esv2=2, esv=3, asv=4 nasb=5 Revision number???
+        keep['byte84'] = (index,value)
+        assert isZeroes( fileView[j:84] ) and isZeroes( fileView[85:index+MODULE_NAME_BLOCK_LENGTH] )
+        index += MODULE_NAME_BLOCK_LENGTH
 
         # Get the optional booknames and the raw data for each book into a list
+        assert index == BOOK_INFO_BLOCK_START
         rawBooks = []
-        for bookNumber in range( 1, 66+1 ):
-            bookInfoBlock = fileBytes[index:index+51]
+        for bookNumber, (bookInfoBlock, chapterVerseBlock, bookStart, bookStartHigh, bookLength, bookLengthHigh) \
+                in enumerate( BOOK_INFO_STRUCT.iter_unpack( fileView[index:index+66*BOOK_INFO_STRUCT.size] ), start=1 ):
             blockName = 'bookInfoBlock-{}'.format( bookNumber )
             keep[blockName] = (index,bookInfoBlock)
             #if debuggingThisModule: print( blockName, hexlify( bookInfoBlock ), bookInfoBlock )
-            bookName = ''
-            for j in range( 0, 32 ):
-                char8 = fileBytes[index+j]
-                #print( char8, repr(char8) )
-                if char8 < 0x20: break # bookName seems quite optional -- maybe the English ones are assumed if empty???
-                bookName += chr( char8 )
-            assert fileBytes[index+j:index+51] == b'\x00' * (51-j) # Skipped some zeroes here
-            index += 51
+            bookName, j = getCString( bookInfoBlock ) # bookName seems quite optional -- maybe the English ones are assumed if empty???
+            assert isZeroes( bookInfoBlock[j:] ) # Skipped some zeroes here
             if bookName and bookName[-1] == '.': bookName = bookName[:-1] # Remove final period
             #if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
                 #print( 'bookName', repr(bookName) )
-            numChapters = fileBytes[index]
-            numVerses = []
-            for j in range( 0, numChapters ):
-                numVerses.append( fileBytes[index+j+1] )
-            #print( "here1", 157-j-2, hexlify(fileBytes[index+j+2:index+157]), fileBytes[index+j+2:index+157] )
+            numChapters = chapterVerseBlock[0]
+            numVerses = list( chapterVerseBlock[1:1+numChapters] )
             if self.abbreviation != 'fn1938': # Why does this fail???
-                assert fileBytes[index+j+2:index+157] == b'\x00' * (157-j-2) # Skipped some zeroes here
-            index += 157
+                assert isZeroes( chapterVerseBlock[1+numChapters:] ) # Skipped some zeroes here
             #if BibleOrgSysGlobals.debugFlag or debuggingThisModule:
                 #print( ' {!r} numChapters={} verses={}'.format( bookName, numChapters, numVerses ) )
-            bookStart, = struct.unpack( "<I", fileBytes[index:index+4] )
-            assert fileBytes[index+4:index+8] == b'\x00' * 4 # Skipped some zeroes here
-            index += 8
+            assert bookStartHigh == 0 and bookLengthHigh == 0 # Skipped some zeroes here
+            index += BOOK_INFO_STRUCT.size
             #if BibleOrgSysGlobals.debugFlag or debuggingThisModule:
                 #print( '    bookStart is at {:,}'.format( bookStart ) )
-            bookLength, = struct.unpack( "<I", fileBytes[index:index+4] )
-            assert fileBytes[index+4:index+8] == b'\x00' * 4 # Skipped some zeroes here
-            index += 8
-            #if BibleOrgSysGlobals.debugFlag or debuggingThisModule:
                 #print( '    {} bookLength is {:,} which goes to {:,}'.format( bookNumber, bookLength, bookStart+bookLength ) )
-            bookBytes = fileBytes[bookStart:bookStart+bookLength] # Looking ahead into the file
+            bookBytes = fileView[bookStart:bookStart+bookLength] # Looking ahead into the file (without copying)
             rawBooks.append( (bookName, numChapters, numVerses, bookStart, bookLength, bookBytes) )
             if bookLength == 0: # e.g., gkm Philippians (book number 50)
                 logging.critical( "Booknumber {} is empty in {}".format( bookNumber, self.abbreviation ) )
@@ -502,11 +505,11 @@ class EasyWorshipBible( Bible ):
         keep['workNameBlock'] = (index,workNameBlock) # This block starts with a length, then a work name, e.g., ezFreeASV
         #if debuggingThisModule or BibleOrgSysGlobals.debugFlag:
             #print( 'workNameBlock', index, hexlify(workNameBlock), workNameBlock )
-        length3, = struct.unpack( "<I", fileBytes[index:index+4] )
+        length3, = struct.unpack_from( '<I', fileView, index )
         #print( "length3", length3 ) # Seems to include the compressed string plus six more bytes
         keep['length3'] = (index,length3)
         if length3:
-            bookInfoBlock = fileBytes[index+4:index+4+length3-4-6]
+            bookInfoBlock = fileView[index+4:index+4+length3-4-6]
             if debuggingThisModule:
                 print( "cHeader2 for {}: {}={} {}={}".format( self.abbreviation, bookInfoBlock[0], hexlify(bookInfoBlock[0:1]), bookInfoBlock[1], hexlify(bookInfoBlock[1:2]) ) )
             assert bookInfoBlock[0]==0x78 and bookInfoBlock[1]==0xda # Zlib compression header (for compression levels 7-9)
@@ -537,9 +540,9 @@ class EasyWorshipBible( Bible ):
             workNameAppendage = fileBytes[index+4+length3-6-4:index+4+length3-4]
             #print( "workNameAppendage", len(workNameAppendage), hexlify(workNameAppendage), workNameAppendage )
             keep['workNameAppendage'] = (index+4+length3-6-4,workNameAppendage)
-            assert workNameAppendage[:4] == b'QK\x03\x04'
-            uncompressedNameLength, = struct.unpack( "<B", workNameAppendage[4:5] )
-            assert workNameAppendage[5:] == b'\x00'
+            appendageMarker, uncompressedNameLength, appendageZero = struct.unpack( '<4sBs', workNameAppendage )
+            assert appendageMarker == b'QK\x03\x04'
+            assert appendageZero == b'\x00'
             assert len(textResult) == uncompressedNameLength
         keep['length3'] = (index,length3)
         index += length3
@@ -569,7 +572,6 @@ class EasyWorshipBible( Bible ):
         assert len(endBytes) == 16
         keep['endBytes'] = (index,endBytes)
         assert endBytes == b'\x18:\x00\x00\x00\x00\x00\x00ezwBible' # b'183a000000000000657a774269626c65'
-        del fileBytes # Not needed any more
 
         # Now we have to decode the book text (compressed about 4x with zlib)
         if BibleOrgSysGlobals.verbosityLevel > 1: print( "EWB loading books for {}…".format( self.abbreviation ) )
@@ -580,12 +582,11 @@ class EasyWorshipBible( Bible ):
                 logging.critical( "   Skipped empty {}".format( BBB ) )
                 continue
             if BibleOrgSysGlobals.verbosityLevel > 2: print( '  Decoding {}…'.format( BBB ) )
-            bookBytes, bookExtra = bookBytes[:-10], bookBytes[-10:]
-            assert len(bookExtra) == 10
-            keep['bookExtra-{}'.format(j+1)] = (-10,bookExtra)
-            assert bookExtra[:4] == b'QK\x03\x04'
-            uncompressedBookLength, = struct.unpack( "<I", bookExtra[4:8] )
-            assert bookExtra[8:] == b'\x08\x00'
+            bookBytes, bookExtra = bookBytes[:-BOOK_EXTRA_STRUCT.size], bookBytes[-BOOK_EXTRA_STRUCT.size:]
+            keep['bookExtra-{}'.format(j+1)] = (-BOOK_EXTRA_STRUCT.size,bookExtra.tobytes())
+            extraMarker, uncompressedBookLength, extraEnd = BOOK_EXTRA_STRUCT.unpack( bookExtra )
+            assert extraMarker == b'QK\x03\x04'
+            assert extraEnd == b'\x08\x00'
             byteResult = zlib.decompress( bookBytes )
             assert len(byteResult) == uncompressedBookLength
             try: textResult = byteResult.decode( 'utf8' )
@@ -653,6 +654,7 @@ class EasyWorshipBible( Bible ):
 
             if BibleOrgSysGlobals.verbosityLevel > 3: print( "Saving", BBB )
             self.stashBook( thisBook )
+        del rawBooks, fileView, fileBytes # Not needed any more
 
         self.doPostLoadProcessing()
         return keep
@@ -706,6 +708,48 @@ def testEWB( TEWBfilename ):
 # end of testEWB
 
 
+def benchmarkEWB( TEWBfolder, TEWBfilename, numRuns=3 ):
+    """
+    Time the loading of an EasyWorship Bible
+        and show how much of that is zlib decompression,
+        how much is decoding the binary file structures,
+        and how much is processing the loaded books.
+
+    Returns the average load time (in seconds).
+    """
+    import cProfile, pstats
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Benchmarking the EasyWorship Bible loader…") )
+    loadTimes = []
+    for run in range( numRuns ):
+        ewb = EasyWorshipBible( TEWBfolder, TEWBfilename )
+        startTime = time.perf_counter()
+        ewb.load()
+        loadTimes.append( time.perf_counter() - startTime )
+    averageLoadTime = sum(loadTimes) / len(loadTimes)
+
+    # Now do one more (slower) profiled load to see where the time goes
+    profiler = cProfile.Profile()
+    ewb = EasyWorshipBible( TEWBfolder, TEWBfilename )
+    profiler.enable()
+    ewb.load()
+    profiler.disable()
+    profileStats = pstats.Stats( profiler )
+    decompressTime = decodeTime = totalTime = 0
+    for (filename,lineNumber,functionName), (primitiveCalls,numCalls,ownTime,cumulativeTime,callers) in profileStats.stats.items():
+        if 'zlib.decompress' in functionName: decompressTime += ownTime
+        elif filename == __file__ or functionName.startswith( '<method \'match\'' ) \
+        or 'struct' in functionName or 'memoryview' in functionName: decodeTime += ownTime
+        totalTime += ownTime
+    if BibleOrgSysGlobals.verbosityLevel > 0:
+        print( "  Loaded {} in {:.3f} seconds (average of {} runs)".format( TEWBfilename, averageLoadTime, numRuns ) )
+        print( "    Profiled load took {:.3f} seconds: {:.0%} zlib decompression, {:.0%} decoding the file structures, {:.0%} processing the books" \
+                .format( totalTime, decompressTime/totalTime, decodeTime/totalTime, (totalTime-decompressTime-decodeTime)/totalTime ) )
+        if BibleOrgSysGlobals.verbosityLevel > 2: profileStats.sort_stats( 'tottime' ).print_stats( 12 )
+    return averageLoadTime
+# end of benchmarkEWB
+
+
 def demo():
     """
     Main program to handle command line parameters and then run what they want.
@@ -740,6 +784,11 @@ def demo():
         #testFilepath = os.path.join( testFolder, singleModule+'/', singleModule+'_utf8.txt' )
         testEWB( singleModule )
 
+    if 0: # benchmark the loading of a specified module
+        singleModule = 'kjv.ewb'
+        if BibleOrgSysGlobals.verbosityLevel > 1: print( "\nEasyWorship C2/ Benchmarking {}".format( singleModule ) )
+        benchmarkEWB( testFolder, singleModule )
+
     if 1: # specified modules
         allModulesKeepDict = OrderedDict()
         one = ( 'asv.ewb', )
@@ -34,10 +34,10 @@ Module handling the morphgnt Greek lexicon.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2017-12-07' # by RJH
+LastModifiedDate = '2018-03-16' # by RJH
 ShortProgName = "GreekLexicon"
 ProgName = "Greek Lexicon format handler"
-ProgVersion = '0.17'
+ProgVersion = '0.18'
 ProgNameVersion = '{} v{}'.format( ProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -49,6 +49,10 @@ import logging, os.path, sys, re
 from xml.etree.ElementTree import ElementTree, ParseError
 
 import BibleOrgSysGlobals
+import LexiconStore
+
+
+GREEK_LEXICON_STORE_FILENAME = 'GreekLexicon.sqlite'
 
 
 
@@ -333,6 +337,19 @@ class GreekStrongsFileConverter:
 
 
 
+def makeGreekLexiconStoreSections( XMLFolder ):
+    """
+    Load and validate the Greek lexicon XML file (slow)
+        and return a dictionary of sections for the lexicon store.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Loading Greek lexicon XML file from {}…").format( XMLFolder ) )
+    gStr = GreekStrongsFileConverter() # Create the empty object
+    gStr.loadAndValidate( XMLFolder ) # Load the XML
+    return { 'Strongs':gStr.importDataToPython() }
+# end of makeGreekLexiconStoreSections
+
+
+
 
 class GreekLexicon:
     """
@@ -349,15 +366,27 @@ class GreekLexicon:
             print( t("GreekLexicon.__init__( {} )").format( XMLFolder ) )
         self.XMLFolder = XMLFolder
         self.StrongsEntries = None
+        self.lexiconStore = None
         if preload: self.load()
     # end of GreekLexicon.__init__
 
 
     def load( self ):
         """
+        Load the actual lexicon.
+
+        Uses the prebuilt lexicon store if possible (fast -- entries are then read as needed),
+            building it the first time (slow).
+        Otherwise loads the XML file (slow).
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( t("GreekLexicon.load()") )
         assert self.StrongsEntries is None
+        self.lexiconStore = LexiconStore.getLexiconStore( GREEK_LEXICON_STORE_FILENAME, self.XMLFolder,
+                                        (GreekStrongsFileConverter.databaseFilename,), makeGreekLexiconStoreSections )
+        if self.lexiconStore is not None:
+            self.StrongsEntries = self.lexiconStore.getSection( 'Strongs' )
+            return
+
         gStr = GreekStrongsFileConverter() # Create the empty object
         gStr.loadAndValidate( self.XMLFolder ) # Load the XML
         self.StrongsEntries = gStr.importDataToPython()
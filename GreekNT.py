@@ -47,14 +47,17 @@ from gettext import gettext as _
 LastModifiedDate = '2017-12-07' # by RJH
 ShortProgName = "GreekNTHandler"
 ProgName = "Greek NT format handler"
-ProgVersion = '0.08'
+ProgVersion = '0.09'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
+WORD_ANALYSIS_FILENAME = 'GreekNT_WordAnalysis.pickle' # Saved in the default cache folder
 
-import os, logging
+
+import os, logging, pickle
+from array import array
 
 import BibleOrgSysGlobals, Greek
 from Bible import Bible, BibleBook
@@ -259,124 +262,114 @@ class GreekNT( Bible ):
     # end of loadBook
 
 
-    def analyzeWords( self ):
+    def __getWordAnalysisSignature( self ):
+        """
+        Returns a tuple which identifies the source files (and their sizes and modification times)
+            for the books which are currently loaded.
+
+        Used to check that a saved word analysis is still valid.
+        """
+        signature = [ProgVersion]
+        for BBB in self.books:
+            filepath = os.path.join( self.sourceFilepath, Greek.morphgntFilenames[BBB] )
+            try: fileStat = os.stat( filepath )
+            except OSError: return None # Can't check it
+            signature.append( (BBB, fileStat.st_size, fileStat.st_mtime) )
+        return tuple( signature )
+    # end of GreekNT.__getWordAnalysisSignature
+
+
+    def __makeWordMappings( self, referenceList, postingDicts ):
+        """
+        Expand the compact postings into the four word mappings used by the interlinearizer app.
+
+        Each posting dict has keys which are words (or lemmas)
+            and entries which are dicts with keys which are the related word (or parsing)
+                and entries which are arrays of indexes into referenceList.
+
+        The resulting mappings have the same keys
+            and entries which are lists of (referenceList,relatedWordOrParsing) 2-tuples (in the order first found).
+        """
+        resultDicts = []
+        for postingDict in postingDicts:
+            resultDict = {}
+            for key,relatedDict in postingDict.items():
+                resultDict[key] = [([referenceList[refIndex] for refIndex in refIndexArray],relatedWordOrParsing,) \
+                                        for relatedWordOrParsing,refIndexArray in relatedDict.items()]
+            resultDicts.append( resultDict )
+        self.actualWordsToNormalized, self.normalizedWordsToActual, self.normalizedWordsToParsing, self.lemmasToNormalizedWords = resultDicts
+    # end of GreekNT.__makeWordMappings
+
+
+    def analyzeWords( self, useSavedAnalysisFlag=True ):
         """
         Go through the NT data and do some filing and sorting of the Greek words.
 
+        The words are filed into dict/array postings with each reference encoded as an index into a list of references
+            and then expanded into the four mappings (see __makeWordMappings).
+        The compact postings are saved in the default cache folder
+            and reloaded next time (if useSavedAnalysisFlag is set and the source files haven't changed).
+
         Used by the interlinearizer app.
         """
         if BibleOrgSysGlobals.verbosityLevel > 3:
             print( "analyzeWords: have {} books in the loaded NT".format( len(self.books) ) )
 
+        signature = self.__getWordAnalysisSignature()
+        if useSavedAnalysisFlag and signature is not None:
+            try:
+                savedSignature, self.wordCounts, referenceList, postingDicts = BibleOrgSysGlobals.unpickleObject( WORD_ANALYSIS_FILENAME )
+            except ( OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError ): savedSignature = None
+            if savedSignature == signature:
+                if BibleOrgSysGlobals.verbosityLevel > 2: print( "analyzeWords: using previously saved word analysis" )
+                self.__makeWordMappings( referenceList, postingDicts )
+                return
+
         self.wordCounts = {} # Wordcount organized by BBB
         self.wordCounts['Total'] = 0
-        self.actualWordsToNormalized, self.normalizedWordsToActual, self.normalizedWordsToParsing, self.lemmasToNormalizedWords = {}, {}, {}, {}
-        for BBB in self.books:
-            wordCount = len(self.books[BBB])
+        referenceList, referenceIndexDict = [], {} # Each reference (a BBB,C,V tuple) is only stored once
+        postingDicts = ( {}, {}, {}, {} ) # actualWordsToNormalized, normalizedWordsToActual, normalizedWordsToParsing, lemmasToNormalizedWords
+        actualPostings, normalizedPostings, parsingPostings, lemmaPostings = postingDicts
+        for BBB,bookObject in self.books.items():
+            wordCount = 0
+            C = V = wordsBits = None
+            for entry in bookObject:
+                marker = entry.getMarker()
+                if marker == 'c': C = entry.getCleanText()
+                elif marker == 'v': V = entry.getCleanText()
+                elif marker == 'vw': wordsBits = entry.getCleanText().split( '/' )
+                elif marker == 'g' and wordsBits is not None: # The grammar line follows the word line
+                    punctuatedWord, actualWord, normalizedWord, lemma = wordsBits
+                    parsing = tuple( entry.getCleanText().split( '/' ) ) # POSCode,parsingCode
+                    wordsBits = None
+                    wordCount += 1
+
+                    reference = (BBB,C,V)
+                    try: refIndex = referenceIndexDict[reference]
+                    except KeyError:
+                        refIndex = referenceIndexDict[reference] = len( referenceList )
+                        referenceList.append( reference )
+
+                    # File the words -- because the references come in order, we only need to check the last one for duplicates
+                    for postingDict,key,relatedWordOrParsing in ( (actualPostings,actualWord,normalizedWord),
+                                                                    (normalizedPostings,normalizedWord,actualWord),
+                                                                    (parsingPostings,normalizedWord,parsing),
+                                                                    (lemmaPostings,lemma,normalizedWord) ):
+                        try: relatedDict = postingDict[key]
+                        except KeyError: relatedDict = postingDict[key] = {}
+                        try: refIndexArray = relatedDict[relatedWordOrParsing]
+                        except KeyError: relatedDict[relatedWordOrParsing] = array( 'I', (refIndex,) )
+                        else:
+                            if refIndexArray[-1] != refIndex: refIndexArray.append( refIndex )
             self.wordCounts[BBB] = wordCount
             self.wordCounts['Total'] += wordCount
             if BibleOrgSysGlobals.verbosityLevel > 3: print( "  analyzeWords: {} has {} Greek words".format( BBB, wordCount ) )
-            for reference,parsing,(punctuatedWord,actualWord,normalizedWord,lemma) in self.books[BBB]: # Stuff is: reference,parsing,words
-                # File the actual words
-                if actualWord not in self.actualWordsToNormalized:
-                    self.actualWordsToNormalized[actualWord] = [([reference],normalizedWord,)]
-                    #print( "Saved", actualWord, "with", self.actualWordsToNormalized[actualWord] )
-                else: # we've already had this word before
-                    previous = self.actualWordsToNormalized[actualWord]
-                    #print( "had", actualWord, "before with", previous, "now with", reference, normalizedWord )
-                    found = changed = False
-                    newList = []
-                    for oldRefList,oldnormalizedWord in previous:
-                        #print( "  oRL", oldRefList, "oP", oldnormalizedWord )
-                        if normalizedWord == oldnormalizedWord:
-                            assert not found
-                            if reference not in oldRefList:
-                                oldRefList.append( reference )
-                                newList.append( (oldRefList,oldnormalizedWord,) )
-                                changed = True
-                            found = True
-                        else: newList.append( (oldRefList,oldnormalizedWord,) )
-                    if not found:
-                        #print( "  Found a new", normalizedWord, "normalized word for", actualWord, "was", previous )
-                        newList.append( ([reference],normalizedWord,) )
-                        changed = True
-                    if changed:
-                        self.actualWordsToNormalized[actualWord] = newList
-                        #print( "  now have", newList )
-                # File the normalized words
-                if normalizedWord not in self.normalizedWordsToActual:
-                    self.normalizedWordsToActual[normalizedWord] = [([reference],actualWord,)]
-                    #print( "Saved", normalizedWord, "with", self.normalizedWordsToActual[normalizedWord] )
-                else: # we've already had this word before
-                    previous = self.normalizedWordsToActual[normalizedWord]
-                    #print( "had", normalizedWord, "before with", previous, "now with", reference, actualWord )
-                    found = changed = False
-                    newList = []
-                    for oldRefList,oldActualWord in previous:
-                        #print( "  oRL", oldRefList, "oP", oldActualWord )
-                        if actualWord == oldActualWord:
-                            assert not found
-                            if reference not in oldRefList:
-                                oldRefList.append( reference )
-                                newList.append( (oldRefList,oldActualWord,) )
-                                changed = True
-                            found = True
-                        else: newList.append( (oldRefList,oldActualWord,) )
-                    if not found:
-                        newList.append( ([reference],actualWord,) )
-                        changed = True
-                    if changed:
-                        self.normalizedWordsToActual[normalizedWord] = newList
-                        #print( "  now have", newList )
-                if normalizedWord not in self.normalizedWordsToParsing:
-                    self.normalizedWordsToParsing[normalizedWord] = [([reference],parsing,)]
-                    #print( "Saved", normalizedWord, "with", self.normalizedWordsToParsing[normalizedWord] )
-                else: # we've already had this word before
-                    previous = self.normalizedWordsToParsing[normalizedWord]
-                    #print( "had", normalizedWord, "before with", previous, "now with", reference, parsing )
-                    found = changed = False
-                    newList = []
-                    for oldRefList,oldParsing in previous:
-                        #print( "  oRL", oldRefList, "oP", oldParsing )
-                        if parsing == oldParsing:
-                            assert not found
-                            if reference not in oldRefList:
-                                oldRefList.append( reference )
-                                newList.append( (oldRefList,oldParsing,) )
-                                changed = True
-                            found = True
-                        else: newList.append( (oldRefList,oldParsing,) )
-                    if not found:
-                        newList.append( ([reference],parsing,) )
-                        changed = True
-                    if changed:
-                        self.normalizedWordsToParsing[normalizedWord] = newList
-                        #print( "  now have", newList )
-                # File the self.lemmasToNormalizedWords
-                if lemma not in self.lemmasToNormalizedWords:
-                    self.lemmasToNormalizedWords[lemma] = [([reference],normalizedWord,)]
-                    #print( "Saved", lemma, "with", self.lemmasToNormalizedWords[lemma] )
-                else: # we've already had this word before
-                    previous = self.lemmasToNormalizedWords[lemma]
-                    #print( "had", lemma, "before with", previous, "now with", reference, normalizedWord )
-                    found = changed = False
-                    newList = []
-                    for oldRefList,oldnormalizedWord in previous:
-                        #print( "  oRL", oldRefList, "oP", oldnormalizedWord )
-                        if normalizedWord == oldnormalizedWord:
-                            assert not found
-                            if reference not in oldRefList:
-                                oldRefList.append( reference )
-                                newList.append( (oldRefList,oldnormalizedWord,) )
-                                changed = True
-                            found = True
-                        else: newList.append( (oldRefList,oldnormalizedWord,) )
-                    if not found:
-                        newList.append( ([reference],normalizedWord,) )
-                        changed = True
-                    if changed:
-                        self.lemmasToNormalizedWords[lemma] = newList
-                        #print( "  now have", newList )
+
+        if signature is not None:
+            try: BibleOrgSysGlobals.pickleObject( (signature, self.wordCounts, referenceList, postingDicts), WORD_ANALYSIS_FILENAME )
+            except OSError as err: logging.warning( "analyzeWords: unable to save word analysis: {}".format( err ) )
+        self.__makeWordMappings( referenceList, postingDicts )
+
         if BibleOrgSysGlobals.verbosityLevel > 2: print( "analyzeWords: NT has {} Greek words".format( self.wordCounts['Total'] ) )
         if BibleOrgSysGlobals.verbosityLevel > 2: print( "analyzeWords: NT has {} actual Greek words".format( len(self.actualWordsToNormalized) ) )
         if BibleOrgSysGlobals.verbosityLevel > 3:
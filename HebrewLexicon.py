@@ -34,10 +34,10 @@ Module handling the OpenScriptures Hebrew lexicon.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2017-12-09' # by RJH
+LastModifiedDate = '2018-03-16' # by RJH
 ShortProgName = "HebrewLexicon"
 ProgName = "Hebrew Lexicon format handler"
-ProgVersion = '0.19'
+ProgVersion = '0.20'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -48,6 +48,10 @@ import logging, os.path, sys, re
 from xml.etree.ElementTree import ElementTree, ParseError
 
 import BibleOrgSysGlobals
+import LexiconStore
+
+
+HEBREW_LEXICON_STORE_FILENAME = 'HebrewLexicon.sqlite'
 
 
 
@@ -771,6 +775,39 @@ class BrownDriverBriggsFileConverter:
 
 
 
+HEBREW_LEXICON_SOURCE_FILENAMES = ( AugmentedStrongsIndexFileConverter.indexFilename, LexicalIndexFileConverter.indexFilename,
+                                    HebrewStrongsFileConverter.databaseFilename, BrownDriverBriggsFileConverter.databaseFilename )
+
+def makeHebrewLexiconStoreSections( XMLFolder ):
+    """
+    Load and validate all of the Hebrew lexicon XML files (slow)
+        and return a dictionary of sections for the lexicon store.
+
+    The index sections are omitted if those XML files aren't there.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Loading Hebrew lexicon XML files from {}…").format( XMLFolder ) )
+    sectionDict = {}
+    hStr = HebrewStrongsFileConverter() # Create the empty object
+    hStr.loadAndValidate( XMLFolder ) # Load the XML
+    sectionDict['Strongs'] = hStr.importDataToPython()
+    hBrDrBr = BrownDriverBriggsFileConverter() # Create the empty object
+    hBrDrBr.loadAndValidate( XMLFolder ) # Load the XML
+    BrownDriverBriggsEntries = hBrDrBr.importDataToPython()
+    sectionDict['BrDrBr.heb'], sectionDict['BrDrBr.arc'] = BrownDriverBriggsEntries['heb'], BrownDriverBriggsEntries['arc']
+    if os.path.isfile( os.path.join( XMLFolder, AugmentedStrongsIndexFileConverter.indexFilename ) ) \
+    and os.path.isfile( os.path.join( XMLFolder, LexicalIndexFileConverter.indexFilename ) ):
+        hASIndex = AugmentedStrongsIndexFileConverter() # Create the empty object
+        hASIndex.loadAndValidate( XMLFolder ) # Load the XML
+        sectionDict['Index1'], sectionDict['Index2'] = hASIndex.importDataToPython()
+        hLexIndex = LexicalIndexFileConverter() # Create the empty object
+        hLexIndex.loadAndValidate( XMLFolder ) # Load the XML
+        IndexEntries = hLexIndex.importDataToPython()
+        sectionDict['Index.heb'], sectionDict['Index.arc'] = IndexEntries['heb'], IndexEntries['arc']
+    return sectionDict
+# end of makeHebrewLexiconStoreSections
+
+
+
 
 class HebrewLexiconIndex:
     """
@@ -778,13 +815,19 @@ class HebrewLexiconIndex:
 
     This class doesn't deal at all with XML, only with Python dictionaries, etc.
     """
-    def __init__( self, XMLFolder ):
+    def __init__( self, XMLFolder, lexiconStore=None ):
         """
         Constructor: expects the filepath of the source XML file.
         Loads (and crudely validates the XML file) into an element tree.
+
+        If a lexiconStore (containing the index sections) is given, the XML isn't needed.
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( t("HebrewLexiconIndex.__init__( {} )").format( XMLFolder ) )
+        if lexiconStore is not None and 'Index.heb' in lexiconStore.getSectionNames():
+            self.IndexEntries1, self.IndexEntries2 = lexiconStore.getSection( 'Index1' ), lexiconStore.getSection( 'Index2' )
+            self.IndexEntries = { 'heb':lexiconStore.getSection( 'Index.heb' ), 'arc':lexiconStore.getSection( 'Index.arc' ) }
+            return
         hASIndex = AugmentedStrongsIndexFileConverter() # Create the empty object
         hASIndex.loadAndValidate( XMLFolder ) # Load the XML
         self.IndexEntries1, self.IndexEntries2 = hASIndex.importDataToPython()
@@ -926,14 +969,27 @@ class HebrewLexiconSimple:
             print( t("HebrewLexiconSimple.__init__( {} )").format( XMLFolder ) )
         self.XMLFolder = XMLFolder
         self.StrongsEntries = self.BrownDriverBriggsEntries = None
+        self.lexiconStore = None
         if preload: self.load()
     # end of HebrewLexiconSimple.__init__
 
 
     def load( self ):
         """
-        Load the actual lexicon (slow).
+        Load the actual lexicon.
+
+        Uses the prebuilt lexicon store if possible (fast -- entries are then read as needed),
+            building it the first time (slow).
+        Otherwise loads the XML files (slow).
         """
+        self.lexiconStore = LexiconStore.getLexiconStore( HEBREW_LEXICON_STORE_FILENAME, self.XMLFolder,
+                                                    HEBREW_LEXICON_SOURCE_FILENAMES, makeHebrewLexiconStoreSections )
+        if self.lexiconStore is not None:
+            self.StrongsEntries = self.lexiconStore.getSection( 'Strongs' )
+            self.BrownDriverBriggsEntries = { 'heb':self.lexiconStore.getSection( 'BrDrBr.heb' ),
+                                              'arc':self.lexiconStore.getSection( 'BrDrBr.arc' ) }
+            return
+
         hStr = HebrewStrongsFileConverter() # Create the empty object
         hStr.loadAndValidate( self.XMLFolder ) # Load the XML
         self.StrongsEntries = hStr.importDataToPython()
@@ -1188,7 +1244,7 @@ class HebrewLexicon( HebrewLexiconSimple ):
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule: print( t("HebrewLexicon.load()") )
         HebrewLexiconSimple.load( self )
         assert self.hix is None
-        self.hix = HebrewLexiconIndex( self.XMLFolder ) # Load and process the XML
+        self.hix = HebrewLexiconIndex( self.XMLFolder, self.lexiconStore ) # Load and process the XML (if necessary)
     # end of HebrewLexicon.load
 
 
@@ -28,10 +28,10 @@ Module handling the Hebrew WLC OSIS files from Open Scriptures.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-03-09' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "HebrewWLCBibleHandler"
 ProgName = "Hebrew WLC format handler"
-ProgVersion = '0.22'
+ProgVersion = '0.24'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -40,6 +40,8 @@ debuggingThisModule = False
 
 import os.path
 import logging, pickle
+import sqlite3
+from collections.abc import MutableMapping
 
 import BibleOrgSysGlobals, Hebrew
 from InternalBibleInternals import InternalBibleEntry, InternalBibleExtra, parseWordAttributes
@@ -50,6 +52,8 @@ DEFAULT_OSIS_WLC_FILEPATH = '../morphhb/wlc/'
 DEFAULT_ZIPPED_PICKLED_WLC_FILEPATH = BibleOrgSysGlobals.DOWNLOADED_RESOURCES_FOLDER + 'WLC' + ZIPPED_FILENAME_END
 
 DEFAULT_GLOSSING_DICT_FILEPATH = '../BibleOrgSys/DataFiles/WLCHebrewGlosses.pickle'
+GLOSSING_DB_FILENAME_END = '.sqlite'
+DEFAULT_GLOSSING_DB_FILEPATH = '../BibleOrgSys/DataFiles/WLCHebrewGlosses' + GLOSSING_DB_FILENAME_END
 DEFAULT_GLOSSING_EXPORT_FILEPATH = '../BibleOrgSys/DataFiles/DerivedFiles/WLCHebrewGlosses.txt'
 DEFAULT_GENERIC_GLOSSING_REVERSE_EXPORT_FILEPATH = '../BibleOrgSys/DataFiles/DerivedFiles/WLCHebrewGenericGlossesReversed.txt'
 
@@ -95,6 +99,263 @@ NUMBER_NAMES = { 'd':_("dual"), 'p':_("plural"), 's':_("singular") }
 STATE_NAMES = { 'a':_("absolute"), 'c':_("construct"), 'd':_("determined") }
 
 
+GLOSSING_DB_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS glosses ( word TEXT PRIMARY KEY, genericGloss TEXT NOT NULL );
+    CREATE TABLE IF NOT EXISTS refs ( word TEXT NOT NULL, BBB TEXT NOT NULL, C TEXT NOT NULL, V TEXT NOT NULL, W TEXT NOT NULL,
+                                        specificGloss TEXT, PRIMARY KEY (word,BBB,C,V,W) );
+    """
+
+
+
+class HebrewGlossingStore():
+    """
+    Class for storing the Hebrew glossing dictionary in an SQLite database.
+
+    Each change is committed as it's made (into the write-ahead log)
+        so we never have to rewrite the entire dictionary
+        and an interrupted session doesn't lose earlier changes.
+
+    Entries are indexed by normalized Hebrew word.
+        References keep their insertion order (by rowid).
+
+    Only uses SQL which works with older SQLite versions (e.g., no UPSERT which needs SQLite 3.24).
+    """
+    def __init__( self, glossingDBFilepath ):
+        """
+        Open (or create) the database.
+        """
+        if debuggingThisModule: print( "HebrewGlossingStore.__init__( {!r} )".format( glossingDBFilepath ) )
+        self.glossingDBFilepath = glossingDBFilepath
+        self.connection = sqlite3.connect( glossingDBFilepath )
+        self.connection.execute( 'PRAGMA journal_mode=WAL' )
+        self.connection.execute( 'PRAGMA synchronous=NORMAL' ) # Still safe with WAL
+        with self.connection: self.connection.executescript( GLOSSING_DB_SCHEMA )
+    # end of HebrewGlossingStore.__init__
+
+    def __len__( self ):
+        return self.connection.execute( 'SELECT COUNT(*) FROM glosses' ).fetchone()[0]
+
+    def __contains__( self, normalizedHebrewWord ):
+        return self.connection.execute( 'SELECT 1 FROM glosses WHERE word=?', (normalizedHebrewWord,) ).fetchone() is not None
+
+    def __iter__( self ):
+        for (word,) in self.connection.execute( 'SELECT word FROM glosses' ).fetchall():
+            yield word
+
+
+    def getGenericGloss( self, normalizedHebrewWord ):
+        """
+        Returns the generic gloss string or None.
+        """
+        row = self.connection.execute( 'SELECT genericGloss FROM glosses WHERE word=?', (normalizedHebrewWord,) ).fetchone()
+        return None if row is None else row[0]
+    # end of HebrewGlossingStore.getGenericGloss
+
+    def hasReference( self, normalizedHebrewWord, ref ):
+        """
+        Returns True if the 4-tuple reference is already recorded for this word.
+        """
+        return self.connection.execute( 'SELECT 1 FROM refs WHERE word=? AND BBB=? AND C=? AND V=? AND W=?',
+                                                (normalizedHebrewWord,)+ref ).fetchone() is not None
+    # end of HebrewGlossingStore.hasReference
+
+    def getEntry( self, normalizedHebrewWord ):
+        """
+        Returns a 3-tuple (genericGloss,genericReferencesList,specificReferencesDict)
+            (the same as the values in the glossing dictionary)
+            or None if the word isn't in the database.
+        """
+        genericGloss = self.getGenericGloss( normalizedHebrewWord )
+        if genericGloss is None: return None
+        genericReferencesList, specificReferencesDict = [], {}
+        for BBB,C,V,W,specificGloss in self.connection.execute( 'SELECT BBB,C,V,W,specificGloss FROM refs WHERE word=? ORDER BY rowid',
+                                                                                                (normalizedHebrewWord,) ):
+            ref = (BBB,C,V,W)
+            genericReferencesList.append( ref )
+            if specificGloss is not None: specificReferencesDict[ref] = specificGloss
+        return genericGloss, genericReferencesList, specificReferencesDict
+    # end of HebrewGlossingStore.getEntry
+
+    def items( self ):
+        """
+        Returns a list of all (normalizedHebrewWord,(genericGloss,genericReferencesList,specificReferencesDict)) entries
+            using only two queries (rather than one per word).
+        """
+        resultDict = { word:(genericGloss,[],{}) for word,genericGloss in self.connection.execute( 'SELECT word,genericGloss FROM glosses' ) }
+        for word,BBB,C,V,W,specificGloss in self.connection.execute( 'SELECT word,BBB,C,V,W,specificGloss FROM refs ORDER BY rowid' ):
+            try: genericGloss, genericReferencesList, specificReferencesDict = resultDict[word]
+            except KeyError: continue # orphaned reference -- checkConsistency will report it
+            ref = (BBB,C,V,W)
+            genericReferencesList.append( ref )
+            if specificGloss is not None: specificReferencesDict[ref] = specificGloss
+        return list( resultDict.items() )
+    # end of HebrewGlossingStore.items
+
+
+    def setGenericGloss( self, normalizedHebrewWord, genericGloss, ref ):
+        """
+        Add or update the generic gloss for the word and add the reference if it's not already there.
+        """
+        with self.connection:
+            self.connection.execute( 'INSERT OR IGNORE INTO glosses (word,genericGloss) VALUES (?,?)', (normalizedHebrewWord,genericGloss) )
+            self.connection.execute( 'UPDATE glosses SET genericGloss=? WHERE word=?', (genericGloss,normalizedHebrewWord) )
+            self.connection.execute( 'INSERT OR IGNORE INTO refs (word,BBB,C,V,W) VALUES (?,?,?,?,?)', (normalizedHebrewWord,)+ref )
+    # end of HebrewGlossingStore.setGenericGloss
+
+    def setSpecificGloss( self, normalizedHebrewWord, specificGloss, ref ):
+        """
+        Set the specific gloss for an existing reference.
+
+        Returns False if the word doesn't have that reference.
+        """
+        with self.connection:
+            cursor = self.connection.execute( 'UPDATE refs SET specificGloss=? WHERE word=? AND BBB=? AND C=? AND V=? AND W=?',
+                                                (specificGloss,normalizedHebrewWord)+ref )
+        return cursor.rowcount == 1
+    # end of HebrewGlossingStore.setSpecificGloss
+
+    def addReference( self, normalizedHebrewWord, ref ):
+        """
+        Add a reference to an existing word.
+
+        Returns False if it was already there.
+        """
+        with self.connection:
+            cursor = self.connection.execute( 'INSERT OR IGNORE INTO refs (word,BBB,C,V,W) VALUES (?,?,?,?,?)',
+                                                (normalizedHebrewWord,)+ref )
+        return cursor.rowcount == 1
+    # end of HebrewGlossingStore.addReference
+
+    def setEntry( self, normalizedHebrewWord, entry ):
+        """
+        Replace the entire entry for a word
+            with a (genericGloss,genericReferencesList,specificReferencesDict) 3-tuple.
+        """
+        genericGloss, genericReferencesList, specificReferencesDict = entry
+        with self.connection:
+            self.connection.execute( 'DELETE FROM refs WHERE word=?', (normalizedHebrewWord,) )
+            self.connection.execute( 'INSERT OR REPLACE INTO glosses (word,genericGloss) VALUES (?,?)', (normalizedHebrewWord,genericGloss) )
+            self.connection.executemany( 'INSERT OR IGNORE INTO refs (word,BBB,C,V,W,specificGloss) VALUES (?,?,?,?,?,?)',
+                        ((normalizedHebrewWord,)+ref+(specificReferencesDict.get(ref),) for ref in genericReferencesList) )
+    # end of HebrewGlossingStore.setEntry
+
+    def deleteEntry( self, normalizedHebrewWord ):
+        """
+        Remove the word (and all of its references).
+        """
+        with self.connection:
+            self.connection.execute( 'DELETE FROM refs WHERE word=?', (normalizedHebrewWord,) )
+            self.connection.execute( 'DELETE FROM glosses WHERE word=?', (normalizedHebrewWord,) )
+    # end of HebrewGlossingStore.deleteEntry
+
+    def replaceAll( self, glossingDict ):
+        """
+        Replace the entire contents of the database (in a single transaction)
+            from a glossing dictionary (e.g., loaded from the pickle or imported from a text file).
+        """
+        if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
+            print( _("Writing {} Hebrew gloss entries to '{}'…").format( len(glossingDict), self.glossingDBFilepath ) )
+        with self.connection:
+            self.connection.execute( 'DELETE FROM refs' )
+            self.connection.execute( 'DELETE FROM glosses' )
+            self.connection.executemany( 'INSERT INTO glosses (word,genericGloss) VALUES (?,?)',
+                        ((word,genericGloss) for word,(genericGloss,genericReferencesList,specificReferencesDict) in glossingDict.items()) )
+            self.connection.executemany( 'INSERT OR IGNORE INTO refs (word,BBB,C,V,W,specificGloss) VALUES (?,?,?,?,?,?)',
+                        ((word,)+ref+(specificReferencesDict.get(ref),)
+                            for word,(genericGloss,genericReferencesList,specificReferencesDict) in glossingDict.items()
+                                for ref in genericReferencesList) )
+    # end of HebrewGlossingStore.replaceAll
+
+
+    def checkConsistency( self ):
+        """
+        Do the glossing dictionary consistency checks with indexed queries
+            (duplicate references can't occur because of the primary key).
+
+        Returns a list of (normalizedHebrewWord,genericGloss,errorMessage) 3-tuples
+            for entries that should be removed.
+        """
+        problems = []
+        for word,genericGloss in self.connection.execute( "SELECT word,genericGloss FROM glosses WHERE word LIKE '% %' OR instr(word,?)",
+                                                                                        (ORIGINAL_MORPHEME_BREAK_CHAR,) ):
+            problems.append( (word,genericGloss,_("Removing invalid Hebrew (normalized) word: {!r}").format( word )) )
+        for word,genericGloss in self.connection.execute( "SELECT word,genericGloss FROM glosses WHERE genericGloss LIKE '% %'" ):
+            problems.append( (word,genericGloss,_("Removing {!r} word with invalid generic gloss: {!r}").format( word, genericGloss )) )
+        for word,genericGloss in self.connection.execute( 'SELECT word,genericGloss FROM glosses WHERE NOT EXISTS '
+                                                            '(SELECT 1 FROM refs WHERE refs.word=glosses.word)' ):
+            problems.append( (word,genericGloss,_("Removing {!r} = {!r} entry with no references").format( word, genericGloss )) )
+        for word,ref in self.connection.execute( "SELECT word,BBB||' '||C||':'||V||'#'||W FROM refs WHERE NOT EXISTS "
+                                                            '(SELECT 1 FROM glosses WHERE glosses.word=refs.word)' ):
+            logging.error( _("Orphaned Hebrew glossing reference {} for {!r}").format( ref, word ) )
+        for word,ref,specificGloss in self.connection.execute( "SELECT refs.word,BBB||' '||C||':'||V||'#'||W,specificGloss FROM refs "
+                                                            'JOIN glosses ON refs.word=glosses.word '
+                                                            "WHERE specificGloss IS NOT NULL AND (specificGloss='' "
+                                                            "OR specificGloss LIKE '% %' OR instr(specificGloss,?) OR specificGloss=genericGloss)",
+                                                                                        (ORIGINAL_MORPHEME_BREAK_CHAR,) ):
+            logging.error( _("Invalid specific gloss {!r} for {!r} at {}").format( specificGloss, word, ref ) )
+        return problems
+    # end of HebrewGlossingStore.checkConsistency
+
+
+    def checkpoint( self ):
+        """
+        Move the committed changes from the write-ahead log into the main database file.
+        """
+        self.connection.execute( 'PRAGMA wal_checkpoint(TRUNCATE)' )
+    # end of HebrewGlossingStore.checkpoint
+
+    def close( self ):
+        """
+        Checkpoint and close the database.
+        """
+        self.checkpoint()
+        self.connection.close()
+    # end of HebrewGlossingStore.close
+# end of HebrewGlossingStore class
+
+
+
+class HebrewGlossingStoreDict( MutableMapping ):
+    """
+    Dictionary-like view onto a HebrewGlossingStore
+        so that code using the glossing dictionary directly keeps working.
+
+    NOTE: Entries are read from the database each time,
+        so changes must be made by assigning the entry, not by mutating the returned list/dict.
+    """
+    def __init__( self, glossingStore ):
+        self.glossingStore = glossingStore
+
+    def __getitem__( self, normalizedHebrewWord ):
+        entry = self.glossingStore.getEntry( normalizedHebrewWord )
+        if entry is None: raise KeyError( normalizedHebrewWord )
+        return entry
+
+    def __setitem__( self, normalizedHebrewWord, entry ):
+        self.glossingStore.setEntry( normalizedHebrewWord, entry )
+
+    def __delitem__( self, normalizedHebrewWord ):
+        if normalizedHebrewWord not in self.glossingStore: raise KeyError( normalizedHebrewWord )
+        self.glossingStore.deleteEntry( normalizedHebrewWord )
+
+    def __contains__( self, normalizedHebrewWord ):
+        return normalizedHebrewWord in self.glossingStore
+
+    def __iter__( self ):
+        return iter( self.glossingStore )
+
+    def __len__( self ):
+        return len( self.glossingStore )
+
+    def items( self ):
+        return self.glossingStore.items()
+
+    def copy( self ):
+        return dict( self.glossingStore.items() )
+# end of HebrewGlossingStoreDict class
+
+
+
 class HebrewWLCBibleAddon():
     """
     Class for handling a Hebrew WLC object (which may contain one or more Bible books)
@@ -110,6 +371,7 @@ class HebrewWLCBibleAddon():
         if debuggingThisModule: print( "HebrewWLCBibleAddon.__init__()" )
 
         self.glossingDict, self.haveGlossingDictChanges, self.loadedGlossEntryCount = None, False, 0
+        self.glossingStore = None # Set if the glossing dictionary is held in an SQLite database
     # end of HebrewWLCBibleAddon.__init__
 
 
@@ -338,6 +600,14 @@ class HebrewWLCBibleAddon():
             assert self.glossingDict
 
         print( "Checking {} loaded Hebrew gloss entries for consistency…".format( self.loadedGlossEntryCount ) )
+        if self.glossingStore is not None: # Let the database do the work
+            for word,genericGloss,errorMessage in self.glossingStore.checkConsistency():
+                logging.critical( errorMessage )
+                self.glossingStore.deleteEntry( word )
+                self.haveGlossingDictChanges = True
+            print( "  "+_("Finished checking Hebrew glosses") )
+            return
+
         for word,(genericGloss,genericReferencesList,specificReferencesDict) in self.glossingDict.copy().items(): # Use a copy because we can modify it
             #print( repr(word), repr(genericGloss), genericReferencesList )
             assert isinstance( word, str ) and word
@@ -354,12 +624,13 @@ class HebrewWLCBibleAddon():
                 self.haveGlossingDictChanges = True
                 continue
             if genericReferencesList:
+                genericReferencesSet = set( genericReferencesList )
+                assert len(genericReferencesSet) == len(genericReferencesList) # Don't allow multiples
                 for reference in genericReferencesList:
                     assert isinstance( reference, tuple )
                     assert len(reference) == 4 # BBB,C,V,word# (starting with 1)
                     for part in reference:
                         assert isinstance( part, str ) # We don't use INTs for references
-                    assert genericReferencesList.count( reference ) == 1 # Don't allow multiples
             else: # the genericReferencesList is empty!
                 logging.critical( _("Removing {!r} = {!r} entry with no references").format( word, genericGloss ) )
                 del self.glossingDict[word]
@@ -373,7 +644,7 @@ class HebrewWLCBibleAddon():
                 assert len(reference) == 4 # BBB,C,V,word# (starting with 1)
                 for part in reference:
                     assert isinstance( part, str ) # We don't use INTs for references
-                assert reference in genericReferencesList
+                assert reference in genericReferencesSet
                 assert isinstance( specificGloss, str ) and specificGloss
                 assert ' ' not in specificGloss
                 assert ORIGINAL_MORPHEME_BREAK_CHAR not in specificGloss
@@ -386,10 +657,20 @@ class HebrewWLCBibleAddon():
 
     def loadGlossingDict( self, glossingDictFilepath=None ):
         """
+        Load the glossing dictionary.
+
+        If no filepath is given, the default pickle file is loaded (and saveAnyChangedGlosses rewrites it).
+        If the filepath ends with GLOSSING_DB_FILENAME_END, it's opened as an SQLite database
+            and changes are then saved incrementally as they're made.
+            (A database is only ever made from a pickle file by an explicit call to convertGlossingDictToDatabase.)
         """
+        if glossingDictFilepath is None: glossingDictFilepath = DEFAULT_GLOSSING_DICT_FILEPATH
+        if glossingDictFilepath.endswith( GLOSSING_DB_FILENAME_END ):
+            self.loadGlossingDatabase( glossingDictFilepath )
+            return
+
         self.glossingDictFilepath = glossingDictFilepath
-        if glossingDictFilepath is None:
-            self.glossingDictFilepath = DEFAULT_GLOSSING_DICT_FILEPATH
+        self.glossingStore = None
 
         # Read our glossing data from the pickle file
         if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
@@ -413,13 +694,66 @@ class HebrewWLCBibleAddon():
     # end of HebrewWLCBibleAddon.loadGlossingDict
 
 
+    def loadGlossingDatabase( self, glossingDBFilepath=None ):
+        """
+        Open the glossing dictionary from an SQLite database.
+
+        self.glossingDict then becomes a dictionary-like view onto the database.
+        """
+        if glossingDBFilepath is None: glossingDBFilepath = DEFAULT_GLOSSING_DB_FILEPATH
+        if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
+            print( _("Opening Hebrew glossing database '{}'…").format( glossingDBFilepath ) )
+        if self.glossingStore is not None: self.glossingStore.close()
+        self.glossingDictFilepath = glossingDBFilepath
+        self.glossingStore = HebrewGlossingStore( glossingDBFilepath )
+        self.glossingDict = HebrewGlossingStoreDict( self.glossingStore )
+        self.loadedGlossEntryCount = len( self.glossingDict )
+        self.haveGlossingDictChanges = False
+        if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
+            print( "  "+_("{} Hebrew gloss entries in database.").format( self.loadedGlossEntryCount ) )
+
+        if BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag or debuggingThisModule:
+            self._checkLoadedDict()
+            if self.haveGlossingDictChanges: self.saveAnyChangedGlosses( exportAlso=True )
+    # end of HebrewWLCBibleAddon.loadGlossingDatabase
+
+
+    def convertGlossingDictToDatabase( self, glossingDBFilepath=None ):
+        """
+        Write the currently loaded glossing dictionary into an SQLite database
+            and then use the database from now on.
+
+        The pickle file (if any) is left as it was.
+        """
+        if glossingDBFilepath is None: glossingDBFilepath = DEFAULT_GLOSSING_DB_FILEPATH
+        if BibleOrgSysGlobals.verbosityLevel > 1:
+            print( _("Converting Hebrew glossing dictionary ({} entries) to '{}'…").format( len(self.glossingDict), glossingDBFilepath ) )
+        glossingStore = HebrewGlossingStore( glossingDBFilepath )
+        glossingStore.replaceAll( self.glossingDict )
+        glossingStore.close()
+        haveGlossingDictChanges = self.haveGlossingDictChanges
+        self.loadGlossingDatabase( glossingDBFilepath )
+        self.haveGlossingDictChanges = haveGlossingDictChanges
+    # end of HebrewWLCBibleAddon.convertGlossingDictToDatabase
+
+
     def saveAnyChangedGlosses( self, exportAlso=False ):
         """
         Save the glossing dictionary to a pickle file.
+
+        If we're using a database, the changes have already been saved
+            so we just checkpoint the write-ahead log.
         """
         if debuggingThisModule: print( "saveAnyChangedGlosses()" )
 
-        if self.haveGlossingDictChanges:
+        if self.glossingStore is not None:
+            if self.haveGlossingDictChanges:
+                if BibleOrgSysGlobals.verbosityLevel > 1:
+                    print( "  Hebrew glossing database has {}->{} entries".format( self.loadedGlossEntryCount, len(self.glossingDict) ) )
+                self.glossingStore.checkpoint()
+                if exportAlso: self.exportGlossingDictionary()
+                self.haveGlossingDictChanges = False
+        elif self.haveGlossingDictChanges:
             BibleOrgSysGlobals.backupAnyExistingFile( self.glossingDictFilepath, 9 )
             if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
                 print( "  Saving Hebrew glossing dictionary ({}->{} entries) to '{}'…".format( self.loadedGlossEntryCount, len(self.glossingDict), self.glossingDictFilepath ) )
@@ -482,7 +816,10 @@ class HebrewWLCBibleAddon():
             if BibleOrgSysGlobals.verbosityLevel > 1: print( "  Loaded {} entries.".format( len(newDict) ) )
             if len(newDict) > self.loadedGlossEntryCount-10: # Seems to have been successful
                 if len(newDict) != self.loadedGlossEntryCount: print( "  Went from {} to {} entries!".format( self.loadedGlossEntryCount, len(newDict) ) )
-                self.glossingDict = newDict # Replace the dictionary with the upgraded one
+                if self.glossingStore is not None: # Replace the database contents in one transaction
+                    self.glossingStore.replaceAll( newDict )
+                    self.haveGlossingDictChanges = True
+                else: self.glossingDict = newDict # Replace the dictionary with the upgraded one
                 if BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag or debuggingThisModule:
                     self._checkLoadedDict()
     # end of HebrewWLCBibleAddon.importGlossingDictionary
@@ -542,6 +879,17 @@ class HebrewWLCBibleAddon():
         assert ' ' not in genericGloss
         assert isinstance( ref, tuple ) and len(ref)==4 # BBB,C,V plus word# (starting with 1)
 
+        if self.glossingStore is not None: # Save just this change to the database
+            prevGenericGloss = self.glossingStore.getGenericGloss( normalizedHebrewWord )
+            if prevGenericGloss is not None and BibleOrgSysGlobals.verbosityLevel > 1:
+                if genericGloss!=prevGenericGloss:
+                    print( _("Updating generic gloss for {!r} from {!r} to {!r}").format( normalizedHebrewWord, prevGenericGloss, genericGloss ) )
+                if not self.glossingStore.hasReference( normalizedHebrewWord, ref ):
+                    print( _("Adding {} for generic gloss {!r} for {!r}").format( ref, genericGloss, normalizedHebrewWord ) )
+            self.glossingStore.setGenericGloss( normalizedHebrewWord, genericGloss, ref )
+            self.haveGlossingDictChanges = True
+            return
+
         if normalizedHebrewWord in self.glossingDict: # it's an update
             (prevGenericGloss,prevRefList,prevSpecificGlossDict) = self.glossingDict[normalizedHebrewWord]
             if genericGloss!=prevGenericGloss:
@@ -570,6 +918,17 @@ class HebrewWLCBibleAddon():
         assert isinstance( normalizedHebrewWord, str ) and normalizedHebrewWord
         assert ' ' not in normalizedHebrewWord
         assert ORIGINAL_MORPHEME_BREAK_CHAR not in normalizedHebrewWord # Should already be converted to OUR_MORPHEME_BREAK_CHAR
+
+        if self.glossingStore is not None: # Save just this change to the database
+            assert self.glossingStore.getGenericGloss( normalizedHebrewWord )
+            assert isinstance( ref, tuple ) and len(ref)==4 # BBB,C,V plus word# (starting with 1)
+            assert isinstance( specificGloss, str )
+            assert ' ' not in specificGloss
+            if not self.glossingStore.setSpecificGloss( normalizedHebrewWord, specificGloss, ref ):
+                raise KeyError( ref ) # The ref must already be in the genericReferencesList
+            self.haveGlossingDictChanges = True
+            return
+
         genericGloss,genericReferencesList,specificReferencesDict = self.glossingDict[normalizedHebrewWord]
         assert isinstance( genericGloss, str ) and genericGloss
         assert isinstance( ref, tuple ) and len(ref)==4 # BBB,C,V plus word# (starting with 1)
@@ -601,6 +960,12 @@ class HebrewWLCBibleAddon():
         assert normalizedHebrewWord in self.glossingDict
         assert isinstance( ref, tuple ) and len(ref)==4 # BBB,C,V plus word# (starting with 1)
 
+        if self.glossingStore is not None: # Save just this change to the database
+            if self.glossingStore.addReference( normalizedHebrewWord, ref ):
+                self.haveGlossingDictChanges = True
+            else: logging.error( _("addNewGenericGlossingReference: {} was already there for {!r}").format( ref, normalizedHebrewWord ) )
+            return
+
         (genericGloss,genericReferencesList,specificReferencesDict) = self.glossingDict[normalizedHebrewWord]
         assert ref not in genericReferencesList
         if ref not in genericReferencesList:
@@ -650,10 +1015,15 @@ class HebrewWLCBibleAddon():
                             normalizedHebrewWord =  self.removeCantillationMarks( word, removeMetegOrSiluq=True ) \
                                         .replace( ORIGINAL_MORPHEME_BREAK_CHAR, OUR_MORPHEME_BREAK_CHAR )
                             #print( '  ', len(word), repr(word), len(normalizedHebrewWord), repr(normalizedHebrewWord) )
-                            genericGloss,genericReferencesList,specificReferencesDict = self.glossingDict[normalizedHebrewWord] \
-                                                    if normalizedHebrewWord in self.glossingDict else ('',[],{})
+                            if self.glossingStore is not None: # Use the indexes rather than fetching all the references
+                                genericGloss = self.glossingStore.getGenericGloss( normalizedHebrewWord )
+                                haveRef = genericGloss is not None and self.glossingStore.hasReference( normalizedHebrewWord, fullRefTuple )
+                            else:
+                                genericGloss,genericReferencesList,specificReferencesDict = self.glossingDict[normalizedHebrewWord] \
+                                                        if normalizedHebrewWord in self.glossingDict else ('',[],{})
+                                haveRef = fullRefTuple in genericReferencesList
                             #if genericGloss: print( fullRefTuple, repr(genericGloss) )
-                            if genericGloss and genericGloss not in '־׃ספ-' and fullRefTuple not in genericReferencesList:
+                            if genericGloss and genericGloss not in '־׃ספ-' and not haveRef:
                                 #print( "  Adding {}".format( fullRefTuple ) )
                                 self.addNewGenericGlossingReference( normalizedHebrewWord, fullRefTuple )
                                 numRefsAdded += 1
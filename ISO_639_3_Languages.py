@@ -31,7 +31,7 @@ from gettext import gettext as _
 LastModifiedDate = '2016-02-25' # by RJH
 ShortProgName = "ISOLanguages"
 ProgName = "ISO 639_3_Languages handler"
-ProgVersion = "0.84"
+ProgVersion = "0.86"
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -39,9 +39,11 @@ debuggingThisModule = False
 
 
 import os
+from bisect import bisect_left
 
 from singleton import singleton
 import BibleOrgSysGlobals
+from ISO_639_3_LanguagesConverter import MAX_NAME_INDEX_NGRAM_LENGTH
 
 
 @singleton # Can only ever have one instance
@@ -59,6 +61,7 @@ class ISO_639_3_Languages:
         Constructor:
         """
         self.__IDDict, self.__NameDict = None, None # We'll import into this in loadData
+        self.__sortedUCNames, self.__ngramDict = None, None # The name index is loaded in loadData or made in getNameMatches
     # end of ISO_639_3_Languages.__init__
 
     def __str__( self ):
@@ -89,6 +92,13 @@ class ISO_639_3_Languages:
                 if BibleOrgSysGlobals.verbosityLevel > 2: print( "Loading pickle file {}…".format( standardPickleFilepath ) )
                 with open( standardPickleFilepath, 'rb') as pickleFile:
                     self.__IDDict, self.__NameDict = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
+                standardIndexPickleFilepath = os.path.join( dataFilepath, "DerivedFiles", "iso_639_3_Languages_Tables.index.pickle" )
+                if os.access( standardIndexPickleFilepath, os.R_OK ) \
+                and os.stat(standardIndexPickleFilepath)[8] > os.stat(standardXMLFilepath)[8] \
+                and os.stat(standardIndexPickleFilepath)[9] > os.stat(standardXMLFilepath)[9]: # There's a newer index file
+                    if BibleOrgSysGlobals.verbosityLevel > 2: print( "Loading pickle index file {}…".format( standardIndexPickleFilepath ) )
+                    with open( standardIndexPickleFilepath, 'rb') as pickleFile:
+                        self.__sortedUCNames, self.__ngramDict = pickle.load( pickleFile )
             else: # We have to load the XML
                 from ISO_639_3_LanguagesConverter import ISO_639_3_LanguagesConverter
                 self._lgC = ISO_639_3_LanguagesConverter()
@@ -141,17 +151,56 @@ class ISO_639_3_Languages:
         UCName = name.upper() # Convert to UPPERCASE for searching
         if UCName in self.__NameDict: return self.__NameDict[UCName]
 
-    def getNameMatches( self, namePortion ):
+    def getNameMatches( self, namePortion, maxResults=None ):
         """ Return a list of matching names for the given part of a name.
-            This is slow because it is a brute-force search.
+
+            The results are ranked with an exact match first, then names starting with namePortion,
+                then names with a word starting with namePortion, then any other matches
+                (and alphabetically within each of those groups).
+            If maxResults is given, no more than that number of names are returned.
+            An empty namePortion matches every name (as the old brute-force search did).
+
+            Uses the precomputed n-gram index rather than a brute-force search.
         """
+        if self.__ngramDict is None: # We didn't load the index file so need to make the index now
+            from ISO_639_3_LanguagesConverter import makeNameIndex
+            self.__sortedUCNames, self.__ngramDict = makeNameIndex( self.__NameDict )
         UCNamePortion = namePortion.upper()
-        results = []
-        for UCName in self.__NameDict:
-            if UCNamePortion in UCName:
-                ccc = self.__NameDict[UCName]
-                results.append( self.__IDDict[ccc][0] ) # Get the mixed case language name
-        return results
+        if maxResults==0: return []
+        sortedUCNames = self.__sortedUCNames
+
+        # Start with the names that start with our string (they're all together in the sorted list
+        #   and any exact match will be the first one)
+        indexList = []
+        ix = bisect_left( sortedUCNames, UCNamePortion )
+        while ix < len(sortedUCNames) and sortedUCNames[ix].startswith( UCNamePortion ):
+            if maxResults and len(indexList)>=maxResults: break
+            indexList.append( ix ); ix += 1
+        if not maxResults or len(indexList)<maxResults:
+            # Now find the candidates for other matches
+            if len(UCNamePortion) <= MAX_NAME_INDEX_NGRAM_LENGTH:
+                candidates, needsCheck = self.__ngramDict.get( UCNamePortion, () ), False
+            else: # Use the shortest posting list of all the n-grams in our string
+                candidates, needsCheck = None, True
+                for jx in range( 0, len(UCNamePortion)-MAX_NAME_INDEX_NGRAM_LENGTH+1 ):
+                    postingList = self.__ngramDict.get( UCNamePortion[jx:jx+MAX_NAME_INDEX_NGRAM_LENGTH], () )
+                    if candidates is None or len(postingList) < len(candidates): candidates = postingList
+                    if not candidates: break
+            wordStartList, otherList = [], []
+            for ix in candidates:
+                UCName = sortedUCNames[ix]
+                if needsCheck and UCNamePortion not in UCName: continue
+                fx = UCName.find( UCNamePortion )
+                if fx == 0: continue # Already got it above
+                while fx != -1:
+                    if not UCName[fx-1].isalpha(): wordStartList.append( ix ); break
+                    fx = UCName.find( UCNamePortion, fx+1 )
+                else: otherList.append( ix )
+            indexList.extend( wordStartList )
+            indexList.extend( otherList )
+        if maxResults: indexList = indexList[:maxResults]
+        return [self.__IDDict[self.__NameDict[sortedUCNames[ix]]][0] for ix in indexList] # Get the mixed case language names
+    # end of ISO_639_3_Languages.getNameMatches
 # end of ISO_639_3_Languages class
 
 
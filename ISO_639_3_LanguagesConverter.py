@@ -31,7 +31,7 @@ from gettext import gettext as _
 LastModifiedDate = '2016-04-23' # by RJH
 ShortProgName = "ISOLanguagesConverter"
 ProgName = "ISO 639_3_Languages handler"
-ProgVersion = "0.84"
+ProgVersion = "0.85"
 ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
 
 
@@ -44,6 +44,33 @@ from singleton import singleton
 import BibleOrgSysGlobals
 
 
+MAX_NAME_INDEX_NGRAM_LENGTH = 3 # Longer search strings are checked against the candidates from their rarest n-gram
+
+
+def makeNameIndex( NameDict ):
+    """
+    Given the dictionary of UPPERCASE language names (as made by importDataToPython),
+        make a substring index so that getNameMatches doesn't have to do a brute-force search.
+
+    Returns a 2-tuple containing:
+        a list of the UPPERCASE names (sorted alphabetically)
+        a dictionary with all the 1..MAX_NAME_INDEX_NGRAM_LENGTH character n-grams as keys
+            and tuples of (sorted) indexes into the above list as entries.
+    """
+    sortedUCNames = sorted( NameDict )
+    ngramDict = {}
+    for j,UCName in enumerate( sortedUCNames ):
+        for ngramLength in range( 1, MAX_NAME_INDEX_NGRAM_LENGTH+1 ):
+            for ix in range( 0, len(UCName)-ngramLength+1 ):
+                ngram = UCName[ix:ix+ngramLength]
+                if ngram not in ngramDict: ngramDict[ngram] = [j]
+                elif ngramDict[ngram][-1] != j: ngramDict[ngram].append( j ) # Don't want duplicates in each posting list
+    for ngram,postingList in ngramDict.items():
+        ngramDict[ngram] = tuple( postingList ) # More compact
+    return sortedUCNames, ngramDict
+# end of makeNameIndex
+
+
 
 @singleton # Can only ever have one instance
 class ISO_639_3_LanguagesConverter:
@@ -230,6 +257,26 @@ class ISO_639_3_LanguagesConverter:
             pickle.dump( self.__DataDicts, myFile )
     # end of pickle
 
+    def pickleNameIndex( self, filepath=None ):
+        """
+        Writes the name substring index to a .index.pickle file (alongside the main .pickle file)
+            so that ISO_639_3_Languages.getNameMatches can load it rather than building it.
+        """
+        import pickle
+
+        assert self._XMLtree
+        self.importDataToPython()
+        assert self.__DataDicts
+
+        if not filepath:
+            folder = os.path.join( os.path.split(self.__XMLFilepath)[0], "DerivedFiles/" )
+            if not os.path.exists( folder ): os.mkdir( folder )
+            filepath = os.path.join( folder, self._filenameBase + "_Languages_Tables.index.pickle" )
+        if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Exporting to {}…").format( filepath ) )
+        with open( filepath, 'wb' ) as myFile:
+            pickle.dump( makeNameIndex( self.__DataDicts[1] ), myFile )
+    # end of pickleNameIndex
+
     def exportDataToPython( self, filepath=None ):
         """
         Writes the information tables to a .py file that can be cut and pasted into a Python program.
@@ -379,6 +426,7 @@ def demo():
     if BibleOrgSysGlobals.commandLineArguments.export:
         lgC = ISO_639_3_LanguagesConverter().loadAndValidate() # Load the XML
         lgC.pickle() # Produce a pickle output file
+        lgC.pickleNameIndex() # Produce a pickle index file for name searches
         lgC.exportDataToPython() # Produce the .py tables
         lgC.exportDataToJSON() # Produce a json output file
         lgC.exportDataToC() # Produce the .h and .c tables
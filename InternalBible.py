@@ -56,10 +56,10 @@ The calling class then fills
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "InternalBible"
 ProgName = "Internal Bible handler"
-ProgVersion = '0.82'
+ProgVersion = '0.87'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -72,8 +72,9 @@ from collections import OrderedDict
 
 import BibleOrgSysGlobals
 from InternalBibleInternals import InternalBibleEntryList, BOS_EXTRA_TYPES, BOS_EXTRA_MARKERS
-from InternalBibleBook import BCV_VERSION
+from InternalBibleBook import BCV_VERSION, getTypicalAddedUnitData
 from VerseReferences import SimpleVerseKey
+from BibleFingerprints import VERSE_FINGERPRINT_VERSION, VerseFingerprints
 
 
 OT39_BOOKLIST = ( 'GEN', 'EXO', 'LEV', 'NUM', 'DEU', 'JOS', 'JDG', 'RUT', 'SA1', 'SA2', 'KI1', 'KI2', 'CH1', 'CH2', \
@@ -84,6 +85,9 @@ NT27_BOOKLIST = ( 'MAT', 'MRK', 'LUK', 'JHN', 'ACT', 'ROM', 'CO1', 'CO2', 'GAL',
         'TH1', 'TH2', 'TI1', 'TI2', 'TIT', 'PHM', 'HEB', 'JAM', 'PE1', 'PE2', 'JN1', 'JN2', 'JN3', 'JDE', 'REV' )
 assert len(NT27_BOOKLIST) == 27
 
+# NOTE: We can't pickle sqlite3.Cursor objects so can not use multiprocessing for these types of Bibles
+NON_MULTIPROCESSING_BIBLE_TYPES = ( 'CrosswireSword', 'e-Sword-Bible', 'e-Sword-Commentary', 'MyBible', )
+
 
 def exp( messageString ):
     """
@@ -100,6 +104,169 @@ def exp( messageString ):
 # end of exp
 
 
+FIND_TEXT_OPTIONS = ( 'parentApp', 'parentWindow', 'parentBox', 'givenBible', 'workName',
+                'findText', 'findHistoryList', 'wordMode', 'caselessFlag', 'ignoreDiacriticsFlag',
+                'includeIntroFlag', 'includeMainTextFlag', 'includeMarkerTextFlag', 'includeExtrasFlag',
+                'contextLength', 'bookList', 'chapterList', 'markerList', 'regexFlag',
+                'cacheFoldedTextFlag', 'currentBCV', )
+
+def prepareFindTextOptions( optionsDict, workName ):
+    """
+    Check the findText options in optionsDict
+        (adding defaults for any missing ones as well as updating the 'findHistoryList')
+        and prepare the search text.
+
+    Used by InternalBible.findText and also by BibleSearchDatabase.
+
+    Returns a 3-tuple: the (folded and/or lowercased) text to find,
+        the compiled regex (or None), and a list of standard markers (or an empty list).
+    """
+    for someKey in optionsDict:
+        if someKey not in FIND_TEXT_OPTIONS:
+            print( "findText warning: unexpected {!r} option = {!r}".format( someKey, optionsDict[someKey] ) )
+            if debuggingThisModule: halt
+
+    # Go through all the given options
+    if 'workName' not in optionsDict: optionsDict['workName'] = workName
+    if 'findHistoryList' not in optionsDict: optionsDict['findHistoryList'] = [] # Oldest first
+    if 'wordMode' not in optionsDict: optionsDict['wordMode'] = 'Any' # or 'Whole' or 'EndsWord' or 'Begins' or 'EndsLine'
+    if 'caselessFlag' not in optionsDict: optionsDict['caselessFlag'] = True
+    if 'ignoreDiacriticsFlag' not in optionsDict: optionsDict['ignoreDiacriticsFlag'] = False
+    if 'includeIntroFlag' not in optionsDict: optionsDict['includeIntroFlag'] = True
+    if 'includeMainTextFlag' not in optionsDict: optionsDict['includeMainTextFlag'] = True
+    if 'includeMarkerTextFlag' not in optionsDict: optionsDict['includeMarkerTextFlag'] = False
+    if 'includeExtrasFlag' not in optionsDict: optionsDict['includeExtrasFlag'] = False
+    if 'contextLength' not in optionsDict: optionsDict['contextLength'] = 30 # each side
+    if 'bookList' not in optionsDict: optionsDict['bookList'] = 'ALL' # or BBB or a list
+    if 'chapterList' not in optionsDict: optionsDict['chapterList'] = None
+    if 'markerList' not in optionsDict: optionsDict['markerList'] = None
+    if 'cacheFoldedTextFlag' not in optionsDict: optionsDict['cacheFoldedTextFlag'] = True
+    optionsDict['regexFlag'] = False
+
+    if BibleOrgSysGlobals.debugFlag:
+        if optionsDict['chapterList']: assert optionsDict['bookList'] is None or len(optionsDict['bookList']) == 1 \
+                            or optionsDict['chapterList'] == [0] # Only combinations that make sense
+        assert '\r' not in optionsDict['findText'] and '\n' not in optionsDict['findText']
+        assert optionsDict['wordMode'] in ( 'Any', 'Whole', 'Begins', 'EndsWord', 'EndsLine', )
+        if optionsDict['wordMode'] != 'Any': assert ' ' not in optionsDict['findText']
+        if optionsDict['markerList']:
+            assert isinstance( markerList, list )
+            assert not optionsDict['includeIntroFlag']
+            assert not optionsDict['includeMainTextFlag']
+            assert not optionsDict['includeMarkerTextFlag']
+            assert not optionsDict['includeExtrasFlag']
+
+    ourMarkerList = []
+    if optionsDict['markerList']:
+        for marker in optionsDict['markerList']:
+            ourMarkerList.append( BibleOrgSysGlobals.USFMMarkers.toStandardMarker( marker ) )
+
+    ourFindText = optionsDict['findText']
+    # Save the search history (with the 'regex:' text still prefixed if applicable)
+    try: optionsDict['findHistoryList'].remove( ourFindText )
+    except ValueError: pass
+    optionsDict['findHistoryList'].append( ourFindText ) # Make sure it goes on the end
+
+    compiledFindText = None
+    if ourFindText.lower().startswith( 'regex:' ):
+        optionsDict['regexFlag'] = True
+        ourFindText = ourFindText[6:]
+        compiledFindText = re.compile( ourFindText )
+    if optionsDict['ignoreDiacriticsFlag']: ourFindText = BibleOrgSysGlobals.removeAccents( ourFindText )
+    if optionsDict['caselessFlag']: ourFindText = ourFindText.lower()
+    if BibleOrgSysGlobals.debugFlag: assert ourFindText
+    return ourFindText, compiledFindText, ourMarkerList
+# end of prepareFindTextOptions
+
+
+def findTextInLine( optionsDict, ourFindText, compiledFindText, textToBeSearched, origTextToBeSearched, BBB, C, V, originalMarker ):
+    """
+    Find all the occurrences of the prepared search text (see prepareFindTextOptions above)
+        in one line (textToBeSearched is already folded and/or lowercased as required).
+
+    Used by InternalBible.findText and also by BibleSearchDatabase.
+
+    Returns a list of findText result tuples (see InternalBible.findText).
+    """
+    searchLen = len( ourFindText )
+    resultList = []
+    textLen = len( textToBeSearched )
+
+    if optionsDict['regexFlag']: # ignores wordMode flag
+        for match in compiledFindText.finditer( textToBeSearched ):
+            ix, ixAfter = match.span()
+
+            if optionsDict['contextLength']: # Find the context in the original (fully-cased) string
+                contextBefore = origTextToBeSearched[max(0,ix-optionsDict['contextLength']):ix]
+                contextAfter = origTextToBeSearched[ixAfter:ixAfter+optionsDict['contextLength']]
+            else: contextBefore = contextAfter = None
+
+            ixHyphen = V.find( '-' )
+            if ixHyphen != -1: V = V[:ixHyphen] # Remove verse bridges
+            resultTuple = (SimpleVerseKey(BBB, C, V, ix), originalMarker, contextBefore,
+                                                origTextToBeSearched[ix:ixAfter], contextAfter, ) \
+                        if optionsDict['caselessFlag'] else \
+                            (SimpleVerseKey(BBB, C, V, ix), originalMarker, contextBefore, contextAfter, )
+            resultList.append( resultTuple )
+    else: # not regExp
+        ix = -1
+        while True:
+            ix = textToBeSearched.find( ourFindText, ix+1 )
+            if ix == -1: break
+            ixAfter = ix + searchLen
+            if optionsDict['wordMode'] == 'Whole':
+                #print( "BF", repr(textToBeSearched[ix-1]) )
+                #print( "AF", repr(textToBeSearched[ixAfter]) )
+                if ix>0 and textToBeSearched[ix-1].isalpha(): continue
+                if ixAfter<textLen and textToBeSearched[ixAfter].isalpha(): continue
+            elif optionsDict['wordMode'] == 'Begins':
+                if ix>0 and textToBeSearched[ix-1].isalpha(): continue
+            elif optionsDict['wordMode'] == 'EndsWord':
+                if ixAfter<textLen and textToBeSearched[ixAfter].isalpha(): continue
+            elif optionsDict['wordMode'] == 'EndsLine':
+                if ixAfter<textLen: continue
+
+            if optionsDict['contextLength']: # Find the context in the original (fully-cased) string
+                contextBefore = origTextToBeSearched[max(0,ix-optionsDict['contextLength']):ix]
+                contextAfter = origTextToBeSearched[ixAfter:ixAfter+optionsDict['contextLength']]
+            else: contextBefore = contextAfter = None
+
+            ixHyphen = V.find( '-' )
+            if ixHyphen != -1: V = V[:ixHyphen] # Remove verse bridges
+            #adjMarker = None if marker=='v~' else marker # most markers are v~ -- ignore them (for space)
+            resultTuple = (SimpleVerseKey(BBB, C, V, ix), originalMarker, contextBefore,
+                                                origTextToBeSearched[ix:ixAfter], contextAfter, ) \
+                        if optionsDict['caselessFlag'] else \
+                            (SimpleVerseKey(BBB, C, V, ix), originalMarker, contextBefore, contextAfter, )
+            resultList.append( resultTuple )
+    return resultList
+# end of findTextInLine
+
+
+checkingBible = checkingNames = None # Only set in the worker processes used by InternalBible.check
+
+def _initialiseCheckWorker( givenBible, givenCheckNames ):
+    """
+    Runs once at the start of each InternalBible.check worker process
+        so that the Bible (and the typical added unit data) aren't sent with every book.
+    """
+    global checkingBible, checkingNames
+    checkingBible, checkingNames = givenBible, givenCheckNames
+    getTypicalAddedUnitData() # Load it once for this process
+# end of _initialiseCheckWorker
+
+def _checkBookMP( BBB ):
+    """
+    Runs the book checks in a worker process
+        and returns just the book's error dictionary.
+    """
+    bookObject = checkingBible.books[BBB]
+    bookObject.check( checkingBible.discoveryResults['ALL'], getTypicalAddedUnitData(), checkingNames )
+    return bookObject.errorDictionary
+# end of _checkBookMP
+
+
+
 InternalBibleProperties = {} # Used for diagnostic reasons
 
 class InternalBible:
@@ -134,6 +301,7 @@ class InternalBible:
         self.preloadDone = self.loadedAllBooks = False
         self.triedLoadingBook, self.bookNeedsReloading = {}, {} # Dictionaries with BBB as key
         self.divisions = OrderedDict()
+        self.verseFingerprints = None # Used by getVerseFingerprints (and saved by createPickledBible)
         self.errorDictionary = OrderedDict()
         self.errorDictionary['Priority Errors'] = [] # Put this one first in the ordered dictionary
     # end of InternalBible.__init__
@@ -895,6 +1063,7 @@ class InternalBible:
                 logging.critical( exp("stashBook: stashing already stashed {} book!").format( BBB ) )
         self.books[BBB] = bookData
         self.availableBBBs.add( BBB )
+        if self.verseFingerprints is not None: self.verseFingerprints.removeBook( BBB ) # Now out of date
 
         # Make up our book name dictionaries while we're at it
         assumedBookNames = bookData.getAssumedBookNames()
@@ -1158,7 +1327,7 @@ class InternalBible:
 
         if BibleOrgSysGlobals.verbosityLevel > 2: print( exp("Running discover on {}…").format( self.name ) )
         # NOTE: We can't pickle sqlite3.Cursor objects so can not use multiprocessing here for e-Sword Bibles or commentaries
-        if self.objectTypeString not in ('CrosswireSword','e-Sword-Bible','e-Sword-Commentary','MyBible') \
+        if self.objectTypeString not in NON_MULTIPROCESSING_BIBLE_TYPES \
         and BibleOrgSysGlobals.maxProcesses > 1 \
         and not BibleOrgSysGlobals.alreadyMultiprocessing: # Check all the books as quickly as possible
             if BibleOrgSysGlobals.verbosityLevel > 1:
@@ -1374,7 +1543,7 @@ class InternalBible:
     # end of InternalBible.__aggregateDiscoveryResults
 
 
-    def check( self, givenBookList=None ):
+    def check( self, givenBookList=None, parallelFlag=None, checkNames=None ):
         """
         Runs self.discover() first if necessary.
 
@@ -1383,32 +1552,47 @@ class InternalBible:
 
         If a book list is given, only checks those books.
 
+        If a list of checkNames is given, only does those checks
+            (from InternalBibleBook.INTERNAL_BIBLE_BOOK_CHECKS) on each book.
+
+        If parallelFlag is None, the books are checked in separate processes
+            if BibleOrgSysGlobals.maxProcesses allows it (and this type of Bible can be pickled).
+            Only the error dictionary of each book is sent back
+                and they're put back in book order so the results are the same as for a single process.
+
         getErrors() must be called to request the results.
         """
-        # Get our recommendations for added units -- only load this once per Bible
         if BibleOrgSysGlobals.verbosityLevel > 1:
             if givenBookList is None: print( exp("Checking {} Bible…").format( self.name ) )
             else: print( exp("Checking {} Bible books {}…").format( self.name, givenBookList ) )
         if 'discoveryResults' not in dir(self): self.discover()
 
-        import pickle
-        pickleFolder = os.path.join( os.path.dirname(__file__), "DataFiles/", "ScrapedFiles/" ) # Relative to module, not cwd
-        pickleFilepath = os.path.join( pickleFolder, "AddedUnitData.pickle" )
-        if BibleOrgSysGlobals.verbosityLevel > 3: print( exp("Importing from {}…").format( pickleFilepath ) )
-        try:
-            with open( pickleFilepath, 'rb' ) as pickleFile:
-                typicalAddedUnitData = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
-        except FileNotFoundError:
-                logging.error( "InternalBible.check: Unable to find file for typical added units checks: {}".format( pickleFilepath ) )
-                typicalAddedUnitData = None
-
         if BibleOrgSysGlobals.debugFlag: assert self.discoveryResults
         if BibleOrgSysGlobals.verbosityLevel > 2: print( exp("Running checks on {}…").format( self.name ) )
         if givenBookList is None:
             givenBookList = self.books # this is an OrderedDict
-        for BBB in givenBookList: # Do individual book checks
-            if BibleOrgSysGlobals.verbosityLevel > 2: print( "  " + exp("Checking {}…").format( BBB ) )
-            self.books[BBB].check( self.discoveryResults['ALL'], typicalAddedUnitData )
+        BBBList = [BBB for BBB in givenBookList]
+        if parallelFlag is None:
+            parallelFlag = self.objectTypeString not in NON_MULTIPROCESSING_BIBLE_TYPES \
+                            and BibleOrgSysGlobals.maxProcesses > 1 and len(BBBList) > 1
+        if parallelFlag and not BibleOrgSysGlobals.alreadyMultiprocessing: # Check all the books as quickly as possible
+            numProcesses = min( BibleOrgSysGlobals.maxProcesses, len(BBBList) )
+            if BibleOrgSysGlobals.verbosityLevel > 1:
+                print( exp("Checking {} books using {} processes…").format( len(BBBList), numProcesses ) )
+                print( "  NOTE: Outputs (including error and warning messages) from checking various books may be interspersed." )
+            BibleOrgSysGlobals.alreadyMultiprocessing = True
+            try:
+                with multiprocessing.Pool( processes=numProcesses, initializer=_initialiseCheckWorker, initargs=(self,checkNames) ) as pool: # start worker processes
+                    results = pool.map( _checkBookMP, BBBList ) # have the pool do our checks
+                assert len(results) == len(BBBList)
+                for BBB,errorDictionary in zip( BBBList, results ): # Saves them in the correct order
+                    self.books[BBB].errorDictionary = errorDictionary
+            finally: BibleOrgSysGlobals.alreadyMultiprocessing = False
+        else: # Just single threaded
+            typicalAddedUnitData = getTypicalAddedUnitData() # Only loaded once per process
+            for BBB in BBBList: # Do individual book checks
+                if BibleOrgSysGlobals.verbosityLevel > 2: print( "  " + exp("Checking {}…").format( BBB ) )
+                self.books[BBB].check( self.discoveryResults['ALL'], typicalAddedUnitData, checkNames )
 
         # Do overall Bible checks here
         # xxxxxxxxxxxxxxxxx …
@@ -2160,6 +2344,40 @@ class InternalBible:
     # end of InternalBible.getVerseDataList
 
 
+    def getVerseDataForReferences( self, BCVReferences, contextFlag=False ):
+        """
+        Given a list of Bible references (SimpleVerseKeys or (B,C,V,S) tuples),
+            return a list (in the same order) of verseData (InternalBibleEntryList -- a specialised list)
+            (or (verseData,context) 2-tuples if contextFlag is set).
+
+        This is much faster than calling getVerseDataList for each reference
+            because the references are grouped by book
+            and each book is only loaded (if necessary) and searched once.
+
+        Unlike getVerseDataList, None is returned (in the list)
+            for references that aren't found (rather than raising a KeyError).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "InternalBible.getVerseDataForReferences( {} references, {} ) for {}".format( len(BCVReferences), contextFlag, self.name ) )
+
+        referencesByBook = OrderedDict()
+        for n,BCVReference in enumerate( BCVReferences ):
+            if isinstance( BCVReference, tuple ): BBB, CV = BCVReference[0], (BCVReference[1],BCVReference[2],)
+            else: BBB, CV = BCVReference.getBBB(), BCVReference.getCV() # Assume it's a SimpleVerseKey object
+            if BBB not in referencesByBook: referencesByBook[BBB] = []
+            referencesByBook[BBB].append( (n,CV) )
+
+        results = [None] * len(BCVReferences)
+        for BBB,bookReferences in referencesByBook.items():
+            self.loadBookIfNecessary( BBB )
+            if BBB not in self.books: continue # Leave the results as None
+            bookResults = self.books[BBB].getVerseDataForCVs( [CV for n,CV in bookReferences], contextFlag )
+            for (n,CV),result in zip( bookReferences, bookResults ):
+                results[n] = result
+        return results
+    # end of InternalBible.getVerseDataForReferences
+
+
     def getVerseText( self, BCVReference, fullTextFlag=False ):
         """
         First miserable attempt at converting (USFM-like) verseData into a string.
@@ -2207,6 +2425,28 @@ class InternalBible:
     # end of InternalBible.getVerseText
 
 
+    def getVerseFingerprints( self ):
+        """
+        Returns a VerseFingerprints table for the verse text in all of the loaded books
+            (see BibleFingerprints.py).
+
+        The table is cached (and only books loaded since last time are added),
+            and it's also saved with a PickledBible
+            so that it's available there without loading any books.
+        """
+        verseFingerprints = getattr( self, 'verseFingerprints', None ) # Could be missing from an older pickled Bible
+        if verseFingerprints is None or verseFingerprints.fingerprintVersion != VERSE_FINGERPRINT_VERSION:
+            verseFingerprints = VerseFingerprints( self.getAName( abbrevFirst=True ) )
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("InternalBible.getVerseFingerprints() for {} with {}/{} books done").format( self.getAName(), len(verseFingerprints.books), len(self.books) ) )
+        for BBB,bookObject in self.books.items():
+            if BBB not in verseFingerprints.books: # e.g., (re)loaded since last time
+                verseFingerprints.addBook( BBB, *bookObject.getVerseFingerprints() )
+        self.verseFingerprints = verseFingerprints
+        return verseFingerprints
+    # end of InternalBible.getVerseFingerprints
+
+
     def findText( self, optionsDict ):
         """
         Search the internal Bible for the given text which is contained in a dictionary of options.
@@ -2228,70 +2468,16 @@ class InternalBible:
             SimpleVerseKey, marker (none if v~), contextBefore, foundWordForm, contextAfter
 
         NOTE: ignoreDiacriticsFlag uses BibleOrgSysGlobals.removeAccents() which might not be general enough for all languages.
+
+        If cacheFoldedTextFlag is set (the default), the diacritic-folded and/or lowercased text of each book
+            is cached in the book object (see InternalBibleBook.getFoldedTextList) for faster repeated searches.
         """
         if BibleOrgSysGlobals.debugFlag:
             if debuggingThisModule:
                 print( exp("findText( {} )").format( optionsDict ) )
                 assert 'findText' in optionsDict
 
-        optionsList = ( 'parentApp', 'parentWindow', 'parentBox', 'givenBible', 'workName',
-                'findText', 'findHistoryList', 'wordMode', 'caselessFlag', 'ignoreDiacriticsFlag',
-                'includeIntroFlag', 'includeMainTextFlag', 'includeMarkerTextFlag', 'includeExtrasFlag',
-                'contextLength', 'bookList', 'chapterList', 'markerList', 'regexFlag',
-                'currentBCV', )
-        for someKey in optionsDict:
-            if someKey not in optionsList:
-                print( "findText warning: unexpected {!r} option = {!r}".format( someKey, optionsDict[someKey] ) )
-                if debuggingThisModule: halt
-
-        # Go through all the given options
-        if 'workName' not in optionsDict: optionsDict['workName'] = self.getAName( abbrevFirst=True )
-        if 'findHistoryList' not in optionsDict: optionsDict['findHistoryList'] = [] # Oldest first
-        if 'wordMode' not in optionsDict: optionsDict['wordMode'] = 'Any' # or 'Whole' or 'EndsWord' or 'Begins' or 'EndsLine'
-        if 'caselessFlag' not in optionsDict: optionsDict['caselessFlag'] = True
-        if 'ignoreDiacriticsFlag' not in optionsDict: optionsDict['ignoreDiacriticsFlag'] = False
-        if 'includeIntroFlag' not in optionsDict: optionsDict['includeIntroFlag'] = True
-        if 'includeMainTextFlag' not in optionsDict: optionsDict['includeMainTextFlag'] = True
-        if 'includeMarkerTextFlag' not in optionsDict: optionsDict['includeMarkerTextFlag'] = False
-        if 'includeExtrasFlag' not in optionsDict: optionsDict['includeExtrasFlag'] = False
-        if 'contextLength' not in optionsDict: optionsDict['contextLength'] = 30 # each side
-        if 'bookList' not in optionsDict: optionsDict['bookList'] = 'ALL' # or BBB or a list
-        if 'chapterList' not in optionsDict: optionsDict['chapterList'] = None
-        if 'markerList' not in optionsDict: optionsDict['markerList'] = None
-        optionsDict['regexFlag'] = False
-
-        if BibleOrgSysGlobals.debugFlag:
-            if optionsDict['chapterList']: assert optionsDict['bookList'] is None or len(optionsDict['bookList']) == 1 \
-                                or optionsDict['chapterList'] == [0] # Only combinations that make sense
-            assert '\r' not in optionsDict['findText'] and '\n' not in optionsDict['findText']
-            assert optionsDict['wordMode'] in ( 'Any', 'Whole', 'Begins', 'EndsWord', 'EndsLine', )
-            if optionsDict['wordMode'] != 'Any': assert ' ' not in optionsDict['findText']
-            if optionsDict['markerList']:
-                assert isinstance( markerList, list )
-                assert not optionsDict['includeIntroFlag']
-                assert not optionsDict['includeMainTextFlag']
-                assert not optionsDict['includeMarkerTextFlag']
-                assert not optionsDict['includeExtrasFlag']
-
-        ourMarkerList = []
-        if optionsDict['markerList']:
-            for marker in optionsDict['markerList']:
-                ourMarkerList.append( BibleOrgSysGlobals.USFMMarkers.toStandardMarker( marker ) )
-
-        ourFindText = optionsDict['findText']
-        # Save the search history (with the 'regex:' text still prefixed if applicable)
-        try: optionsDict['findHistoryList'].remove( ourFindText )
-        except ValueError: pass
-        optionsDict['findHistoryList'].append( ourFindText ) # Make sure it goes on the end
-
-        if ourFindText.lower().startswith( 'regex:' ):
-            optionsDict['regexFlag'] = True
-            ourFindText = ourFindText[6:]
-            compiledFindText = re.compile( ourFindText )
-        if optionsDict['ignoreDiacriticsFlag']: ourFindText = BibleOrgSysGlobals.removeAccents( ourFindText )
-        if optionsDict['caselessFlag']: ourFindText = ourFindText.lower()
-        searchLen = len( ourFindText )
-        if BibleOrgSysGlobals.debugFlag: assert searchLen
+        ourFindText, compiledFindText, ourMarkerList = prepareFindTextOptions( optionsDict, self.getAName( abbrevFirst=True ) )
         #print( "  Searching for {!r} in {} loaded books".format( ourFindText, len(self) ) )
 
         # Now do the actual search
@@ -2305,7 +2491,13 @@ class InternalBible:
                 resultSummaryDict['searchedBookList'].append( BBB )
                 C, V = '-1', '-1' # So first/id line starts at -1:0
                 marker = None
-                for lineEntry in bookObject:
+                foldedTextList = bookObject.getFoldedTextList( optionsDict['includeExtrasFlag'],
+                                    optionsDict['ignoreDiacriticsFlag'], optionsDict['caselessFlag'] ) \
+                                if optionsDict['cacheFoldedTextFlag'] \
+                                and (optionsDict['ignoreDiacriticsFlag'] or optionsDict['caselessFlag']) \
+                                and not optionsDict['includeMarkerTextFlag'] \
+                                else None
+                for lineIndex,lineEntry in enumerate( bookObject ):
                     if marker in BibleOrgSysGlobals.USFMParagraphMarkers:
                         lastParagraphMarker = marker
 
@@ -2329,10 +2521,12 @@ class InternalBible:
 
                         # Get our text to search
                         origTextToBeSearched = lineEntry.getFullText() if optionsDict['includeExtrasFlag'] else cleanText
+                        textAdjustedFlag = False
                         if C != '0' and not optionsDict['includeMainTextFlag']:
                             #print( "Got {!r} but  don't include main text".format( origTextToBeSearched ) )
                             if marker in ('v~','p~') or marker in BibleOrgSysGlobals.USFMParagraphMarkers:
                                 origTextToBeSearched = ''
+                                textAdjustedFlag = True
                                 if origTextToBeSearched != cleanText: # we must have extras -- we need to remove the main text
                                     #print( "  Got extras" )
                                     assert optionsDict['includeExtrasFlag']
@@ -2348,60 +2542,17 @@ class InternalBible:
                         if optionsDict['includeMarkerTextFlag']:
                             origTextToBeSearched = '\\{} {}'.format( marker, origTextToBeSearched )
                         if not origTextToBeSearched: continue
-                        textToBeSearched = origTextToBeSearched
-                        if optionsDict['ignoreDiacriticsFlag']: textToBeSearched = BibleOrgSysGlobals.removeAccents( textToBeSearched )
-                        if optionsDict['caselessFlag']: textToBeSearched = textToBeSearched.lower()
-                        textLen = len( textToBeSearched )
-
-                        if optionsDict['regexFlag']: # ignores wordMode flag
-                            for match in compiledFindText.finditer( textToBeSearched ):
-                                ix, ixAfter = match.span()
-
-                                if optionsDict['contextLength']: # Find the context in the original (fully-cased) string
-                                    contextBefore = origTextToBeSearched[max(0,ix-optionsDict['contextLength']):ix]
-                                    contextAfter = origTextToBeSearched[ixAfter:ixAfter+optionsDict['contextLength']]
-                                else: contextBefore = contextAfter = None
-
-                                ixHyphen = V.find( '-' )
-                                if ixHyphen != -1: V = V[:ixHyphen] # Remove verse bridges
-                                resultTuple = (SimpleVerseKey(BBB, C, V, ix), lineEntry.getOriginalMarker(), contextBefore,
-                                                                    origTextToBeSearched[ix:ixAfter], contextAfter, ) \
-                                            if optionsDict['caselessFlag'] else \
-                                                (SimpleVerseKey(BBB, C, V, ix), lineEntry.getOriginalMarker(), contextBefore, contextAfter, )
-                                resultList.append( resultTuple )
-                                if BBB not in resultSummaryDict['foundBookList']: resultSummaryDict['foundBookList'].append( BBB )
-                        else: # not regExp
-                            ix = -1
-                            while True:
-                                ix = textToBeSearched.find( ourFindText, ix+1 )
-                                if ix == -1: break
-                                ixAfter = ix + searchLen
-                                if optionsDict['wordMode'] == 'Whole':
-                                    #print( "BF", repr(textToBeSearched[ix-1]) )
-                                    #print( "AF", repr(textToBeSearched[ixAfter]) )
-                                    if ix>0 and textToBeSearched[ix-1].isalpha(): continue
-                                    if ixAfter<textLen and textToBeSearched[ixAfter].isalpha(): continue
-                                elif optionsDict['wordMode'] == 'Begins':
-                                    if ix>0 and textToBeSearched[ix-1].isalpha(): continue
-                                elif optionsDict['wordMode'] == 'EndsWord':
-                                    if ixAfter<textLen and textToBeSearched[ixAfter].isalpha(): continue
-                                elif optionsDict['wordMode'] == 'EndsLine':
-                                    if ixAfter<textLen: continue
-
-                                if optionsDict['contextLength']: # Find the context in the original (fully-cased) string
-                                    contextBefore = origTextToBeSearched[max(0,ix-optionsDict['contextLength']):ix]
-                                    contextAfter = origTextToBeSearched[ixAfter:ixAfter+optionsDict['contextLength']]
-                                else: contextBefore = contextAfter = None
-
-                                ixHyphen = V.find( '-' )
-                                if ixHyphen != -1: V = V[:ixHyphen] # Remove verse bridges
-                                #adjMarker = None if marker=='v~' else marker # most markers are v~ -- ignore them (for space)
-                                resultTuple = (SimpleVerseKey(BBB, C, V, ix), lineEntry.getOriginalMarker(), contextBefore,
-                                                                    origTextToBeSearched[ix:ixAfter], contextAfter, ) \
-                                            if optionsDict['caselessFlag'] else \
-                                                (SimpleVerseKey(BBB, C, V, ix), lineEntry.getOriginalMarker(), contextBefore, contextAfter, )
-                                resultList.append( resultTuple )
-                                if BBB not in resultSummaryDict['foundBookList']: resultSummaryDict['foundBookList'].append( BBB )
+                        if foldedTextList is not None and not textAdjustedFlag:
+                            textToBeSearched = foldedTextList[lineIndex] # Already folded (and cached)
+                        else:
+                            textToBeSearched = origTextToBeSearched
+                            if optionsDict['ignoreDiacriticsFlag']: textToBeSearched = BibleOrgSysGlobals.removeAccents( textToBeSearched )
+                            if optionsDict['caselessFlag']: textToBeSearched = textToBeSearched.lower()
+                        lineResultList = findTextInLine( optionsDict, ourFindText, compiledFindText,
+                                    textToBeSearched, origTextToBeSearched, BBB, C, V, lineEntry.getOriginalMarker() )
+                        if lineResultList:
+                            resultList.extend( lineResultList )
+                            if BBB not in resultSummaryDict['foundBookList']: resultSummaryDict['foundBookList'].append( BBB )
 
         #print( exp("findText: returning {}").format( resultList ) )
         return optionsDict, resultSummaryDict, resultList
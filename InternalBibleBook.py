@@ -50,10 +50,10 @@ To use the InternalBibleBook class,
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-03-01' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "InternalBibleBook"
 ProgName = "Internal Bible book handler"
-ProgVersion = '0.97'
+ProgVersion = '1.07'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -63,9 +63,18 @@ debuggingThisModule = False
 MAX_NONCRITICAL_ERRORS_PER_BOOK_NORMAL = 3
 MAX_NONCRITICAL_ERRORS_PER_BOOK_VERBOSE = 5
 
+# These caches are rebuilt as required so aren't saved when a book is pickled (see InternalBibleBook.__getstate__)
+UNPICKLED_CACHE_ATTRIBUTES = ( '_foldedTextCache', '_wordTokenCache', )
+MAX_WORD_TOKEN_CACHE_ENTRIES = 10000 # per book (then the cache is emptied and starts again)
+
+# These are the checks (in order) that can be done in a single pass by InternalBibleBook.runChecks
+INTERNAL_BIBLE_BOOK_CHECKS = ( 'SFMs', 'Characters', 'SpeechMarks', 'Words', 'Headings', 'Introduction', 'Notes', )
+
 
 import os, logging
+import re
 from collections import OrderedDict
+from array import array
 import unicodedata
 
 import BibleOrgSysGlobals
@@ -77,6 +86,7 @@ from InternalBibleInternals import BOS_ADDED_CONTENT_MARKERS, BOS_ADDED_NESTING_
     InternalBibleExtra, InternalBibleExtraList, \
     parseWordAttributes, parseFigureAttributes
 from BibleReferences import BibleAnchorReference
+from BibleFingerprints import VERSE_TEXT_MARKERS, normalizeVerseText, makeVerseFingerprint
 
 
 
@@ -124,6 +134,126 @@ def hasClosingPunctuation( text ):
 # end of hasClosingPunctuation
 
 
+typicalAddedUnitData, triedLoadingTypicalAddedUnitData = None, False # Only loaded once per process
+
+def getTypicalAddedUnitData():
+    """
+    Returns our recommendations for added units (from the scraped pickle file),
+        only loading them the first time that this is called in each process.
+
+    Returns None (after logging an error) if the file can't be found.
+    """
+    global typicalAddedUnitData, triedLoadingTypicalAddedUnitData
+    if not triedLoadingTypicalAddedUnitData:
+        import pickle
+        pickleFolder = os.path.join( os.path.dirname(__file__), "DataFiles/", "ScrapedFiles/" ) # Relative to module, not cwd
+        pickleFilepath = os.path.join( pickleFolder, "AddedUnitData.pickle" )
+        if BibleOrgSysGlobals.verbosityLevel > 3: print( exp("Importing from {}…").format( pickleFilepath ) )
+        try:
+            with open( pickleFilepath, 'rb' ) as pickleFile:
+                typicalAddedUnitData = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
+        except FileNotFoundError:
+            logging.error( ErrorRecord( '', "getTypicalAddedUnitData: Unable to find file for typical added units checks: {}", pickleFilepath ) )
+        triedLoadingTypicalAddedUnitData = True
+    return typicalAddedUnitData
+# end of getTypicalAddedUnitData
+
+
+# Used by processLineFix to find the first of each type of note (or other field that gets moved out to the extras)
+#   in a single pass through the line (lower and UPPER case markers are kept separate)
+NOTE_START_REGEX = re.compile( r'\\(f|fe|x|fig|str|sem|ww|vp|F|FE|X|FIG|STR|SEM|WW|VP) ' )
+CHARACTER_MARKER_START_REGEX = re.compile( r'\\([^\\ ]+) ' ) # Finds the possible character markers in a line
+noteCleaningRegex = characterMarkerRemovalList = None # Made by makeLineFixTables the first time that they're needed
+
+def getNoteStartIndexes( text ):
+    """
+    Returns a dictionary with the index of the first start marker (with the following space) of each type of note
+        e.g., { 'f':12, 'x':45, 'F':83 } (no entries for the ones that weren't found).
+    """
+    noteStartIndexes = {}
+    for match in NOTE_START_REGEX.finditer( text ):
+        if match.group(1) not in noteStartIndexes: noteStartIndexes[match.group(1)] = match.start()
+    return noteStartIndexes
+# end of getNoteStartIndexes
+
+
+def makeLineFixTables():
+    """
+    Make the tables used by processLineFix (once USFMMarkers are loaded).
+
+    noteCleaningRegex matches all of the markers to be removed from notes
+        (in the same order as the old list so that the results are the same as repeated replaces).
+    characterMarkerRemovalList is a list of 4-tuples (markerName, openMarker, closeMarker, shouldBeClosed)
+        in the same order as USFMMarkers.getCharacterMarkersList() (with numbered markers first).
+    """
+    global noteCleaningRegex, characterMarkerRemovalList
+    noteCleaningRegex = re.compile( '|'.join( re.escape( marker ) for marker in
+                            ['\\xo*','\\xo ', '\\xt*','\\xt ', '\\xk*','\\xk ', '\\xq*','\\xq ',
+                            '\\xot*','\\xot ', '\\xnt*','\\xnt ', '\\xdc*','\\xdc ',
+                            '\\fr*','\\fr ','\\ft*','\\ft ','\\fqa*','\\fqa ','\\fq*','\\fq ',
+                            '\\fv*','\\fv ','\\fk*','\\fk ','\\fl*','\\fl ','\\fdc*','\\fdc ',] \
+                                + BibleOrgSysGlobals.internal_SFMs_to_remove ) )
+    characterMarkerRemovalList = []
+    for possibleCharacterMarker in BibleOrgSysGlobals.USFMMarkers.getCharacterMarkersList():
+        closeMarker = '\\'+possibleCharacterMarker+'*'
+        shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( possibleCharacterMarker )
+        if BibleOrgSysGlobals.USFMMarkers.isNumberableMarker( possibleCharacterMarker ):
+            for d in ('1','2','3','4','5'):
+                characterMarkerRemovalList.append( (possibleCharacterMarker+d, '\\'+possibleCharacterMarker+d+' ', closeMarker, shouldBeClosed) )
+        characterMarkerRemovalList.append( (possibleCharacterMarker, '\\'+possibleCharacterMarker+' ', closeMarker, shouldBeClosed) )
+# end of makeLineFixTables
+
+
+
+class ErrorRecord:
+    """
+    A compact record of a single error message
+        which is only formatted into a string when it's actually needed
+        (by formatErrorRecords below, called from InternalBibleBook.getErrors).
+
+    The prefix is usually the (shared) lineLocationSpace string, e.g., 'GEN 1:1 ',
+        and the template is the (already translated) format string for the args.
+
+    It's also passed as the message to the logging calls in this module,
+        because logging only calls str() on it if the message is actually going to be emitted.
+    """
+    __slots__ = ( 'prefix', 'template', 'args', )
+
+    def __init__( self, prefix, template, *args ):
+        self.prefix, self.template = prefix, template
+        self.args = tuple( arg.copy() if isinstance( arg, (list,dict,set) ) else arg for arg in args ) # In case they get changed later
+
+    def __str__( self ):
+        return self.prefix + (self.template.format( *self.args ) if self.args else self.template)
+
+    def __repr__( self ): return 'ErrorRecord({!r})'.format( str(self) )
+
+    def __eq__( self, other ):
+        if isinstance( other, ErrorRecord ):
+            return self.prefix==other.prefix and self.template==other.template and self.args==other.args
+        return str(self) == other
+    def __ne__( self, other ): return not self.__eq__( other )
+    def __hash__( self ): return hash( str(self) )
+# end of ErrorRecord class
+
+
+def formatErrorRecords( errorDictionary ):
+    """
+    Go through the (nested) error dictionary
+        and replace any ErrorRecords (including in priority error tuples) with formatted strings.
+
+    The lists are updated in place.
+    """
+    for value in errorDictionary.values():
+        if isinstance( value, dict ): formatErrorRecords( value )
+        elif isinstance( value, list ):
+            for j,item in enumerate( value ):
+                if isinstance( item, ErrorRecord ): value[j] = str( item )
+                elif isinstance( item, tuple ) and len(item)==3 and isinstance( item[1], ErrorRecord ): # priority error
+                    value[j] = (item[0], str(item[1]), item[2])
+# end of formatErrorRecords
+
+
 
 class InternalBibleBook:
     """
@@ -142,7 +272,7 @@ class InternalBibleBook:
         """
         #print( "InternalBibleBook.__init__( {} )".format( BBB ) )
         if isinstance( parameter1, str ):
-            logging.warning( "InternalBibleBook.constructor( {!r}, {} ): Not passed a containing Bible object".format( parameter1, BBB ) )
+            logging.warning( ErrorRecord( '', "InternalBibleBook.constructor( {!r}, {} ): Not passed a containing Bible object", parameter1, BBB ) )
             self.containerBibleObject = None
             self.workName = parameter1
         else:
@@ -155,6 +285,9 @@ class InternalBibleBook:
 
         self._rawLines = [] # Contains 2-tuples (marker,text) which contain the actual Bible text -- see addLine below
         self._processedFlag = self._indexedFlag = False
+        self._foldedTextCache = {} # Used by getFoldedTextList
+        self._wordTokenCache = {} # Used by getWordTokens
+        self._verseFingerprints = None # Used by getVerseFingerprints
         self.errorDictionary = OrderedDict()
         self.errorDictionary['Priority Errors'] = [] # Put this one first in the ordered dictionary
         self.givenAngleBracketWarning = self.givenDoubleQuoteWarning = False
@@ -166,7 +299,7 @@ class InternalBibleBook:
 
         self.badMarkers, self.badMarkerCounts = [], []
         self.versificationList = self.omittedVersesList = self.combinedVersesList = self.reorderedVersesList = None
-        self.pntsCount = self.nfvnCount = self.owfvnCount = self.rtsCount = self.sahtCount = self.fwmifCount = self.fswncCount = 0
+        self.limitedMessageCounts = {} # Used by __logLimited
 
         self.maxNoncriticalErrorsPerBook = MAX_NONCRITICAL_ERRORS_PER_BOOK_VERBOSE \
                         if BibleOrgSysGlobals.debugFlag or debuggingThisModule \
@@ -200,6 +333,25 @@ class InternalBibleBook:
     # end of InternalBibleBook.__str__
 
 
+    def __getstate__( self ):
+        """
+        Returns the attributes to be pickled
+            (without the caches which can be very large, e.g., when passed to multiprocessing workers).
+        """
+        state = self.__dict__.copy()
+        for attributeName in UNPICKLED_CACHE_ATTRIBUTES: state.pop( attributeName, None )
+        return state
+    # end of InternalBibleBook.__getstate__
+
+    def __setstate__( self, state ):
+        """
+        Restores the pickled attributes (with empty caches).
+        """
+        self.__dict__.update( state )
+        for attributeName in UNPICKLED_CACHE_ATTRIBUTES: setattr( self, attributeName, {} )
+    # end of InternalBibleBook.__setstate__
+
+
     def __len__( self ):
         """ This method returns the number of lines in the internal Bible book object. """
         return len( self._processedLines if self._processedFlag else self._rawLines )
@@ -218,14 +370,18 @@ class InternalBibleBook:
     # end of InternalBibleBook.__iter__
 
 
-    def addPriorityError( self, priority, C, V, string ):
+    def addPriorityError( self, priority, C, V, string, *args ):
         """
         Adds a priority error to self.errorDictionary.
+
+        If args are given, string is a format template for them
+            and the error is saved as an ErrorRecord (and only formatted by getErrors).
         """
         if BibleOrgSysGlobals.debugFlag:
             assert isinstance( priority, int ) and ( 0 <= priority <= 100 )
-            assert isinstance( string, str ) and string
+            assert isinstance( string, (str,ErrorRecord) ) and string
         if not 'Priority Errors' in self.errorDictionary: self.errorDictionary['Priority Errors'] = [] # Just in case getErrors() deleted it
+        if args: string = ErrorRecord( '', string, *args )
 
         BBB = self.BBB
         if self.errorDictionary['Priority Errors']:
@@ -252,6 +408,23 @@ class InternalBibleBook:
     # end of InternalBibleBook.__makeErrorRef
 
 
+    def __logLimited( self, messageName, level, template, *args ):
+        """
+        Logs a noncritical message at the given logging level,
+            but only up to self.maxNoncriticalErrorsPerBook times (for each messageName) for this book.
+
+        The message is only formatted if it's actually going to be logged.
+        After that, the messages are just counted
+            and the number suppressed is logged at the end of processLines.
+        """
+        try: self.limitedMessageCounts[messageName][1] += 1
+        except KeyError: self.limitedMessageCounts[messageName] = [level, 1]
+        if self.limitedMessageCounts[messageName][1] <= self.maxNoncriticalErrorsPerBook \
+        and logging.getLogger().isEnabledFor( level ):
+            logging.log( level, template.format( *args ) )
+    # end of InternalBibleBook.__logLimited
+
+
     def addLine( self, marker, text ):
         """
         Append a (USFM-based) 2-tuple to self._rawLines.
@@ -264,7 +437,7 @@ class InternalBibleBook:
             #if len(self._rawLines ) > 200: halt
             #if 'xyz' in text: halt
         if text and ( '\n' in text or '\r' in text ):
-            logging.critical( "InternalBibleBook.addLine found newLine in {} text: {}={!r}".format( self.objectTypeString, marker, text ) )
+            logging.critical( ErrorRecord( '', "InternalBibleBook.addLine found newLine in {} text: {}={!r}", self.objectTypeString, marker, text ) )
             if forceDebugHere or BibleOrgSysGlobals.debugFlag: halt
         if BibleOrgSysGlobals.debugFlag:
             assert not self._processedFlag
@@ -275,8 +448,7 @@ class InternalBibleBook:
                 assert '\n' not in text and '\r' not in text
 
         if not ( marker in BibleOrgSysGlobals.USFMMarkers or marker in BOS_ADDED_CONTENT_MARKERS ):
-            logging.critical( "InternalBibleBook.addLine marker for {} not in USFM/BOS lists: {}={!r}" \
-                                                        .format( self.objectTypeString, marker, text ) )
+            logging.critical( ErrorRecord( '', "InternalBibleBook.addLine marker for {} not in USFM/BOS lists: {}={!r}", self.objectTypeString, marker, text ) )
             if marker in self.badMarkers:
                 ix = self.badMarkers.index( marker )
                 assert 0 <= ix < len(self.badMarkers)
@@ -287,25 +459,19 @@ class InternalBibleBook:
         if BibleOrgSysGlobals.debugFlag: assert marker in BibleOrgSysGlobals.USFMMarkers or marker in BOS_ADDED_CONTENT_MARKERS
 
         if marker not in BOS_ADDED_CONTENT_MARKERS and not BibleOrgSysGlobals.USFMMarkers.isNewlineMarker( marker ):
-            logging.critical( "IBB.addLine: Not a NL marker: {}={!r}".format( marker, text ) )
+            logging.critical( ErrorRecord( '', "IBB.addLine: Not a NL marker: {}={!r}", marker, text ) )
             if BibleOrgSysGlobals.debugFlag: print( self, repr(marker), repr(text) ); halt # How did this happen?
 
         if text is None:
-            logging.critical( "InternalBibleBook.addLine: Received {} {} {}={!r}".format( self.objectTypeString, self.BBB, marker, text ) )
+            logging.critical( ErrorRecord( '', "InternalBibleBook.addLine: Received {} {} {}={!r}", self.objectTypeString, self.BBB, marker, text ) )
             if BibleOrgSysGlobals.debugFlag: halt # Programming error in the calling routine, sorry
             text = '' # Try to recover
 
         if text.strip() != text:
             if marker=='v' and len(text)<=4 and self.objectTypeString in ('USX',): pass
             else:
-                if self.pntsCount != -1:
-                    self.pntsCount += 1
-                    stripLogger = logging.warning if debuggingThisModule else logging.info
-                    if self.pntsCount <= self.maxNoncriticalErrorsPerBook:
-                        stripLogger( "InternalBibleBook.addLine: Possibly needed to strip {} {} {}={!r}".format( self.objectTypeString, self.BBB, marker, text ) )
-                    else: # we've reached our limit
-                        stripLogger( _('Additional "Possibly needed to strip" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                        self.pntsCount = -1 # So we don't do this again (for this book)
+                self.__logLimited( 'Possibly needed to strip', logging.WARNING if debuggingThisModule else logging.INFO,
+                        "InternalBibleBook.addLine: Possibly needed to strip {} {} {}={!r}", self.objectTypeString, self.BBB, marker, text )
 
         rawLineTuple = ( marker, text )
         self._rawLines.append( rawLineTuple )
@@ -326,7 +492,7 @@ class InternalBibleBook:
             assert not self._processedFlag
             assert self._rawLines # Must be an existing line to append to
         if additionalText and ( '\n' in additionalText or '\r' in additionalText ):
-            logging.critical( "InternalBibleBook.appendToLastLine found newLine in {} additionalText: {}={!r}".format( self.objectTypeString, expectedLastMarker, additionalText ) )
+            logging.critical( ErrorRecord( '', "InternalBibleBook.appendToLastLine found newLine in {} additionalText: {}={!r}", self.objectTypeString, expectedLastMarker, additionalText ) )
             if forceDebugHere or BibleOrgSysGlobals.debugFlag: halt
         if BibleOrgSysGlobals.debugFlag:
             assert not self._processedFlag
@@ -337,7 +503,7 @@ class InternalBibleBook:
         marker, text = self._rawLines[-1]
         #print( "additionalText for {} {!r} is {!r}".format( marker, text, additionalText ) )
         if expectedLastMarker and marker!=expectedLastMarker: # Not what we were expecting
-            logging.critical( _("InternalBibleBook.appendToLastLine: expected \\{} but got \\{}").format( expectedLastMarker, marker ) )
+            logging.critical( ErrorRecord( '', _("InternalBibleBook.appendToLastLine: expected \\{} but got \\{}"), expectedLastMarker, marker ) )
         if expectedLastMarker and BibleOrgSysGlobals.debugFlag: assert marker == expectedLastMarker
         #if marker in ('v','c',) and ' ' not in text: text += ' ' # Put a space after the verse or chapter number
         text += additionalText
@@ -427,7 +593,7 @@ class InternalBibleBook:
                             #if C==1 and V==1 and not appendedCFlag: self.addLine( 'c', str(C) ); appendedCFlag = True
                             self.addLine( marker, '' )
                         else:
-                            logging.error( "It seems that we had a blank {!r} field \nin {!r}".format( bits[0], ourText ) )
+                            logging.error( ErrorRecord( '', "It seems that we had a blank {!r} field \nin {!r}", bits[0], ourText ) )
                             if BibleOrgSysGlobals.debugFlag: halt
                     else:
                         assert len(bits) == 2
@@ -499,14 +665,9 @@ class InternalBibleBook:
         # Remove trailing spaces
         if adjText and adjText[-1].isspace():
             #print( 10, self.BBB, C, V, _("Trailing space at end of line") )
-            fixErrors.append( lineLocationSpace + _("Removed trailing space in {}: {}").format( originalMarker, text ) )
-            if self.rtsCount != -1:
-                self.rtsCount += 1
-                if self.rtsCount <= self.maxNoncriticalErrorsPerBook:
-                    logging.warning( _("processLineFix: Removed trailing space after {} {}:{} in \\{}: {!r}").format( self.BBB, C, V, originalMarker, text ) )
-                else: # we've reached our limit
-                    logging.warning( _('processLineFix: Additional "Removed trailing space" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                    self.rtsCount = -1 # So we don't do this again (for this book)
+            fixErrors.append( ErrorRecord( lineLocationSpace, _("Removed trailing space in {}: {}"), originalMarker, text ) )
+            self.__logLimited( 'Removed trailing space', logging.WARNING,
+                    _("processLineFix: Removed trailing space after {} {}:{} in \\{}: {!r}"), self.BBB, C, V, originalMarker, text )
             self.addPriorityError( 10, C, V, _("Trailing space at end of line") )
             adjText = adjText.rstrip()
             #print( "QQQ1: rstrip ok" )
@@ -519,12 +680,12 @@ class InternalBibleBook:
                 if '<' in adjText or '>' in adjText:
                     if not self.givenAngleBracketWarning: # Just give the warning once (per book)
                         if self.replaceAngleBracketsFlag:
-                            fixErrors.append( lineLocationSpace + _("Replaced angle bracket(s) in {}: {}").format( originalMarker, text ) )
-                            logging.info( _("processLineFix: Replaced angle bracket(s) after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, text ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Replaced angle bracket(s) in {}: {}"), originalMarker, text ) )
+                            logging.info( ErrorRecord( '', _("processLineFix: Replaced angle bracket(s) after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, text ) )
                             self.addPriorityError( 3, '', '', _("Book contains angle brackets (which we attempted to replace)") )
                         else:
-                            fixErrors.append( lineLocationSpace + _("Found (first) angle bracket in {}: {}").format( originalMarker, text ) )
-                            logging.info( _("processLineFix: Found (first) angle bracket after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, text ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Found (first) angle bracket in {}: {}"), originalMarker, text ) )
+                            logging.info( ErrorRecord( '', _("processLineFix: Found (first) angle bracket after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, text ) )
                             self.addPriorityError( 3, '', '', _("Book contains angle bracket(s)") )
                         self.givenAngleBracketWarning = True
                     if self.replaceAngleBracketsFlag:
@@ -532,12 +693,12 @@ class InternalBibleBook:
                 if '"' in adjText:
                     if not self.givenDoubleQuoteWarning: # Just give the warning once (per book)
                         if self.replaceStraightDoubleQuotesFlag:
-                            fixErrors.append( lineLocationSpace + _("Replaced straight quote sign(s) (\") in \\{}: {}").format( originalMarker, adjText ) )
-                            logging.info( _("processLineFix: Replaced straight quote sign(s) (\") after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Replaced straight quote sign(s) (\") in \\{}: {}"), originalMarker, adjText ) )
+                            logging.info( ErrorRecord( '', _("processLineFix: Replaced straight quote sign(s) (\") after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                             self.addPriorityError( 8, '', '', _("Book contains straight quote signs (which we attempted to replace)") )
                         else: # we're not attempting to replace them
-                            fixErrors.append( lineLocationSpace + _("Found (first) straight quote sign (\") in \\{}: {}").format( originalMarker, adjText ) )
-                            logging.info( _("processLineFix: Found (first) straight quote sign (\") after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Found (first) straight quote sign (\") in \\{}: {}"), originalMarker, adjText ) )
+                            logging.info( ErrorRecord( '', _("processLineFix: Found (first) straight quote sign (\") after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                             self.addPriorityError( 58, '', '', _("Book contains straight quote sign(s)") )
                         self.givenDoubleQuoteWarning = True
                     if self.replaceStraightDoubleQuotesFlag:
@@ -547,17 +708,17 @@ class InternalBibleBook:
                         adjText = adjText.replace('";','”;').replace('"(','”(').replace('"[','”[') # Including the questionable ones
                         adjText = adjText.replace('" ','” ').replace('",','”,').replace('".','”.').replace('"?','”?').replace('"!','”!') # Even the bad ones!
                         if '"' in adjText:
-                            logging.warning( "processLineFix: {} {}:{} still has straight quotes in {}:{!r}".format( self.BBB, C, V, originalMarker, adjText ) )
+                            logging.warning( ErrorRecord( '', "processLineFix: {} {}:{} still has straight quotes in {}:{!r}", self.BBB, C, V, originalMarker, adjText ) )
 
             # Do XML/HTML common character replacements
             #adjText = adjText.replace( '&', '&amp;' )
             #adjText = adjText.replace( "'", '&#39;' ) # XML does contain &apos; for optional use, but not recognised in all versions of HTML
             if '<' in adjText or '>' in adjText:
-                logging.error( "processLineFix: {} still has angle-brackets in {}:{!r}".format( self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                logging.error( ErrorRecord( '', "processLineFix: {} still has angle-brackets in {}:{!r}", self.__makeErrorRef(C,V), originalMarker, adjText ) )
                 self.addPriorityError( 12, C, V, _("Contains angle-bracket(s)") )
                 #adjText = adjText.replace( '<', '&lt;' ).replace( '>', '&gt;' )
             if '"' in adjText:
-                logging.warning( "processLineFix: {} straight-quotes in {}:{!r}".format( self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                logging.warning( ErrorRecord( '', "processLineFix: {} straight-quotes in {}:{!r}", self.__makeErrorRef(C,V), originalMarker, adjText ) )
                 self.addPriorityError( 11, C, V, _("Contains straight-quote(s)") )
                 #adjText = adjText.replace( '"', '&quot;' )
 
@@ -573,8 +734,8 @@ class InternalBibleBook:
                 if ixW == -1:
                     ixW = adjText.find( '\\W ' )
                     if ixW != -1:
-                        fixErrors.append( lineLocationSpace + _("Found UPPERCASE word marker in \\{}: {}").format( originalMarker, adjText ) )
-                        logging.warning( _("processLineFix: Found UPPERCASE word marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                        fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE word marker in \\{}: {}"), originalMarker, adjText ) )
+                        logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE word marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                         self.addPriorityError( 9, C, V, _("Word marker is UPPERCASE") )
             if ixW == -1: ixW = largeDummyValue
             while ixW < largeDummyValue: # We have one or the other
@@ -595,8 +756,8 @@ class InternalBibleBook:
                     if ixW == -1:
                         ixW = adjText.find( '\\W ', ixWend+4 )
                         if ixW != -1:
-                            fixErrors.append( lineLocationSpace + _("Found UPPERCASE word marker in \\{}: {}").format( originalMarker, adjText ) )
-                            logging.warning( _("processLineFix: Found UPPERCASE word marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE word marker in \\{}: {}"), originalMarker, adjText ) )
+                            logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE word marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                             self.addPriorityError( 9, C, V, _("Word marker is UPPERCASE") )
                 if ixW == -1: ixW = largeDummyValue
 
@@ -606,65 +767,66 @@ class InternalBibleBook:
 
         #print( "QQQ MOVE OUT NOTES" )
         # This particular little piece of code can also mostly handle it if the markers are UPPER CASE
-        ixFN = adjText.find( '\\f ' )
+        noteStartIndexes = getNoteStartIndexes( adjText ) if '\\' in adjText else {}
+        ixFN = noteStartIndexes.get( 'f', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixFN == -1:
-                ixFN = adjText.find( '\\F ' )
+                ixFN = noteStartIndexes.get( 'F', -1 )
                 if ixFN != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE footnote marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE footnote marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE footnote marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE footnote marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Footnote marker is UPPERCASE") )
         if ixFN == -1: ixFN = largeDummyValue
-        ixEN = adjText.find( '\\fe ' )
+        ixEN = noteStartIndexes.get( 'fe', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixEN == -1:
-                ixEN = adjText.find( '\\FE ' )
+                ixEN = noteStartIndexes.get( 'FE', -1 )
                 if ixEN != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE endnote marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE endnote marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE endnote marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE endnote marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Endnote marker is UPPERCASE") )
         if ixEN == -1: ixEN = largeDummyValue
-        ixXR = adjText.find( '\\x ' )
+        ixXR = noteStartIndexes.get( 'x', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixXR == -1:
-                ixXR = adjText.find( '\\X ' )
+                ixXR = noteStartIndexes.get( 'X', -1 )
                 if ixXR != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE cross-reference marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE cross-reference marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE cross-reference marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE cross-reference marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Cross-reference marker is UPPERCASE") )
         if ixXR == -1: ixXR = largeDummyValue
-        ixFIG = adjText.find( '\\fig ' )
+        ixFIG = noteStartIndexes.get( 'fig', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixFIG == -1:
-                ixFIG = adjText.find( '\\FIG ' )
+                ixFIG = noteStartIndexes.get( 'FIG', -1 )
                 if ixFIG != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE figure marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE figure marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE figure marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE figure marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Figure marker is UPPERCASE") )
         if ixFIG == -1: ixFIG = largeDummyValue
-        ixSTR = adjText.find( '\\str ' )
+        ixSTR = noteStartIndexes.get( 'str', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixSTR == -1:
-                ixSTR = adjText.find( '\\STR ' )
+                ixSTR = noteStartIndexes.get( 'STR', -1 )
                 if ixSTR != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE Strongs marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE Strongs marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE Strongs marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE Strongs marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Strongs marker is UPPERCASE") )
         if ixSTR == -1: ixSTR = largeDummyValue
-        ixSEM = adjText.find( '\\sem ' )
+        ixSEM = noteStartIndexes.get( 'sem', -1 )
         if not BibleOrgSysGlobals.strictCheckingFlag:
             if ixSEM == -1:
-                ixSEM = adjText.find( '\\SEM ' )
+                ixSEM = noteStartIndexes.get( 'SEM', -1 )
                 if ixSEM != -1:
-                    fixErrors.append( lineLocationSpace + _("Found UPPERCASE semantic marker in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found UPPERCASE semantic marker {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found UPPERCASE semantic marker in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found UPPERCASE semantic marker {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 9, C, V, _("Semantic marker is UPPERCASE") )
         if ixSEM == -1: ixSEM = largeDummyValue
-        ixWW = adjText.find( '\\ww ' )
-        if ixWW == -1: ixWW = adjText.find( '\\WW ' )
+        ixWW = noteStartIndexes.get( 'ww', -1 )
+        if ixWW == -1: ixWW = noteStartIndexes.get( 'WW', -1 )
         if ixWW == -1: ixWW = largeDummyValue
-        ixVP = adjText.find( '\\vp ' )
-        if ixVP == -1: ixVP = adjText.find( '\\VP ' )
+        ixVP = noteStartIndexes.get( 'vp', -1 )
+        if ixVP == -1: ixVP = noteStartIndexes.get( 'VP', -1 )
         if ixVP == -1: ixVP = largeDummyValue
         #print( 'ixFN =',ixFN, ixEN, 'ixXR = ',ixXR, ixFIG, ixSTR )
         ix1 = min( ixFN, ixEN, ixXR, ixFIG, ixSTR, ixSEM, ixWW, ixVP )
@@ -675,8 +837,8 @@ class InternalBibleBook:
                 #print( 'A', 'ix1 =',ix1,repr(adjText[ix1]), 'ix2 = ',ix2,repr(adjText[ix2]) )
                 noteSFM, lenSFM, thisOne, this1 = 'f', 1, 'footnote', 'fn'
                 if ixFN and adjText[ixFN-1]==' ':
-                    fixErrors.append( lineLocationSpace + _("Found footnote preceded by a space in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found footnote preceded by a space after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found footnote preceded by a space in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found footnote preceded by a space after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 52, C, V, _("Footnote is preceded by a space") )
             elif ix1 == ixEN:
                 ix2 = adjText.find( '\\fe*' )
@@ -684,8 +846,8 @@ class InternalBibleBook:
                 #print( 'A', 'ix1 =',ix1,repr(adjText[ix1]), 'ix2 = ',ix2,repr(adjText[ix2]) )
                 noteSFM, lenSFM, thisOne, this1 = 'fe', 2, 'endnote', 'en'
                 if ixEN and adjText[ixEN-1]==' ':
-                    fixErrors.append( lineLocationSpace + _("Found endnote preceded by a space in \\{}: {}").format( originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found endnote preceded by a space after {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found endnote preceded by a space in \\{}: {}"), originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found endnote preceded by a space after {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
                     self.addPriorityError( 52, C, V, _("Endnote is preceded by a space") )
             elif ix1 == ixXR:
                 ix2 = adjText.find( '\\x*' )
@@ -720,8 +882,8 @@ class InternalBibleBook:
                 # (returned dictionary above is just ignored here)
             elif ix1 == ixVP:
                 if originalMarker != 'v~': # We only expect vp fields in v (now converted to v~) lines
-                    fixErrors.append( lineLocationSpace + _("Found unexpected 'vp' field in \\{} line: {}").format( originalMarker, adjText ) )
-                    logging.error( _("processLineFix: Found unexpected 'vp' field after {} in \\{}: {}").format( self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found unexpected 'vp' field in \\{} line: {}"), originalMarker, adjText ) )
+                    logging.error( ErrorRecord( '', _("processLineFix: Found unexpected 'vp' field after {} in \\{}: {}"), self.__makeErrorRef(C,V), originalMarker, adjText ) )
                     self.addPriorityError( 95, C, V, _("Misplaced 'vp' field") )
                 ix2 = adjText.find( '\\vp*' )
                 if ix2 == -1: ix2 = adjText.find( '\\VP*' )
@@ -729,14 +891,14 @@ class InternalBibleBook:
                 noteSFM, lenSFM, thisOne, this1 = 'vp', 2, 'verse-character', 'vp'
             elif BibleOrgSysGlobals.debugFlag: halt # programming error
             if ix2 == -1: # no closing marker
-                fixErrors.append( lineLocationSpace + _("Found unmatched {} open in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                logging.error( _("processLineFix: Found unmatched {} open after {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                self.addPriorityError( 84, C, V, _("Marker {} is unmatched").format( thisOne ) )
+                fixErrors.append( ErrorRecord( lineLocationSpace, _("Found unmatched {} open in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                logging.error( ErrorRecord( '', _("processLineFix: Found unmatched {} open after {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                self.addPriorityError( 84, C, V, _("Marker {} is unmatched"), thisOne )
                 ix2 = largeDummyValue # Go to the end
             elif ix2 < ix1: # closing marker is before opening marker
-                fixErrors.append( lineLocationSpace + _("Found unmatched {} in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                logging.error( _("processLineFix: Found unmatched {} after {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                self.addPriorityError( 84, C, V, _("Marker {} is unmatched").format( thisOne ) )
+                fixErrors.append( ErrorRecord( lineLocationSpace, _("Found unmatched {} in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                logging.error( ErrorRecord( '', _("processLineFix: Found unmatched {} after {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                self.addPriorityError( 84, C, V, _("Marker {} is unmatched"), thisOne )
                 ix1, ix2 = ix2, ix1 # swap them then
             # Remove the footnote or endnote or xref or figure
             #print( "\nFound {} at {} {} in {!r}".format( repr(thisOne), ix1, ix2, repr(adjText) ) )
@@ -744,73 +906,63 @@ class InternalBibleBook:
             note = adjText[ix1+lenSFM+2:ix2] # Get the note text (without the beginning and end markers)
             #print( "\nNote is", repr(note) )
             if not note:
-                fixErrors.append( lineLocationSpace + _("Found empty {} in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                logging.error( _("processLineFix: Found empty {} after {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                self.addPriorityError( 53, C, V, _("Empty {}").format( thisOne ) )
+                fixErrors.append( ErrorRecord( lineLocationSpace, _("Found empty {} in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                logging.error( ErrorRecord( '', _("processLineFix: Found empty {} after {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                self.addPriorityError( 53, C, V, _("Empty {}"), thisOne )
             else: # there is a note
                 if note[0].isspace():
-                    fixErrors.append( lineLocationSpace + _("Found {} starting with space in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found {} starting with space after {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                    self.addPriorityError( 12, C, V, _("{} starts with space").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} starting with space in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found {} starting with space after {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                    self.addPriorityError( 12, C, V, _("{} starts with space"), thisOne.title() )
                     note = note.lstrip()
                     #print( "QQQ2: lstrip in note" ); halt
                 if note and note[-1].isspace():
-                    fixErrors.append( lineLocationSpace + _("Found {} ending with space in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: Found {} ending with space after {} {}:{} in \\{}: {}").format( thisOne, self.BBB, C, V, originalMarker, adjText ) )
-                    self.addPriorityError( 11, C, V, _("{} ends with space").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} ending with space in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: Found {} ending with space after {} {}:{} in \\{}: {}"), thisOne, self.BBB, C, V, originalMarker, adjText ) )
+                    self.addPriorityError( 11, C, V, _("{} ends with space"), thisOne.title() )
                     note = note.rstrip()
                     #print( "QQQ3: rstrip in note" )
                 if '\\f ' in note or '\\f*' in note or '\\x ' in note or '\\x*' in note: # Only the contents of these fields should be here now
-                    fixErrors.append( lineLocationSpace + _("Found illegal nested footnote or cross-reference in {} in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.error( _("processLineFix: Found illegal nested footnote or cross-reference in {} after {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                    self.addPriorityError( 85, C, V, _("{} seems to have illegal nested footnote or cross-reference").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found illegal nested footnote or cross-reference in {} in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.error( ErrorRecord( '', _("processLineFix: Found illegal nested footnote or cross-reference in {} after {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                    self.addPriorityError( 85, C, V, _("{} seems to have illegal nested footnote or cross-reference"), thisOne.title() )
                     if debuggingThisModule:
                         print( "processLineFix: {} {}:{} What went wrong here: {!r} from \\{} {!r} (Is it an embedded note?)".format( self.BBB, C, V, note, originalMarker, text ) )
                         print( "processLineFix: Have an embedded note perhaps! Not handled correctly yet" )
                     note = note.replace( '\\f ', ' ' ).replace( '\\f*','').replace( '\\x ', ' ').replace('\\x*','') # Temporary fix …
                 minNoteLength = 2 if thisOne=='Strongs-number' else 6 # Strongs numbers can be quite short, e.g., H3, G314
                 if len(note)<minNoteLength:
-                    fixErrors.append( lineLocationSpace + _("{} seems too short in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.warning( _("processLineFix: {} seems to short after {} {}:{} in \\{}: {}").format( thisOne, self.BBB, C, V, originalMarker, adjText ) )
-                    self.addPriorityError( 43, C, V, _("{} seems too short").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("{} seems too short in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.warning( ErrorRecord( '', _("processLineFix: {} seems to short after {} {}:{} in \\{}: {}"), thisOne, self.BBB, C, V, originalMarker, adjText ) )
+                    self.addPriorityError( 43, C, V, _("{} seems too short"), thisOne.title() )
 
             # Now fix some common errors
             if thisOne in ('footnote','endnote','cross-reference'):
                 if note.startswith( '\\' ):
-                    fixErrors.append( lineLocationSpace + _("Found {} without any caller in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.error( _("processLineFix: Found {} without any caller at {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                    self.addPriorityError( 86, C, V, _("{} should have a caller").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} without any caller in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.error( ErrorRecord( '', _("processLineFix: Found {} without any caller at {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                    self.addPriorityError( 86, C, V, _("{} should have a caller"), thisOne.title() )
                     note = '+ ' + note
                 if len(note)>2 and note[0] in '+-' and note[1] == '\\':
-                    fixErrors.append( lineLocationSpace + _("Found {} specified with no space after caller in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    logging.error( _("processLineFix: Found {} specified with no space after caller at {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                    self.addPriorityError( 76, C, V, _("{} should have space after caller").format( thisOne.title() ) )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} specified with no space after caller in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    logging.error( ErrorRecord( '', _("processLineFix: Found {} specified with no space after caller at {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
+                    self.addPriorityError( 76, C, V, _("{} should have space after caller"), thisOne.title() )
                     note = note[0] + ' ' + note[1:] # Add in the space
                 if note.startswith( '- ' ):
-                    if self.fswncCount != -1:
-                        self.fswncCount += 1
-                        if self.fswncCount <= self.maxNoncriticalErrorsPerBook:
-                            logging.error( _("processLineFix: Found {} specified with no caller at {} in \\{}: {}").format( thisOne, self.__makeErrorRef(C,V), originalMarker, adjText ) )
-                        else: # we've reached our limit
-                            logging.error( _('processLineFix: Additional "Found specified with no caller" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                            self.fswncCount = -1 # So we don't do this again (for this book)
-                    fixErrors.append( lineLocationSpace + _("Found {} specified with no caller in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    self.addPriorityError( 8, C, V, _("{} should not have specified no caller").format( thisOne.title() ) )
+                    self.__logLimited( 'Found specified with no caller', logging.ERROR,
+                            _("processLineFix: Found {} specified with no caller at {} in \\{}: {}"), thisOne, self.__makeErrorRef(C,V), originalMarker, adjText )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} specified with no caller in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    self.addPriorityError( 8, C, V, _("{} should not have specified no caller"), thisOne.title() )
                     note = '+ ' + note[2:] # Replace - (no caller) with + (automatic caller)
                 try: caller,rest = note.split( None, 1 ) # Split off the caller and get the rest
                 except ValueError: # presumably no spaces in note
                     caller, rest = note.strip(), ''
                 #print( "\ncaller {!r}, rest {!r}".format( caller, rest ) )
                 if not rest.startswith( '\\' ):
-                    if self.fwmifCount != -1:
-                        self.fwmifCount += 1
-                        if self.fwmifCount <= self.maxNoncriticalErrorsPerBook:
-                            logging.error( _("processLineFix: Found {} without marked internal fields at {} {}:{} in \\{}: {}").format( thisOne, self.BBB, C, V, originalMarker, adjText ) )
-                        else: # we've reached our limit
-                            logging.error( _('processLineFix: Additional "Found without marked internal fields" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                            self.fwmifCount = -1 # So we don't do this again (for this book)
-                    fixErrors.append( lineLocationSpace + _("Found {} without marked internal fields in \\{}: {}").format( thisOne, originalMarker, adjText ) )
-                    self.addPriorityError( 84, C, V, _("{} should have an internal field marked").format( thisOne.title() ) )
+                    self.__logLimited( 'Found without marked internal fields', logging.ERROR,
+                            _("processLineFix: Found {} without marked internal fields at {} {}:{} in \\{}: {}"), thisOne, self.BBB, C, V, originalMarker, adjText )
+                    fixErrors.append( ErrorRecord( lineLocationSpace, _("Found {} without marked internal fields in \\{}: {}"), thisOne, originalMarker, adjText ) )
+                    self.addPriorityError( 84, C, V, _("{} should have an internal field marked"), thisOne.title() )
                     # Add the expected fields (could be the wrong ones, but saves lots of problems later, especially if exporting)
                     if thisOne == 'cross-reference': add = 'xt'
                     else: add = 'ft'
@@ -818,7 +970,9 @@ class InternalBibleBook:
 
             # Now prepare a cleaned version
             adjText = adjText[:ix1] + adjText[ix2+lenSFM+2:] # Remove the note completely from the text
-            cleanedNote = note \
+            cleanedNote = note
+            if '&' in cleanedNote:
+                cleanedNote = cleanedNote \
                             .replace( '&amp;', '&' ) \
                             .replace( '&#39;', "'" ) \
                             .replace( '&lt;',  '<' ) \
@@ -826,16 +980,13 @@ class InternalBibleBook:
                             .replace( '&quot;', '"' ) # Undo any replacements above
             for sign in ('- ', '+ '): # Remove common leader characters (and the following space)
                 cleanedNote = cleanedNote.replace( sign, '' )
-            for marker in ['\\xo*','\\xo ', '\\xt*','\\xt ', '\\xk*','\\xk ', '\\xq*','\\xq ',
-                            '\\xot*','\\xot ', '\\xnt*','\\xnt ', '\\xdc*','\\xdc ',
-                            '\\fr*','\\fr ','\\ft*','\\ft ','\\fqa*','\\fqa ','\\fq*','\\fq ',
-                            '\\fv*','\\fv ','\\fk*','\\fk ','\\fl*','\\fl ','\\fdc*','\\fdc ',] \
-                                + BibleOrgSysGlobals.internal_SFMs_to_remove:
-                cleanedNote = cleanedNote.replace( marker, '' )
             if '\\' in cleanedNote:
-                fixErrors.append( lineLocationSpace + _("Found unexpected backslash in {}: {}").format( thisOne, cleanedNote ) )
-                logging.error( _("processLineFix: Found unexpected backslash after {} {}:{} in {}: {}").format( self.BBB, C, V, thisOne, cleanedNote ) )
-                self.addPriorityError( 81, C, V, _("{} contains unexpected backslash").format( thisOne.title() ) )
+                if noteCleaningRegex is None: makeLineFixTables()
+                cleanedNote = noteCleaningRegex.sub( '', cleanedNote ) # Remove all the note (and character) markers in one pass
+            if '\\' in cleanedNote:
+                fixErrors.append( ErrorRecord( lineLocationSpace, _("Found unexpected backslash in {}: {}"), thisOne, cleanedNote ) )
+                logging.error( ErrorRecord( '', _("processLineFix: Found unexpected backslash after {} {}:{} in {}: {}"), self.BBB, C, V, thisOne, cleanedNote ) )
+                self.addPriorityError( 81, C, V, _("{} contains unexpected backslash"), thisOne.title() )
                 cleanedNote = cleanedNote.replace( '\\', '' )
             #print( "Note: {!r} Cleaned note: {!r}".format( note, cleanedNote ) )
 
@@ -848,38 +999,39 @@ class InternalBibleBook:
                 self._processedLines.append( InternalBibleEntry('vp#', 'vp', cleanedNote, cleanedNote, None, cleanedNote) )
                 self._processedLines.append( vEntry ) # Put the original v entry back afterwards
             # Get ready for the next loop
-            ixFN = adjText.find( '\\f ' )
-            if ixFN == -1: ixFN = adjText.find( '\\F ' )
+            noteStartIndexes = getNoteStartIndexes( adjText )
+            ixFN = noteStartIndexes.get( 'f', -1 )
+            if ixFN == -1: ixFN = noteStartIndexes.get( 'F', -1 )
             if ixFN == -1: ixFN = largeDummyValue
-            ixEN = adjText.find( '\\fe ' )
-            if ixEN == -1: ixEN = adjText.find( '\\FE ' )
+            ixEN = noteStartIndexes.get( 'fe', -1 )
+            if ixEN == -1: ixEN = noteStartIndexes.get( 'FE', -1 )
             if ixEN == -1: ixEN = largeDummyValue
-            ixXR = adjText.find( '\\x ' )
-            if ixXR == -1: ixXR = adjText.find( '\\X ' )
+            ixXR = noteStartIndexes.get( 'x', -1 )
+            if ixXR == -1: ixXR = noteStartIndexes.get( 'X', -1 )
             if ixXR == -1: ixXR = largeDummyValue
-            ixFIG = adjText.find( '\\fig ' )
-            if ixFIG == -1: ixFIG = adjText.find( '\\FIG ' )
+            ixFIG = noteStartIndexes.get( 'fig', -1 )
+            if ixFIG == -1: ixFIG = noteStartIndexes.get( 'FIG', -1 )
             if ixFIG == -1: ixFIG = largeDummyValue
-            ixSTR = adjText.find( '\\str ' )
-            if ixSTR == -1: ixSTR = adjText.find( '\\STR ' )
+            ixSTR = noteStartIndexes.get( 'str', -1 )
+            if ixSTR == -1: ixSTR = noteStartIndexes.get( 'STR', -1 )
             if ixSTR == -1: ixSTR = largeDummyValue
-            ixSEM = adjText.find( '\\sem ' )
-            if ixSEM == -1: ixSEM = adjText.find( '\\SEM ' )
+            ixSEM = noteStartIndexes.get( 'sem', -1 )
+            if ixSEM == -1: ixSEM = noteStartIndexes.get( 'SEM', -1 )
             if ixSEM == -1: ixSEM = largeDummyValue
-            ixWW = adjText.find( '\\ww ' )
-            if ixWW == -1: ixWW = adjText.find( '\\WW ' )
+            ixWW = noteStartIndexes.get( 'ww', -1 )
+            if ixWW == -1: ixWW = noteStartIndexes.get( 'WW', -1 )
             if ixWW == -1: ixWW = largeDummyValue
-            ixVP = adjText.find( '\\vp ' )
-            if ixVP == -1: ixVP = adjText.find( '\\VP ' )
+            ixVP = noteStartIndexes.get( 'vp', -1 )
+            if ixVP == -1: ixVP = noteStartIndexes.get( 'VP', -1 )
             if ixVP == -1: ixVP = largeDummyValue
             ix1 = min( ixFN, ixEN, ixXR, ixFIG, ixSTR, ixSEM, ixWW, ixVP )
         #if extras: print( "Fix gave {!r} and {!r}".format( adjText, extras ) )
         #if len(extras)>1: print( "Mutiple fix gave {!r} and {!r}".format( adjText, extras ) )
 
         # Check for anything left over
-        if '\\f ' in adjText or '\\f*' in adjText or '\\x ' in adjText or '\\x*' in adjText:
-            fixErrors.append( lineLocationSpace + _("Unable to properly process footnotes and cross-references in \\{}: {}").format( originalMarker, adjText ) )
-            logging.error( _("processLineFix: Unable to properly process footnotes and cross-references {} {}:{} in \\{}: {}").format( self.BBB, C, V, originalMarker, adjText ) )
+        if '\\' in adjText and ('\\f ' in adjText or '\\f*' in adjText or '\\x ' in adjText or '\\x*' in adjText):
+            fixErrors.append( ErrorRecord( lineLocationSpace, _("Unable to properly process footnotes and cross-references in \\{}: {}"), originalMarker, adjText ) )
+            logging.error( ErrorRecord( '', _("processLineFix: Unable to properly process footnotes and cross-references {} {}:{} in \\{}: {}"), self.BBB, C, V, originalMarker, adjText ) )
             self.addPriorityError( 82, C, V, _("Invalid footnotes or cross-references") )
             if BibleOrgSysGlobals.strictCheckingFlag: halt
 
@@ -1035,8 +1187,8 @@ class InternalBibleBook:
         # Check trailing spaces again now
         if adjText and adjText[-1].isspace():
             #print( 10, self.BBB, C, V, _("Trailing space before note at end of line") )
-            fixErrors.append( lineLocationSpace + _("Removed trailing space before note in \\{}: {!r}").format( originalMarker, text ) )
-            logging.warning( _("processLineFix: Removed trailing space before note after {} {}:{} in \\{}: {!r}").format( self.BBB, C, V, originalMarker, text ) )
+            fixErrors.append( ErrorRecord( lineLocationSpace, _("Removed trailing space before note in \\{}: {!r}"), originalMarker, text ) )
+            logging.warning( ErrorRecord( '', _("processLineFix: Removed trailing space before note after {} {}:{} in \\{}: {!r}"), self.BBB, C, V, originalMarker, text ) )
             self.addPriorityError( 10, C, V, _("Trailing space before note at end of line") )
             adjText = adjText.rstrip()
             #print( "QQQ6: rstrip" ); halt
@@ -1060,30 +1212,26 @@ class InternalBibleBook:
                 print( " Still have angle brackets left in:", cleanText )
         else: # not Sword
             #print( BibleOrgSysGlobals.USFMMarkers.getCharacterMarkersList() )
-            cleanText = adjText \
+            cleanText = adjText
+            if '&' in cleanText:
+                cleanText = cleanText \
                             .replace( '&amp;', '&' ) \
                             .replace( '&#39;', "'" ) \
                             .replace( '&lt;',  '<' ) \
                             .replace( '&gt;',  '>' ) \
                             .replace( '&quot;', '"' ) # Undo any replacements above
             if '\\' in cleanText: # we will first remove known USFM character formatting markers
-                for possibleCharacterMarker in BibleOrgSysGlobals.USFMMarkers.getCharacterMarkersList():
-                    tryMarkers = []
-                    if BibleOrgSysGlobals.USFMMarkers.isNumberableMarker( possibleCharacterMarker ):
-                        for d in ('1','2','3','4','5'):
-                            tryMarkers.append( '\\'+possibleCharacterMarker+d+' ' )
-                    tryMarkers.append( '\\'+possibleCharacterMarker+' ' )
-                    #print( "tryMarkers", tryMarkers )
-                    for tryMarker in tryMarkers:
-                        while tryMarker in cleanText:
-                            #print( "Removing {!r} from {!r}".format( tryMarker, cleanText ) )
-                            cleanText = cleanText.replace( tryMarker, '', 1 ) # Remove it
-                            tryCloseMarker = '\\'+possibleCharacterMarker+'*'
-                            shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( possibleCharacterMarker )
-                            if shouldBeClosed == 'A' \
-                            or shouldBeClosed == 'S' and tryCloseMarker in cleanText:
-                                #print( "Removing {!r} from {!r}".format( tryCloseMarker, cleanText ) )
-                                cleanText = cleanText.replace( tryCloseMarker, '', 1 ) # Remove it
+                if characterMarkerRemovalList is None: makeLineFixTables()
+                possibleMarkers = set( CHARACTER_MARKER_START_REGEX.findall( cleanText ) ) # So we only need to try the ones that are there
+                for markerName, tryMarker, tryCloseMarker, shouldBeClosed in characterMarkerRemovalList:
+                    if markerName not in possibleMarkers: continue
+                    while tryMarker in cleanText:
+                        #print( "Removing {!r} from {!r}".format( tryMarker, cleanText ) )
+                        cleanText = cleanText.replace( tryMarker, '', 1 ) # Remove it
+                        if shouldBeClosed == 'A' \
+                        or shouldBeClosed == 'S' and tryCloseMarker in cleanText:
+                            #print( "Removing {!r} from {!r}".format( tryCloseMarker, cleanText ) )
+                            cleanText = cleanText.replace( tryCloseMarker, '', 1 ) # Remove it
                     if not '\\' in cleanText: break # no point in looping further
                 while '\\' in cleanText: # we will now try to remove any bad markers
                     ixBS = cleanText.index( '\\' )
@@ -1103,12 +1251,12 @@ class InternalBibleBook:
                         #print( "cleanText part: …{!r}<<HERE>>{!r}…".format( cleanText[ixBS-10:ixBS], cleanText[ixBS:ixBS+20] ) )
                         if BibleOrgSysGlobals.debugFlag:
                             assert ixSP==largeDummyValue and ixAS==largeDummyValue and ixEND==largeDummyValue
-                            logging.critical( "InternalBibleBook.processLines.processLineFix: truncating {} {}:{} {} line".format( self.BBB, C, V, originalMarker ) )
+                            logging.critical( ErrorRecord( '', "InternalBibleBook.processLines.processLineFix: truncating {} {}:{} {} line", self.BBB, C, V, originalMarker ) )
                         cleanText = cleanText[:ixBS].rstrip()
                         #print( "QQQ7: rstrip" ); halt
                         #print( "cleanText: {!r}".format( cleanText ) )
                 if '\\' in cleanText:
-                    logging.critical( "processLineFix: Why do we still have a backslash in {!r} from {!r}?".format( cleanText, adjText ) )
+                    logging.critical( ErrorRecord( '', "processLineFix: Why do we still have a backslash in {!r} from {!r}?", cleanText, adjText ) )
                     if BibleOrgSysGlobals.debugFlag: halt
 
         if BibleOrgSysGlobals.debugFlag: # Now do a final check that we did everything right
@@ -1244,7 +1392,7 @@ class InternalBibleBook:
                 openMarker( 'intro' )
                 haveIntro += 1 # now 'true' but counted to detect errors
                 if haveIntro > 1:
-                    logging.warning( "Multiple introduction sections in {}!!!".format( self.BBB ) )
+                    logging.warning( ErrorRecord( '', "Multiple introduction sections in {}!!!", self.BBB ) )
                     if BibleOrgSysGlobals.debugFlag and debuggingThisModule: halt
 
             if 'iot' in openMarkers and marker not in ourIntroOutlineMarkers: closeOpenMarker( 'iot' )
@@ -1513,8 +1661,8 @@ class InternalBibleBook:
 
             if adjMarker=='b' and text:
                 fixErrors.append( _("{} {}:{} Paragraph marker {!r} should not contain text").format( self.BBB, C, V, originalMarker ) )
-                logging.error( "doAppendEntry: " + _("Illegal text for {!r} paragraph marker {} {}:{}").format( originalMarker, self.BBB, C, V ) )
-                self.addPriorityError( 97, C, V, _("Should not have text following character marker '{}").format( originalMarker ) )
+                logging.error( ErrorRecord( "doAppendEntry: ", _("Illegal text for {!r} paragraph marker {} {}:{}"), originalMarker, self.BBB, C, V ) )
+                self.addPriorityError( 97, C, V, _("Should not have text following character marker '{}"), originalMarker )
 
             if (adjMarker=='b' or adjMarker in BibleOrgSysGlobals.USFMParagraphMarkers) and text:
                 # Separate the verse text from the paragraph markers
@@ -1522,8 +1670,8 @@ class InternalBibleBook:
                 adjMarker = 'p~'
                 if not text.strip():
                     fixErrors.append( _("{} {}:{} Paragraph marker {!r} seems to contain only whitespace").format( self.BBB, C, V, originalMarker ) )
-                    logging.error( "doAppendEntry: " + _("Only whitespace for {!r} paragraph marker {} {}:{}").format( originalMarker, self.BBB, C, V ) )
-                    self.addPriorityError( 68, C, V, _("Only whitespace following character marker '{}").format( originalMarker ) )
+                    logging.error( ErrorRecord( "doAppendEntry: ", _("Only whitespace for {!r} paragraph marker {} {}:{}"), originalMarker, self.BBB, C, V ) )
+                    self.addPriorityError( 68, C, V, _("Only whitespace following character marker '{}"), originalMarker )
                     return # nothing more to do here
 
             # Separate out the notes (footnotes and cross-references)
@@ -1538,13 +1686,8 @@ class InternalBibleBook:
                 #print( "processLine: marker should always have text (ignoring it):", self.BBB, C, V, originalMarker, adjMarker, " originally '"+text+"'" )
                 #fixErrors.append( lineLocationSpace + _("Marker {!r} should always have text").format( originalMarker ) )
                 if self.objectTypeString in ('USFM2','USFM3','USX',):
-                    if self.sahtCount != -1:
-                        self.sahtCount += 1
-                        if self.sahtCount <= self.maxNoncriticalErrorsPerBook:
-                            logging.error( "doAppendEntry: " + _("Marker {!r} at {} should always have text").format( originalMarker, self.__makeErrorRef(C,V) ) )
-                        else: # we've reached our limit
-                            logging.error( "doAppendEntry: " + _("Additional \"Marker should always have text\" messages suppressed for {} {}").format( self.workName, self.BBB ) )
-                            self.sahtCount = -1 # So we don't do this again (for this book)
+                    self.__logLimited( 'Marker should always have text', logging.ERROR,
+                            "doAppendEntry: " + _("Marker {!r} at {} should always have text"), originalMarker, self.__makeErrorRef(C,V) )
                 #self.addPriorityError( 96, C, V, _("Marker \\{} should always have text").format( originalMarker ) )
                 if adjMarker != 'v~': # Save all other empty markers
                     self._processedLines.append( InternalBibleEntry(adjMarker, originalMarker, adjText, cleanText, extras, originalText) )
@@ -1577,7 +1720,7 @@ class InternalBibleBook:
             try:
                 adjustedMarker = originalMarker if originalMarker in BOS_ADDED_CONTENT_MARKERS else BibleOrgSysGlobals.USFMMarkers.toStandardMarker( originalMarker )
             except KeyError: # unknown marker
-                logging.error( "processLine-check: unknown {} originalMarker = {}".format( self.objectTypeString, originalMarker ) )
+                logging.error( ErrorRecord( '', "processLine-check: unknown {} originalMarker = {}", self.objectTypeString, originalMarker ) )
                 adjustedMarker = originalMarker # temp……
 
             def splitCNumber( inputString ):
@@ -1638,7 +1781,7 @@ class InternalBibleBook:
 
             # Main code of processLine -- keep track of where we are
             if originalMarker=='c' and text:
-                if haveWaitingC: logging.warning( "Note: Two c markers with no intervening v markers at {} {}:{}".format( self.BBB, C, V ) )
+                if haveWaitingC: logging.warning( ErrorRecord( '', "Note: Two c markers with no intervening v markers at {} {}:{}", self.BBB, C, V ) )
                 #C = text.split()[0]; V = '0'
                 cBits = splitCNumber( text )
                 if BibleOrgSysGlobals.debugFlag and debuggingThisModule and len(cBits)>1:
@@ -1646,26 +1789,26 @@ class InternalBibleBook:
                 C, V = cBits[0], '0'
                 if C == '-1':
                     fixErrors.append( _("{} {}:{} Chapter zero is not allowed {!r}").format( self.BBB, C, V, text ) )
-                    logging.error( "InternalBibleBook.processLine: " + _("Found zero {!r} in chapter marker {} {}:{}").format( text, self.BBB, C, V ) )
-                    self.addPriorityError( 97, C, V, _("Chapter zero {!r} not allowed").format( text ) )
+                    logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Found zero {!r} in chapter marker {} {}:{}"), text, self.BBB, C, V ) )
+                    self.addPriorityError( 97, C, V, _("Chapter zero {!r} not allowed"), text )
                     if len(self._processedLines) < 30: # It's near the beginning of the file
-                        logging.warning( "Converting given chapter zero to chapter one in {}".format( self.BBB ) )
+                        logging.warning( ErrorRecord( '', "Converting given chapter zero to chapter one in {}", self.BBB ) )
                         C = '1' # Our best guess
                         text = C + text[1:]
                 haveWaitingC = C
                 if len(cBits) > 1: # We have extra stuff on the c line after the chapter number
                     if cBits[1] == ' ': # It's just a space
                         fixErrors.append( _("{} {}:{} Extra space after chapter marker").format( self.BBB, C, V ) )
-                        logging.warning( "InternalBibleBook.processLine: " + _("Extra space after chapter marker at {}").format( self.__makeErrorRef(C,V) ) )
+                        logging.warning( ErrorRecord( "InternalBibleBook.processLine: ", _("Extra space after chapter marker at {}"), self.__makeErrorRef(C,V) ) )
                         self.addPriorityError( 10, C, V, _("Extra space after chapter marker") )
                     elif not cBits[1].strip(): # It's more than a space but just whitespace
                         fixErrors.append( _("{} {}:{} Extra whitespace after chapter marker").format( self.BBB, C, V ) )
-                        logging.warning( "InternalBibleBook.processLine: " + _("Extra whitespace after chapter marker at {}").format( self.__makeErrorRef(C,V) ) )
+                        logging.warning( ErrorRecord( "InternalBibleBook.processLine: ", _("Extra whitespace after chapter marker at {}"), self.__makeErrorRef(C,V) ) )
                         self.addPriorityError( 20, C, V, _("Extra whitespace after chapter marker") )
                     else: # it's more than just whitespace
                         fixErrors.append( _("{} {}:{} Chapter marker seems to contain extra material {!r}").format( self.BBB, C, V, cBits[1] ) )
-                        logging.error( "InternalBibleBook.processLine: " + _("Extra {!r} material in chapter marker {}").format( cBits[1], self.__makeErrorRef(C,V) ) )
-                        self.addPriorityError( 30 if '\f ' in cBits[1] else 98, C, V, _("Extra {!r} material after chapter marker").format( cBits[1] ) )
+                        logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Extra {!r} material in chapter marker {}"), cBits[1], self.__makeErrorRef(C,V) ) )
+                        self.addPriorityError( 30 if '\f ' in cBits[1] else 98, C, V, _("Extra {!r} material after chapter marker"), cBits[1] )
                         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
                             print( "InternalBibleBook.processLine: Something on c line", self.BBB, C, V, repr(text), repr(cBits[1]) )
                         adjText, cleanText, extras = self.processLineFix( C, V, originalMarker, cBits[1], fixErrors )
@@ -1694,12 +1837,12 @@ class InternalBibleBook:
                 if C == '-1': # Some single chapter books don't have an explicit chapter 1 marker -- we'll make it explicit here
                     if not self.isSingleChapterBook:
                         fixErrors.append( _("{} {}:{} Chapter marker seems to be missing before first verse").format( self.BBB, C, V ) )
-                        logging.error( "InternalBibleBook.processLine: " + _("Missing chapter number before first verse {} {}:{}").format( self.BBB, C, V ) )
+                        logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Missing chapter number before first verse {} {}:{}"), self.BBB, C, V ) )
                         self.addPriorityError( 98, C, V, _("Missing chapter number before first verse") )
                     C = '1'
                     if self.isSingleChapterBook and V!='1':
                         fixErrors.append( _("{} {}:{} Expected single chapter book to start with verse 1").format( self.BBB, C, V ) )
-                        logging.error( "InternalBibleBook.processLine: " + _("Expected single chapter book to start with verse 1 at {} {}:{}").format( self.BBB, C, V ) )
+                        logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Expected single chapter book to start with verse 1 at {} {}:{}"), self.BBB, C, V ) )
                         self.addPriorityError( 38, C, V, _("Expected single chapter book to start with verse 1") )
                     poppedStuff = self._processedLines.pop()
                     if poppedStuff is not None:
@@ -1712,7 +1855,7 @@ class InternalBibleBook:
                         self._processedLines.append( InternalBibleEntry(lastAdjustedMarker, lastOriginalMarker, lastAdjustedText, lastCleanText, lastExtras, lastOriginalText) )
                     else: # Assume that the last marker was part of the introduction, so write it first
                         if lastAdjustedMarker not in ( 'ip', ):
-                            logging.info( "{} {}:{} Assumed {} was part of intro after {}".format( self.BBB, C, V, lastAdjustedMarker, marker ) )
+                            logging.info( ErrorRecord( '', "{} {}:{} Assumed {} was part of intro after {}", self.BBB, C, V, lastAdjustedMarker, marker ) )
                             #if V!='13': halt # Just double-checking this code (except for one weird book that starts at v13)
                         if lastOriginalText:
                             self._processedLines.append( InternalBibleEntry(lastAdjustedMarker, lastOriginalMarker, lastAdjustedText, lastCleanText, lastExtras, lastOriginalText) )
@@ -1734,8 +1877,8 @@ class InternalBibleBook:
                 if ix<ixSP: # It must have been the backslash first
                     #print( "processLine had an unusual case in {} {}:{}: {!r} {!r}".format( self.BBB, C, V, originalMarker, originalText ) )
                     fixErrors.append( '{} {}:{} '.format( self.BBB, C, V ) + _("Unusual field (after verse number): {!r}").format( originalText ) )
-                    logging.error( "InternalBibleBook.processLine: " + _("Unexpected backslash touching verse number (missing space?) after {} {}:{} in \\{}: {!r}").format( self.BBB, C, V, originalMarker, originalText ) )
-                    self.addPriorityError( 94, C, V, _("Unexpected backslash touching verse number (missing space?) in {!r}").format( originalText ) )
+                    logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Unexpected backslash touching verse number (missing space?) after {} {}:{} in \\{}: {!r}"), self.BBB, C, V, originalMarker, originalText ) )
+                    self.addPriorityError( 94, C, V, _("Unexpected backslash touching verse number (missing space?) in {!r}"), originalText )
                 if ix==largeDummyValue: # There's neither -- not unexpected if this is a translation in progress
                     #print( "processLine had an empty verse field in {} {}:{}: {!r} {!r} {} {} {}".format( self.BBB, C, V, originalMarker, originalText, ix, ixSP, ixBS ) )
                     # Removed these fix and priority errors, coz it seems to be covered in checkSFMs
@@ -1746,13 +1889,8 @@ class InternalBibleBook:
                         #if self.nfvnCount == -1:
                             #priority = 12
                         #else:
-                        if self.nfvnCount != -1:
-                            self.nfvnCount += 1
-                            if self.nfvnCount <= self.maxNoncriticalErrorsPerBook:
-                                logging.error( "InternalBibleBook.processLine: " + _("Nothing following verse number after {} in \\{}: {!r}").format( self.__makeErrorRef(C,V), originalMarker, originalText ) )
-                            else: # we've reached our limit
-                                logging.error( "InternalBibleBook.processLine: " + _('Additional "Nothing following verse number" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                                self.nfvnCount = -1 # So we don't do this again (for this book)
+                        self.__logLimited( 'Nothing following verse number', logging.ERROR,
+                                "InternalBibleBook.processLine: " + _("Nothing following verse number after {} in \\{}: {!r}"), self.__makeErrorRef(C,V), originalMarker, originalText )
                                 #priority = 12
                     #self.addPriorityError( priority, C, V, _("Nothing following verse number in {!r}").format( originalText ) )
                     verseNumberBit = text
@@ -1786,13 +1924,8 @@ class InternalBibleBook:
                     strippedVerseText = verseNumberRest.lstrip()
                     #print( "QQQ9: lstrip" )
                     if not strippedVerseText:
-                        if self.owfvnCount != -1:
-                            self.owfvnCount += 1
-                            if self.owfvnCount <= self.maxNoncriticalErrorsPerBook:
-                                logging.error( "InternalBibleBook.processLine: " + _("Only whitespace following verse number after {} in \\{}: {!r}").format( self.__makeErrorRef(C,V), originalMarker, originalText ) )
-                            else: # we've reached our limit
-                                logging.error( "InternalBibleBook.processLine: " + _('Additional "Only whitespace following verse number" messages suppressed for {} {}').format( self.workName, self.BBB ) )
-                                self.owfvnCount = -1 # So we don't do this again (for this book)
+                        self.__logLimited( 'Only whitespace following verse number', logging.ERROR,
+                                "InternalBibleBook.processLine: " + _("Only whitespace following verse number after {} in \\{}: {!r}"), self.__makeErrorRef(C,V), originalMarker, originalText )
                         # Removed these fix and priority errors, coz it seems to be covered in checkSFMs
                         # (and especially coz we don't know yet if this is a finished translation)
                         #self.addPriorityError( 91, C, V, _("Only whitespace following verse number in {!r}").format( originalText ) )
@@ -1811,9 +1944,9 @@ class InternalBibleBook:
                 for insideMarker, iMIndex, nextSignificantChar, fullMarker, characterContext, endIndex, markerField in markerList: # check paragraph markers
                     if BibleOrgSysGlobals.USFMMarkers.isNewlineMarker(insideMarker): # Need to split the line for everything else to work properly
                         if ix==0:
-                            fixErrors.append( lineLocationSpace + _("Marker {!r} shouldn't appear within line in \\{}: {!r}").format( insideMarker, originalMarker, text ) )
-                            logging.error( "InternalBibleBook.processLine: " + _("Marker {!r} shouldn't appear within line after {} {}:{} in \\{}: {!r}").format( insideMarker, self.BBB, C, V, originalMarker, text ) ) # Only log the first error in the line
-                            self.addPriorityError( 96, C, V, _("Marker \\{} shouldn't be inside a line").format( insideMarker ) )
+                            fixErrors.append( ErrorRecord( lineLocationSpace, _("Marker {!r} shouldn't appear within line in \\{}: {!r}"), insideMarker, originalMarker, text ) )
+                            logging.error( ErrorRecord( "InternalBibleBook.processLine: ", _("Marker {!r} shouldn't appear within line after {} {}:{} in \\{}: {!r}"), insideMarker, self.BBB, C, V, originalMarker, text ) ) # Only log the first error in the line
+                            self.addPriorityError( 96, C, V, _("Marker \\{} shouldn't be inside a line"), insideMarker )
                         thisText = text[ix:iMIndex].rstrip()
                         #print( "QQQ10: rstrip" ); halt
                         adjText, cleanText, extras = self.processLineFix( C, V, originalMarker, thisText, fixErrors )
@@ -1924,7 +2057,10 @@ class InternalBibleBook:
             #print( "\nQQQ" )
             if self.objectTypeString=='USX' and text and text[-1]==' ': text = text[:-1] # Removing extra trailing space from USX files
             processLine( marker, text ) # Saves its results in self._processedLines
-        del self.pntsCount, self.nfvnCount, self.owfvnCount, self.rtsCount, self.sahtCount, self.fwmifCount, self.fswncCount
+        for messageName,(level,count) in self.limitedMessageCounts.items(): # Now we can say how many we suppressed
+            if count > self.maxNoncriticalErrorsPerBook:
+                logging.log( level, ErrorRecord( '', _('{} additional {!r} messages suppressed for {} {}'), count-self.maxNoncriticalErrorsPerBook, messageName, self.workName, self.BBB ) )
+        del self.limitedMessageCounts
 
         # Go through the lines and add nesting markers like 'intro', 'chapter', etc.
         self.addNestingMarkers()
@@ -1937,10 +2073,58 @@ class InternalBibleBook:
 
         if fixErrors: self.errorDictionary['Fix Text Errors'] = fixErrors
         self._processedFlag = True
+        self._foldedTextCache = {} # Any previously folded text is now out of date
+        self._wordTokenCache = {}
+        self._verseFingerprints = None
         self.makeCVIndex()
     # end of InternalBibleBook.processLines
 
 
+    def getFoldedTextList( self, fullTextFlag=False, ignoreDiacriticsFlag=False, caselessFlag=False ):
+        """
+        Returns a list (parallel to self._processedLines) of the clean text (or full text if fullTextFlag is set)
+            with accents removed (if ignoreDiacriticsFlag is set) and/or lowercased (if caselessFlag is set).
+
+        The list is cached so that repeated searches don't have to fold the entire book again.
+        """
+        assert self._processedFlag
+        cacheKey = (fullTextFlag, ignoreDiacriticsFlag, caselessFlag)
+        try: return self._foldedTextCache[cacheKey]
+        except AttributeError: self._foldedTextCache = {} # Could be from an older pickled book
+        except KeyError: pass
+
+        foldedTextList = []
+        for entry in self._processedLines:
+            text = entry.getFullText() if fullTextFlag else entry.getCleanText()
+            if text:
+                if ignoreDiacriticsFlag: text = BibleOrgSysGlobals.removeAccents( text )
+                if caselessFlag: text = text.lower()
+            foldedTextList.append( text )
+        self._foldedTextCache[cacheKey] = foldedTextList
+        return foldedTextList
+    # end of InternalBibleBook.getFoldedTextList
+
+
+    def getWordTokens( self, text ):
+        """
+        Returns a list of (startIndex, rawWord, word) 3-tuples for the text
+            -- see BibleOrgSysGlobals.tokenizeWords.
+
+        The lists are cached (by text) so that discover, the checks, and comparisons
+            don't all have to tokenize the same book text again.
+            (The cache is limited to MAX_WORD_TOKEN_CACHE_ENTRIES, and isn't pickled with the book.)
+        """
+        try: return self._wordTokenCache[text]
+        except AttributeError: self._wordTokenCache = {} # Could be from an older pickled book
+        except KeyError: pass
+
+        tokens = BibleOrgSysGlobals.tokenizeWords( text )
+        if len(self._wordTokenCache) >= MAX_WORD_TOKEN_CACHE_ENTRIES: self._wordTokenCache = {}
+        self._wordTokenCache[text] = tokens
+        return tokens
+    # end of InternalBibleBook.getWordTokens
+
+
     def makeCVIndex( self ):
         """
         Index the InternalBibleBook processed lines InternalBibleEntryList for faster reference.
@@ -2018,14 +2202,14 @@ class InternalBibleBook:
                 if text: C = text.split()[0]
                 else:
                     validationErrors.append( '{} {}:{} '.format( self.BBB, C, V ) + _("Missing chapter number").format( self.BBB, C, V ) )
-                    logging.error( _("Missing chapter number after") + " {} {}:{}".format( self.BBB, C, V ) )
+                    logging.error( ErrorRecord( '', _("Missing chapter number after") + " {} {}:{}", self.BBB, C, V ) )
                     if C == '-1': C = '1' # Makes it more robust since we had a chapter marker at least
                 V = '0'
             elif marker == 'v':
                 if text: V = text.split()[0]
                 else:
                     validationErrors.append( '{} {}:{} '.format( self.BBB, C, V ) + _("Missing verse number").format( self.BBB, C, V ) )
-                    logging.error( _("Missing verse number after") + " {} {}:{}".format( self.BBB, C, V ) )
+                    logging.error( ErrorRecord( '', _("Missing verse number after") + " {} {}:{}", self.BBB, C, V ) )
             elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
 
             # Temporarily substitute some markers just to make this check go easier
@@ -2038,32 +2222,32 @@ class InternalBibleBook:
 
             # Do a rough check of the SFMs
             if marker=='id' and j!=0:
-                validationErrors.append( lineLocationSpace + _("Marker 'id' should only appear as the first marker in a book but found on line {} in {}: {}").format( j+1, marker, text ) )
-                logging.error( _("Marker 'id' should only appear as the first marker in a book but found on line {} after {} {}:{} in {}: {}").format( j+1, self.BBB, C, V, marker, text ) )
+                validationErrors.append( ErrorRecord( lineLocationSpace, _("Marker 'id' should only appear as the first marker in a book but found on line {} in {}: {}"), j+1, marker, text ) )
+                logging.error( ErrorRecord( '', _("Marker 'id' should only appear as the first marker in a book but found on line {} after {} {}:{} in {}: {}"), j+1, self.BBB, C, V, marker, text ) )
                 self.addPriorityError( 99, C, V, _("'id' marker should only be in first line of file") )
             #if ( marker[0]=='¬' and marker not in BOS_END_MARKERS and not BibleOrgSysGlobals.USFMMarkers.isNewlineMarker( marker[1:] ) ) \
             if ( marker[0]=='¬' and marker not in BOS_END_MARKERS ) \
             or ( marker[0]!='¬' and marker not in ('c#','vp#',) and marker not in BOS_ADDED_NESTING_MARKERS and not BibleOrgSysGlobals.USFMMarkers.isNewlineMarker( marker ) ):
-                validationErrors.append( lineLocationSpace + _("Unexpected {!r} newline marker in Bible book (Text is {!r})").format( marker, text ) )
-                logging.warning( _("Unexpected {!r} newline marker in Bible book after {} {}:{} (Text is {!r})").format( marker, self.BBB, C, V, text ) )
-                self.addPriorityError( 80, C, V, _("Marker {!r} not expected at beginning of line").format( marker ) )
+                validationErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected {!r} newline marker in Bible book (Text is {!r})"), marker, text ) )
+                logging.warning( ErrorRecord( '', _("Unexpected {!r} newline marker in Bible book after {} {}:{} (Text is {!r})"), marker, self.BBB, C, V, text ) )
+                self.addPriorityError( 80, C, V, _("Marker {!r} not expected at beginning of line"), marker )
             if BibleOrgSysGlobals.USFMMarkers.isDeprecatedMarker( marker ):
-                validationErrors.append( lineLocationSpace + _("Deprecated {!r} newline marker in Bible book (Text is {!r})").format( marker, text ) )
-                logging.warning( _("Deprecated {!r} newline marker in Bible book after {} {}:{} (Text is {!r})").format( marker, self.BBB, C, V, text ) )
-                self.addPriorityError( 90, C, V, _("Newline marker {!r} is deprecated in USFM standard").format( marker ) )
+                validationErrors.append( ErrorRecord( lineLocationSpace, _("Deprecated {!r} newline marker in Bible book (Text is {!r})"), marker, text ) )
+                logging.warning( ErrorRecord( '', _("Deprecated {!r} newline marker in Bible book after {} {}:{} (Text is {!r})"), marker, self.BBB, C, V, text ) )
+                self.addPriorityError( 90, C, V, _("Newline marker {!r} is deprecated in USFM standard"), marker )
             markerList = BibleOrgSysGlobals.USFMMarkers.getMarkerListFromText( text )
             #if markerList: print( "\nText = {}:{!r}".format(marker,text)); print( markerList )
             for insideMarker, iMIndex, nextSignificantChar, fullMarker, characterContext, endIndex, markerField in markerList: # check character markers
                 if BibleOrgSysGlobals.USFMMarkers.isDeprecatedMarker( insideMarker ):
-                    validationErrors.append( lineLocationSpace + _("Deprecated {!r} internal marker in Bible book (Text is {!r})").format( insideMarker, text ) )
-                    logging.warning( _("Deprecated {!r} internal marker in Bible book after {} {}:{} (Text is {!r})").format( insideMarker, self.BBB, C, V, text ) )
-                    self.addPriorityError( 89, C, V, _("Internal marker {!r} is deprecated in USFM standard").format( insideMarker ) )
+                    validationErrors.append( ErrorRecord( lineLocationSpace, _("Deprecated {!r} internal marker in Bible book (Text is {!r})"), insideMarker, text ) )
+                    logging.warning( ErrorRecord( '', _("Deprecated {!r} internal marker in Bible book after {} {}:{} (Text is {!r})"), insideMarker, self.BBB, C, V, text ) )
+                    self.addPriorityError( 89, C, V, _("Internal marker {!r} is deprecated in USFM standard"), insideMarker )
             ix = 0
             for insideMarker, iMIndex, nextSignificantChar, fullMarker, characterContext, endIndex, markerField in markerList: # check newline markers
                 if BibleOrgSysGlobals.USFMMarkers.isNewlineMarker(insideMarker):
-                    validationErrors.append( lineLocationSpace + _("Marker {!r} must not appear within line in {}: {}").format( insideMarker, marker, text ) )
-                    logging.error( _("Marker {!r} must not appear within line after {} {}:{} in {}: {}").format( insideMarker, self.BBB, C, V, marker, text ) )
-                    self.addPriorityError( 90, C, V, _("Newline marker {!r} should be at start of line").format( insideMarker ) )
+                    validationErrors.append( ErrorRecord( lineLocationSpace, _("Marker {!r} must not appear within line in {}: {}"), insideMarker, marker, text ) )
+                    logging.error( ErrorRecord( '', _("Marker {!r} must not appear within line after {} {}:{} in {}: {}"), insideMarker, self.BBB, C, V, marker, text ) )
+                    self.addPriorityError( 90, C, V, _("Newline marker {!r} should be at start of line"), insideMarker )
 
         if validationErrors: self.errorDictionary['Validation Errors'] = validationErrors
     # end of InternalBibleBook.validateMarkers
@@ -2206,25 +2390,25 @@ class InternalBibleBook:
                 chapterText = text.strip()
                 if ' ' in chapterText: # Seems that we can have footnotes here :)
                     versificationErrors.append( "{} {}:{} ".format( self.BBB, chapterText, verseNumberString ) + _("Unexpected space in USFM chapter number field {!r}").format( self.BBB, lastChapterNumber, lastVerseNumberString, chapterText, lastChapterNumber ) )
-                    logging.info( _("Unexpected space in USFM chapter number field {!r} after chapter {} of {}").format( chapterText, lastChapterNumber, self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Unexpected space in USFM chapter number field {!r} after chapter {} of {}"), chapterText, lastChapterNumber, self.BBB ) )
                     chapterText = chapterText.split( None, 1)[0]
                 #print( "{} chapter {}".format( self.BBB, chapterText ) )
                 chapterNumber = int( chapterText)
                 if chapterNumber != lastChapterNumber+1:
                     versificationErrors.append( _("{} ({} after {}) USFM chapter numbers out of sequence in Bible book").format( self.BBB, chapterNumber, lastChapterNumber ) )
-                    logging.error( _("USFM chapter numbers out of sequence in Bible book {} ({} after {})").format( self.BBB, chapterNumber, lastChapterNumber ) )
+                    logging.error( ErrorRecord( '', _("USFM chapter numbers out of sequence in Bible book {} ({} after {})"), self.BBB, chapterNumber, lastChapterNumber ) )
                 lastChapterNumber = chapterNumber
                 verseText = verseNumberString = lastVerseNumberString = '0'
             elif marker == 'cp':
                 versificationErrors.append( "{} {}:{} ".format( self.BBB, chapterText, verseNumberString ) + _("Encountered cp field {}").format( self.BBB, chapterNumber, lastVerseNumberString, text ) )
-                logging.warning( _("Encountered cp field {} after {}:{} of {}").format( text, chapterNumber, lastVerseNumberString, self.BBB ) )
+                logging.warning( ErrorRecord( '', _("Encountered cp field {} after {}:{} of {}"), text, chapterNumber, lastVerseNumberString, self.BBB ) )
             elif marker == 'v':
                 if chapterText == '0':
                     versificationErrors.append( _("{} {} Missing chapter number field before verse {}").format( self.BBB, chapterText, text ) )
-                    logging.warning( _("Missing chapter number field before verse {} in chapter {} of {}").format( text, chapterText, self.BBB ) )
+                    logging.warning( ErrorRecord( '', _("Missing chapter number field before verse {} in chapter {} of {}"), text, chapterText, self.BBB ) )
                 if not text:
                     versificationErrors.append( _("{} {} Missing USFM verse number after v{}").format( self.BBB, chapterNumber, lastVerseNumberString ) )
-                    logging.warning( _("Missing USFM verse number after v{} in chapter {} of {}").format( lastVerseNumberString, chapterNumber, self.BBB ) )
+                    logging.warning( ErrorRecord( '', _("Missing USFM verse number after v{} in chapter {} of {}"), lastVerseNumberString, chapterNumber, self.BBB ) )
                     continue
                 verseText = text
                 doneWarning = False
@@ -2232,12 +2416,12 @@ class InternalBibleBook:
                     if char in verseText:
                         if not doneWarning:
                             versificationErrors.append( _("{} {} Removing letter(s) from USFM verse number {} in Bible book").format( self.BBB, chapterText, verseText ) )
-                            logging.info( _("Removing letter(s) from USFM verse number {} in Bible book {} {}").format( verseText, self.BBB, chapterText ) )
+                            logging.info( ErrorRecord( '', _("Removing letter(s) from USFM verse number {} in Bible book {} {}"), verseText, self.BBB, chapterText ) )
                             doneWarning = True
                         verseText = verseText.replace( char, '' )
                 if '-' in verseText or '–' in verseText: # we have a range like 7-9 with hyphen or en-dash
                     #versificationErrors.append( "{} {}:{} ".format( self.BBB, chapterText, verseNumberString ) + _("Encountered combined verses field {}").format( self.BBB, chapterNumber, lastVerseNumberString, verseText ) )
-                    logging.info( _("Encountered combined verses field {} after {}:{} of {}").format( verseText, chapterNumber, lastVerseNumberString, self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Encountered combined verses field {} after {}:{} of {}"), verseText, chapterNumber, lastVerseNumberString, self.BBB ) )
                     bits = verseText.replace('–','-').split( '-', 1 ) # Make sure that it's a hyphen then split once
                     verseNumberString, verseNumber = bits[0], 0
                     endVerseNumberString, endVerseNumber = bits[1], 0
@@ -2245,20 +2429,20 @@ class InternalBibleBook:
                         verseNumber = int( verseNumberString )
                     except ValueError:
                         versificationErrors.append( _("{} {} Invalid USFM verse range start {!r} in {!r} in Bible book").format( self.BBB, chapterText, verseNumberString, verseText ) )
-                        logging.error( _("Invalid USFM verse range start {!r} in {!r} in Bible book {} {}").format( verseNumberString, verseText, self.BBB, chapterText ) )
+                        logging.error( ErrorRecord( '', _("Invalid USFM verse range start {!r} in {!r} in Bible book {} {}"), verseNumberString, verseText, self.BBB, chapterText ) )
                     try:
                         endVerseNumber = int( endVerseNumberString )
                     except ValueError:
                         versificationErrors.append( _("{} {} Invalid USFM verse range end {!r} in {!r} in Bible book").format( self.BBB, chapterText, endVerseNumberString, verseText ) )
-                        logging.error( _("Invalid USFM verse range end {!r} in {!r} in Bible book {} {}").format( endVerseNumberString, verseText, self.BBB, chapterText ) )
+                        logging.error( ErrorRecord( '', _("Invalid USFM verse range end {!r} in {!r} in Bible book {} {}"), endVerseNumberString, verseText, self.BBB, chapterText ) )
                     if verseNumber >= endVerseNumber:
                         versificationErrors.append( _("{} {} ({}-{}) USFM verse range out of sequence in Bible book").format( self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
-                        logging.error( _("USFM verse range out of sequence in Bible book {} {} ({}-{})").format( self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
+                        logging.error( ErrorRecord( '', _("USFM verse range out of sequence in Bible book {} {} ({}-{})"), self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
                     #else:
                     combinedVerses.append( (chapterText, verseText,) )
                 elif ',' in verseText: # we have a range like 7,8
                     versificationErrors.append( "{} {}:{} ".format( self.BBB, chapterText, verseNumberString ) + _("Encountered comma combined verses field {}").format( self.BBB, chapterNumber, lastVerseNumberString, verseText ) )
-                    logging.info( _("Encountered comma combined verses field {} after {}:{} of {}").format( verseText, chapterNumber, lastVerseNumberString, self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Encountered comma combined verses field {} after {}:{} of {}"), verseText, chapterNumber, lastVerseNumberString, self.BBB ) )
                     bits = verseText.split( ',', 1 )
                     verseNumberString, verseNumber = bits[0], 0
                     endVerseNumberString, endVerseNumber = bits[1], 0
@@ -2266,15 +2450,15 @@ class InternalBibleBook:
                         verseNumber = int( verseNumberString )
                     except ValueError:
                         versificationErrors.append( _("{} {} Invalid USFM verse list start {!r} in {!r} in Bible book").format( self.BBB, chapterText, verseNumberString, verseText ) )
-                        logging.error( _("Invalid USFM verse list start {!r} in {!r} in Bible book {} {}").format( verseNumberString, verseText, self.BBB, chapterText ) )
+                        logging.error( ErrorRecord( '', _("Invalid USFM verse list start {!r} in {!r} in Bible book {} {}"), verseNumberString, verseText, self.BBB, chapterText ) )
                     try:
                         endVerseNumber = int( endVerseNumberString )
                     except ValueError:
                         versificationErrors.append( _("{} {} Invalid USFM verse list end {!r} in {!r} in Bible book").format( self.BBB, chapterText, endVerseNumberString, verseText ) )
-                        logging.error( _("Invalid USFM verse list end {!r} in {!r} in Bible book {} {}").format( endVerseNumberString, verseText, self.BBB, chapterText ) )
+                        logging.error( ErrorRecord( '', _("Invalid USFM verse list end {!r} in {!r} in Bible book {} {}"), endVerseNumberString, verseText, self.BBB, chapterText ) )
                     if verseNumber >= endVerseNumber:
                         versificationErrors.append( _("{} {} ({}-{}) USFM verse list out of sequence in Bible book").format( self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
-                        logging.error( _("USFM verse list out of sequence in Bible book {} {} ({}-{})").format( self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
+                        logging.error( ErrorRecord( '', _("USFM verse list out of sequence in Bible book {} {} ({}-{})"), self.BBB, chapterText, verseNumberString, endVerseNumberString ) )
                     #else:
                     combinedVerses.append( (chapterText, verseText,) )
                 else: # Should be just a single verse number
@@ -2284,7 +2468,7 @@ class InternalBibleBook:
                     verseNumber = int( verseNumberString )
                 except ValueError:
                     versificationErrors.append( _("{} {} {} Invalid verse number digits in Bible book").format( self.BBB, chapterText, verseNumberString ) )
-                    logging.error( _("Invalid verse number digits in Bible book {} {} {}").format( self.BBB, chapterText, verseNumberString ) )
+                    logging.error( ErrorRecord( '', _("Invalid verse number digits in Bible book {} {} {}"), self.BBB, chapterText, verseNumberString ) )
                     newString = ''
                     for char in verseNumberString:
                         if char.isdigit(): newString += char
@@ -2301,11 +2485,11 @@ class InternalBibleBook:
                 if verseNumber != lastVerseNumber+1:
                     if verseNumber <= lastVerseNumber:
                         versificationErrors.append( _("{} {} ({} after v{}) USFM verse numbers out of sequence in Bible book").format( self.BBB, chapterText, verseText, lastVerseNumberString ) )
-                        logging.warning( _("USFM verse numbers out of sequence in Bible book {} {} ({} after v{})").format( self.BBB, chapterText, verseText, lastVerseNumberString ) )
+                        logging.warning( ErrorRecord( '', _("USFM verse numbers out of sequence in Bible book {} {} ({} after v{})"), self.BBB, chapterText, verseText, lastVerseNumberString ) )
                         reorderedVerses.append( (chapterText, lastVerseNumberString, verseText,) )
                     else: # Must be missing some verse numbers
                         versificationErrors.append( _("{} {} Missing USFM verse number(s) between {} and {} in Bible book").format( self.BBB, chapterText, lastVerseNumberString, verseNumberString ) )
-                        logging.info( _("Missing USFM verse number(s) between {} and {} in Bible book {} {}").format( lastVerseNumberString, verseNumberString, self.BBB, chapterText ) )
+                        logging.info( ErrorRecord( '', _("Missing USFM verse number(s) between {} and {} in Bible book {} {}"), lastVerseNumberString, verseNumberString, self.BBB, chapterText ) )
                         for number in range( lastVerseNumber+1, verseNumber ):
                             omittedVerses.append( (chapterText, str(number),) )
                 lastVerseNumberString = endVerseNumberString
@@ -2390,11 +2574,8 @@ class InternalBibleBook:
             ## end of stripWordPunctuation
 
             # countWords() main code
-            words = segment.replace('—',' ').replace('–',' ').split() # Treat em-dash and en-dash as word break characters
-            for j,rawWord in enumerate(words):
+            for j,(ix,rawWord,word) in enumerate( self.getWordTokens( segment ) ): # Internal markers already removed
                 if marker=='c' or marker=='v' and j==1 and rawWord.isdigit(): continue # Ignore the chapter and verse numbers (except ones like 6a)
-                word = rawWord
-                for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
                 word = BibleOrgSysGlobals.stripWordPunctuation( word )
                 if word and not word[0].isalnum():
                     #print( word, BibleOrgSysGlobals.stripWordPunctuation( word ) )
@@ -2512,13 +2693,13 @@ class InternalBibleBook:
                     #or ( aKey=='chapterCount' and bkDict[aKey]==1 ) # Some people put a chapter count in their front matter, glossary, etc.
                 if bkDict[aKey] is not None and ( aKey!='chapterCount' or bkDict[aKey]!=1 ):
                     # Some people put a chapter count in their front matter, glossary, etc.
-                    logging.debug( "InternalBibleBook.discover: ToProgrammer -- Some wrong in {} here. Why? {!r} {!r}".format( self.BBB, aKey, bkDict[aKey] ) )
+                    logging.debug( ErrorRecord( '', "InternalBibleBook.discover: ToProgrammer -- Some wrong in {} here. Why? {!r} {!r}", self.BBB, aKey, bkDict[aKey] ) )
                 del bkDict[aKey]
         else: # Do some finalizing to do with verse counts
             if bkDict['verseCount'] is not None:
                 bkDict['percentageProgress'] = round( bkDict['completedVerseCount'] * 100 / bkDict['verseCount'] )
                 if bkDict['percentageProgress'] > 100:
-                    logging.info( "Adjusting percentageProgress from {} back to 100%".format( bkDict['percentageProgress'] ) )
+                    logging.info( ErrorRecord( '', "Adjusting percentageProgress from {} back to 100%", bkDict['percentageProgress'] ) )
                     bkDict['percentageProgress'] = 100
 
             #print( self.BBB, bkDict )
@@ -2577,7 +2758,7 @@ class InternalBibleBook:
                 #print( self.BBB, chapterNumberStr, marker, text )
                 if not text:
                     addedUnitErrors.append( _("{} {} Missing USFM verse number after v{}").format( self.BBB, chapterNumberStr, verseNumberStr ) )
-                    logging.warning( _("Missing USFM verse number after v{} in chapter {} of {}").format( verseNumberStr, chapterNumberStr, self.BBB ) )
+                    logging.warning( ErrorRecord( '', _("Missing USFM verse number after v{} in chapter {} of {}"), verseNumberStr, chapterNumberStr, self.BBB ) )
                     self.addPriorityError( 86, chapterNumberStr, verseNumberStr, _("Missing verse number") )
                     continue
                 verseNumberStr = text
@@ -2651,7 +2832,7 @@ class InternalBibleBook:
                 if reference in paragraphReferences:
                     if typical == 'F':
                         addedUnitNotices.append( _("{} {} Paragraph break is less common after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Paragraph break is less common after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Paragraph break is less common after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 17, C, V, _("Less common to have a paragraph break after field") )
                         #print( "Surprise", self.BBB, reference, typical, present )
                     elif typical == 'S' and severe:
@@ -2660,7 +2841,7 @@ class InternalBibleBook:
                 else: # we didn't have it
                     if typical == 'A':
                         addedUnitNotices.append( _("{} {} Paragraph break normally inserted after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Paragraph break normally inserted after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Paragraph break normally inserted after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 27, C, V, _("Paragraph break normally inserted after field") )
                         #print( "All", self.BBB, reference, typical, present )
                     elif typical == 'M' and severe:
@@ -2672,13 +2853,13 @@ class InternalBibleBook:
                     C, V = reference[0], reference[1]
                     if len(reference)==3: V += reference[2] # append the suffix
                     addedUnitNotices.append( _("{} {} Paragraph break is unusual after v{}").format( self.BBB, C, V ) )
-                    logging.info( _("Paragraph break is unusual after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Paragraph break is unusual after v{} in chapter {} of {}"), V, C, self.BBB ) )
                     self.addPriorityError( 37, C, V, _("Unusual to have a paragraph break after field") )
                     #print( "Weird paragraph after", self.BBB, reference )
         else: # We don't have any info for this book
             addedUnitNotices.append( _("{} has no paragraph info available").format( self.BBB ) )
-            logging.info( _("{} No paragraph info available").format( self.BBB ) )
-            self.addPriorityError( 3, '-', '-', _("No paragraph info for {!r} book").format( self.BBB ) )
+            logging.info( ErrorRecord( '', _("{} No paragraph info available"), self.BBB ) )
+            self.addPriorityError( 3, '-', '-', _("No paragraph info for {!r} book"), self.BBB )
         if addedUnitNotices:
             if 'Added Formatting' not in self.errorDictionary: self.errorDictionary['Added Formatting'] = OrderedDict() # So we hopefully get the most important errors first
             self.errorDictionary['Added Formatting']['Possible Paragraphing Errors'] = addedUnitNotices
@@ -2696,7 +2877,7 @@ class InternalBibleBook:
                 if reference in qReferences:
                     if typical == 'F':
                         addedUnitNotices.append( _("{} {} Quote Paragraph is less common after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Quote Paragraph is less common after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Quote Paragraph is less common after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 17, C, V, _("Less common to have a Quote Paragraph after field") )
                         #print( "Surprise", self.BBB, reference, typical, present )
                     elif typical == 'S' and severe:
@@ -2705,7 +2886,7 @@ class InternalBibleBook:
                 else: # we didn't have it
                     if typical == 'A':
                         addedUnitNotices.append( _("{} {} Quote Paragraph normally inserted after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Quote Paragraph normally inserted after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Quote Paragraph normally inserted after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 27, C, V, _("Quote Paragraph normally inserted after field") )
                         #print( "All", self.BBB, reference, typical, present )
                     elif typical == 'M' and severe:
@@ -2717,13 +2898,13 @@ class InternalBibleBook:
                     C, V = reference[0], reference[1]
                     if len(reference)==3: V += reference[2] # append the suffix
                     addedUnitNotices.append( _("{} {} Quote Paragraph is unusual after v{}").format( self.BBB, C, V ) )
-                    logging.info( _("Quote Paragraph is unusual after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Quote Paragraph is unusual after v{} in chapter {} of {}"), V, C, self.BBB ) )
                     self.addPriorityError( 37, C, V, _("Unusual to have a Quote Paragraph after field") )
                     #print( "Weird qParagraph after", self.BBB, reference )
         else: # We don't have any info for this book
             addedUnitNotices.append( _("{} has no quote paragraph info available").format( self.BBB ) )
-            logging.info( _("{} No quote paragraph info available").format( self.BBB ) )
-            self.addPriorityError( 3, '-', '-', _("No quote paragraph info for {!r} book").format( self.BBB ) )
+            logging.info( ErrorRecord( '', _("{} No quote paragraph info available"), self.BBB ) )
+            self.addPriorityError( 3, '-', '-', _("No quote paragraph info for {!r} book"), self.BBB )
         if addedUnitNotices:
             if 'Added Formatting' not in self.errorDictionary: self.errorDictionary['Added Formatting'] = OrderedDict() # So we hopefully get the most important errors first
             self.errorDictionary['Added Formatting']['Possible Indenting Errors'] = addedUnitNotices
@@ -2741,7 +2922,7 @@ class InternalBibleBook:
                 if reference in sectionHeadings:
                     if typical == 'F':
                         addedUnitNotices.append( _("{} {} Section Heading is less common after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Section Heading is less common after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Section Heading is less common after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 17, C, V, _("Less common to have a Section Heading after field") )
                         #print( "Surprise", self.BBB, reference, typical, present )
                     elif typical == 'S' and severe:
@@ -2750,7 +2931,7 @@ class InternalBibleBook:
                 else: # we didn't have it
                     if typical == 'A':
                         addedUnitNotices.append( _("{} {} Section Heading normally inserted after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Section Heading normally inserted after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Section Heading normally inserted after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 27, C, V, _("Section Heading normally inserted after field") )
                         #print( "All", self.BBB, reference, typical, present )
                     elif typical == 'M' and severe:
@@ -2763,13 +2944,13 @@ class InternalBibleBook:
                     C, V = reference[0], reference[1]
                     if len(reference)==3: V += reference[2] # append the suffix
                     addedUnitNotices.append( _("{} {} Section Heading is unusual after v{}").format( self.BBB, C, V ) )
-                    logging.info( _("Section Heading is unusual after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Section Heading is unusual after v{} in chapter {} of {}"), V, C, self.BBB ) )
                     self.addPriorityError( 37, C, V, _("Unusual to have a Section Heading after field") )
                     #print( "Weird section heading after", self.BBB, reference )
         else: # We don't have any info for this book
             addedUnitNotices.append( _("{} has no section heading info available").format( self.BBB ) )
-            logging.info( _("{} No section heading info available").format( self.BBB ) )
-            self.addPriorityError( 3, '-', '-', _("No section heading info for {!r} book").format( self.BBB ) )
+            logging.info( ErrorRecord( '', _("{} No section heading info available"), self.BBB ) )
+            self.addPriorityError( 3, '-', '-', _("No section heading info for {!r} book"), self.BBB )
         if addedUnitNotices:
             if 'Added Formatting' not in self.errorDictionary: self.errorDictionary['Added Formatting'] = OrderedDict() # So we hopefully get the most important errors first
             self.errorDictionary['Added Formatting']['Possible Section Heading Errors'] = addedUnitNotices
@@ -2786,7 +2967,7 @@ class InternalBibleBook:
                 if reference in sectionReferences:
                     if typical == 'F':
                         addedUnitNotices.append( _("{} {} Section Reference is less common after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Section Reference is less common after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Section Reference is less common after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 17, C, V, _("Less common to have a Section Reference after field") )
                         #print( "Surprise", self.BBB, reference, typical, present )
                     elif typical == 'S' and severe:
@@ -2795,7 +2976,7 @@ class InternalBibleBook:
                 else: # we didn't have it
                     if typical == 'A':
                         addedUnitNotices.append( _("{} {} Section Reference normally inserted after v{}").format( self.BBB, C, V ) )
-                        logging.info( _("Section Reference normally inserted after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                        logging.info( ErrorRecord( '', _("Section Reference normally inserted after v{} in chapter {} of {}"), V, C, self.BBB ) )
                         self.addPriorityError( 27, C, V, _("Section Reference normally inserted after field") )
                         #print( "All", self.BBB, reference, typical, present )
                     elif typical == 'M' and severe:
@@ -2808,22 +2989,26 @@ class InternalBibleBook:
                     C, V = reference[0], reference[1]
                     if len(reference)==3: V += reference[2] # append the suffix
                     addedUnitNotices.append( _("{} {} Section Reference is unusual after v{}").format( self.BBB, C, V ) )
-                    logging.info( _("Section Reference is unusual after v{} in chapter {} of {}").format( V, C,self.BBB ) )
+                    logging.info( ErrorRecord( '', _("Section Reference is unusual after v{} in chapter {} of {}"), V, C, self.BBB ) )
                     self.addPriorityError( 37, C, V, _("Unusual to have a Section Reference after field") )
                     #print( "Weird Section Reference after", self.BBB, reference )
         else: # We don't have any info for this book
             addedUnitNotices.append( _("{} has no section reference info available").format( self.BBB ) )
-            logging.info( _("{} No section reference info available").format( self.BBB ) )
-            self.addPriorityError( 3, '-', '-', _("No section reference info for {!r} book").format( self.BBB ) )
+            logging.info( ErrorRecord( '', _("{} No section reference info available"), self.BBB ) )
+            self.addPriorityError( 3, '-', '-', _("No section reference info for {!r} book"), self.BBB )
         if addedUnitNotices:
             if 'Added Formatting' not in self.errorDictionary: self.errorDictionary['Added Formatting'] = OrderedDict() # So we hopefully get the most important errors first
             self.errorDictionary['Added Formatting']['Possible Section Reference Errors'] = addedUnitNotices
     # end of InternalBibleBook.doCheckAddedUnits
 
 
-    def doCheckSFMs( self, discoveryDict ):
+    def _checkSFMsVisitor( self, discoveryDict ):
         """
         Runs a number of comprehensive checks on the USFM codes in this Bible book.
+
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
         """
         allAvailableNewlineMarkers = BibleOrgSysGlobals.USFMMarkers.getNewlineMarkersList( 'Numbered' )
         allAvailableCharacterMarkers = BibleOrgSysGlobals.USFMMarkers.getCharacterMarkersList( includeEndMarkers=True )
@@ -2845,23 +3030,21 @@ class InternalBibleBook:
         newlineMarkerErrors, internalMarkerErrors, noteMarkerErrors = [], [], []
         functionalCounts = {}
         modifiedMarkerList = []
-        C, V = '-1', '-1' # So first/id line starts at -1:0
         section, lastMarker, lastModifiedMarker = '', '', None
         lastMarkerEmpty = True
-        for entry in self._processedLines:
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
             marker, originalMarker, text, extras = entry.getMarker(), entry.getOriginalMarker(), entry.getText(), entry.getExtras()
             markerEmpty = not text
-            # Keep track of where we are for more helpful error messages
+            # Count the chapters and verses
             if marker=='c' and text:
-                C, V = text.split()[0], '0'
                 functionalCounts['Chapters'] = 1 if 'Chapters' not in functionalCounts else (functionalCounts['Chapters'] + 1)
             elif marker=='v' and text:
-                V = text.split()[0]
                 functionalCounts['Verses'] = 1 if 'Verses' not in functionalCounts else (functionalCounts['Verses'] + 1)
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
 
             # Do other useful functional counts
             if marker=='id':
@@ -2883,11 +3066,11 @@ class InternalBibleBook:
                         #else: # we've reached our limit
                             #logging.warning( _('doCheckSFMs: Additional "Marker should always have text" messages suppressed for {} {}').format( self.workName, self.BBB ) )
                             #self.sahtCount = -1 # So we don't do this again (for this book)
-                self.addPriorityError( emptyFieldPriority, C, V, _("Marker \\{} should always have text").format( originalMarker ) )
+                addPriorityError( emptyFieldPriority, C, V, _("Marker \\{} should always have text"), originalMarker )
                 if emptyFieldPriority >= HIGH_EMPTY_FIELD_PRIORITY:
-                    newlineMarkerErrors.append( lineLocationSpace + _("Marker {!r} has no content").format( marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker {!r} has no content"), marker ) )
                 else:
-                    newlineMarkerErrors.append( lineLocationSpace + _("Marker {!r} should always have text").format( originalMarker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker {!r} should always have text"), originalMarker ) )
                 if logger is not None:
                     logger( _("Marker {!r} has no content after").format( marker ) + " {} {}:{}".format( self.BBB, C, V ) )
 
@@ -2918,31 +3101,31 @@ class InternalBibleBook:
 
             # Check the progression through the various sections
             try: newSection = BibleOrgSysGlobals.USFMMarkers.markerOccursIn( marker if marker!='v~' else 'v' )
-            except KeyError: logging.error( "IBB:doCheckSFMs: markerOccursIn failed for {!r}".format( marker ) )
+            except KeyError: logging.error( ErrorRecord( '', "IBB:doCheckSFMs: markerOccursIn failed for {!r}", marker ) )
             if newSection != section: # Check changes into new sections
                 #print( "{} {}:{} {} takes us from {} to {}".format( self.BBB, C, V, marker, section, newSection ) )
 
                 if section=='' and newSection!='Header':
                     if discoveryDict and 'haveMainHeadings' in discoveryDict and discoveryDict['haveMainHeadings']:
-                        newlineMarkerErrors.append( lineLocationSpace + _("Missing Header section (went straight to {} section with {} marker)").format( newSection, marker ) )
+                        newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Missing Header section (went straight to {} section with {} marker)"), newSection, marker ) )
                 elif section!='' and newSection=='Header':
-                    newlineMarkerErrors.append( lineLocationSpace + _("Didn't expect {} section after {} section (with {} marker)").format( newSection, section, marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Didn't expect {} section after {} section (with {} marker)"), newSection, section, marker ) )
 
                 if section=='Header' and newSection!='Introduction':
                     if discoveryDict and 'haveIntroductoryText' in discoveryDict and discoveryDict['haveIntroductoryText']:
-                        newlineMarkerErrors.append( lineLocationSpace + _("Missing Introduction section (went from {} straight to {} section with {} marker)").format( section, newSection, marker ) )
-                elif section!='Header' and newSection=='Introduction': newlineMarkerErrors.append( lineLocationSpace + _("Didn't expect {} section after {} section (with {} marker)").format( newSection, section, marker ) )
+                        newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Missing Introduction section (went from {} straight to {} section with {} marker)"), section, newSection, marker ) )
+                elif section!='Header' and newSection=='Introduction': newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Didn't expect {} section after {} section (with {} marker)"), newSection, section, marker ) )
                 if section=='Introduction' and newSection!='Numbering':
-                    newlineMarkerErrors.append( lineLocationSpace + _("Missing Numbering section (went from {} straight to {} section with {} marker)").format( section, newSection, marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Missing Numbering section (went from {} straight to {} section with {} marker)"), section, newSection, marker ) )
                 if section=='Numbering' and newSection not in ('Text','Canonical Text','Text, Poetry',):
-                    newlineMarkerErrors.append( lineLocationSpace + _("Missing Text section (went from {} straight to {} section with {} marker)").format( section, newSection, marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Missing Text section (went from {} straight to {} section with {} marker)"), section, newSection, marker ) )
                 if section=='Text' and newSection not in ('Canonical Text','Text, Poetry',):
-                    newlineMarkerErrors.append( lineLocationSpace + _("Unexpected section after {} section (went to {} section with {} marker)").format( section, newSection, marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected section after {} section (went to {} section with {} marker)"), section, newSection, marker ) )
                 #elif section!='Text' and newSection=='Text, Poetry':
                     #newlineMarkerErrors.append( lineLocationSpace + _("Didn't expect {} section after {} section (with {} marker)").format( newSection, section, marker ) )
 
                 if newSection=='Text' and section not in ('Introduction','Numbering','Canonical Text','Text, Poetry',):
-                    newlineMarkerErrors.append( lineLocationSpace + _("DDidn't expect {} section after {} section (with {} marker)").format( newSection, section, marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("DDidn't expect {} section after {} section (with {} marker)"), newSection, section, marker ) )
                 #print( "section", newSection )
                 section = newSection
 
@@ -2956,7 +3139,7 @@ class InternalBibleBook:
 
             # Check for known bad combinations
             if marker=='nb' and lastMarker in ('s','s1','s2','s3','s4','s5', 'qa'):
-                newlineMarkerErrors.append( lineLocationSpace + _("'nb' not allowed immediately after {!r} section heading").format( marker ) )
+                newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("'nb' not allowed immediately after {!r} section heading"), marker ) )
             if self.checkUSFMSequencesFlag: # Check for known good combinations
                 commonGoodNewlineMarkerCombinations = (
                     # If a marker has nothing after it, it must contain data
@@ -2998,34 +3181,34 @@ class InternalBibleBook:
                 if lastMarkerEmpty and markerEmpty:
                     if (lastMarker+'=E',marker+'=E') not in commonGoodNewlineMarkerCombinations:
                         if (lastMarker+'=E',marker+'=E') in rarerGoodNewlineMarkerCombinations:
-                            newlineMarkerErrors.append( lineLocationSpace + _("(Warning only) Empty {!r} not commonly used following empty {!r} marker").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("(Warning only) Empty {!r} not commonly used following empty {!r} marker"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("(Warning only) Empty {!r} not commonly used following empty {!r} marker").format( marker, lastMarker ) )
                         else:
-                            newlineMarkerErrors.append( lineLocationSpace + _("Empty {!r} not normally used following empty {!r} marker").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Empty {!r} not normally used following empty {!r} marker"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("Empty {!r} not normally used following empty {!r} marker").format( marker, lastMarker ) )
                 elif lastMarkerEmpty and not markerEmpty and marker!='rem':
                     if (lastMarker+'=E',marker) not in commonGoodNewlineMarkerCombinations:
                         if (lastMarker+'=E',marker) in rarerGoodNewlineMarkerCombinations:
-                            newlineMarkerErrors.append( lineLocationSpace + _("(Warning only) {!r} with text not commonly used following empty {!r} marker").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("(Warning only) {!r} with text not commonly used following empty {!r} marker"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("(Warning only) {!r} with text not commonly used following empty {!r} marker").format( marker, lastMarker ) )
                         else:
-                            newlineMarkerErrors.append( lineLocationSpace + _("{!r} with text not normally used following empty {!r} marker").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("{!r} with text not normally used following empty {!r} marker"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("{!r} with text not normally used following empty {!r} marker").format( marker, lastMarker ) )
                 elif not lastMarkerEmpty and markerEmpty and lastMarker!='rem':
                     if (lastMarker,marker+'=E') not in commonGoodNewlineMarkerCombinations:
                         if (lastMarker,marker+'=E') in rarerGoodNewlineMarkerCombinations:
-                            newlineMarkerErrors.append( lineLocationSpace + _("(Warning only) Empty {!r} not commonly used following {!r} with text").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("(Warning only) Empty {!r} not commonly used following {!r} with text"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("(Warning only) Empty {!r} not commonly used following {!r} with text").format( marker, lastMarker ) )
                         else:
-                            newlineMarkerErrors.append( lineLocationSpace + _("Empty {!r} not normally used following {!r} with text").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Empty {!r} not normally used following {!r} with text"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("Empty {!r} not normally used following {!r} with text").format( marker, lastMarker ) )
                 elif lastMarker!='rem' and marker!='rem': # both not empty
                     if (lastMarker,marker) not in commonGoodNewlineMarkerCombinations:
                         if (lastMarker,marker) in rarerGoodNewlineMarkerCombinations:
-                            newlineMarkerErrors.append( lineLocationSpace + _("(Warning only) {!r} with text not commonly used following {!r} with text").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("(Warning only) {!r} with text not commonly used following {!r} with text"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("(Warning only) {!r} with text not commonly used following {!r} with text").format( marker, lastMarker ) )
                         else:
-                            newlineMarkerErrors.append( lineLocationSpace + _("{!r} with text not normally used following {!r} with text").format( marker, lastMarker ) )
+                            newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("{!r} with text not normally used following {!r} with text"), marker, lastMarker ) )
                             #print( lineLocationSpace + _("{!r} with text not normally used following {!r} with text").format( marker, lastMarker ) )
 
             markerShouldHaveContent = BibleOrgSysGlobals.USFMMarkers.markerShouldHaveContent( marker )
@@ -3054,43 +3237,43 @@ class InternalBibleBook:
                         if internalMarker and internalMarker[-1] == '*':
                             closedMarkerText = internalMarker[:-1]
                             shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( closedMarkerText )
-                            if shouldBeClosed == 'N': internalMarkerErrors.append( lineLocationSpace + _("Marker {} cannot be closed").format( closedMarkerText ) )
+                            if shouldBeClosed == 'N': internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker {} cannot be closed"), closedMarkerText ) )
                             elif hierarchy and hierarchy[-1] == closedMarkerText: hierarchy.pop(); continue # all ok
-                            elif closedMarkerText in hierarchy: internalMarkerErrors.append( lineLocationSpace + _("Internal markers appear to overlap: {}").format( internalTextMarkers ) )
-                            else: internalMarkerErrors.append( lineLocationSpace + _("Unexpected internal closing marker: {} in {}").format( internalMarker, internalTextMarkers ) )
+                            elif closedMarkerText in hierarchy: internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Internal markers appear to overlap: {}"), internalTextMarkers ) )
+                            else: internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected internal closing marker: {} in {}"), internalMarker, internalTextMarkers ) )
                         else: # it's not a closing marker
                             shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( internalMarker )
                             if shouldBeClosed == 'N': continue # N for never
                             else: hierarchy.append( internalMarker ) # but what if it's optional ????????????????????????????????
                     if hierarchy: # it should be empty
-                        internalMarkerErrors.append( lineLocationSpace + _("These markers {} appear not to be closed in {}").format( hierarchy, internalTextMarkers ) )
+                        internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("These markers {} appear not to be closed in {}"), hierarchy, internalTextMarkers ) )
 
                 if markerShouldHaveContent == 'N': # Never
-                    newlineMarkerErrors.append( lineLocationSpace + _("Marker {!r} should not have content: {!r}").format( marker, text ) )
-                    logging.warning( _("Marker {!r} should not have content after {} {}:{} with: {!r}").format( marker, self.BBB, C, V, text ) )
-                    self.addPriorityError( 83, C, V, _("Marker {} shouldn't have content").format( marker ) )
+                    newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker {!r} should not have content: {!r}"), marker, text ) )
+                    logging.warning( ErrorRecord( '', _("Marker {!r} should not have content after {} {}:{} with: {!r}"), marker, self.BBB, C, V, text ) )
+                    addPriorityError( 83, C, V, _("Marker {} shouldn't have content"), marker )
                 markerList = BibleOrgSysGlobals.USFMMarkers.getMarkerListFromText( text )
                 #if markerList: print( "\nText {} {}:{} = {}:{!r}".format(self.BBB, C, V, marker, text)); print( markerList )
                 openList = []
                 for insideMarker, iMIndex, nextSignificantChar, fullMarker, characterContext, endIndex, markerField in markerList: # check character markers
                     if not BibleOrgSysGlobals.USFMMarkers.isInternalMarker( insideMarker ): # these errors have probably been noted already
-                        internalMarkerErrors.append( lineLocationSpace + _("Non-internal {} marker in {}: {}").format( insideMarker, marker, text ) )
-                        logging.warning( _("Non-internal {} marker after {} {}:{} in {}: {}").format( insideMarker, self.BBB, C, V, marker, text ) )
-                        self.addPriorityError( 66, C, V, _("Non-internal {} marker").format( insideMarker, ) )
+                        internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Non-internal {} marker in {}: {}"), insideMarker, marker, text ) )
+                        logging.warning( ErrorRecord( '', _("Non-internal {} marker after {} {}:{} in {}: {}"), insideMarker, self.BBB, C, V, marker, text ) )
+                        addPriorityError( 66, C, V, _("Non-internal {} marker"), insideMarker )
                     else:
                         if not openList: # no open markers
                             if nextSignificantChar in ('',' '): openList.append( insideMarker ) # Got a new marker
                             else:
-                                internalMarkerErrors.append( lineLocationSpace + _("Unexpected {}{} marker in {}: {}").format( insideMarker, nextSignificantChar, marker, text ) )
-                                logging.warning( _("Unexpected {}{} marker after {} {}:{} in {}: {}").format( insideMarker, nextSignificantChar, self.BBB, C, V, marker, text ) )
-                                self.addPriorityError( 66, C, V, _("Unexpected {}{} marker").format( insideMarker, nextSignificantChar ) )
+                                internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected {}{} marker in {}: {}"), insideMarker, nextSignificantChar, marker, text ) )
+                                logging.warning( ErrorRecord( '', _("Unexpected {}{} marker after {} {}:{} in {}: {}"), insideMarker, nextSignificantChar, self.BBB, C, V, marker, text ) )
+                                addPriorityError( 66, C, V, _("Unexpected {}{} marker"), insideMarker, nextSignificantChar )
                         else: # have at least one open marker
                             if nextSignificantChar=='*':
                                 if insideMarker==openList[-1]: openList.pop() # We got the correct closing marker
                                 else:
-                                    internalMarkerErrors.append( lineLocationSpace + _("Wrong {}* closing marker for {} in {}: {}").format( insideMarker, openList[-1], marker, text ) )
-                                    logging.warning( _("Wrong {}* closing marker for {} after {} {}:{} in {}: {}").format( insideMarker, openList[-1], self.BBB, C, V, marker, text ) )
-                                    self.addPriorityError( 66, C, V, _("Wrong {}* closing marker for {}").format( insideMarker, openList[-1] ) )
+                                    internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Wrong {}* closing marker for {} in {}: {}"), insideMarker, openList[-1], marker, text ) )
+                                    logging.warning( ErrorRecord( '', _("Wrong {}* closing marker for {} after {} {}:{} in {}: {}"), insideMarker, openList[-1], self.BBB, C, V, marker, text ) )
+                                    addPriorityError( 66, C, V, _("Wrong {}* closing marker for {}"), insideMarker, openList[-1] )
                             else: # it's not an asterisk so appears to be another marker
                                 if not BibleOrgSysGlobals.USFMMarkers.isNestingMarker( openList[-1] ): openList.pop() # Let this marker close the last one
                                 openList.append( insideMarker ) # Now have multiple entries in the openList
@@ -3098,14 +3281,14 @@ class InternalBibleBook:
                     closedFlag = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( openList[0] )
                     if closedFlag != 'A': # always
                         if closedFlag == 'S': # sometimes
-                            internalMarkerErrors.append( lineLocationSpace + _("Marker(s) {} don't appear to be (optionally) closed in {}: {}").format( openList, marker, text ) )
-                            logging.info( _("Marker(s) {} don't appear to be (optionally) closed after {} {}:{} in {}: {}").format( openList, self.BBB, C, V, marker, text ) )
-                            self.addPriorityError( 26, C, V, _("Marker(s) {} isn't closed").format( openList ) )
+                            internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker(s) {} don't appear to be (optionally) closed in {}: {}"), openList, marker, text ) )
+                            logging.info( ErrorRecord( '', _("Marker(s) {} don't appear to be (optionally) closed after {} {}:{} in {}: {}"), openList, self.BBB, C, V, marker, text ) )
+                            addPriorityError( 26, C, V, _("Marker(s) {} isn't closed"), openList )
                         openList.pop() # This marker can (always or sometimes) be closed by the end of line
                 if openList:
-                    internalMarkerErrors.append( lineLocationSpace + _("Marker(s) {} don't appear to be closed in {}: {}").format( openList, marker, text ) )
-                    logging.warning( _("Marker(s) {} don't appear to be closed after {} {}:{} in {}: {}").format( openList, self.BBB, C, V, marker, text ) )
-                    self.addPriorityError( 36, C, V, _("Marker(s) {} should be closed").format( openList ) )
+                    internalMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker(s) {} don't appear to be closed in {}: {}"), openList, marker, text ) )
+                    logging.warning( ErrorRecord( '', _("Marker(s) {} don't appear to be closed after {} {}:{} in {}: {}"), openList, self.BBB, C, V, marker, text ) )
+                    addPriorityError( 36, C, V, _("Marker(s) {} should be closed"), openList )
                     if len(openList) == 1: text += '\\' + openList[-1] + '*' # Try closing the last one for them
             # The following is handled above
             #else: # There's no text
@@ -3130,13 +3313,13 @@ class InternalBibleBook:
                         assert extraType in BOS_EXTRA_TYPES
                     extraName = 'footnote' if extraType=='fn' else 'cross-reference'
                     if '\\f ' in extraText or '\\f*' in extraText or '\\x ' in extraText or '\\x*' in extraText: # Only the contents of these fields should be in extras
-                        newlineMarkerErrors.append( lineLocationSpace + _("Programming error with extras: {}").format( extraText ) )
-                        logging.warning( _("Programming error with {} notes after").format( extraText ) + " {} {}:{}".format( self.BBB, C, V ) )
-                        self.addPriorityError( 99, C, V, _("Extras {} have a programming error").format( extraText ) )
+                        newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Programming error with extras: {}"), extraText ) )
+                        logging.warning( ErrorRecord( '', _("Programming error with {} notes after") + " {} {}:{}", extraText, self.BBB, C, V ) )
+                        addPriorityError( 99, C, V, _("Extras {} have a programming error"), extraText )
                         continue # we have a programming error -- just skip this one
                     thisExtraMarkers = []
                     if '\\\\' in extraText:
-                        noteMarkerErrors.append( lineLocationSpace + _("doubled backslash characters in  {}: {}").format( extraType, extraText ) )
+                        noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("doubled backslash characters in  {}: {}"), extraType, extraText ) )
                         while '\\\\' in extraText: extraText = extraText.replace( '\\\\', '\\' )
                     #if '  ' in extraText:
                     #    noteMarkerErrors.append( lineLocationSpace + _("doubled space characters in  {}: {}").format( extraType, extraText ) )
@@ -3164,10 +3347,10 @@ class InternalBibleBook:
                                 closedMarkerText = extraMarker[:-1]
                                 shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( closedMarkerText )
                                 #print( "here with", extraType, extraText, thisExtraMarkers, hierarchy, closedMarkerText, shouldBeClosed )
-                                if shouldBeClosed == 'N': noteMarkerErrors.append( lineLocationSpace + _("Marker {} is not closeable").format( closedMarkerText ) )
+                                if shouldBeClosed == 'N': noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Marker {} is not closeable"), closedMarkerText ) )
                                 elif hierarchy and hierarchy[-1] == closedMarkerText: hierarchy.pop(); continue # all ok
-                                elif closedMarkerText in hierarchy: noteMarkerErrors.append( lineLocationSpace + _("Internal {} markers appear to overlap: {}").format( extraName, thisExtraMarkers ) )
-                                else: noteMarkerErrors.append( lineLocationSpace + _("Unexpected {} closing marker: {} in {}").format( extraName, extraMarker, thisExtraMarkers ) )
+                                elif closedMarkerText in hierarchy: noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Internal {} markers appear to overlap: {}"), extraName, thisExtraMarkers ) )
+                                else: noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected {} closing marker: {} in {}"), extraName, extraMarker, thisExtraMarkers ) )
                             else: # it's not a closing marker -- for extras, it probably automatically closes the previous marker
                                 shouldBeClosed = BibleOrgSysGlobals.USFMMarkers.markerShouldBeClosed( extraMarker )
                                 if shouldBeClosed == 'N': continue # N for never
@@ -3181,14 +3364,14 @@ class InternalBibleBook:
                             hierarchy.pop()
                         if hierarchy: # it should be empty
                             #print( "here with remaining", extraType, extraText, thisExtraMarkers, hierarchy )
-                            noteMarkerErrors.append( lineLocationSpace + _("These {} markers {} appear not to be closed in {}").format( extraName, hierarchy, extraText ) )
+                            noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("These {} markers {} appear not to be closed in {}"), extraName, hierarchy, extraText ) )
                     adjExtraMarkers = thisExtraMarkers
                     for uninterestingMarker in allAvailableCharacterMarkers: # Remove character formatting markers so we can check the footnote/xref hierarchy
                         while uninterestingMarker in adjExtraMarkers: adjExtraMarkers.remove( uninterestingMarker )
                     if adjExtraMarkers and adjExtraMarkers not in BibleOrgSysGlobals.USFMMarkers.getTypicalNoteSets( extraType ):
                         #print( "Got", extraType, extraText, thisExtraMarkers )
-                        if thisExtraMarkers: noteMarkerErrors.append( lineLocationSpace + _("Unusual {} marker set: {} in {}").format( extraName, thisExtraMarkers, extraText ) )
-                        else: noteMarkerErrors.append( lineLocationSpace + _("Missing {} formatting in {}").format( extraName, extraText ) )
+                        if thisExtraMarkers: noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Unusual {} marker set: {} in {}"), extraName, thisExtraMarkers, extraText ) )
+                        else: noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("Missing {} formatting in {}"), extraName, extraText ) )
 
                     # Moved to checkNotes
                     #if len(extraText) > 2 and extraText[1] == ' ':
@@ -3209,6 +3392,7 @@ class InternalBibleBook:
             lastMarker, lastMarkerEmpty = marker, markerEmpty
 
 
+        for args in priorityErrors: self.addPriorityError( *args )
         # Check the relative ordering of newline markers
         #print( "modifiedMarkerList", modifiedMarkerList, self.BBB )
         if self.objectTypeString in ('USFM2','USFM3','USX'):
@@ -3231,7 +3415,7 @@ class InternalBibleBook:
 
         for otherHeaderMarker in ( 'ide','sts', ):
             if otherHeaderMarker in modifiedMarkerList and modifiedMarkerList.index(otherHeaderMarker) > 8:
-                newlineMarkerErrors.append( lineLocationSpace + _("USFM {!r} field in file should have been earlier in {}…").format( otherHeaderMarker, modifiedMarkerList[:10] ) )
+                newlineMarkerErrors.append( ErrorRecord( lineLocationSpace, _("USFM {!r} field in file should have been earlier in {}…"), otherHeaderMarker, modifiedMarkerList[:10] ) )
         if 'mt2' in modifiedMarkerList: # Must be before or after a mt1
             ix = modifiedMarkerList.index( 'mt2' )
             if (ix==0 or modifiedMarkerList[ix-1]!='mt1') and (ix==len(modifiedMarkerList)-1 or modifiedMarkerList[ix+1]!='mt1'):
@@ -3261,11 +3445,16 @@ class InternalBibleBook:
             self.errorDictionary['USFMs']['All Footnote and Cross-Reference Internal Marker Counts'] = noteMarkerCounts
             self.errorDictionary['USFMs']['All Footnote and Cross-Reference Internal Marker Counts']['Total'] = total
         if functionalCounts: self.errorDictionary['USFMs']['Functional Marker Counts'] = functionalCounts
-    # end of InternalBibleBook.doCheckSFMs
+    # end of InternalBibleBook._checkSFMsVisitor
 
 
-    def doCheckCharacters( self ):
-        """Runs a number of checks on the characters used."""
+    def _checkCharactersVisitor( self, discoveryDict ):
+        """
+        Runs a number of checks on the characters used.
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
+        """
 
         def countCharacters( adjText ):
             """
@@ -3276,14 +3465,14 @@ class InternalBibleBook:
             nonlocal haveNonAsciiChars
             #print( "countCharacters: {!r}".format( adjText ) )
             if '  ' in adjText:
-                characterErrors.append( lineLocationSpace + _("Multiple spaces in {!r}").format( adjText.replace( '  ', '··' ) ) )
-                self.addPriorityError( 7, C, V, _("Multiple spaces in text line") )
+                characterErrors.append( ErrorRecord( lineLocationSpace, _("Multiple spaces in {!r}"), adjText.replace( '  ', '··' ) ) )
+                addPriorityError( 7, C, V, _("Multiple spaces in text line") )
             if '  ' in adjText:
-                characterErrors.append( lineLocationSpace + _("Multiple non-breaking spaces in {!r}").format( adjText.replace( '  ', '··' ) ) )
-                self.addPriorityError( 9, C, V, _("Multiple non-breaking spaces in text line") )
+                characterErrors.append( ErrorRecord( lineLocationSpace, _("Multiple non-breaking spaces in {!r}"), adjText.replace( '  ', '··' ) ) )
+                addPriorityError( 9, C, V, _("Multiple non-breaking spaces in text line") )
             if adjText[-1].isspace(): # Most trailing spaces have already been removed, but this can happen in a note after the markers have been removed
-                characterErrors.append( lineLocationSpace + _("Trailing space in {!r}").format( adjText ) )
-                self.addPriorityError( 5, C, V, _("Trailing space in text line") )
+                characterErrors.append( ErrorRecord( lineLocationSpace, _("Trailing space in {!r}"), adjText ) )
+                addPriorityError( 5, C, V, _("Trailing space in text line") )
                 #print( lineLocationSpace + _("Trailing space in {} {!r}").format( marker, adjText ) )
             if BibleOrgSysGlobals.USFMMarkers.isPrinted( marker ): # Only do character counts on lines that will be printed
                 for char in adjText:
@@ -3298,7 +3487,7 @@ class InternalBibleBook:
                     except ValueError: unicodeCharName = simpleCharName
                     try: unicodeLCCharName = unicodedata.name( lcChar )
                     except (ValueError,TypeError):
-                        logging.error( exp("InternalBibleBook.countCharacters has error getting Unicode name of {!r} (from {!r})").format( lcChar, char ) )
+                        logging.error( ErrorRecord( '', exp("InternalBibleBook.countCharacters has error getting Unicode name of {!r} (from {!r})"), lcChar, char ) )
                         unicodeLCCharName = simpleLCCharName
 
                     charNum = ord(char)
@@ -3327,8 +3516,8 @@ class InternalBibleBook:
                     elif not char.isalnum(): # Assume it's punctuation
                         punctuationCounts[simpleCharName] = 1 if simpleCharName not in punctuationCounts else punctuationCounts[simpleCharName] + 1
                         if char not in BibleOrgSysGlobals.ALL_WORD_PUNCT_CHARS:
-                            characterErrors.append( lineLocationSpace + _("Invalid {!r} ({}) word-building character ({})").format( simpleCharName, unicodeCharName, charHex ) )
-                            self.addPriorityError( 10, C, V, _("Invalid {!r} ({}) word-building character ({})").format( simpleCharName, unicodeCharName, charHex ) )
+                            characterErrors.append( ErrorRecord( lineLocationSpace, _("Invalid {!r} ({}) word-building character ({})"), simpleCharName, unicodeCharName, charHex ) )
+                            addPriorityError( 10, C, V, _("Invalid {!r} ({}) word-building character ({})"), simpleCharName, unicodeCharName, charHex )
                 for char in BibleOrgSysGlobals.LEADING_WORD_PUNCT_CHARS:
                     if char not in BibleOrgSysGlobals.TRAILING_WORD_PUNCT_CHARS and len(adjText)>1 \
                     and ( adjText[-1]==char or char+' ' in adjText ):
@@ -3338,8 +3527,8 @@ class InternalBibleBook:
                         else: simpleCharName = char
                         unicodeCharName = unicodedata.name( char )
                         #print( "{} {}:{} char is {!r} {}".format( char, simpleCharName ) )
-                        characterErrors.append( lineLocationSpace + _("Misplaced {!r} ({}) word leading character").format( simpleCharName, unicodeCharName ) )
-                        self.addPriorityError( 21, C, V, _("Misplaced {!r} ({}) word leading character").format( simpleCharName, unicodeCharName ) )
+                        characterErrors.append( ErrorRecord( lineLocationSpace, _("Misplaced {!r} ({}) word leading character"), simpleCharName, unicodeCharName ) )
+                        addPriorityError( 21, C, V, _("Misplaced {!r} ({}) word leading character"), simpleCharName, unicodeCharName )
                 for char in BibleOrgSysGlobals.TRAILING_WORD_PUNCT_CHARS:
                     if char not in BibleOrgSysGlobals.LEADING_WORD_PUNCT_CHARS and len(adjText)>1 \
                     and ( adjText[0]==char or ' '+char in adjText ):
@@ -3349,24 +3538,20 @@ class InternalBibleBook:
                         else: simpleCharName = char
                         unicodeCharName = unicodedata.name( char )
                         #print( "{} {}:{} char is {!r} {}".format( char, simpleCharName ) )
-                        characterErrors.append( lineLocationSpace + _("Misplaced {!r} ({}) word trailing character").format( simpleCharName, unicodeCharName ) )
-                        self.addPriorityError( 20, C, V, _("Misplaced {!r} ({}) word trailing character").format( simpleCharName, unicodeCharName ) )
+                        characterErrors.append( ErrorRecord( lineLocationSpace, _("Misplaced {!r} ({}) word trailing character"), simpleCharName, unicodeCharName ) )
+                        addPriorityError( 20, C, V, _("Misplaced {!r} ({}) word trailing character"), simpleCharName, unicodeCharName )
         # end of countCharacters
 
         haveNonAsciiChars = False
         simpleCharacterCounts, unicodeCharacterCounts, letterCounts, punctuationCounts = {}, {}, {}, {} # We don't care about the order in which they appeared
         characterErrors = []
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
-            marker, text, cleanText = entry.getMarker(), entry.getText(), entry.getCleanText()
-
-            # Keep track of where we are for more helpful error messages
-            if marker=='c' and text: C, V= text.split()[0], '0'
-            elif marker=='v' and text: V = text.split()[0]
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
+            marker, cleanText = entry.getMarker(), entry.getCleanText()
 
             if cleanText: countCharacters( cleanText )
 
@@ -3389,6 +3574,7 @@ class InternalBibleBook:
                     #    cleanExtraText = cleanExtraText.replace( marker, '' )
                     if cleanExtraText: countCharacters( cleanExtraText )
 
+        for args in priorityErrors: self.addPriorityError( *args )
         # Add up the totals
         if (characterErrors or simpleCharacterCounts or unicodeCharacterCounts or letterCounts or punctuationCounts) and 'Characters' not in self.errorDictionary:
             self.errorDictionary['Characters'] = OrderedDict()
@@ -3413,12 +3599,16 @@ class InternalBibleBook:
             for character in punctuationCounts: total += punctuationCounts[character]
             self.errorDictionary['Characters']['Punctuation Counts'] = punctuationCounts
             self.errorDictionary['Characters']['Punctuation Counts']['Total'] = total
-    # end of InternalBibleBook.doCheckCharacters
+    # end of InternalBibleBook._checkCharactersVisitor
 
 
-    def doCheckSpeechMarks( self ):
+    def _checkSpeechMarksVisitor( self, discoveryDict ):
         """
         Runs a number of checks on the speech marks in the Bible book.
+
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
         """
         goodNow = False # Yes, this code needs fixing badly
 
@@ -3434,22 +3624,18 @@ class InternalBibleBook:
         newSection = newParagraph = newBit = False
         bitMarker = ''
         startsWithOpen = endedWithClose = False
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
             marker, originalMarker, text, cleanText = entry.getMarker(), entry.getOriginalMarker(), entry.getText(), entry.getCleanText()
 
-            # Keep track of where we are for more helpful error messages
             if marker=='c' and text:
-                C, V = text.split()[0], '0'
                 if C=='1': newSection = True # A new section after any introduction even if it doesn't start with an actual section heading
                 continue # c fields contain no quote signs and don't affect formatting blocks
-            elif marker=='v':
-                if text: V = text.split()[0]
-                continue # v fields contain no quote signs and don't affect formatting blocks
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
+            elif marker=='v': continue # v fields contain no quote signs and don't affect formatting blocks
 
             if marker in ('s1','s2','s3','s4', 'qa'):
                 newSection = True; bitMarker = originalMarker; continue # Nothing more to process here (although will miss check rare notes in section headings)
@@ -3475,25 +3661,23 @@ class InternalBibleBook:
                 if newSection and closeQuotesAtSectionEnd \
                 or newParagraph and closeQuotesAtParagraphEnd:
                     match = openChars if len(openChars)>1 else "{!r}".format( openChars[0] )
-                    speechMarkErrors.append( lineLocationSpace + _("Unclosed speech marks matching {} before {} marker").format( match, bitMarker ) )
-                    logging.error( _("Unclosed speech marks matching {} before {} marker at").format( match, bitMarker ) \
-                                                            + " {} {}:{}".format( self.BBB, C, V ) )
-                    self.addPriorityError( 56, C, V, _("Unclosed speech marks matching {} after {} marker").format( match, bitMarker ) )
+                    speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unclosed speech marks matching {} before {} marker"), match, bitMarker ) )
+                    logging.error( ErrorRecord( '', _("Unclosed speech marks matching {} before {} marker at") + " {} {}:{}", match, bitMarker, self.BBB, C, V ) )
+                    addPriorityError( 56, C, V, _("Unclosed speech marks matching {} after {} marker"), match, bitMarker )
                     openChars = []
                 elif newParagraph and reopenQuotesAtParagraph and not startsWithOpen:
                     match = openChars if len(openChars)>1 else "{!r}".format( openChars[0] )
                     speechMarkErrors.append( lineLocationSpace \
                                                 + _("Unclosed speech marks matching {} before {} marker or missing reopening quotes").format( match, originalMarker ) )
-                    logging.error( _("Unclosed speech marks matching {} before {} marker or missing reopening quotes at").format( match, originalMarker ) \
-                                                            + " {} {}:{}".format( self.BBB, C, V ) )
-                    self.addPriorityError( 55, C, V, _("Unclosed speech marks matching {} after {} marker or missing reopening quotes").format( match, originalMarker ) )
+                    logging.error( ErrorRecord( '', _("Unclosed speech marks matching {} before {} marker or missing reopening quotes at") + " {} {}:{}", match, originalMarker, self.BBB, C, V ) )
+                    addPriorityError( 55, C, V, _("Unclosed speech marks matching {} after {} marker or missing reopening quotes"), match, originalMarker )
                     openChars = []
 
             if newSection and startsWithOpen and endedWithClose and not closeQuotesAtSectionEnd:
                 if openQuoteIndex == closeQuoteIndex:
-                    speechMarkErrors.append( lineLocationSpace + _("Unnecessary closing of speech marks before section heading") )
-                    logging.error( _("Unnecessary closing of speech marks before section heading") + " {} {}:{}".format( self.BBB, C, V ) )
-                    self.addPriorityError( 50, C, V, _("Unnecessary closing of speech marks before section heading") )
+                    speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unnecessary closing of speech marks before section heading") ) )
+                    logging.error( ErrorRecord( '', _("Unnecessary closing of speech marks before section heading") + " {} {}:{}", self.BBB, C, V ) )
+                    addPriorityError( 50, C, V, _("Unnecessary closing of speech marks before section heading") )
 
             #print( C, V, openChars, newParagraph, marker, '<' + cleanText + '>' )
             for j,char in enumerate(cleanText): # Go through each character handling speech marks
@@ -3508,33 +3692,32 @@ class InternalBibleBook:
                             if newBit:
                                 speechMarkErrors.append( lineLocationSpace \
                                                                             + _("Seemed to reopen {!r} speech marks after {}").format( char, bitMarker ) )
-                                logging.warning( _("Seemed to reopen {!r} speech marks after {} at").format( char, bitMarker ) \
-                                                                            + " {} {}:{}".format( self.BBB, C, V ) )
-                                self.addPriorityError( 43, C, V, _("Seemed to reopen {!r} speech marks after {}").format( char, bitMarker ) )
+                                logging.warning( ErrorRecord( '', _("Seemed to reopen {!r} speech marks after {} at") + " {} {}:{}", char, bitMarker, self.BBB, C, V ) )
+                                addPriorityError( 43, C, V, _("Seemed to reopen {!r} speech marks after {}"), char, bitMarker )
                                 openChars.pop()
                             else:
                                 speechMarkErrors.append( lineLocationSpace \
                                                                             + _("Unclosed {!r} speech marks (or improperly nested speech marks) after {}").format( char, openChars ) )
-                                logging.error( _("Unclosed {!r} speech marks (or improperly nested speech marks) after {} at {}").format( char, openChars, self.__makeErrorRef(C,V) ) )
-                                self.addPriorityError( 53, C, V, _("Unclosed {!r} speech marks (or improperly nested speech marks) after {}").format( char, openChars ) )
+                                logging.error( ErrorRecord( '', _("Unclosed {!r} speech marks (or improperly nested speech marks) after {} at {}"), char, openChars, self.__makeErrorRef(C,V) ) )
+                                addPriorityError( 53, C, V, _("Unclosed {!r} speech marks (or improperly nested speech marks) after {}"), char, openChars )
                         openChars.append( char )
                     if len(openChars)>4:
-                        speechMarkErrors.append( lineLocationSpace + _("Excessive nested speech marks {}").format( openChars ) )
-                        logging.error( _("Excessive nested speech marks {} at").format( openChars ) + " {} {}:{}".format( self.BBB, C, V ) )
-                        self.addPriorityError( 50, C, V, _("Excessive nested speech marks {}").format( openChars ) )
+                        speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Excessive nested speech marks {}"), openChars ) )
+                        logging.error( ErrorRecord( '', _("Excessive nested speech marks {} at") + " {} {}:{}", openChars, self.BBB, C, V ) )
+                        addPriorityError( 50, C, V, _("Excessive nested speech marks {}"), openChars )
                     elif len(openChars)>3:
-                        speechMarkErrors.append( lineLocationSpace + _("Lots of nested speech marks {}").format( openChars ) )
-                        logging.warning( _("Lots of nested speech marks {} at").format( openChars ) + " {} {}:{}".format( self.BBB, C, V ) )
-                        self.addPriorityError( 40, C, V, _("Lots of nested speech marks {}").format( openChars ) )
+                        speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Lots of nested speech marks {}"), openChars ) )
+                        logging.warning( ErrorRecord( '', _("Lots of nested speech marks {} at") + " {} {}:{}", openChars, self.BBB, C, V ) )
+                        addPriorityError( 40, C, V, _("Lots of nested speech marks {}"), openChars )
                 elif char in BibleOrgSysGlobals.CLOSING_SPEECH_CHARACTERS:
                     closeIndex = BibleOrgSysGlobals.CLOSING_SPEECH_CHARACTERS.index( char )
                     if not openChars:
                         #print( "here1 with ", char, C, V, openChars )
                         if char not in '?!': # Ignore the dual purpose punctuation characters
                             if goodNow:
-                                speechMarkErrors.append( lineLocationSpace + _("Unexpected {!r} speech closing character").format( char ) )
-                                logging.error( _("Unexpected {!r} speech closing character at {}").format( char, self.__makeErrorRef(C,V) ) )
-                                self.addPriorityError( 52, C, V, _("Unexpected {!r} speech closing character").format( char ) )
+                                speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected {!r} speech closing character"), char ) )
+                                logging.error( ErrorRecord( '', _("Unexpected {!r} speech closing character at {}"), char, self.__makeErrorRef(C,V) ) )
+                                addPriorityError( 52, C, V, _("Unexpected {!r} speech closing character"), char )
                     elif closeIndex==BibleOrgSysGlobals.OPENING_SPEECH_CHARACTERS.index(openChars[-1]): # A good closing match
                         #print( "here2 with ", char, C, V )
                         openChars.pop()
@@ -3542,9 +3725,9 @@ class InternalBibleBook:
                         # We have closing marker that doesn't match
                         #print( "here3 with ", char, C, V, openChars )
                         if goodNow:
-                            speechMarkErrors.append( lineLocationSpace + _("Mismatched {!r} speech closing character after {}").format( char, openChars ) )
-                            logging.error( _("Mismatched {!r} speech closing character after {} at {}").format( char, openChars, self.__makeErrorRef(C,V) ) )
-                            self.addPriorityError( 51, C, V, _("Mismatched {!r} speech closing character after {}").format( char, openChars ) )
+                            speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Mismatched {!r} speech closing character after {}"), char, openChars ) )
+                            logging.error( ErrorRecord( '', _("Mismatched {!r} speech closing character after {} at {}"), char, openChars, self.__makeErrorRef(C,V) ) )
+                            addPriorityError( 51, C, V, _("Mismatched {!r} speech closing character after {}"), char, openChars )
 
             # End of processing clean-up
             endedWithClose = cleanText[-1] in BibleOrgSysGlobals.CLOSING_SPEECH_CHARACTERS
@@ -3569,48 +3752,51 @@ class InternalBibleBook:
                     for char in extraText:
                         if char in BibleOrgSysGlobals.OPENING_SPEECH_CHARACTERS:
                             if extraOpenChars and char==extraOpenChars[-1]:
-                                speechMarkErrors.append( lineLocationSpace + _("Improperly nested speech marks {} after {} in note").format( char, extraOpenChars ) )
-                                logging.error( _("Improperly nested speech marks {} after {} in note in").format( char, extraOpenChars ) \
-                                                                        + " {} {}:{}".format( self.BBB, C, V ) )
-                                self.addPriorityError( 45, C, V, _("Improperly nested speech marks {} after {} in note").format( char, extraOpenChars ) )
+                                speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Improperly nested speech marks {} after {} in note"), char, extraOpenChars ) )
+                                logging.error( ErrorRecord( '', _("Improperly nested speech marks {} after {} in note in") + " {} {}:{}", char, extraOpenChars, self.BBB, C, V ) )
+                                addPriorityError( 45, C, V, _("Improperly nested speech marks {} after {} in note"), char, extraOpenChars )
                             extraOpenChars.append( char )
                         elif char in BibleOrgSysGlobals.CLOSING_SPEECH_CHARACTERS:
                             closeIndex = BibleOrgSysGlobals.CLOSING_SPEECH_CHARACTERS.index( char )
                             if not extraOpenChars:
                                 #print( "here1 with ", char, C, V, extraOpenChars )
                                 if char not in '?!': # Ignore the dual purpose punctuation characters
-                                    speechMarkErrors.append( lineLocationSpace + _("Unexpected {!r} speech closing character in note").format( char ) )
-                                    logging.error( _("Unexpected {!r} speech closing character in note in").format( char ) + " {} {}:{}".format( self.BBB, C, V ) )
-                                    self.addPriorityError( 43, C, V, _("Unexpected {!r} speech closing character in note").format( char ) )
+                                    speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unexpected {!r} speech closing character in note"), char ) )
+                                    logging.error( ErrorRecord( '', _("Unexpected {!r} speech closing character in note in") + " {} {}:{}", char, self.BBB, C, V ) )
+                                    addPriorityError( 43, C, V, _("Unexpected {!r} speech closing character in note"), char )
                             elif closeIndex==BibleOrgSysGlobals.OPENING_SPEECH_CHARACTERS.index(extraOpenChars[-1]): # A good closing match
                                 #print( "here2 with ", char, C, V )
                                 extraOpenChars.pop()
                             elif char not in '?!': # Ignore the dual purpose punctuation characters
                                 #print( "here3 with ", char, C, V, extraOpenChars )
-                                speechMarkErrors.append( lineLocationSpace + _("Mismatched {!r} speech closing character after {} in note").format( char, extraOpenChars ) )
-                                logging.error( _("Mismatched {!r} speech closing character after {} in note in").format( char, extraOpenChars ) \
-                                                                            + " {} {}:{}".format( self.BBB, C, V ) )
-                                self.addPriorityError( 42, C, V, _("Mismatched {!r} speech closing character after {} in note").format( char, extraOpenChars ) )
+                                speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Mismatched {!r} speech closing character after {} in note"), char, extraOpenChars ) )
+                                logging.error( ErrorRecord( '', _("Mismatched {!r} speech closing character after {} in note in") + " {} {}:{}", char, extraOpenChars, self.BBB, C, V ) )
+                                addPriorityError( 42, C, V, _("Mismatched {!r} speech closing character after {} in note"), char, extraOpenChars )
                     if extraOpenChars: # We've finished the note but some things weren't closed
-                        speechMarkErrors.append( lineLocationSpace + _("Unclosed {} speech marks at end of note").format( extraOpenChars ) )
-                        logging.error( _("Unclosed {} speech marks at end of note in").format( extraOpenChars ) + " {} {}:{}".format( self.BBB, C, V ) )
-                        self.addPriorityError( 47, C, V, _("Unclosed {} speech marks at end of note").format( extraOpenChars ) )
+                        speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unclosed {} speech marks at end of note"), extraOpenChars ) )
+                        logging.error( ErrorRecord( '', _("Unclosed {} speech marks at end of note in") + " {} {}:{}", extraOpenChars, self.BBB, C, V ) )
+                        addPriorityError( 47, C, V, _("Unclosed {} speech marks at end of note"), extraOpenChars )
 
+        for args in priorityErrors: self.addPriorityError( *args )
         if openChars: # We've finished the book but some things weren't closed
             #print( "here9 with ", openChars )
-            speechMarkErrors.append( lineLocationSpace + _("Unclosed {} speech marks at end of book").format( openChars ) )
-            logging.error( _("Unclosed {} speech marks at end of book after").format( openChars ) + " {} {}:{}".format( self.BBB, C, V ) )
-            self.addPriorityError( 54, C, V, _("Unclosed {} speech marks at end of book").format( openChars ) )
+            speechMarkErrors.append( ErrorRecord( lineLocationSpace, _("Unclosed {} speech marks at end of book"), openChars ) )
+            logging.error( ErrorRecord( '', _("Unclosed {} speech marks at end of book after") + " {} {}:{}", openChars, self.BBB, C, V ) )
+            self.addPriorityError( 54, C, V, _("Unclosed {} speech marks at end of book"), openChars )
 
         # Add up the totals
         if (speechMarkErrors) and 'Speech Marks' not in self.errorDictionary: self.errorDictionary['Speech Marks'] = OrderedDict()
         if speechMarkErrors: self.errorDictionary['Speech Marks']['Possible Matching Errors'] = speechMarkErrors
-    # end of InternalBibleBook.doCheckSpeechMarks
+    # end of InternalBibleBook._checkSpeechMarksVisitor
 
 
-    def doCheckWords( self ):
+    def _checkWordsVisitor( self, discoveryDict ):
         """
         Runs a number of checks on the words used.
+
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
         """
 
         def countWords( marker, segment, lastWordTuple=None ):
@@ -3629,28 +3815,25 @@ class InternalBibleBook:
                 return word
             # end of stripWordPunctuation
 
-            words = segment.replace('—',' ').replace('–',' ').split() # Treat em-dash and en-dash as word break characters
             if lastWordTuple is None: ourLastWord = ourLastRawWord = '' # No need to check words repeated across segment boundaries
             else: # Check in case a word has been repeated (e.g., at the end of one verse and then again at the beginning of the next verse)
                 if BibleOrgSysGlobals.debugFlag:
                     assert isinstance( lastWordTuple, tuple )
                     assert len(lastWordTuple) == 2
                 ourLastWord, ourLastRawWord = lastWordTuple
-            for j,rawWord in enumerate(words):
+            for j,(ix,rawWord,word) in enumerate( self.getWordTokens( segment ) ): # Internal markers already removed
                 if marker=='c' or marker=='v' and j==1 and rawWord.isdigit(): continue # Ignore the chapter and verse numbers (except ones like 6a)
-                word = rawWord
-                for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
                 word = stripWordPunctuation( word )
                 if word and not word[0].isalnum():
                     #print( word, stripWordPunctuation( word ) )
                     #print( lineLocationSpace + _("Have unexpected character starting word {!r}").format( word ) )
-                    wordErrors.append( lineLocationSpace + _("Have unexpected character starting word {!r}").format( word ) )
+                    wordErrors.append( ErrorRecord( lineLocationSpace, _("Have unexpected character starting word {!r}"), word ) )
                     word = word[1:]
                 if word: # There's still some characters remaining after all that stripping
                     if BibleOrgSysGlobals.verbosityLevel > 3: # why???
                         for k,char in enumerate(word):
                             if not char.isalnum() and (k==0 or k==len(word)-1 or char not in BibleOrgSysGlobals.MEDIAL_WORD_PUNCT_CHARS):
-                                wordErrors.append( lineLocationSpace + _("Have unexpected {!r} in word {!r}").format( char, word ) )
+                                wordErrors.append( ErrorRecord( lineLocationSpace, _("Have unexpected {!r} in word {!r}"), char, word ) )
                     lcWord = word.lower()
                     isAReferenceOrNumber = True
                     for char in word:
@@ -3662,7 +3845,7 @@ class InternalBibleBook:
 
                     # Check for repeated words (case insensitive comparison)
                     if lcWord==ourLastWord.lower(): # Have a repeated word (might be across sentences)
-                        repeatedWordErrors.append( lineLocationSpace + _("Have possible repeated word with {} {}").format( ourLastRawWord, rawWord ) )
+                        repeatedWordErrors.append( ErrorRecord( lineLocationSpace, _("Have possible repeated word with {} {}"), ourLastRawWord, rawWord ) )
                     ourLastWord, ourLastRawWord = word, rawWord
             return ourLastWord, ourLastRawWord
         # end of countWords
@@ -3672,18 +3855,12 @@ class InternalBibleBook:
         wordCounts, caseInsensitiveWordCounts = {}, {}
         wordErrors, repeatedWordErrors = [], []
         lastTextWordTuple = ('','')
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
             marker, text, cleanText = entry.getMarker(), entry.getText(), entry.getCleanText()
 
-            # Keep track of where we are for more helpful error messages
-            if marker=='c' and text: C, V = text.split()[0], '0'
-            elif marker=='v' and text: V = text.split()[0]
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
-
             if text and BibleOrgSysGlobals.USFMMarkers.isPrinted(marker): # process this main text
                 lastTextWordTuple = countWords( marker, cleanText, lastTextWordTuple )
 
@@ -3719,7 +3896,7 @@ class InternalBibleBook:
             for word in caseInsensitiveWordCounts: total += caseInsensitiveWordCounts[word]
             self.errorDictionary['Words']['Case Insensitive Word Counts'] = caseInsensitiveWordCounts
             self.errorDictionary['Words']['Case Insensitive Word Counts']['--Total--'] = total
-    # end of InternalBibleBook.doCheckWords
+    # end of InternalBibleBook._checkWordsVisitor
 
 
     def doCheckFileControls( self ):
@@ -3750,76 +3927,71 @@ class InternalBibleBook:
     # end of InternalBibleBook.doCheckFileControls
 
 
-    def doCheckHeadings( self, discoveryDict ):
+    def _checkHeadingsVisitor( self, discoveryDict ):
         """
         Runs a number of checks on headings and section cross-references.
-        """
-        if not self._processedFlag:
-            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
-                print( "InternalBibleBook {} {!r}: processing lines called from 'doCheckHeadings'".format( self.BBB, self.workName ) )
-            self.processLines()
-        if BibleOrgSysGlobals.debugFlag: assert self._processedLines
 
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
+        """
         titleList, sectionHeadingList, sectionReferenceList, descriptiveTitleList, headingErrors = [], [], [], [], []
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
             marker, text = entry.getMarker(), entry.getText()
-            # Keep track of where we are for more helpful error messages
-            if marker=='c' and text: C, V = text.split()[0], '0'
-            elif marker=='v' and text: V = text.split()[0]
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
-
             if marker.startswith('mt'):
                 titleList.append( "{} {}:{} Main Title {}: '{}'".format( self.BBB, C, V, marker[2:], text ) )
                 if not text:
-                    headingErrors.append( lineLocationSpace + _("Missing title text for marker {}").format( marker ) )
-                    self.addPriorityError( 59, C, V, _("Missing title text") )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("Missing title text for marker {}"), marker ) )
+                    addPriorityError( 59, C, V, _("Missing title text") )
                 elif text[-1] in '.።':
-                    headingErrors.append( lineLocationSpace + _("{} title ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 69, C, V, _("Title ends with a period") )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("{} title ends with a period: {}"), marker, text ) )
+                    addPriorityError( 69, C, V, _("Title ends with a period") )
             elif marker in ('s1','s2','s3','s4', 'qa'):
                 if marker=='s1': sectionHeadingList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 else: sectionHeadingList.append( "{} {}:{} ({}) '{}'".format( self.BBB, C, V, marker, text ) )
                 if not text:
-                    headingErrors.append( lineLocationSpace + _("Missing heading text for marker {}").format( marker ) )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("Missing heading text for marker {}"), marker ) )
                     priority = 58
                     if discoveryDict:
                         if 'partlyDone' in discoveryDict and discoveryDict['partlyDone']>0: priority = 28
                         if 'notStarted' in discoveryDict and discoveryDict['notStarted']>0: priority = 18
-                    self.addPriorityError( priority, C, V, _("Missing heading text") )
+                    addPriorityError( priority, C, V, _("Missing heading text") )
                 elif text[-1] in '.።':
-                    headingErrors.append( lineLocationSpace + _("{} heading ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 68, C, V, _("Heading ends with a period") )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("{} heading ends with a period: {}"), marker, text ) )
+                    addPriorityError( 68, C, V, _("Heading ends with a period") )
             elif marker=='r':
                 sectionReferenceList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 if not text:
-                    headingErrors.append( lineLocationSpace + _("Missing section cross-reference text for marker {}").format( marker ) )
-                    self.addPriorityError( 57, C, V, _("Missing section cross-reference text") )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("Missing section cross-reference text for marker {}"), marker ) )
+                    addPriorityError( 57, C, V, _("Missing section cross-reference text") )
                 else: # We have a section reference with text
                     if discoveryDict and 'sectionReferencesParenthesisFlag' in discoveryDict and discoveryDict['sectionReferencesParenthesisFlag']==False:
                         if text[0]=='(' or text[-1]==')':
-                            headingErrors.append( lineLocationSpace + _("Section cross-reference not expected to have parenthesis: {}").format( text ) )
-                            self.addPriorityError( 67, C, V, _("Section cross-reference not expected to have parenthesis") )
+                            headingErrors.append( ErrorRecord( lineLocationSpace, _("Section cross-reference not expected to have parenthesis: {}"), text ) )
+                            addPriorityError( 67, C, V, _("Section cross-reference not expected to have parenthesis") )
                     else: # assume that parenthesis are required
                         if text[0]!='(' or text[-1]!=')':
-                            headingErrors.append( lineLocationSpace + _("Section cross-reference not in parenthesis: {}").format( text ) )
-                            self.addPriorityError( 67, C, V, _("Section cross-reference not in parenthesis") )
+                            headingErrors.append( ErrorRecord( lineLocationSpace, _("Section cross-reference not in parenthesis: {}"), text ) )
+                            addPriorityError( 67, C, V, _("Section cross-reference not in parenthesis") )
             elif marker=='d':
                 descriptiveTitleList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 if not text:
-                    headingErrors.append( lineLocationSpace + _("Missing heading text for marker {}").format( marker ) )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("Missing heading text for marker {}"), marker ) )
                     priority = 57
                     if discoveryDict:
                         if 'partlyDone' in discoveryDict and discoveryDict['partlyDone']>0: priority = 27
                         if 'notStarted' in discoveryDict and discoveryDict['notStarted']>0: priority = 17
-                    self.addPriorityError( priority, C, V, _("Missing heading text") )
+                    addPriorityError( priority, C, V, _("Missing heading text") )
                 elif text[-1] != ':' and not hasClosingPunctuation( text ):
-                    headingErrors.append( lineLocationSpace + _("{} heading should have closing punctuation (period): {}").format( marker, text ) )
-                    self.addPriorityError( 67, C, V, _("Heading should have closing punctuation (period)") )
+                    headingErrors.append( ErrorRecord( lineLocationSpace, _("{} heading should have closing punctuation (period): {}"), marker, text ) )
+                    addPriorityError( 67, C, V, _("Heading should have closing punctuation (period)") )
 
+        for args in priorityErrors: self.addPriorityError( *args )
         if (headingErrors or titleList or sectionHeadingList or sectionReferenceList or descriptiveTitleList) and 'Headings' not in self.errorDictionary:
             self.errorDictionary['Headings'] = OrderedDict() # So we hopefully get the errors first
         if headingErrors: self.errorDictionary['Headings']['Possible Heading Errors'] = headingErrors
@@ -3827,80 +3999,75 @@ class InternalBibleBook:
         if sectionHeadingList: self.errorDictionary['Headings']['Section Heading Lines'] = sectionHeadingList
         if descriptiveTitleList: self.errorDictionary['Headings']['Descriptive Heading Lines'] = descriptiveTitleList
         if sectionReferenceList: self.errorDictionary['Headings']['Section Cross-reference Lines'] = sectionReferenceList
-    # end of InternalBibleBook.doCheckHeadings
+    # end of InternalBibleBook._checkHeadingsVisitor
 
 
-    def doCheckIntroduction( self ):
+    def _checkIntroductionVisitor( self, discoveryDict ):
         """
         Runs a number of checks on introductory parts.
-        """
-        if not self._processedFlag:
-            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
-                print( "InternalBibleBook {} {!r}: processing lines called from 'doCheckIntroduction'".format( self.BBB, self.workName ) )
-            self.processLines()
-        if BibleOrgSysGlobals.debugFlag: assert self._processedLines
 
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
+        """
         mainTitleList, headingList, titleList, outlineList, introductionErrors = [], [], [], [], []
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
             marker, text, cleanText = entry.getMarker(), entry.getText(), entry.getCleanText()
 
-            # Keep track of where we are for more helpful error messages
-            if marker=='c' and text: C, V = text.split()[0], '0'
-            elif marker=='v' and text: V = text.split()[0]
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
-
             if marker in ('imt1','imt2','imt3','imt4',):
                 if marker=='imt1': mainTitleList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 else: mainTitleList.append( "{} {}:{} ({}) '{}'".format( self.BBB, C, V, marker, text ) )
                 if not cleanText:
-                    introductionErrors.append( lineLocationSpace + _("Missing heading text for marker {}").format( marker ) )
-                    self.addPriorityError( 39, C, V, _("Missing heading text") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("Missing heading text for marker {}"), marker ) )
+                    addPriorityError( 39, C, V, _("Missing heading text") )
                 elif cleanText[-1] in '.።':
-                    introductionErrors.append( lineLocationSpace + _("{} heading ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 49, C, V, _("Heading ends with a period") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} heading ends with a period: {}"), marker, text ) )
+                    addPriorityError( 49, C, V, _("Heading ends with a period") )
             elif marker in ('is1','is2','is3','is4',):
                 if marker=='is1': headingList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 else: headingList.append( "{} {}:{} ({}) '{}'".format( self.BBB, C, V, marker, text ) )
                 if not cleanText:
-                    introductionErrors.append( lineLocationSpace + _("Missing heading text for marker {}").format( marker ) )
-                    self.addPriorityError( 39, C, V, _("Missing heading text") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("Missing heading text for marker {}"), marker ) )
+                    addPriorityError( 39, C, V, _("Missing heading text") )
                 elif cleanText[-1] in '.።':
-                    introductionErrors.append( lineLocationSpace + _("{} heading ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 49, C, V, _("Heading ends with a period") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} heading ends with a period: {}"), marker, text ) )
+                    addPriorityError( 49, C, V, _("Heading ends with a period") )
             elif marker=='iot':
                 titleList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 if not cleanText:
-                    introductionErrors.append( lineLocationSpace + _("Missing outline title text for marker {}").format( marker ) )
-                    self.addPriorityError( 38, C, V, _("Missing outline title text") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("Missing outline title text for marker {}"), marker ) )
+                    addPriorityError( 38, C, V, _("Missing outline title text") )
                 elif cleanText[-1] in '.።':
-                    introductionErrors.append( lineLocationSpace + _("{} heading ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 48, C, V, _("Heading ends with a period") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} heading ends with a period: {}"), marker, text ) )
+                    addPriorityError( 48, C, V, _("Heading ends with a period") )
             elif marker in ('io1','io2','io3','io4',):
                 if marker=='io1': outlineList.append( "{} {}:{} '{}'".format( self.BBB, C, V, text ) )
                 else: outlineList.append( "{} {}:{} ({}) '{}'".format( self.BBB, C, V, marker, text ) )
                 if not cleanText:
-                    introductionErrors.append( lineLocationSpace + _("Missing outline text for marker {}").format( marker ) )
-                    self.addPriorityError( 37, C, V, _("Missing outline text") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("Missing outline text for marker {}"), marker ) )
+                    addPriorityError( 37, C, V, _("Missing outline text") )
                 elif cleanText[-1] in '.።':
-                    introductionErrors.append( lineLocationSpace + _("{} outline entry ends with a period: {}").format( marker, text ) )
-                    self.addPriorityError( 47, C, V, _("Outline entry ends with a period") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} outline entry ends with a period: {}"), marker, text ) )
+                    addPriorityError( 47, C, V, _("Outline entry ends with a period") )
             elif marker in ('ip','ipi','im','imi',):
                 if not cleanText:
-                    introductionErrors.append( lineLocationSpace + _("Missing introduction text for marker {}").format( marker ) )
-                    self.addPriorityError( 36, C, V, _("Missing introduction text") )
+                    introductionErrors.append( ErrorRecord( lineLocationSpace, _("Missing introduction text for marker {}"), marker ) )
+                    addPriorityError( 36, C, V, _("Missing introduction text") )
                 elif cleanText[-1] != ':' and not hasClosingPeriod( cleanText ):
                 #and not cleanText.endswith('.\\it*') and not text.endswith('.&quot;') and not text.endswith('.&#39;'):
                     if cleanText.endswith(')') or cleanText.endswith(']'): # do we still need this
-                        introductionErrors.append( lineLocationSpace + _("{} introduction text possibly does not have closing punctuation (period): {}").format( marker, text ) )
-                        self.addPriorityError( 26, C, V, _("Introduction text possibly ends without closing punctuation (period)") )
+                        introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} introduction text possibly does not have closing punctuation (period): {}"), marker, text ) )
+                        addPriorityError( 26, C, V, _("Introduction text possibly ends without closing punctuation (period)") )
                     else:
-                        introductionErrors.append( lineLocationSpace + _("{} introduction text does not have closing punctuation (period): {}").format( marker, text ) )
-                        self.addPriorityError( 46, C, V, _("Introduction text ends without closing punctuation (period)") )
+                        introductionErrors.append( ErrorRecord( lineLocationSpace, _("{} introduction text does not have closing punctuation (period): {}"), marker, text ) )
+                        addPriorityError( 46, C, V, _("Introduction text ends without closing punctuation (period)") )
 
+        for args in priorityErrors: self.addPriorityError( *args )
         if (introductionErrors or mainTitleList or headingList or titleList or outlineList) and 'Introduction' not in self.errorDictionary:
             self.errorDictionary['Introduction'] = OrderedDict() # So we hopefully get the errors first
         if introductionErrors: self.errorDictionary['Introduction']['Possible Introduction Errors'] = introductionErrors
@@ -3908,36 +4075,30 @@ class InternalBibleBook:
         if headingList: self.errorDictionary['Introduction']['Section Heading Lines'] = headingList
         if titleList: self.errorDictionary['Introduction']['Outline Title Lines'] = titleList
         if outlineList: self.errorDictionary['Introduction']['Outline Entry Lines'] = outlineList
-    # end of InternalBibleBook.doCheckIntroduction
+    # end of InternalBibleBook._checkIntroductionVisitor
 
 
-    def doCheckNotes( self, discoveryDict ):
+    def _checkNotesVisitor( self, discoveryDict ):
         """
         Runs a number of checks on footnotes and cross-references.
-        """
-        if not self._processedFlag:
-            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
-                print( "InternalBibleBook {} {!r}: processing lines called from 'doCheckNotes'".format( self.BBB, self.workName ) )
-            self.processLines()
-        if BibleOrgSysGlobals.debugFlag: assert self._processedLines
 
+
+        This is a generator (for runChecks) which is sent (entry,C,V,lineLocationSpace) 4-tuples
+            and then None at the end of the book.
+        """
         allAvailableCharacterMarkers = BibleOrgSysGlobals.USFMMarkers.getCharacterMarkersList( includeBackslash=True )
 
         footnoteList, xrefList = [], []
         footnoteLeaderList, xrefLeaderList, CVSeparatorList = [], [], []
         footnoteErrors, xrefErrors, noteMarkerErrors = [], [], []
         leaderCounts = {}
-        C, V = '-1', '-1' # So first/id line starts at -1:0
-        for entry in self._processedLines:
-            marker, text = entry.getMarker(), entry.getText()
-
-            # Keep track of where we are for more helpful error messages
-            if marker=='c' and text: C, V = text.split()[0], '0'
-            elif marker=='v' and text: V = text.split()[0]
-            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
-
-            lineLocation = '{} {}:{}'.format( self.BBB, C, V )
-            lineLocationSpace = lineLocation + ' '
+        priorityErrors = []
+        addPriorityError = lambda priority, C, V, string, *args: priorityErrors.append( (priority, C, V, ErrorRecord( '', string, *args ) if args else string) ) # Saved until the end so that the order is the same as when this check is run by itself
+        while True:
+            item = yield # Get the next entry (or None at the end of the book)
+            if item is None: break
+            entry, C, V, lineLocationSpace = item
+            marker = entry.getMarker()
 
             extras = entry.getExtras()
             if extras:
@@ -4001,11 +4162,11 @@ class InternalBibleBook:
                                         status, myString, lastCode = 1, '', ''
                                     else:
                                         if extraType == 'fn':
-                                            footnoteErrors.append( lineLocationSpace + _("Footnote markers don't match: {!r} and {!r}").format( lastCode, myString+'*' ) )
-                                            self.addPriorityError( 32, C, V, _("Mismatching footnote markers") )
+                                            footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote markers don't match: {!r} and {!r}"), lastCode, myString+'*' ) )
+                                            addPriorityError( 32, C, V, _("Mismatching footnote markers") )
                                         elif extraType == 'xr':
-                                            xrefErrors.append( lineLocationSpace + _("Cross-reference don't match: {!r} and {!r}").format( lastCode, myString+'*' ) )
-                                            self.addPriorityError( 31, C, V, _("Mismatching cross-reference markers") )
+                                            xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference don't match: {!r} and {!r}"), lastCode, myString+'*' ) )
+                                            addPriorityError( 31, C, V, _("Mismatching cross-reference markers") )
                                         #print( "checkNotes: error with", lastCode, extraList, myString, self.BBB, C, V, ); halt
                                         status, myString, lastCode = 1, '', '' # Treat the last one as closed
                                 elif char==' ' and myString:
@@ -4025,45 +4186,45 @@ class InternalBibleBook:
                             haveFinalPeriod = True
                             footnoteList.append( line )
                             if cleanExtraText.endswith(' '):
-                                footnoteErrors.append( lineLocationSpace + _("Footnote seems to have an extra space at end: {!r}").format( extraText ) )
-                                self.addPriorityError( 32, C, V, _("Extra space at end of footnote") )
+                                footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote seems to have an extra space at end: {!r}"), extraText ) )
+                                addPriorityError( 32, C, V, _("Extra space at end of footnote") )
                             elif cleanExtraText and not hasClosingPunctuation( cleanExtraText ):
                             #and not cleanExtraText.endswith('.&quot;') and not text.endswith('.&#39;'):
                                 haveFinalPeriod = False
                             if discoveryDict and 'footnotesPeriodFlag' in discoveryDict:
                                 if discoveryDict['footnotesPeriodFlag']==True and not haveFinalPeriod:
-                                    footnoteErrors.append( lineLocationSpace + _("Footnote seems to be missing closing punctuation (period): {!r}").format( extraText ) )
-                                    self.addPriorityError( 33, C, V, _("Missing closing punctuation (period) at end of footnote") )
+                                    footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote seems to be missing closing punctuation (period): {!r}"), extraText ) )
+                                    addPriorityError( 33, C, V, _("Missing closing punctuation (period) at end of footnote") )
                                 if discoveryDict['footnotesPeriodFlag']==False and haveFinalPeriod:
-                                    footnoteErrors.append( lineLocationSpace + _("Footnote seems to include possible unnecessary closing punctuation (period): {!r}").format( extraText ) )
-                                    self.addPriorityError( 32, C, V, _("Possible unnecessary closing punctuation (period) at end of footnote") )
+                                    footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote seems to include possible unnecessary closing punctuation (period): {!r}"), extraText ) )
+                                    addPriorityError( 32, C, V, _("Possible unnecessary closing punctuation (period) at end of footnote") )
                         elif extraType == 'xr':
                             haveFinalPeriod = True
                             xrefList.append( line )
                             if cleanExtraText.endswith(' '):
-                                xrefErrors.append( lineLocationSpace + _("Cross-reference seems to have an extra space at end: {!r}").format( extraText ) )
-                                self.addPriorityError( 30, C, V, _("Extra space at end of cross-reference") )
+                                xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference seems to have an extra space at end: {!r}"), extraText ) )
+                                addPriorityError( 30, C, V, _("Extra space at end of cross-reference") )
                             elif cleanExtraText and not hasClosingPunctuation( cleanExtraText ):
                             #and not cleanExtraText.endswith('.&quot;') and not text.endswith('.&#39;'):
                                 haveFinalPeriod = False
                             if discoveryDict and 'crossReferencesPeriodFlag' in discoveryDict:
                                 if discoveryDict['crossReferencesPeriodFlag']==True and not haveFinalPeriod:
-                                    xrefErrors.append( lineLocationSpace + _("Cross-reference seems to be missing closing punctuation (period): {!r}").format( extraText ) )
-                                    self.addPriorityError( 31, C, V, _("Missing closing punctuation (period) at end of cross-reference") )
+                                    xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference seems to be missing closing punctuation (period): {!r}"), extraText ) )
+                                    addPriorityError( 31, C, V, _("Missing closing punctuation (period) at end of cross-reference") )
                                 if discoveryDict['crossReferencesPeriodFlag']==False and haveFinalPeriod:
-                                    xrefErrors.append( lineLocationSpace + _("Cross-reference seems to include possible unnecessary closing punctuation (period): {!r}").format( extraText ) )
-                                    self.addPriorityError( 32, C, V, _("Possible unnecessary closing punctuation (period) at end of cross-reference") )
+                                    xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference seems to include possible unnecessary closing punctuation (period): {!r}"), extraText ) )
+                                    addPriorityError( 32, C, V, _("Possible unnecessary closing punctuation (period) at end of cross-reference") )
 
                         # Check for two identical fields in a row
                         lastNoteMarker = None
                         for noteMarker,noteText in extraList:
                             if noteMarker == lastNoteMarker: # Have two identical fields in a row
                                 if extraType == 'fn':
-                                    footnoteErrors.append( lineLocationSpace + _("Consecutive {} fields in footnote: {!r}").format( noteMarker, extraText ) )
-                                    self.addPriorityError( 35, C, V, _("Consecutive {} fields in footnote").format( noteMarker ) )
+                                    footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Consecutive {} fields in footnote: {!r}"), noteMarker, extraText ) )
+                                    addPriorityError( 35, C, V, _("Consecutive {} fields in footnote"), noteMarker )
                                 elif extraType == 'xr':
-                                    xrefErrors.append( lineLocationSpace + _("Consecutive {} fields in cross-reference: {!r}").format( noteMarker, extraText ) )
-                                    self.addPriorityError( 35, C, V, _("Consecutive {} fields in cross-reference").format( noteMarker ) )
+                                    xrefErrors.append( ErrorRecord( lineLocationSpace, _("Consecutive {} fields in cross-reference: {!r}"), noteMarker, extraText ) )
+                                    addPriorityError( 35, C, V, _("Consecutive {} fields in cross-reference"), noteMarker )
                                 #print( "Consecutive fields in {!r}".format( extraText ) )
                             lastNoteMarker = noteMarker
 
@@ -4085,7 +4246,7 @@ class InternalBibleBook:
                                 leaderName = "Cross-reference leader {!r}".format( leader )
                                 leaderCounts[leaderName] = 1 if leaderName not in leaderCounts else (leaderCounts[leaderName] + 1)
                                 if leader not in xrefLeaderList: xrefLeaderList.append( leader )
-                        else: noteMarkerErrors.append( lineLocationSpace + _("{} seems to be missing a leader character in {}").format( extraType, extraText ) )
+                        else: noteMarkerErrors.append( ErrorRecord( lineLocationSpace, _("{} seems to be missing a leader character in {}"), extraType, extraText ) )
 
                         # Find, count and check CVSeparators
                         #  and also check that the references match
@@ -4098,9 +4259,9 @@ class InternalBibleBook:
                                     anchor = BibleAnchorReference( self.BBB, C, V )
                                     #print( "here at BibleAnchorReference", self.BBB, C, V, anchor )
                                     if not anchor.matchesAnchorString( noteText, 'footnote' ):
-                                        footnoteErrors.append( lineLocationSpace + _("Footnote anchor reference seems not to match: {!r}").format( noteText ) )
-                                        logging.error( _("Footnote anchor reference seems not to match after {} {}:{} in {!r}").format( self.BBB, C, V, noteText ) )
-                                        self.addPriorityError( 42, C, V, _("Footnote anchor reference mismatch") )
+                                        footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote anchor reference seems not to match: {!r}"), noteText ) )
+                                        logging.error( ErrorRecord( '', _("Footnote anchor reference seems not to match after {} {}:{} in {!r}"), self.BBB, C, V, noteText ) )
+                                        addPriorityError( 42, C, V, _("Footnote anchor reference mismatch") )
                                         #print( self.BBB, C, V, 'FN0', '"'+noteText+'"' )
                                 else: # old code
                                     for j,char in enumerate(noteText):
@@ -4118,11 +4279,11 @@ class InternalBibleBook:
                                     if CV2 != noteText:
                                         if CV1 not in noteText and noteText not in CV2: # This crudely handles a range in either the verse number or the anchor (as long as the individual one is at the start of the range)
                                             #print( "{} fn m={!r} V={} myV={} CV1={!r} CV2={!r} nT={!r}".format( self.BBB, marker, V, myV, CV1, CV2, noteText ) )
-                                            footnoteErrors.append( lineLocationSpace + _("Footnote anchor reference seems not to match: {!r}").format( noteText ) )
-                                            self.addPriorityError( 42, C, V, _("Footnote anchor reference mismatch") )
+                                            footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote anchor reference seems not to match: {!r}"), noteText ) )
+                                            addPriorityError( 42, C, V, _("Footnote anchor reference mismatch") )
                                             print( self.BBB, 'FN1', '"'+noteText+'"', "'"+fnCVSeparator+"'", "'"+fnTrailer+"'", CV1, CV2 )
                                         else:
-                                            footnoteErrors.append( lineLocationSpace + _("Footnote anchor reference possibly does not match: {!r}").format( noteText ) )
+                                            footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote anchor reference possibly does not match: {!r}"), noteText ) )
                                             print( self.BBB, 'FN2', '"'+noteText+'"', "'"+fnCVSeparator+"'", "'"+fnTrailer+"'", CV1, CV2 )
                                 break # Only process the first fr field
                             elif noteMarker=='xo':
@@ -4130,9 +4291,9 @@ class InternalBibleBook:
                                 if 1: # new code
                                     anchor = BibleAnchorReference( self.BBB, C, V )
                                     if not anchor.matchesAnchorString( noteText, 'cross-reference' ):
-                                        footnoteErrors.append( lineLocationSpace + _("Cross-reference anchor reference seems not to match: {!r}").format( noteText ) )
-                                        logging.error( _("Cross-reference anchor reference seems not to match after {} {}:{} in {!r}").format( self.BBB, C, V, noteText ) )
-                                        self.addPriorityError( 41, C, V, _("Cross-reference anchor reference mismatch") )
+                                        footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference anchor reference seems not to match: {!r}"), noteText ) )
+                                        logging.error( ErrorRecord( '', _("Cross-reference anchor reference seems not to match after {} {}:{} in {!r}"), self.BBB, C, V, noteText ) )
+                                        addPriorityError( 41, C, V, _("Cross-reference anchor reference mismatch") )
                                         #print( self.BBB, C, V, 'XR0', '"'+noteText+'"' )
                                 else: # old code
                                     for j,char in enumerate(noteText):
@@ -4150,29 +4311,30 @@ class InternalBibleBook:
                                         #print( "V={!r}  xrT={!r}  CV1={!r}  CV2={!r}  NT={!r}".format( V, xrTrailer, CV1, CV2, noteText ) )
                                         if CV1 not in noteText and noteText not in CV2: # This crudely handles a range in either the verse number or the anchor (as long as the individual one is at the start of the range)
                                             #print( 'xr', CV1, noteText )
-                                            xrefErrors.append( lineLocationSpace + _("Cross-reference anchor reference seems not to match: {!r}").format( noteText ) )
-                                            self.addPriorityError( 41, C, V, _("Cross-reference anchor reference mismatch") )
+                                            xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference anchor reference seems not to match: {!r}"), noteText ) )
+                                            addPriorityError( 41, C, V, _("Cross-reference anchor reference mismatch") )
                                             print( self.BBB, 'XR1', '"'+noteText+'"', "'"+xrCVSeparator+"'", "'"+xrTrailer+"'", CV1, CV2 )
                                         elif noteText.startswith(CV2) or noteText.startswith(CV1+',') or noteText.startswith(CV1+'-'):
                                             #print( "  ok" )
                                             pass # it seems that the reference is contained there in the anchor
                                             #print( self.BBB, 'XR2', '"'+noteText+'"', "'"+xrCVSeparator+"'", "'"+xrTrailer+"'", CV1, CV2 )
                                         else:
-                                            xrefErrors.append( lineLocationSpace + _("Cross-reference anchor reference possibly does not match: {!r}").format( noteText ) )
+                                            xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference anchor reference possibly does not match: {!r}"), noteText ) )
                                             print( self.BBB, 'XR3', '"'+noteText+'"', "'"+xrCVSeparator+"'", "'"+xrTrailer+"'", CV1, CV2 )
                                 break # Only process the first xo field
                         if not haveAnchor:
                             if extraType == 'fn':
                                 if discoveryDict and 'haveFootnoteOrigins' in discoveryDict and discoveryDict['haveFootnoteOrigins']>0:
-                                    footnoteErrors.append( lineLocationSpace + _("Footnote seems to have no anchor reference: {!r}").format( extraText ) )
-                                    self.addPriorityError( 39, C, V, _("Missing anchor reference for footnote") )
+                                    footnoteErrors.append( ErrorRecord( lineLocationSpace, _("Footnote seems to have no anchor reference: {!r}"), extraText ) )
+                                    addPriorityError( 39, C, V, _("Missing anchor reference for footnote") )
                             elif extraType == 'xr':
                                 if discoveryDict and 'haveCrossReferenceOrigins' in discoveryDict and discoveryDict['haveCrossReferenceOrigins']>0:
-                                    xrefErrors.append( lineLocationSpace + _("Cross-reference seems to have no anchor reference: {!r}").format( extraText ) )
-                                    self.addPriorityError( 38, C, V, _("Missing anchor reference for cross-reference") )
+                                    xrefErrors.append( ErrorRecord( lineLocationSpace, _("Cross-reference seems to have no anchor reference: {!r}"), extraText ) )
+                                    addPriorityError( 38, C, V, _("Missing anchor reference for cross-reference") )
 
                     # much more yet to be written …
 
+        for args in priorityErrors: self.addPriorityError( *args )
         if (footnoteErrors or xrefErrors or noteMarkerErrors or footnoteList or xrefList or leaderCounts) and 'Notes' not in self.errorDictionary:
             self.errorDictionary['Notes'] = OrderedDict() # So we hopefully get the errors first
         if footnoteErrors: self.errorDictionary['Notes']['Footnote Errors'] = footnoteErrors
@@ -4182,15 +4344,112 @@ class InternalBibleBook:
         if xrefList: self.errorDictionary['Notes']['Cross-reference Lines'] = xrefList
         if leaderCounts:
             self.errorDictionary['Notes']['Leader Counts'] = leaderCounts
-            if len(footnoteLeaderList) > 1: self.addPriorityError( 26, '-', '-', _("Mutiple different footnote leader characters: {}").format( footnoteLeaderList ) )
-            if len(xrefLeaderList) > 1: self.addPriorityError( 25, '-', '-', _("Mutiple different cross-reference leader characters: {}").format( xrefLeaderList ) )
-            if len(CVSeparatorList) > 1: self.addPriorityError( 27, '-', '-', _("Mutiple different chapter/verse separator characters: {}").format( CVSeparatorList ) )
+            if len(footnoteLeaderList) > 1: self.addPriorityError( 26, '-', '-', _("Mutiple different footnote leader characters: {}"), footnoteLeaderList )
+            if len(xrefLeaderList) > 1: self.addPriorityError( 25, '-', '-', _("Mutiple different cross-reference leader characters: {}"), xrefLeaderList )
+            if len(CVSeparatorList) > 1: self.addPriorityError( 27, '-', '-', _("Mutiple different chapter/verse separator characters: {}"), CVSeparatorList )
+    # end of InternalBibleBook._checkNotesVisitor
+
+
+    def runChecks( self, checkNames=None, discoveryDict=None ):
+        """
+        Runs the named checks (default is all of INTERNAL_BIBLE_BOOK_CHECKS)
+            in a single pass through the processed lines.
+
+        Each check is a generator method (named _check<checkName>Visitor)
+            which is sent each entry along with the current chapter and verse
+            (which are only worked out once here for all the checks).
+        Any priority errors are saved up by each check
+            so the results are exactly the same as running the checks one at a time.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "InternalBibleBook.runChecks( {}, … ) for {}".format( checkNames, self.BBB ) )
+        if not self._processedFlag:
+            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
+                print( "InternalBibleBook {} {!r}: processing lines called from 'runChecks'".format( self.BBB, self.workName ) )
+            self.processLines()
+        if BibleOrgSysGlobals.debugFlag: assert self._processedLines
+
+        if checkNames is None: checkNames = INTERNAL_BIBLE_BOOK_CHECKS
+        for checkName in checkNames:
+            if checkName not in INTERNAL_BIBLE_BOOK_CHECKS:
+                logging.error( ErrorRecord( "runChecks: ", _("Unknown {!r} check requested for {}"), checkName, self.BBB ) )
+        visitors = []
+        for checkName in INTERNAL_BIBLE_BOOK_CHECKS: # Always in this order
+            if checkName in checkNames:
+                visitor = getattr( self, '_check{}Visitor'.format( checkName ) )( discoveryDict )
+                next( visitor ) # Do the set-up (up to the first yield)
+                visitors.append( visitor )
+        if not visitors: return
+
+        C, V = '-1', '-1' # So first/id line starts at -1:0
+        for entry in self._processedLines:
+            marker, text = entry.getMarker(), entry.getText()
+            # Keep track of where we are for more helpful error messages
+            if marker=='c' and text: C, V = text.split()[0], '0'
+            elif marker=='v' and text: V = text.split()[0]
+            elif C == '-1' and marker!='intro': V = str( int(V) + 1 ) # first/id line will be 0:0
+            item = entry, C, V, '{} {}:{} '.format( self.BBB, C, V )
+            for visitor in visitors: visitor.send( item )
+        for visitor in visitors: # Tell them we're finished (so they save their results)
+            try: visitor.send( None )
+            except StopIteration: pass
+    # end of InternalBibleBook.runChecks
+
+
+    def doCheckSFMs( self, discoveryDict ):
+        """
+        Runs a number of comprehensive checks on the USFM codes in this Bible book.
+        """
+        self.runChecks( ('SFMs',), discoveryDict )
+    # end of InternalBibleBook.doCheckSFMs
+
+    def doCheckCharacters( self ):
+        """Runs a number of checks on the characters used."""
+        self.runChecks( ('Characters',) )
+    # end of InternalBibleBook.doCheckCharacters
+
+    def doCheckSpeechMarks( self ):
+        """
+        Runs a number of checks on the speech marks in the Bible book.
+        """
+        self.runChecks( ('SpeechMarks',) )
+    # end of InternalBibleBook.doCheckSpeechMarks
+
+    def doCheckWords( self ):
+        """
+        Runs a number of checks on the words used.
+        """
+        self.runChecks( ('Words',) )
+    # end of InternalBibleBook.doCheckWords
+
+    def doCheckHeadings( self, discoveryDict ):
+        """
+        Runs a number of checks on headings and section cross-references.
+        """
+        self.runChecks( ('Headings',), discoveryDict )
+    # end of InternalBibleBook.doCheckHeadings
+
+    def doCheckIntroduction( self ):
+        """
+        Runs a number of checks on introductory parts.
+        """
+        self.runChecks( ('Introduction',) )
+    # end of InternalBibleBook.doCheckIntroduction
+
+    def doCheckNotes( self, discoveryDict ):
+        """
+        Runs a number of checks on footnotes and cross-references.
+        """
+        self.runChecks( ('Notes',), discoveryDict )
     # end of InternalBibleBook.doCheckNotes
 
 
-    def check( self, discoveryDict=None, typicalAddedUnitData=None ):
+    def check( self, discoveryDict=None, typicalAddedUnitData=None, checkNames=None ):
         """
         Runs a number of checks on the book and returns the error dictionary.
+
+        checkNames can be used to only do some of the INTERNAL_BIBLE_BOOK_CHECKS
+            (e.g., for a quick check before committing changes).
         """
         if not self._processedFlag:
             if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
@@ -4201,32 +4460,24 @@ class InternalBibleBook:
         # Ignore the result of these next ones -- just use any errors collected
         #self.getVersification() # This checks CV ordering, etc. at the same time
         # Further checks
-        self.doCheckSFMs( discoveryDict )
-        self.doCheckCharacters()
-        self.doCheckSpeechMarks()
-        self.doCheckWords()
-        self.doCheckHeadings( discoveryDict )
-        self.doCheckIntroduction()
-        self.doCheckNotes( discoveryDict ) # footnotes and cross-references
+        self.runChecks( checkNames, discoveryDict ) # All in one pass through the lines
 
         if self.checkAddedUnitsFlag: # This code is temporary XXXXXXXXXXXXXXXXXXXXXXXX …
             if typicalAddedUnitData is None: # Get our recommendations for added units
-                import pickle
-                folder = os.path.join( os.path.dirname(__file__), "DataFiles/", "ScrapedFiles/" ) # Relative to module, not cwd
-                filepath = os.path.join( folder, "AddedUnitData.pickle" )
-                if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Importing from {}…").format( filepath ) )
-                with open( filepath, 'rb' ) as pickleFile:
-                    typicalAddedUnitData = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
-            self.doCheckAddedUnits( typicalAddedUnitData )
+                typicalAddedUnitData = getTypicalAddedUnitData()
+            if typicalAddedUnitData is not None:
+                self.doCheckAddedUnits( typicalAddedUnitData )
     # end of InternalBibleBook.check
 
 
     def getErrors( self ):
         """
-        Returns the error dictionary for the book.
+        Returns the error dictionary for the book
+            (after formatting any ErrorRecords into strings).
         """
         if 'Priority Errors' in self.errorDictionary and not self.errorDictionary['Priority Errors']:
             self.errorDictionary.pop( 'Priority Errors' ) # Remove empty dictionary entry if unused
+        formatErrorRecords( self.errorDictionary )
         return self.errorDictionary
     # end of InternalBibleBook.getErrors
 
@@ -4257,7 +4508,7 @@ class InternalBibleBook:
             print( exp("getNumVerses( {!r} )").format( C ) )
 
         if isinstance( C, int ): # Just double-check the parameter
-            logging.debug( exp("getNumVerses was passed an integer chapter instead of a string with {} {}").format( self.BBB, C ) )
+            logging.debug( ErrorRecord( '', exp("getNumVerses was passed an integer chapter instead of a string with {} {}"), self.BBB, C ) )
             C = str( C )
         self.getVersificationIfNecessary()
         for thisC,thisNumVerses in self.versificationList:
@@ -4295,6 +4546,58 @@ class InternalBibleBook:
     # end of InternalBibleBook.getContextVerseData
 
 
+    def getVerseDataForCVs( self, CVList, contextFlag=False ):
+        """
+        Given a list of (C,V) 2-tuples,
+            returns a list (in the same order) of InternalBibleEntryList objects
+            (or (InternalBibleEntryList,context) 2-tuples if contextFlag is set).
+
+        Unlike getContextVerseData, None is returned (in the list) for C:V references that aren't found.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "InternalBibleBook.getVerseDataForCVs( {}, {} ) for {}".format( CVList, contextFlag, self.BBB ) )
+
+        if not self._processedFlag:
+            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
+                print( "InternalBibleBook {} {!r}: processing lines called from 'getVerseDataForCVs'".format( self.BBB, self.workName ) )
+            self.processLines()
+        getEntries = self._CVIndex.getEntriesWithContext if contextFlag else self._CVIndex.getEntries
+        results = []
+        for CV in CVList:
+            try: results.append( getEntries( CV ) )
+            except KeyError: results.append( None )
+        return results
+    # end of InternalBibleBook.getVerseDataForCVs
+
+
+    def getVerseFingerprints( self ):
+        """
+        Returns a 2-tuple (CVKeys, fingerprints) for the verses in the book which have verse text,
+            where CVKeys is a tuple of (C,V) keys in index order
+            and fingerprints is a parallel array of 64-bit hashes of the normalized clean verse text.
+
+        The result is cached (and used by InternalBible.getVerseFingerprints).
+        """
+        try:
+            if self._verseFingerprints is not None: return self._verseFingerprints
+        except AttributeError: pass # Could be from an older pickled book
+
+        if not self._processedFlag:
+            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
+                print( "InternalBibleBook {} {!r}: processing lines called from 'getVerseFingerprints'".format( self.BBB, self.workName ) )
+            self.processLines()
+        CVKeys, fingerprints = [], array( 'Q' )
+        for CVKey in self._CVIndex:
+            verseText = normalizeVerseText( ' '.join( entry.getCleanText() for entry in self._CVIndex.getEntries( CVKey )
+                                                        if entry.getMarker() in VERSE_TEXT_MARKERS and entry.getCleanText() ) )
+            if verseText:
+                CVKeys.append( CVKey )
+                fingerprints.append( makeVerseFingerprint( verseText ) )
+        self._verseFingerprints = tuple( CVKeys ), fingerprints
+        return self._verseFingerprints
+    # end of InternalBibleBook.getVerseFingerprints
+
+
     def writeBOSBCVFiles( self, bookFolderPath ):
         """
         Write the internal pseudoUSFM out directly with one file per verse in one folder for the book.
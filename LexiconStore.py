@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# LexiconStore.py
+#
+# Module handling prebuilt, indexed on-disk stores for the Hebrew and Greek lexicons
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module handling prebuilt, indexed on-disk stores for the Hebrew and Greek lexicons.
+
+Parsing and validating the lexicon XML files is slow,
+    so the Python dictionaries made by the *FileConverter.importDataToPython functions
+    are saved (once) into an SQLite database in the cache folder.
+Later runs just open the database and each entry is only read (and unpickled)
+    when it's actually asked for.
+
+A store is divided into named sections (one for each of the original dictionaries).
+    LexiconStoreSection objects can be used like the original (read-only) dictionaries.
+
+The store is rebuilt if any of the source XML files are newer than it.
+"""
+
+from gettext import gettext as _
+
+LastModifiedDate = '2018-03-16' # by RJH
+ShortProgName = "LexiconStore"
+ProgName = "Lexicon store handler"
+ProgVersion = '0.01'
+ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
+ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
+
+debuggingThisModule = False
+
+
+import os.path
+import logging, pickle
+import sqlite3
+from collections.abc import Mapping
+
+import BibleOrgSysGlobals
+
+
+LEXICON_STORE_FORMAT_VERSION = '1'
+
+
+
+class LexiconStoreSection( Mapping ):
+    """
+    Read-only, dictionary-like view of one section of a LexiconStore.
+
+    Entries are fetched (and unpickled) on demand
+        and then remembered (because callers often do "if key in d: return d[key]").
+    """
+    def __init__( self, lexiconStore, sectionName ):
+        self.lexiconStore, self.sectionName = lexiconStore, sectionName
+        self.fetchedEntries = {}
+        self.entryCount = None
+
+    def __getitem__( self, key ):
+        try: return self.fetchedEntries[key]
+        except KeyError: pass
+        row = self.lexiconStore.connection.execute( 'SELECT data FROM entries WHERE section=? AND key=?',
+                                                                        (self.sectionName,key) ).fetchone()
+        if row is None: raise KeyError( key )
+        entry = pickle.loads( row[0] )
+        self.fetchedEntries[key] = entry
+        return entry
+
+    def __contains__( self, key ):
+        try: self[key]
+        except KeyError: return False
+        return True
+
+    def __iter__( self ):
+        for (key,) in self.lexiconStore.connection.execute( 'SELECT key FROM entries WHERE section=?', (self.sectionName,) ).fetchall():
+            yield key
+
+    def __len__( self ):
+        if self.entryCount is None:
+            self.entryCount = self.lexiconStore.connection.execute( 'SELECT COUNT(*) FROM entries WHERE section=?',
+                                                                        (self.sectionName,) ).fetchone()[0]
+        return self.entryCount
+# end of LexiconStoreSection class
+
+
+
+class LexiconStore:
+    """
+    Class for reading a prebuilt lexicon store (an SQLite database).
+    """
+    def __init__( self, storeFilepath ):
+        """
+        Open the store (read-only) -- this is fast because nothing is read yet.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( "LexiconStore.__init__( {!r} )".format( storeFilepath ) )
+        self.storeFilepath = storeFilepath
+        self.connection = sqlite3.connect( 'file:{}?mode=ro'.format( os.path.abspath( storeFilepath ) ), uri=True,
+                                                check_same_thread=False )
+        self.header = dict( self.connection.execute( 'SELECT name,value FROM header' ).fetchall() )
+        self.sections = {}
+    # end of LexiconStore.__init__
+
+
+    def __str__( self ):
+        """
+        This method returns the string representation of the lexicon store.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        result = "Lexicon store object"
+        result += ('\n' if result else '') + "  " + _("Filepath: {}").format( self.storeFilepath )
+        for sectionName in self.getSectionNames():
+            result += ('\n' if result else '') + "  " + _("Number of {} entries = {}").format( sectionName, len(self.getSection(sectionName)) )
+        return result
+    # end of LexiconStore.__str__
+
+
+    def getSectionNames( self ):
+        """
+        Returns a list of the section names in the store.
+        """
+        return [sectionName for (sectionName,) in self.connection.execute( 'SELECT DISTINCT section FROM entries' ).fetchall()]
+    # end of LexiconStore.getSectionNames
+
+
+    def getSection( self, sectionName ):
+        """
+        Returns a LexiconStoreSection which can be used instead of the original dictionary.
+        """
+        if sectionName not in self.sections:
+            self.sections[sectionName] = LexiconStoreSection( self, sectionName )
+        return self.sections[sectionName]
+    # end of LexiconStore.getSection
+
+
+    def close( self ):
+        self.connection.close()
+# end of LexiconStore class
+
+
+
+def makeLexiconStore( storeFilepath, sectionDict, sourceFolder ):
+    """
+    Write a new store from a dictionary of section names to (entry) dictionaries.
+
+    The store is written to a temporary file and then renamed
+        so that readers never see a half-written store.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 1:
+        print( _("Making lexicon store {}…").format( storeFilepath ) )
+    tempFilepath = storeFilepath + '.tmp'
+    if os.path.exists( tempFilepath ): os.remove( tempFilepath )
+    connection = sqlite3.connect( tempFilepath )
+    with connection:
+        connection.execute( 'CREATE TABLE header ( name TEXT PRIMARY KEY, value TEXT )' )
+        connection.execute( 'CREATE TABLE entries ( section TEXT NOT NULL, key TEXT NOT NULL, data BLOB NOT NULL, PRIMARY KEY (section,key) ) WITHOUT ROWID' )
+        connection.executemany( 'INSERT INTO header VALUES (?,?)',
+                                ( ('formatVersion',LEXICON_STORE_FORMAT_VERSION),
+                                  ('sourceFolder',os.path.abspath( sourceFolder )),
+                                  ('madeBy',ProgNameVersion) ) )
+        for sectionName,entries in sectionDict.items():
+            connection.executemany( 'INSERT INTO entries VALUES (?,?,?)',
+                    ((sectionName,key,pickle.dumps( entry, pickle.HIGHEST_PROTOCOL )) for key,entry in entries.items()) )
+    connection.close()
+    os.replace( tempFilepath, storeFilepath )
+# end of makeLexiconStore
+
+
+def getLexiconStore( storeFilename, sourceFolder, sourceFilenames, makeSectionsFunction ):
+    """
+    Returns an open LexiconStore from the cache folder,
+        first making it with makeSectionsFunction( sourceFolder ) if it's missing or out-of-date.
+
+    makeSectionsFunction must return a dictionary of section names to (entry) dictionaries.
+
+    Returns None (after logging the error) if the store can't be made or opened,
+        in which case the caller should just use the XML files directly.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( "getLexiconStore( {!r}, {!r}, {} )".format( storeFilename, sourceFolder, sourceFilenames ) )
+    storeFilepath = os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, storeFilename )
+
+    if os.path.isfile( storeFilepath ):
+        storeModifiedTime = os.stat( storeFilepath )[8]
+        upToDateFlag = True
+        for sourceFilename in sourceFilenames:
+            sourceFilepath = os.path.join( sourceFolder, sourceFilename )
+            if os.path.isfile( sourceFilepath ) and os.stat( sourceFilepath )[8] > storeModifiedTime:
+                upToDateFlag = False; break
+        if upToDateFlag:
+            try:
+                lexiconStore = LexiconStore( storeFilepath )
+                if lexiconStore.header.get( 'formatVersion' ) == LEXICON_STORE_FORMAT_VERSION \
+                and lexiconStore.header.get( 'sourceFolder' ) == os.path.abspath( sourceFolder ):
+                    return lexiconStore
+                lexiconStore.close()
+            except sqlite3.Error as err:
+                logging.warning( _("Unable to open lexicon store {}: {}").format( storeFilepath, err ) )
+
+    sectionDict = makeSectionsFunction( sourceFolder ) # Slow (parses the XML) -- can raise FileNotFoundError
+    try:
+        if not os.access( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, os.W_OK ):
+            os.makedirs( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, exist_ok=True )
+        makeLexiconStore( storeFilepath, sectionDict, sourceFolder )
+        return LexiconStore( storeFilepath )
+    except (OSError, sqlite3.Error) as err:
+        logging.error( _("Unable to make lexicon store {}: {}").format( storeFilepath, err ) )
+# end of getLexiconStore
+
+
+
+def demo():
+    """
+    Main program to handle command line parameters and then run what they want.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 0: print( ProgNameVersion )
+
+    for storeFilename in ('HebrewLexicon.sqlite','GreekLexicon.sqlite',):
+        storeFilepath = os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, storeFilename )
+        if os.path.isfile( storeFilepath ):
+            print( LexiconStore( storeFilepath ) )
+        else: print( "No {} store (yet)".format( storeFilepath ) )
+# end of demo
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    demo()
+
+    BibleOrgSysGlobals.closedown( ProgName, ProgVersion )
+# end of LexiconStore.py
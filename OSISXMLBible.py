@@ -38,10 +38,10 @@ NOTE: We could use multiprocessing in loadBooks()
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-10' # by RJH
+LastModifiedDate = '2018-03-17' # by RJH
 ShortProgName = "OSISBible"
 ProgName = "OSIS XML Bible format handler"
-ProgVersion = '0.63'
+ProgVersion = '0.64'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -49,7 +49,7 @@ debuggingThisModule = False
 
 
 import logging, os, sys
-from xml.etree.ElementTree import ElementTree, ParseError
+from xml.etree.ElementTree import ParseError
 
 import BibleOrgSysGlobals
 from ISO_639_3_Languages import ISO_639_3_Languages
@@ -446,22 +446,23 @@ class OSISXMLBible( Bible ):
         """
         Load a single source XML file and remove the header from the tree.
         Also, extracts some useful elements from the header element.
+
+        The file is parsed incrementally and each book is released once it's been extracted,
+            so only the header, the front matter, and the book currently being loaded are kept in memory.
         """
         if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
             print( _("  OSISXMLBible loading {}…").format( OSISFilepath ) )
 
-        try: self.XMLTree = ElementTree().parse( OSISFilepath )
+        elementEvents = BibleOrgSysGlobals.iterparseXMLElements( OSISFilepath, maxDepth=3 )
+        try: event, depth, self.XMLTree, parentElement = next( elementEvents ) # Only the root tag and attributes are available yet
         except ParseError as err:
             logging.critical( exp("Loader parse error in xml file {}: {} {}").format( OSISFilepath, sys.exc_info()[0], err ) )
             loadErrors.append( exp("Loader parse error in xml file {}: {} {}").format( OSISFilepath, sys.exc_info()[0], err ) )
             return
-        if BibleOrgSysGlobals.debugFlag: assert len( self.XMLTree ) # Fail here if we didn't load anything at all
 
         # Find the main (osis) container
         if self.XMLTree.tag == OSISXMLBible.treeTag:
             location = 'OSIS file'
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h', loadErrors )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8', loadErrors )
             # Process the attributes first
             self.schemaLocation = None
             for attrib,value in self.XMLTree.items():
@@ -471,75 +472,110 @@ class OSISXMLBible( Bible ):
                     logging.warning( "fv6g Unprocessed {} attribute ({}) in {}".format( attrib, value, location ) )
                     loadErrors.append( "Unprocessed {} attribute ({}) in {} (fv6g)".format( attrib, value, location ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+        else:
+            logging.error( "Expected to load {!r} but got {!r}".format( OSISXMLBible.treeTag, self.XMLTree.tag ) )
+            loadErrors.append( "Expected to load {!r} but got {!r}".format( OSISXMLBible.treeTag, self.XMLTree.tag ) )
+            if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+            return
 
-            # Find the submain (osisText) container
-            if len(self.XMLTree)==1 and (self.XMLTree[0].tag == OSISXMLBible.textTag or (not BibleOrgSysGlobals.strictCheckingFlag and self.XMLTree[0].tag == 'osisText')):
-                sublocation = "osisText in " + location
-                textElement = self.XMLTree[0]
-                BibleOrgSysGlobals.checkXMLNoText( textElement, sublocation, '3b5g', loadErrors )
-                BibleOrgSysGlobals.checkXMLNoTail( textElement, sublocation, '7h9k', loadErrors )
-                # Process the attributes first
-                self.osisIDWork = self.osisRefWork = canonical = None
-                for attrib,value in textElement.items():
-                    if attrib=='osisIDWork':
-                        self.osisIDWork = value
-                        if not self.name: self.name = value
-                    elif attrib=='osisRefWork': self.osisRefWork = value
-                    elif attrib=='canonical':
-                        canonical = value
-                        assert canonical in ('true','false')
-                    elif attrib==OSISXMLBible.XMLNameSpace+'lang': self.lang = value
-                    else:
-                        logging.warning( "gb2d Unprocessed {} attribute ({}) in {}".format( attrib, value, sublocation ) )
-                        loadErrors.append( "Unprocessed {} attribute ({}) in {} (gb2d)".format( attrib, value, sublocation ) )
-                        if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-                if self.osisRefWork:
-                    if self.osisRefWork not in ('bible','Bible','defaultReferenceScheme'):
-                        logging.warning( "New variety of osisRefWork: {!r}".format( self.osisRefWork ) )
-                        loadErrors.append( "New variety of osisRefWork: {!r}".format( self.osisRefWork ) )
-                        if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-                if self.lang:
-                    if self.lang in ('en','de','he'): # Only specifically recognise these ones so far (English, German, Hebrew)
-                        if BibleOrgSysGlobals.verbosityLevel > 2: print( "    Language is {!r}".format( self.lang ) )
-                    else:
-                        logging.info( "Discovered unknown {!r} language".format( self.lang ) )
-                if BibleOrgSysGlobals.verbosityLevel > 2: print( "  osisIDWork is {!r}".format( self.osisIDWork ) )
-
-                # Find (and move) the header container
-                if textElement[0].tag == OSISXMLBible.headerTag:
-                    self.header = textElement[0]
-                    textElement.remove( self.header )
-                    self.validateHeader( self.header, loadErrors )
-                else:
-                    logging.warning( "Missing header element (looking for {!r} tag)".format( OSISXMLBible.headerTag ) )
-                    loadErrors.append( "Missing header element (looking for {!r} tag)".format( OSISXMLBible.headerTag ) )
-                    if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-
-                # Find (and move) the optional front matter (div) container
-                if textElement[0].tag == OSISXMLBible.divTag or (not BibleOrgSysGlobals.strictCheckingFlag and textElement[0].tag == 'div'):
-                    sub2location = "div of " + sublocation
-                    # Process the attributes first
-                    div0Type = div0OsisID = canonical = None
-                    for attrib,value in textElement[0].items():
-                        if attrib=='type': div0Type = value
-                        elif attrib=='osisID': div0OsisID = value
-                        elif attrib=='canonical':
-                            assert canonical is None
-                            canonical = value
-                            assert canonical in ('true','false')
+        textElement = None # The submain (osisText) container
+        textElementCount = divCount = 0
+        headerElement = frontMatterDiv = bookGroupDiv = None
+        self.divs, self.divTypesString = [], None
+        try:
+            for event, depth, element, parentElement in elementEvents:
+                if depth == 1: # Find the submain (osisText) container
+                    if event == 'start':
+                        textElementCount += 1
+                        if textElementCount==1 and (element.tag == OSISXMLBible.textTag or (not BibleOrgSysGlobals.strictCheckingFlag and element.tag == 'osisText')):
+                            textElement = element
+                            sublocation = "osisText in " + location
+                            # Process the attributes first
+                            self.osisIDWork = self.osisRefWork = canonical = None
+                            for attrib,value in textElement.items():
+                                if attrib=='osisIDWork':
+                                    self.osisIDWork = value
+                                    if not self.name: self.name = value
+                                elif attrib=='osisRefWork': self.osisRefWork = value
+                                elif attrib=='canonical':
+                                    canonical = value
+                                    assert canonical in ('true','false')
+                                elif attrib==OSISXMLBible.XMLNameSpace+'lang': self.lang = value
+                                else:
+                                    logging.warning( "gb2d Unprocessed {} attribute ({}) in {}".format( attrib, value, sublocation ) )
+                                    loadErrors.append( "Unprocessed {} attribute ({}) in {} (gb2d)".format( attrib, value, sublocation ) )
+                                    if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                            if self.osisRefWork:
+                                if self.osisRefWork not in ('bible','Bible','defaultReferenceScheme'):
+                                    logging.warning( "New variety of osisRefWork: {!r}".format( self.osisRefWork ) )
+                                    loadErrors.append( "New variety of osisRefWork: {!r}".format( self.osisRefWork ) )
+                                    if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                            if self.lang:
+                                if self.lang in ('en','de','he'): # Only specifically recognise these ones so far (English, German, Hebrew)
+                                    if BibleOrgSysGlobals.verbosityLevel > 2: print( "    Language is {!r}".format( self.lang ) )
+                                else:
+                                    logging.info( "Discovered unknown {!r} language".format( self.lang ) )
+                            if BibleOrgSysGlobals.verbosityLevel > 2: print( "  osisIDWork is {!r}".format( self.osisIDWork ) )
                         else:
-                            logging.warning( "7j4d Unprocessed {} attribute ({}) in {}".format( attrib, value, sub2location ) )
-                            loadErrors.append( "Unprocessed {} attribute ({}) in {} (7j4d)".format( attrib, value, sub2location ) )
+                            logging.error( "Expected to find {!r} but got {!r}".format( OSISXMLBible.textTag, element.tag ) )
+                            loadErrors.append( "Expected to find {!r} but got {!r}".format( OSISXMLBible.textTag, element.tag ) )
+                            if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                    else: # must be 'end'
+                        if element is textElement:
+                            BibleOrgSysGlobals.checkXMLNoText( textElement, sublocation, '3b5g', loadErrors )
+                            BibleOrgSysGlobals.checkXMLNoTail( textElement, sublocation, '7h9k', loadErrors )
+                        self.XMLTree.remove( element ) # Release the memory
+
+                elif depth == 3: # Books can be extracted one at a time from a book group as they finish
+                    if bookGroupDiv is not None and parentElement is bookGroupDiv:
+                        self.validateAndExtractBookGroupSubelement( element, loadErrors )
+                        bookGroupDiv.remove( element ) # Release the memory
+
+                elif parentElement is textElement: # The header, front matter, and main divs
+                    isDiv = element.tag == OSISXMLBible.divTag or (not BibleOrgSysGlobals.strictCheckingFlag and element.tag == 'div')
+                    if event == 'start': # Only the tag and attributes are available yet
+                        divCount += 1
+                        if divCount == 1:
+                            if element.tag == OSISXMLBible.headerTag: headerElement = element; continue
+                            logging.warning( "Missing header element (looking for {!r} tag)".format( OSISXMLBible.headerTag ) )
+                            loadErrors.append( "Missing header element (looking for {!r} tag)".format( OSISXMLBible.headerTag ) )
                             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-                    if div0Type == 'front':
-                        self.frontMatter = textElement[0]
-                        textElement.remove( self.frontMatter )
-                        self.validateFrontMatter( self.frontMatter, loadErrors )
-                    else: logging.info( "No front matter division" )
-
-                self.divs, self.divTypesString = [], None
-                for element in textElement:
-                    if element.tag == OSISXMLBible.divTag or (not BibleOrgSysGlobals.strictCheckingFlag and element.tag == 'div'):
+                        if isDiv and (divCount == 1 or (divCount == 2 and headerElement is not None)):
+                            frontMatterDiv = element # Might be the optional front matter (div) container
+                        if isDiv and element.get( 'type' ) == 'bookGroup':
+                            self.validateMainDivAttributes( element, loadErrors )
+                            bookGroupDiv = element
+                        continue
+
+                    # Otherwise it's the end of the element
+                    if element is headerElement: # Move the header container
+                        self.header = element
+                        textElement.remove( self.header )
+                        self.validateHeader( self.header, loadErrors )
+                        continue
+                    if element is frontMatterDiv: # Check for (and move) the optional front matter (div) container
+                        sub2location = "div of " + sublocation
+                        # Process the attributes first
+                        div0Type = div0OsisID = canonical = None
+                        for attrib,value in element.items():
+                            if attrib=='type': div0Type = value
+                            elif attrib=='osisID': div0OsisID = value
+                            elif attrib=='canonical':
+                                assert canonical is None
+                                canonical = value
+                                assert canonical in ('true','false')
+                            else:
+                                logging.warning( "7j4d Unprocessed {} attribute ({}) in {}".format( attrib, value, sub2location ) )
+                                loadErrors.append( "Unprocessed {} attribute ({}) in {} (7j4d)".format( attrib, value, sub2location ) )
+                                if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                        if div0Type == 'front':
+                            self.frontMatter = element
+                            textElement.remove( self.frontMatter )
+                            self.validateFrontMatter( self.frontMatter, loadErrors )
+                            continue
+                        else: logging.info( "No front matter division" )
+
+                    if isDiv:
                         sub2location = "div in " + sublocation
                         BibleOrgSysGlobals.checkXMLNoText( element, sub2location, '3a2s', loadErrors )
                         BibleOrgSysGlobals.checkXMLNoTail( element, sub2location, '4k8a', loadErrors )
@@ -551,20 +587,26 @@ class OSISXMLBible( Bible ):
                         if divType != self.divTypesString:
                             if not self.divTypesString: self.divTypesString = divType
                             else: self.divTypesString = 'MixedTypes'
-                        self.validateAndExtractMainDiv( element, loadErrors )
+                        if element is bookGroupDiv: bookGroupDiv = None # Its books have already been extracted
+                        else: self.validateAndExtractMainDiv( element, loadErrors )
+                        del element[:] # Only keep the (now empty) div itself
                         self.divs.append( element )
                     else:
                         logging.error( "Expected to find {!r} but got {!r}".format( OSISXMLBible.divTag, element.tag ) )
                         loadErrors.append( "Expected to find {!r} but got {!r}".format( OSISXMLBible.divTag, element.tag ) )
                         if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-            else:
-                logging.error( "Expected to find {!r} but got {!r}".format( OSISXMLBible.textTag, self.XMLTree[0].tag ) )
-                loadErrors.append( "Expected to find {!r} but got {!r}".format( OSISXMLBible.textTag, self.XMLTree[0].tag ) )
-                if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-        else:
-            logging.error( "Expected to load {!r} but got {!r}".format( OSISXMLBible.treeTag, self.XMLTree.tag ) )
-            loadErrors.append( "Expected to load {!r} but got {!r}".format( OSISXMLBible.treeTag, self.XMLTree.tag ) )
+                    textElement.remove( element ) # Release the memory
+        except ParseError as err:
+            logging.critical( exp("Loader parse error in xml file {}: {} {}").format( OSISFilepath, sys.exc_info()[0], err ) )
+            loadErrors.append( exp("Loader parse error in xml file {}: {} {}").format( OSISFilepath, sys.exc_info()[0], err ) )
+        if textElementCount == 0:
+            logging.error( "Expected to find {!r} but got nothing".format( OSISXMLBible.textTag ) )
+            loadErrors.append( "Expected to find {!r} but got nothing".format( OSISXMLBible.textTag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+
+        # The root text and tail are only available now
+        BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h', loadErrors )
+        BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8', loadErrors )
         if self.XMLTree.tail is not None and self.XMLTree.tail.strip():
             logging.error( "Unexpected {!r} tail data after {} element".format( self.XMLTree.tail, self.XMLTree.tag ) )
             loadErrors.append( "Unexpected {!r} tail data after {} element".format( self.XMLTree.tail, self.XMLTree.tag ) )
@@ -2117,16 +2159,54 @@ class OSISXMLBible( Bible ):
     # end of OSISXMLBible.validateFrontMatter
 
 
-    def validateAndExtractMainDiv( self, div, loadErrors ):
+    def validateMainDivAttributes( self, div, loadErrors ):
         """
-        Check/validate and extract data from the given OSIS div record.
+        Check/validate the attributes of the given OSIS main div record.
             This may be a book group, or directly into a book
-        """
 
+        This is separate so that it can be called at the start of a (streamed) book group
+            before any of its books are available.
+
+        Returns the div type, osisID, and canonical attributes.
+        """
         if BibleOrgSysGlobals.verbosityLevel > 3: print( _("Loading {}OSIS main div…").format( self.abbreviation+' ' if self.abbreviation else '' ) )
         self.haveEIDs = False
         self.haveBook = False
 
+        # Process the div attributes first
+        mainDivType = mainDivOsisID = mainDivCanonical = None
+        for attrib,value in div.items():
+            if attrib=='type':
+                mainDivType = value
+                if mainDivOsisID and BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {} {}…").format( mainDivOsisID, mainDivType ) )
+            elif attrib=='osisID':
+                mainDivOsisID = value
+                if mainDivType and BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {} {}…").format( mainDivOsisID, mainDivType ) )
+            elif attrib=='canonical':
+                mainDivCanonical = value
+            else:
+                logging.warning( "93f5 Unprocessed {!r} attribute ({}) in main div element".format( attrib, value ) )
+                loadErrors.append( "Unprocessed {!r} attribute ({}) in main div element (93f5)".format( attrib, value ) )
+                if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+        if not mainDivType or not (mainDivOsisID or mainDivCanonical):
+            logging.warning( "Incomplete mainDivType {!r} and mainDivOsisID {!r} attributes in main div element".format( mainDivType, mainDivOsisID ) )
+            loadErrors.append( "Incomplete mainDivType {!r} and mainDivOsisID {!r} attributes in main div element".format( mainDivType, mainDivOsisID ) )
+            if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+
+        if mainDivType == 'bookGroup': # this is all the books lumped in together into one big div
+            if BibleOrgSysGlobals.debugFlag: assert mainDivCanonical == 'true'
+            # We have to set BBB when we get a chapter reference
+            if BibleOrgSysGlobals.verbosityLevel > 2: print( _("  Loading a book group…") )
+        return mainDivType, mainDivOsisID, mainDivCanonical
+    # end of OSISXMLBible.validateMainDivAttributes
+
+
+    def validateAndExtractBookGroupSubelement( self, element, loadErrors ):
+        """
+        Check/validate and extract data from the given subelement of an OSIS book group div,
+            i.e., a group title or a book div.
+        """
+        mainDivType = 'bookGroup'
 
         def validateGroupTitle( element, locationDescription ):
             """
@@ -2158,42 +2238,28 @@ class OSISXMLBible( Bible ):
         # end of OSISXMLBible.validateGroupTitle
 
 
-        # Process the div attributes first
-        mainDivType = mainDivOsisID = mainDivCanonical = None
-        BBB = USFMAbbreviation = USFMNumber = ''
-        for attrib,value in div.items():
-            if attrib=='type':
-                mainDivType = value
-                if mainDivOsisID and BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {} {}…").format( mainDivOsisID, mainDivType ) )
-            elif attrib=='osisID':
-                mainDivOsisID = value
-                if mainDivType and BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {} {}…").format( mainDivOsisID, mainDivType ) )
-            elif attrib=='canonical':
-                mainDivCanonical = value
-            else:
-                logging.warning( "93f5 Unprocessed {!r} attribute ({}) in main div element".format( attrib, value ) )
-                loadErrors.append( "Unprocessed {!r} attribute ({}) in main div element (93f5)".format( attrib, value ) )
-                if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
-        if not mainDivType or not (mainDivOsisID or mainDivCanonical):
-            logging.warning( "Incomplete mainDivType {!r} and mainDivOsisID {!r} attributes in main div element".format( mainDivType, mainDivOsisID ) )
-            loadErrors.append( "Incomplete mainDivType {!r} and mainDivOsisID {!r} attributes in main div element".format( mainDivType, mainDivOsisID ) )
+        if element.tag == OSISXMLBible.OSISNameSpace+'title':
+            location = "title of {} div".format( mainDivType )
+            validateGroupTitle( element, location )
+        elif element.tag == OSISXMLBible.OSISNameSpace+'div': # Assume it's a book
+            self.validateAndExtractBookDiv( element, loadErrors )
+        else:
+            logging.error( "hfs6 Unprocessed {!r} sub-element ({}) in {} div".format( element.tag, element.text, mainDivType ) )
+            loadErrors.append( "Unprocessed {!r} sub-element ({}) in {} div (hfs6)".format( element.tag, element.text, mainDivType ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+    # end of OSISXMLBible.validateAndExtractBookGroupSubelement
+
+
+    def validateAndExtractMainDiv( self, div, loadErrors ):
+        """
+        Check/validate and extract data from the given OSIS div record.
+            This may be a book group, or directly into a book
+        """
+        mainDivType, mainDivOsisID, mainDivCanonical = self.validateMainDivAttributes( div, loadErrors )
 
         if mainDivType == 'bookGroup': # this is all the books lumped in together into one big div
-            if BibleOrgSysGlobals.debugFlag: assert mainDivCanonical == 'true'
-            # We have to set BBB when we get a chapter reference
-            if BibleOrgSysGlobals.verbosityLevel > 2: print( _("  Loading a book group…") )
-            self.haveBook = False
             for element in div:
-                if element.tag == OSISXMLBible.OSISNameSpace+'title':
-                    location = "title of {} div".format( mainDivType )
-                    validateGroupTitle( element, location )
-                elif element.tag == OSISXMLBible.OSISNameSpace+'div': # Assume it's a book
-                    self.validateAndExtractBookDiv( element, loadErrors )
-                else:
-                    logging.error( "hfs6 Unprocessed {!r} sub-element ({}) in {} div".format( element.tag, element.text, mainDivType ) )
-                    loadErrors.append( "Unprocessed {!r} sub-element ({}) in {} div (hfs6)".format( element.tag, element.text, mainDivType ) )
-                    if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                self.validateAndExtractBookGroupSubelement( element, loadErrors )
         elif mainDivType == 'book': # this is a single book (not in a group)
             self.validateAndExtractBookDiv( div, loadErrors )
         else:
@@ -34,10 +34,10 @@ Files are usually:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2017-10-19' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "OnlineBible"
 ProgName = "Online Bible format handler"
-ProgVersion = '0.20'
+ProgVersion = '0.21'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -57,6 +57,32 @@ compulsoryFiles = ( 'VERSION.DAT', 'TEXT.DAT', 'TEXTNDX.DAT', ) # Must be UPPPER
 
 
 
+def get16BitString( byteBuffer, startIndex, numChars ):
+    """
+    Decodes numChars little-endian 16-bit characters from byteBuffer (starting at startIndex).
+        (Each 16-bit value becomes one character -- surrogates aren't combined.)
+
+    Raises struct.error if there's not enough bytes.
+    """
+    return ''.join( map( chr, struct.unpack_from( '<{}H'.format( numChars ), byteBuffer, startIndex ) ) )
+# end of get16BitString
+
+
+def get12BitValues( byteBuffer ):
+    """
+    Decodes pairs of 12-bit values packed (low nibbles first) into each three bytes.
+
+    Returns a list of integers.
+    """
+    values = []
+    for b0, b1, b2 in zip( byteBuffer[0::3], byteBuffer[1::3], byteBuffer[2::3] ):
+        values.append( ((b1 & 0x0F) << 8) | b0 )
+        values.append( (b2 << 4) | (b1 >> 4) )
+    return values
+# end of get12BitValues
+
+
+
 def OnlineBibleFileCheck( givenFolderName, strictCheck=True, autoLoad=False, autoLoadBooks=False ):
     """
     Given a folder, search for Online Bible files or folders in the folder and in the next level down.
@@ -343,7 +369,7 @@ class OnlineBible( Bible ):
             length = 137
             vHeader2 = versionBytes[index:index+length]; index += length
             assert vHeader2[0] == 5
-            for ix in range( 1, 8+1 ): assert vHeader2[ix] == 0
+            assert vHeader2[1:8+1] == bytes( 8 )
             vHeader2 = vHeader2[9:]
             if BibleOrgSysGlobals.debugFlag:
                 print( "    {} vBH2 {} {}".format( self.abbreviation, len(vHeader2), hexlify(vHeader2) ) )
@@ -360,7 +386,7 @@ class OnlineBible( Bible ):
             if BibleOrgSysGlobals.debugFlag:
                 print( "    vHeaderDate {}-{:02}-{:02}".format( year, month, date ) )
             vHeader3 = vHeader3[9:]
-            for ix in range( 0, 11+1 ): assert vHeader3[ix] == 0
+            assert vHeader3[0:11+1] == bytes( 12 )
             vHeader3 = vHeader3[12:]
             if BibleOrgSysGlobals.debugFlag:
                 print( "    {} vBH3 {} {}".format( self.abbreviation, len(vHeader3), hexlify(vHeader3) ) )
@@ -407,15 +433,9 @@ class OnlineBible( Bible ):
             while index < len(versionBytes):
                 vBytes = versionBytes[index:index+length]
                 #print( "  vB {} {}".format( hexlify(vBytes), vBytes ) )
-                vLen, = struct.unpack( ">H", vBytes[0:2] )
                 vLen = vBytes[0]
                 #print( "vL2", repr(vLen) )
-                vString = ''
-                for j in range( 0, int(vLen/2) ):
-                    #print( vBytes[2*j+1:2*j+3] )
-                    char16, = struct.unpack( "<H", vBytes[2*j+1:2*j+3] )
-                    #print( char16 )
-                    vString += chr( char16 )
+                vString = get16BitString( vBytes, 1, vLen//2 )
                 #vString = vBytes[2:vLen+1].decode( 'utf-16' )
                 #print( "    vBl2 {}/{} {!r}".format( vLen, int(vLen/2), vString ), end='' )
                 assert not vString[0].islower()
@@ -466,19 +486,12 @@ class OnlineBible( Bible ):
                 elif self.characterBitSize == 16: assert tokenBytes[1] == 0
                 else: halt
 
-            index = 0
             #self.tokenBytes = []
-            self.tokenString = ''
-            while index < len(tokenBytes):
-                if self.characterBitSize == 8:
-                    token = tokenBytes[index]; index += 1
-                elif self.characterBitSize == 16:
-                    try: token, = struct.unpack( "<H", tokenBytes[index:index+2] ); index += 2
-                    except struct.error: logging.critical( "Struct ERROR" ); break
-                #print( chr(token), end=' ' )
-                #self.tokenBytes.append( token )
-                tokenChar = chr( token )
-                self.tokenString += tokenChar
+            if self.characterBitSize == 8:
+                self.tokenString = tokenBytes.decode( 'latin-1' ) # Same as chr() of each byte
+            elif self.characterBitSize == 16:
+                if len(tokenBytes) % 2: logging.critical( "Struct ERROR" ) # Odd number of bytes -- last one is ignored
+                self.tokenString = get16BitString( tokenBytes, 0, len(tokenBytes)//2 )
             if BibleOrgSysGlobals.verbosityLevel > 2:
                 print( "    {:,} {}-bit token characters loaded".format( len(self.tokenString), self.characterBitSize ) )
         # end of load.loadTokenCharacters
@@ -510,7 +523,7 @@ class OnlineBible( Bible ):
             assert size in (35,51,) # 35-3=32, 51-3=48
             vTIHeader = textIndexBytes[3:size+3]
             #print( "tIB header {} {}".format( len(vTIHeader), hexlify(vTIHeader) ) )
-            for something in vTIHeader: assert something == 0 # It's just filler
+            assert vTIHeader == bytes( len(vTIHeader) ) # It's just filler
             index = size
 
             self.textIndex = []
@@ -519,8 +532,7 @@ class OnlineBible( Bible ):
             while index < numTextIndexBytes:
                 indexEntry = textIndexBytes[index:index+size]; index += size
                 assert len(indexEntry) == size
-                iE0, iE1, iE2 = indexEntry[0], indexEntry[1], indexEntry[2]
-                iE = (iE2<<16) + (iE1<<8) + iE0 # IE starts at 0, increases by 1200-1800 each time, up to 1,393,772
+                iE = int.from_bytes( indexEntry[0:3], 'little' ) # IE starts at 0, increases by 1200-1800 each time, up to 1,393,772
                 assert iE > lastIE or ( iE==0 and lastIE==0)
                 indexEntry = indexEntry[3:]
                 lineOffset = iE - lastIE
@@ -528,42 +540,20 @@ class OnlineBible( Bible ):
                 assert total == lineOffset
                 #print( '{:3} +{:4}={:4} {} {}'.format( len(self.textIndex), lineOffset, iE, hexlify(indexEntry), indexEntry ) )
                 total = 0
-                if size == 35: # One byte per entry (handles offsets in range 0..256)
-                    for something in indexEntry: # KJV G
-                        if something > 0:
-                            total += something
-                            #print( "something={} total={}".format( something, total ) ) # Each one adds another 35-145 for KJV, 20-70+ for YLT
-                            pointer = total + iE
-                            #print( "pointer={} lastPointer={}".format( pointer, lastPointer ) )
-                            assert pointer > lastPointer
-                            self.textIndex.append( pointer )
-                            lastPointer = pointer
-                        #else:
-                            #print( "Skipped zero entry at {}".format( pointer ) )
-                elif size == 51: # 1.5 bytes per entry (handles offsets in range 0..4,095 -- 256 is not enough for long verses)
-                    nibbleIndex = 0
-                    for nibbles in indexEntry: # KJV G
-                        if nibbleIndex == 0: n1, n2 = nibbles & 0x0F, (nibbles & 0xF0) >> 4; nibbleIndex = 2
-                        elif nibbleIndex == 1: n2, n3 = nibbles & 0x0F, (nibbles & 0xF0) >> 4; nibbleIndex = 3
-                        elif nibbleIndex == 2: n3, n4 = nibbles & 0x0F, (nibbles & 0xF0) >> 4; nibbleIndex = 4
-                        else: halt
-                        if nibbleIndex >= 3:
-                            something = (n3<<8) + (n2<<4) + n1
-                            #print( "nibbles1 {} {:02x} {:02x} {:02x} {:02x} {:04x}".format( nibbleIndex, n1, n2, n3, n4, something ) )
-                            if nibbleIndex == 3: nibbleIndex = 0
-                            elif nibbleIndex == 4: n1 = n4; nibbleIndex = 1
-                            #print( "nibbles2 {} {:02x} {:02x} {:02x} {:02x} {:04x}".format( nibbleIndex, n1, n2, n3, n4, something ) )
-                            if something > 0:
-                                total += something
-                                #print( "something={} total={}".format( something, total ) ) # Each one adds another 35-145 for KJV, 20-70+ for YLT
-                                pointer = total + iE
-                                #print( "pointer={} lastPointer={}".format( pointer, lastPointer ) )
-                                assert pointer > lastPointer
-                                self.textIndex.append( pointer )
-                                lastPointer = pointer
-                            #else:
-                                #print( "Skipped zero entry at {}".format( pointer ) )
+                if size == 35: offsets = indexEntry # One byte per entry (handles offsets in range 0..256)
+                elif size == 51: offsets = get12BitValues( indexEntry ) # 1.5 bytes per entry (handles offsets in range 0..4,095 -- 256 is not enough for long verses)
                 else: halt
+                for something in offsets: # KJV G
+                    if something > 0:
+                        total += something
+                        #print( "something={} total={}".format( something, total ) ) # Each one adds another 35-145 for KJV, 20-70+ for YLT
+                        pointer = total + iE
+                        #print( "pointer={} lastPointer={}".format( pointer, lastPointer ) )
+                        assert pointer > lastPointer
+                        self.textIndex.append( pointer )
+                        lastPointer = pointer
+                    #else:
+                        #print( "Skipped zero entry at {}".format( pointer ) )
                 lastIE = iE
                 count += 1
             assert index == numTextIndexBytes
@@ -664,13 +654,10 @@ class OnlineBible( Bible ):
             #print( 'index={}={:04x}'.format( index, index ) )
             assert index == 0xe04
             startIndex = index
-            self.optStuff2 = []
-            while True:
-                stuff = optBytes[index]; index += 1
-                #print( "      {} {:04x} {}".format( len(self.optStuff2), index, hexlify(stuff) ) )
-                assert stuff==0 or stuff==1
-                self.optStuff2.append( stuff )
-                if len(self.optStuff2) >= len(self.optStuff1): break
+            self.optStuff2 = list( optBytes[index:index+max(1,len(self.optStuff1))] )
+            index += len( self.optStuff2 )
+            #print( "      {} {:04x} {}".format( len(self.optStuff2), index, hexlify(stuff) ) )
+            assert set( self.optStuff2 ) <= {0,1}
             if BibleOrgSysGlobals.debugFlag:
                 print( "    {} unknown 1-bit flags loaded from {:04x} onwards".format( len(self.optStuff2), startIndex ) )
                 #print( "  index = {:04x}={}".format( index, index ) )
@@ -689,14 +676,9 @@ class OnlineBible( Bible ):
                 #vLen, = struct.unpack( ">H", vBytes[0:2] )
                 vLen = optBytes[index]
                 #print( "vL2", repr(vLen) )
-                vString = ''
                 if self.characterBitSize == 8:
                     # Nine 8-bit chars filled with rubbish past the specified number
-                    for j in range( 0, vLen ):
-                        #print( vBytes[2*j+1:2*j+3] )
-                        char8 = optBytes[index+j+1]
-                        #print( vLen, j, char8 )
-                        vString += chr( char8 )
+                    vString = optBytes[index+1:index+1+vLen].decode( 'latin-1' ) # Same as chr() of each byte
                     #print( 'vString', repr(vString) )
                     index += 10
                     assert not vString[0].islower()
@@ -704,12 +686,9 @@ class OnlineBible( Bible ):
                 elif self.characterBitSize == 16:
                     # Nine 16-bit characters
                     vBytes = optBytes[index+1:index+19]
-                    for j in range( 0, int(vLen/2) ):
-                        #print( vBytes[2*j+1:2*j+3] )
-                        try: char16, = struct.unpack( "<H", vBytes[2*j:2*j+2] )
-                        except struct.error: logging.critical( "Struct error" ); index += 999999; break
-                        #print( char16 )
-                        vString += chr( char16 )
+                    numChars = min( vLen//2, len(vBytes)//2 )
+                    vString = get16BitString( vBytes, 0, numChars )
+                    if numChars < vLen//2: logging.critical( "Struct error" ); index += 999999
                     #vString = vBytes[2:vLen+1].decode( 'utf-16' )
                     #print( "    tO {}/{} {!r}".format( vLen, int(vLen/2), vString ), end='' )
                     index += 19
@@ -776,8 +755,8 @@ class OnlineBible( Bible ):
                 indexEntry1, indexEntry2 = indexEntry[:size0], indexEntry[size0:]
                 assert len(indexEntry1)==size0 and len(indexEntry2)==size1
                 # Seems part a starts with a 3-byte pointer to something
-                diskPointer1 = (indexEntry1[2]<<16) + (indexEntry1[1]<<8) + indexEntry1[0]
-                diskPointer2 = (indexEntry2[2]<<16) + (indexEntry2[1]<<8) + indexEntry2[0]
+                diskPointer1 = int.from_bytes( indexEntry1[0:3], 'little' )
+                diskPointer2 = int.from_bytes( indexEntry2[0:3], 'little' )
                 assert diskPointer2 == total
                 count1 = indexEntry1[3]
                 if 0 and len(self.xrefIndex) < 10:
@@ -785,8 +764,7 @@ class OnlineBible( Bible ):
                     print( '    a {} {} {}'.format( len(indexEntry1), hexlify(indexEntry1), indexEntry1[3:] ) )
                     print( '     {:06x}={}'.format( diskPointer2, diskPointer2 ) )
                     print( '    b {} {} {}'.format( len(indexEntry2), hexlify(indexEntry2), indexEntry2[3:] ) )
-                for x in range( 0, 32 ):
-                    b1, w2 = indexEntry1[x+3], (indexEntry2[2*x+3+1]<<8) + indexEntry2[2*x+3]
+                for b1, w2 in zip( indexEntry1[3:3+32], struct.unpack_from( '<32H', indexEntry2, 3 ) ):
                     if b1 == 0:
                         assert w2 == 0
                         break
@@ -852,7 +830,7 @@ class OnlineBible( Bible ):
             index = 7
             header = xrefIndexBytes[index:size0]
             #print( "xIB2 header {} {}".format( len(header), hexlify(header) ) )
-            for something in header: assert something == 0 # It's just filler
+            assert header == bytes( len(header) ) # It's just filler
             index = size0
 
             assert index == 67
@@ -863,14 +841,13 @@ class OnlineBible( Bible ):
                 #print( '{:4} {} {} {}'.format( len(self.xrefIndex), len(indexEntry), hexlify(indexEntry), indexEntry ) )
                 assert len(indexEntry) == size0
                 # Seems part a starts with a 3-byte pointer to something
-                diskPointer = (indexEntry[2]<<16) + (indexEntry[1]<<8) + indexEntry[0]
+                diskPointer = int.from_bytes( indexEntry[0:3], 'little' )
                 if total == 0: total = diskPointer # Starts part way through
                 assert diskPointer == total
                 if 0 and len(self.xrefIndex) < 10:
                     print( '  {} {:06x}={}'.format( len(self.xrefIndex), diskPointer, diskPointer ) )
                     print( '    {} {} {}'.format( len(indexEntry), hexlify(indexEntry), indexEntry[3:] ) )
-                for x in range( 0, 32 ):
-                    w2 = (indexEntry[2*x+3+1]<<8) + indexEntry[2*x+3]
+                for x, w2 in enumerate( struct.unpack_from( '<32H', indexEntry, 3 ) ):
                     #print( '    {} w2={:04x}={} @ {}'.format( x, w2, w2, len(self.StrongsIndex) ) )
                     if w2 == 0 and len(self.StrongsIndex)>8849: break
                     total += w2
@@ -67,18 +67,18 @@ Sample:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "OpenSongBible"
 ProgName = "OpenSong XML Bible format handler"
-ProgVersion = '0.39'
+ProgVersion = '0.41'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import logging, os, zipfile
-from xml.etree.ElementTree import ElementTree
+import logging, os, sys, zipfile
+from xml.etree.ElementTree import ParseError
 
 import BibleOrgSysGlobals
 from InternalBibleInternals import BOS_ADDED_NESTING_MARKERS
@@ -98,6 +98,22 @@ BibleBooksNames = None
 
 
 
+def exp( messageString ):
+    """
+    Expands the message string in debug mode.
+    Prepends the module name to a error or warning message string
+        if we are in debug mode.
+    Returns the new string.
+    """
+    try: nameBit, errorBit = messageString.split( ': ', 1 )
+    except ValueError: nameBit, errorBit = '', messageString
+    if BibleOrgSysGlobals.debugFlag or debuggingThisModule:
+        nameBit = '{}{}{}'.format( ShortProgName, '.' if nameBit else '', nameBit )
+    return '{}{}'.format( nameBit+': ' if nameBit else '', errorBit )
+# end of exp
+
+
+
 def OpenSongXMLBibleFileCheck( givenFolderName, strictCheck=True, autoLoad=False, autoLoadBooks=False ):
     """
     Given a folder, search for OpenSong XML Bible files or folders in the folder and in the next level down.
@@ -383,6 +399,7 @@ class OpenSongXMLBible( Bible ):
         self.sourceFilepath =  os.path.join( self.sourceFolder, self.givenName )
 
         self.XMLTree = None # Will hold the XML data
+        self.loadErrors = []
 
         # Get the data tables that we need for proper checking
         #self.ISOLanguages = ISO_639_3_Languages().loadData()
@@ -403,14 +420,19 @@ class OpenSongXMLBible( Bible ):
         Load a single source XML file and load book elements.
         """
         if BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {}…").format( self.sourceFilepath ) )
-        self.XMLTree = ElementTree().parse( self.sourceFilepath )
-        if BibleOrgSysGlobals.debugFlag: assert len( self.XMLTree ) # Fail here if we didn't load anything at all
+        # Parse the file incrementally so that each book element can be released as soon as it's processed
+        #   (rather than having the entire tree in memory)
+        elementEvents = BibleOrgSysGlobals.iterparseXMLElements( self.sourceFilepath )
+        try: event, depth, self.XMLTree, parentElement = next( elementEvents ) # Only the root tag and attributes are available yet
+        except ParseError as err:
+            logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.loadErrors.append( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.errorDictionary['Load Errors'] = self.loadErrors
+            return
 
         # Find the main (bible) container
         if self.XMLTree.tag == OpenSongXMLBible.treeTag:
             location = "XML file"
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
 
             name = shortName = None
             for attrib,value in self.XMLTree.items():
@@ -421,18 +443,30 @@ class OpenSongXMLBible( Bible ):
                 else: logging.warning( "Unprocessed {!r} attribute ({}) in main element".format( attrib, value ) )
 
             # Find the submain (book) containers
-            for element in self.XMLTree:
-                if element.tag == OpenSongXMLBible.bookTag:
-                    sublocation = "book in " + location
-                    BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
-                    self.__validateAndExtractBook( element )
-                elif element.tag == 'OT':
-                    pass
-                elif element.tag == 'NT':
-                    pass
-                else: logging.error( "Expected to find {!r} but got {!r}".format( OpenSongXMLBible.bookTag, element.tag ) )
+            bookCount = 0
+            try:
+                for event, depth, element, parentElement in elementEvents:
+                    if depth != 1: continue # ignore the end of the root element
+                    if element.tag == OpenSongXMLBible.bookTag:
+                        sublocation = "book in " + location
+                        BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
+                        self.__validateAndExtractBook( element )
+                        bookCount += 1
+                    elif element.tag == 'OT':
+                        pass
+                    elif element.tag == 'NT':
+                        pass
+                    else: logging.error( "Expected to find {!r} but got {!r}".format( OpenSongXMLBible.bookTag, element.tag ) )
+                    parentElement.remove( element ) # Release the memory
+            except ParseError as err: # Any books before the error have been loaded
+                logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+                self.loadErrors.append( exp("Loader parse error in xml file {} after {} books: {} {}").format( self.givenName, bookCount, sys.exc_info()[0], err ) )
+            # The root text and tail are only available now
+            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
+            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
         else: logging.error( "Expected to load {!r} but got {!r}".format( OpenSongXMLBible.treeTag, self.XMLTree.tag ) )
+        if self.loadErrors: self.errorDictionary['Load Errors'] = self.loadErrors
         self.doPostLoadProcessing()
     # end of OpenSongXMLBible.load
 
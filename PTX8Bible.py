@@ -41,10 +41,10 @@ TODO: Check if PTX8Bible object should be based on USFMBible.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-01' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "Paratext8Bible"
 ProgName = "Paratext-8 Bible handler"
-ProgVersion = '0.26'
+ProgVersion = '0.27'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -53,7 +53,7 @@ debuggingThisModule = False
 
 import sys, os, logging
 from collections import OrderedDict
-import multiprocessing
+import multiprocessing, threading
 from xml.etree.ElementTree import ElementTree
 import json
 
@@ -79,6 +79,27 @@ EXPECTED_FOLDER_NAMES = ( 'Figures', 'PrintDraft', 'Interlinear_en', 'shared', #
                          '.hg', 'cache', 'store', 'data', 'gather', '_interlinear___english', '_interlinear__en', '_print_draft', # Mercurial sub-folders
                          ) # but these aren't compulsory
 
+# Each of the other metadata sections in suppliedMetadata['PTX8'] and the PTX8Bible method which loads it
+PTX8_METADATA_LOADERS = OrderedDict( (
+    ('UniqueId','loadUniqueId'), ('BooksNames','loadPTX8BooksNames'), ('ProjectUsers','loadPTX8ProjectUserAccess'),
+    ('Languages','loadPTX8LanguagesMetadata'), ('Lexicon','loadPTX8Lexicon'), ('SpellingStatus','loadPTX8SpellingStatus'),
+    ('WordAnalyses','loadPTX8WordAnalyses'), ('Canons','loadPTX8Canons'),
+    ('CheckingStatusByBook','loadPTX8CheckingStatus'), ('CheckingStatusByCheck','loadPTX8CheckingStatus'),
+    ('CommentTags','loadPTX8CommentTags'), ('DerivedTranslationStatusByBook','loadPTX8DerivedTranslationStatus'),
+    ('PTXNotesByName','loadPTX8Notes'), ('PTXNotesByThread','loadPTX8Notes'),
+    ('TermRenderings','loadPTX8TermRenderings'), ('ParallelPassageStatus','loadPTX8ParallelPassageStatus'),
+    ('ProjectBiblicalTerms','loadPTX8ProjectBiblicalTerms'), ('ProjectProgress','loadPTX8ProjectProgress'),
+    ('ProjectProgressCSV','loadPTX8ProjectProgressCSV'), ('PrintConfig','loadPTX8PrintConfig'),
+    ('Autocorrects','loadPTX8Autocorrects'), ('Styles','loadPTX8Styles'), ('PrintDraftChanges','loadPTX8PrintDraftChanges'),
+    ('Versifications','loadPTX8VersificationsMetadata'), ('Licence','loadPTX8Licence'),
+    ) )
+# The (small) subset of the above that's relevant to loading and using the book texts
+PTX8_BOOKS_METADATA_KEYS = ( 'UniqueId', 'BooksNames', 'Languages', 'Styles', 'Versifications', )
+PTX8_METADATA_LOADING_OPTIONS = ( 'all', 'lazy', 'books', 'background', )
+
+# Only one metadata loader can run at a time (they all use PTX8Bible.XMLTree)
+metadataLoadingLock = threading.RLock()
+
 
 def exp( messageString ):
     """
@@ -488,6 +509,80 @@ def loadPTX8Versifications( BibleObject ):
 
 
 
+class PTX8MetadataDict( dict ):
+    """
+    Dictionary used for suppliedMetadata['PTX8'] which only loads each metadata section
+        (by calling the PTX8Bible.loadPTX8… method listed in PTX8_METADATA_LOADERS)
+        the first time that it is asked for, e.g., with "'Lexicon' in …", "…['Lexicon']", or "….get('Lexicon')".
+
+    NOTE: Iterating over the dictionary (or using len, keys, items, etc.)
+        only covers the sections which are already loaded, so call loadAll() first if you want everything.
+    """
+    def __init__( self, PTX8BibleObject ):
+        dict.__init__( self )
+        self.PTX8BibleObject = PTX8BibleObject
+        self.triedLoaderNames = set()
+    # end of PTX8MetadataDict.__init__
+
+
+    def loadSection( self, key ):
+        """
+        Call the loader for the given metadata key if it hasn't been tried yet.
+
+        In strict/debug mode, loader exceptions are passed on, otherwise they're just logged.
+        """
+        try: loaderName = PTX8_METADATA_LOADERS[key]
+        except KeyError: return # Not something that we know how to load
+        with metadataLoadingLock:
+            if loaderName in self.triedLoaderNames: return # Already done (maybe by another thread)
+            self.triedLoaderNames.add( loaderName )
+            if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag or debuggingThisModule:
+                getattr( self.PTX8BibleObject, loaderName )() # and stop if it fails
+            else: # don't let it crash us if it fails
+                try: getattr( self.PTX8BibleObject, loaderName )()
+                except Exception as err: logging.error( '{} failed with {} {}'.format( loaderName, sys.exc_info()[0], err ) )
+    # end of PTX8MetadataDict.loadSection
+
+
+    def loadAll( self, keys=None ):
+        """
+        Load the given metadata sections (default is all of them) if they're not already loaded.
+        """
+        for key in (PTX8_METADATA_LOADERS if keys is None else keys):
+            self.loadSection( key )
+    # end of PTX8MetadataDict.loadAll
+
+
+    def __missing__( self, key ):
+        self.loadSection( key )
+        if dict.__contains__( self, key ): return dict.__getitem__( self, key )
+        raise KeyError( key )
+    # end of PTX8MetadataDict.__missing__
+
+    def __contains__( self, key ):
+        if not dict.__contains__( self, key ): self.loadSection( key )
+        return dict.__contains__( self, key )
+    # end of PTX8MetadataDict.__contains__
+
+    def get( self, key, default=None ):
+        return self[key] if key in self else default
+    # end of PTX8MetadataDict.get
+
+
+    def __reduce__( self ):
+        """
+        Pickle (e.g., for multiprocessing) just what's loaded so far
+            without waiting for (or interfering with) any background loading.
+        """
+        with metadataLoadingLock:
+            return ( self.__class__, (None,),
+                    { 'PTX8BibleObject':self.PTX8BibleObject, 'triedLoaderNames':set( self.triedLoaderNames ) },
+                    None, iter( list( dict.items( self ) ) ) )
+    # end of PTX8MetadataDict.__reduce__
+# end of class PTX8MetadataDict
+
+
+
 class PTX8Bible( Bible ):
     """
     Class to load and manipulate Paratext Bible bundles.
@@ -526,21 +621,29 @@ class PTX8Bible( Bible ):
         self.settingsFilepath = None
         self.filepathsNotYetLoaded = []
         self.conflicts = []
+        self.XMLTree = None # Used by the metadata loaders
 
         # Create empty containers for loading the XML metadata files
         #projectUsersDict = self.PTXStyles = self.PTXVersification = self.PTXLanguage = None
     # end of PTX8Bible.__init__
 
 
-    def preload( self ):
+    def preload( self, metadataLoading=None ):
         """
         Loads the settings file if it can be found.
         Loads other metadata files that are provided.
         Tries to determine USFM filename pattern.
+
+        metadataLoading can be:
+            'all': load all the other metadata files now (the default in strict/debug mode)
+            'lazy': load each metadata file when its section of suppliedMetadata['PTX8'] is first used (the normal default)
+            'books': load the books-relevant metadata (see PTX8_BOOKS_METADATA_KEYS) now and the rest lazily
+            'background': like 'books' but also start a thread to load the rest (while the books are loading)
         """
         if BibleOrgSysGlobals.debugFlag or debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 2:
-            print( exp("preload() from {}").format( self.sourceFolder ) )
+            print( exp("preload( {} ) from {}").format( metadataLoading, self.sourceFolder ) )
             assert self.sourceFolder
+            assert metadataLoading is None or metadataLoading in PTX8_METADATA_LOADING_OPTIONS
 
         #if self.suppliedMetadata is None: self.suppliedMetadata = {}
 
@@ -584,7 +687,7 @@ class PTX8Bible( Bible ):
             print( "USFMFilenamesObject", self.USFMFilenamesObject )
 
         if self.suppliedMetadata is None: self.suppliedMetadata = {}
-        self.suppliedMetadata['PTX8'] = {}
+        self.suppliedMetadata['PTX8'] = PTX8MetadataDict( self )
 
         if self.settingsFilepath is None: # it might have been loaded first
             # Attempt to load the settings file
@@ -609,85 +712,16 @@ class PTX8Bible( Bible ):
             self.availableBBBs.add( BBB )
             self.possibleFilenameDict[BBB] = filename
 
-        if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag or debuggingThisModule:
-            # Load the paratext metadata (and stop if any of them fail)
-            self.loadPTX8Autocorrects() # from text file (if it exists)
-            self.loadPTX8BooksNames() # from XML (if it exists)
-            self.loadPTX8Canons() # from XML (if it exists)
-            self.loadPTX8CheckingStatus() # from XML (if it exists)
-            self.loadPTX8CommentTags() # from XML (if they exist)
-            self.loadPTX8DerivedTranslationStatus() # from XML (if it exists)
-            result = loadPTX8Languages( self ) # from LDML file(s)
-            if result: self.suppliedMetadata['PTX8']['Languages'] = result
-            self.loadPTX8Lexicon() # from XML (if it exists)
-            self.loadPTX8Licence() # from JSON file (if it exists)
-            self.loadPTX8Notes() # from XML (if they exist)
-            self.loadPTX8TermRenderings() # from XML (if they exist)
-            self.loadPTX8ParallelPassageStatus() # from XML (if it exists)
-            self.loadPTX8ProjectBiblicalTerms() # from XML (if it exists)
-            self.loadPTX8ProjectProgress() # from XML (if it exists)
-            self.loadPTX8ProjectProgressCSV() # from text file (if it exists)
-            self.loadPTX8ProjectUserAccess() # from XML (if it exists)
-            self.loadPTX8PrintConfig()  # from XML (if it exists)
-            self.loadPTX8SpellingStatus() # from XML (if it exists)
-            self.loadPTX8Styles() # from text files (if they exist)
-            self.loadPTX8PrintDraftChanges() # from text file (if it exists)
-            self.loadUniqueId() # Text file
-            result = loadPTX8Versifications( self ) # from text file (if it exists)
-            if result: self.suppliedMetadata['PTX8']['Versifications'] = result
-            self.loadPTX8WordAnalyses() # from XML (if it exists)
-        else: # normal operation
-            # Put all of these in try blocks so they don't crash us if they fail
-            try: self.loadUniqueId() # Text file
-            except Exception as err: logging.error( 'loadUniqueId failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8BooksNames() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8BooksNames failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8ProjectUserAccess() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectUserAccess failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:
-                result = loadPTX8Languages( self ) # from LDML file(s)
-                if result: self.suppliedMetadata['PTX8']['Languages'] = result
-            except Exception as err: logging.error( 'loadPTX8Languages failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Lexicon() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Lexicon failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8SpellingStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8SpellingStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8WordAnalyses() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8WordAnalyses failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Canons() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Canons failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8CheckingStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8CheckingStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8CommentTags() # from XML (if they exist)
-            except Exception as err: logging.error( 'loadPTX8CommentTags failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8DerivedTranslationStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8DerivedTranslationStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Notes() # from XML (if they exist) but we don't do the CommentTags.xml file yet
-            except Exception as err: logging.error( 'loadPTX8Notes failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8TermRenderings() # from XML (if they exist)
-            except Exception as err: logging.error( 'loadPTX8TermRenderings failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ParallelPassageStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ParallelPassageStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectBiblicalTerms() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectBiblicalTerms failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectProgress() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectProgress failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectProgressCSV() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectProgressCSV failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8PrintConfig() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8PrintConfig failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Autocorrects() # from text file (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Autocorrects failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Styles() # from text files (if they exist)
-            except Exception as err: logging.error( 'loadPTX8Styles failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8PrintDraftChanges() # from text files (if they exist)
-            except Exception as err: logging.error( 'loadPTX8PrintDraftChanges failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:
-                result = loadPTX8Versifications( self ) # from text file (if it exists)
-                if result: self.suppliedMetadata['PTX8']['Versifications'] = result
-            except Exception as err: logging.error( 'loadPTX8Versifications failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Licence() # from JSON file (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Licence failed with {} {}'.format( sys.exc_info()[0], err ) )
+        if metadataLoading is None:
+            metadataLoading = 'all' if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag or debuggingThisModule \
+                                else 'lazy'
+        if metadataLoading == 'all': # Load the paratext metadata now (and stop if any of them fail in strict mode)
+            self.suppliedMetadata['PTX8'].loadAll()
+        elif metadataLoading in ('books','background'):
+            self.suppliedMetadata['PTX8'].loadAll( PTX8_BOOKS_METADATA_KEYS )
+            if metadataLoading == 'background': # Load the rest while the books are being loaded
+                threading.Thread( target=self.suppliedMetadata['PTX8'].loadAll, name='PTX8MetadataLoader', daemon=True ).start()
+        # else 'lazy' -- everything else is loaded by PTX8MetadataDict when first asked for
 
         self.preloadDone = True
     # end of PTX8Bible.preload
@@ -812,6 +846,24 @@ class PTX8Bible( Bible ):
     # end of PTX8Bible.loadPTX8BooksNames
 
 
+    def loadPTX8LanguagesMetadata( self ):
+        """
+        Load the LDML files (if they exist) into self.suppliedMetadata.
+        """
+        result = loadPTX8Languages( self ) # from LDML file(s)
+        if result: self.suppliedMetadata['PTX8']['Languages'] = result
+    # end of PTX8Bible.loadPTX8LanguagesMetadata
+
+
+    def loadPTX8VersificationsMetadata( self ):
+        """
+        Load the versification files (if they exist) into self.suppliedMetadata.
+        """
+        result = loadPTX8Versifications( self ) # from text file (if it exists)
+        if result: self.suppliedMetadata['PTX8']['Versifications'] = result
+    # end of PTX8Bible.loadPTX8VersificationsMetadata
+
+
     def loadPTX8Lexicon( self ):
         """
         Load the Lexicon.xml file (if it exists) and parse it into the dictionary self.suppliedMetadata.
@@ -3100,6 +3152,7 @@ def demo():
                     #print( "Tried finding '{}' in '{}': got '{}'".format( ref, name, UB.getXRefBBB( ref ) ) )
 
                 # Print unloaded metadata filepaths
+                PTX8_Bible.suppliedMetadata['PTX8'].loadAll() # in case they were waiting to be lazily loaded
                 if PTX8_Bible.filepathsNotYetLoaded and BibleOrgSysGlobals.verbosityLevel > 0:
                     print( "\nFollowing {} file paths have not been processed in folder {}:" \
                                 .format( len(PTX8_Bible.filepathsNotYetLoaded), testFolder ) )
@@ -37,17 +37,17 @@ Limitations:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2017-10-04' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "PDBBible"
 ProgName = "PDB Bible format handler"
-ProgVersion = '0.67'
+ProgVersion = '0.69'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import logging, os, struct
+import logging, os, struct, time
 import multiprocessing
 from binascii import hexlify
 
@@ -58,6 +58,10 @@ from Bible import Bible, BibleBook
 
 filenameEndingsToAccept = ('.PDB',) # Must be UPPERCASE
 
+# name, attributes, version, creationDate, lastModificationDate, lastBackupDate,
+#   modificationNumber, appInfoID, sortInfoID, appType, creator, uniqueIDseed, nextRecordListID, numDBRecords
+PALMDB_HEADER_STRUCT = struct.Struct( ">32shhIIIIII4s4sIIH" ) # 78 bytes (followed by the 8-byte record list entries)
+
 
 
 def exp( messageString ):
@@ -214,22 +218,23 @@ class PalmDBBible( Bible ):
         mainDBIndex = []
 
 
-        def readRecord( recordNumber, thisFile ):
+        def readRecord( recordNumber ):
             """
-            Uses mainDBIndex to read in the specified PalmDB record.
+            Uses mainDBIndex to get the specified PalmDB record out of fileView.
                 dataOffset gives the file offset from the beginning of the file.
+
+            Returns a memoryview (so the record bytes aren't copied).
             """
             if BibleOrgSysGlobals.debugFlag:
                 if debuggingThisModule:
-                    print( exp("readRecord( {}, {} )").format( recordNumber, thisFile ) )
+                    print( exp("readRecord( {} )").format( recordNumber ) )
                 assert recordNumber < len(mainDBIndex)
             dataOffset, recordLength, recordAttributes, id0, id1, id2 = mainDBIndex[recordNumber]
             #recordLength = 99999 if recordNumber==len(mainDBIndex)-1 else (mainDBIndex[recordNumber+1][0] - dataOffset)
             #print( " dataOffset={} recordLength={}".format( dataOffset, recordLength ) )
             #print( " recordAttributes={} id0={} id1={} id2={}".format( recordAttributes, id0, id1, id2 ) )
-            thisFile.seek( dataOffset )
             #print( "Reading {} bytes from record {} at offset {}".format( recordLength, recordNumber, dataOffset ) )
-            binaryInfo = thisFile.read( recordLength )
+            binaryInfo = fileView[dataOffset:dataOffset+recordLength]
             if recordNumber < len(mainDBIndex)-1: assert len(binaryInfo) == recordLength
             return binaryInfo
         # end of readRecord
@@ -248,22 +253,19 @@ class PalmDBBible( Bible ):
             #if BibleOrgSysGlobals.debugFlag:
                 #print( exp("getBinaryString( {}={}, {} )").format( hexlify(binary), binary, numBytes ) )
             if len(binary) < numBytes: halt # Too few bytes provided
-            binary = binary[:numBytes]
+            binary = bytes( binary[:numBytes] )
             if debuggingThisModule:
                 for someInt in binary:
                     #print( repr(someInt) )
                     if someInt == 0xe2:
                         print( exp("getBinaryString( {}={}, {} ) found e2").format( hexlify(binary), binary, numBytes ) )
-            result = ''
-            errorFlag = False
-            for j, value in enumerate( binary ):
-                if j>=numBytes or value==0: break
-                if value > 0x7F:
-                    if debuggingThisModule:
-                        print( exp("getBinaryString( {}={}, {} ) found non-ascii").format( hexlify(binary), binary, numBytes ) )
-                        print( "{} Got non-ASCII character {:02x}->{!r}".format( j, value, chr(value) ) )
-                    errorFlag = True
-                result += chr( value )
+            stringBytes = binary.split( b'\x00', 1 )[0]
+            try: result = stringBytes.decode( 'ascii' ); errorFlag = False
+            except UnicodeDecodeError:
+                if debuggingThisModule:
+                    print( exp("getBinaryString( {}={}, {} ) found non-ascii").format( hexlify(binary), binary, numBytes ) )
+                result = stringBytes.decode( 'latin-1' ) # Same as chr() of each byte
+                errorFlag = True
             if errorFlag:
                 if debuggingThisModule:
                     #print( "{:04x}".format( ord('“') ) ) # ”
@@ -296,16 +298,6 @@ class PalmDBBible( Bible ):
         # end of getBinaryString
 
 
-        def getFileString( thisFile, numBytes ):
-            """
-            Used for reading the PalmDB header information from the file.
-            """
-            #if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                #print( exp("getFileString( {}, {} )").format( thisFile, numBytes ) )
-            return getBinaryString( thisFile.read( numBytes ), numBytes )
-        # end of getFileString
-
-
         words = []
         def loadWordlists():
             """
@@ -316,16 +308,16 @@ class PalmDBBible( Bible ):
 
             # Now read the word index info
             if BibleOrgSysGlobals.verbosityLevel > 1: print( "Loading word index info…" )
-            binary = readRecord( wordIndexIndex, myFile )
+            binary = readRecord( wordIndexIndex )
             byteOffset = 0
-            totalIndicesCount, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+            totalIndicesCount, = struct.unpack_from( ">H",  binary, byteOffset ); byteOffset += 2
             #print( " totalIndicesCount =",totalIndicesCount )
             wordIndexMetadata = []
             expectedWords = 0
-            for n in range( 0, totalIndicesCount ):
-                wordLength, numFixedLengthWords, compressedFlag, ignored = struct.unpack( ">HHBB",  binary[byteOffset:byteOffset+6] ); byteOffset += 6
+            for wordLength, numFixedLengthWords, compressedFlag, ignored in struct.iter_unpack( ">HHBB", binary[byteOffset:byteOffset+6*totalIndicesCount] ):
+                byteOffset += 6
                 if BibleOrgSysGlobals.verbosityLevel > 3:
-                    print( "   {:2}: wordLength={} numFixedLengthWords={} compressedFlag={}".format( n, wordLength, numFixedLengthWords, compressedFlag ) )
+                    print( "   {:2}: wordLength={} numFixedLengthWords={} compressedFlag={}".format( len(wordIndexMetadata), wordLength, numFixedLengthWords, compressedFlag ) )
                 wordIndexMetadata.append( (wordLength, numFixedLengthWords, compressedFlag) )
                 expectedWords += numFixedLengthWords
             assert byteOffset == len(binary)
@@ -337,7 +329,7 @@ class PalmDBBible( Bible ):
             if BibleOrgSysGlobals.verbosityLevel > 2: print( "\nLoading word lists…" )
             #binary = readRecord( wordIndexIndex+1, myFile )
             recordOffset = byteOffset = 0
-            binary = b''
+            binary = bytearray()
             numRegularWords = numCompressedWords = 0
             wordCountIndexes = {}
             for wordLength, numFixedLengthWords, compressedFlag in wordIndexMetadata:
@@ -351,7 +343,7 @@ class PalmDBBible( Bible ):
                     #print( "Got {} bytes available in buffer".format(  numRemainingBufferBytes ) )
                     if numRemainingBufferBytes < wordLength: # Need to continue to the next record
                         #binary += myFile.read( 256 ) # These records are assumed here to be contiguous
-                        binary += readRecord( wordIndexIndex+recordOffset+1, myFile )
+                        binary += readRecord( wordIndexIndex+recordOffset+1 )
                         recordOffset += 1
                     if not compressedFlag:
                         # We have a pointer to an array of characters
@@ -381,7 +373,7 @@ class PalmDBBible( Bible ):
                         # We have pointers to smaller words
                         assert wordLength == 4 # But this is the number of bytes, not the number of word characters!
                         if debuggingThisModule: print( "compressed", byteOffset, hexlify(binary[byteOffset:byteOffset+4]) )
-                        ix1,ix2 = struct.unpack( ">HH",  binary[byteOffset:byteOffset+4] ); byteOffset += 4
+                        ix1,ix2 = struct.unpack_from( ">HH",  binary, byteOffset ); byteOffset += 4
                         if   ix1 == 0xFFFF: word1 = '<BOOK>'
                         elif ix1 == 0xFFFE: word1 = '<CHAPTER>'
                         elif ix1 == 0xFFFD: word1 = '<DESC>'
@@ -411,62 +403,28 @@ class PalmDBBible( Bible ):
         # end of loadWordlists
 
 
-        remainder14count = remainder14bits = 0
-        def get14( binary16 ):
+        def getTokens( binary, numTokens ):
             """
-            Get the next 14-bits from the 16 binary bits supplied
-                plus any remainder from the last call.
+            Decode numTokens word index tokens from the book binary.
+
+            These are normally big-endian 16-bit numbers,
+                but are packed into consecutive 14-bit fields if the module is byte-shifted.
+            Any missing bytes at the very end of a book are taken as zeroes.
+
+            Returns a list of integers.
             """
-            nonlocal remainder14count, remainder14bits
-            #if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                #print( exp("get14( {} ) {} {:04x}").format( hexlify(binary16), remainder14count, remainder14bits ) )
-            if binary16: next16, = struct.unpack( ">H", binary16 )
-            else:
-                if debuggingThisModule: print( "Added error zero bits (should only be at the end of a book)" )
-                next16 = 0
-            #print( "next16 {:04x} {}".format( next16, next16 ) )
-            if remainder14count == 0:
-                result = next16 >> 2
-                remainder14count = 2
-                remainder14bits = (next16 & 0x0003) << 12
-                bytesUsed = 2
-            elif remainder14count == 2:
-                result = (next16 >> 4) | remainder14bits
-                remainder14count = 4
-                remainder14bits = (next16 & 0x000F) << 10
-                bytesUsed = 2
-            elif remainder14count == 4:
-                result = (next16 >> 6) | remainder14bits
-                remainder14count = 6
-                remainder14bits = (next16 & 0x003F) << 8
-                bytesUsed = 2
-            elif remainder14count == 6:
-                result = (next16 >> 8) | remainder14bits
-                remainder14count = 8
-                remainder14bits = (next16 & 0x00FF) << 6
-                bytesUsed = 2
-            elif remainder14count == 8:
-                result = (next16 >> 10) | remainder14bits
-                remainder14count = 10
-                remainder14bits = (next16 & 0x03FF) << 4
-                bytesUsed = 2
-            elif remainder14count == 10:
-                result = (next16 >> 12) | remainder14bits
-                remainder14count = 12
-                remainder14bits = (next16 & 0x0FFF) << 2
-                bytesUsed = 2
-            elif remainder14count == 12:
-                result = (next16 >> 14) | remainder14bits
-                remainder14count = 14
-                remainder14bits = next16 & 0x03FFF
-                bytesUsed = 2
-            elif remainder14count == 14:
-                result = remainder14bits
-                remainder14count = 0
-                bytesUsed = 0
-            #print( " returning {:04x}={}, {} ({})".format( result, result, bytesUsed, remainder14count ) )
-            return result, bytesUsed
-        # end of get14
+            if not byteShiftedFlag:
+                return list( struct.unpack_from( ">{}H".format( numTokens ), binary ) )
+            # Every 14 bytes (112 bits) hold exactly eight 14-bit tokens
+            numChunkBytes = (numTokens+7)//8 * 14
+            binary = bytes( binary[:numChunkBytes] ).ljust( numChunkBytes, b'\x00' )
+            tokens = []
+            for chunkStart in range( 0, numChunkBytes, 14 ):
+                bits112 = int.from_bytes( binary[chunkStart:chunkStart+14], 'big' )
+                tokens.extend( (bits112 >> shift) & 0x3FFF for shift in (98,84,70,56,42,28,14,0) )
+            del tokens[numTokens:]
+            return [ix | 0xC000 if ix >= 0x3FF0 else ix for ix in tokens] # To get it into the original range
+        # end of getTokens
 
 
         hadP = False
@@ -545,34 +503,27 @@ class PalmDBBible( Bible ):
 
         # main code for load()
         with open( self.sourceFilepath, 'rb' ) as myFile: # Automatically closes the file when done
+            fileView = memoryview( myFile.read() ) # The records are sliced out of this (without copying)
+
             # Read the PalmDB header info
             if BibleOrgSysGlobals.verbosityLevel > 1: print( "Loading PalmDB header info…" )
-            name = getFileString( myFile, 32 )
-            binary4 = myFile.read( 4 )
-            attributes, version = struct.unpack( ">hh", binary4 )
-            binary12 = myFile.read( 12 )
-            creationDate, lastModificationDate, lastBackupDate = struct.unpack( ">III", binary12 )
-            binary12 = myFile.read( 12 )
-            modificationNumber, appInfoID, sortInfoID = struct.unpack( ">III", binary12 )
-            appType = getFileString( myFile, 4 )
-            creator = getFileString( myFile, 4 )
+            name, attributes, version, creationDate, lastModificationDate, lastBackupDate, \
+                modificationNumber, appInfoID, sortInfoID, appType, creator, \
+                uniqueIDseed, nextRecordListID, numDBRecords = PALMDB_HEADER_STRUCT.unpack_from( fileView )
+            name, appType, creator = getBinaryString( name, 32 ), getBinaryString( appType, 4 ), getBinaryString( creator, 4 )
             if BibleOrgSysGlobals.verbosityLevel > 1:
                 print( "  name = {!r} appType = {!r} creator = {!r}".format( name, appType, creator ) )
             if BibleOrgSysGlobals.verbosityLevel > 3:
                 print( "  attributes={} version={}".format( attributes, version ) )
                 print( "  creationDate={} lastModificationDate={} lastBackupDate={}".format( creationDate, lastModificationDate, lastBackupDate ) )
                 print( "  modificationNumber={} appInfoID={} sortInfoID={}".format( modificationNumber, appInfoID, sortInfoID ) )
-            binary4 = myFile.read( 4 )
-            uniqueIDseed = struct.unpack( ">I", binary4 )
-            binary6 = myFile.read( 6 )
-            nextRecordListID, numDBRecords = struct.unpack( ">IH", binary6 )
             if BibleOrgSysGlobals.verbosityLevel > 3:
                 print( "  uniqueIDseed={} nextRecordListID={} numDBRecords={}".format( uniqueIDseed, nextRecordListID, numDBRecords ) )
                 print( "  numDBRecords =", numDBRecords )
             tmpIndex = []
-            for n in range( 0, numDBRecords ):
-                binary8 = myFile.read( 8 )
-                dataOffset, recordAttributes, id0, id1, id2 = struct.unpack( ">IBBBB", binary8 )
+            recordListStart = PALMDB_HEADER_STRUCT.size
+            for dataOffset, recordAttributes, id0, id1, id2 \
+                    in struct.iter_unpack( ">IBBBB", fileView[recordListStart:recordListStart+8*numDBRecords] ):
                 #print( '', dataOffset, recordAttributes, id0, id1, id2 )
                 assert recordAttributes + id0 + id1 + id2 == 0
                 tmpIndex.append( (dataOffset, recordAttributes, id0, id1, id2) )
@@ -581,14 +532,14 @@ class PalmDBBible( Bible ):
                 recordLength = 4096 if recordNumber==len(tmpIndex)-1 else (tmpIndex[recordNumber+1][0] - dataOffset)
                 mainDBIndex.append( (dataOffset, recordLength, recordAttributes, id0, id1, id2) )
             if 0:
-                print( "  {} DB header bytes read".format( myFile.tell() ) )
+                print( "  {} DB header bytes read".format( recordListStart+8*numDBRecords ) )
                 print()
                 for recordNumber in range( 0, len(mainDBIndex) ):
                     dataOffset, recordLength, recordAttributes, id0, id1, id2 = mainDBIndex[recordNumber]
                     print( "Record {} @ {} len={} attribs={} {} {} {}".format( recordNumber, dataOffset, recordLength, recordAttributes, id0, id1, id2 ) )
                     #assert recordLength <= 4096
                     if 0:
-                        recordBytes = readRecord( recordNumber, myFile )
+                        recordBytes = readRecord( recordNumber )
                         if recordNumber < 8 or recordLength < 200:
                             print( "    {}\n    {}".format( hexlify(recordBytes), recordBytes ) )
                         else: print( "    {}".format( hexlify(recordBytes) ) )
@@ -597,7 +548,7 @@ class PalmDBBible( Bible ):
 
             # Now read the first record of actual Bible data which is the Bible header info
             if BibleOrgSysGlobals.verbosityLevel > 2: print( "\nLoading Bible header info…" )
-            binary = readRecord( 0, myFile )
+            binary = readRecord( 0 )
             byteOffset = 0
             versionName = getBinaryString( binary, 16 ); byteOffset += 16
             versionInfo = getBinaryString( binary[byteOffset:], 128 ); byteOffset += 128
@@ -605,7 +556,7 @@ class PalmDBBible( Bible ):
             if BibleOrgSysGlobals.verbosityLevel > 2:
                 print( repr(versionName), repr(versionInfo), repr(separatorCharacter) )
             assert separatorCharacter == ' '
-            versionAttribute, wordIndexIndex, numWordListRecords, numBooks = struct.unpack( ">BHHH",  binary[byteOffset:byteOffset+7] ); byteOffset += 7
+            versionAttribute, wordIndexIndex, numWordListRecords, numBooks = struct.unpack_from( ">BHHH",  binary, byteOffset ); byteOffset += 7
             #print( "  versionAttribute =",versionAttribute )
             copyProtectedFlag = versionAttribute & 1
             byteShiftedFlag = not versionAttribute & 2
@@ -621,7 +572,7 @@ class PalmDBBible( Bible ):
                     print( "  wordIndexIndex={} numWordListRecords={} numBooks={}".format( wordIndexIndex, numWordListRecords, numBooks ) )
             bookIndexMetadata = []
             for n in range(  0, numBooks ):
-                bookNumber, bookRecordLocation, numBookRecords = struct.unpack( ">HHH",  binary[byteOffset:byteOffset+6] ); byteOffset += 6
+                bookNumber, bookRecordLocation, numBookRecords = struct.unpack_from( ">HHH",  binary, byteOffset ); byteOffset += 6
                 shortName = getBinaryString( binary[byteOffset:], 8 ); byteOffset += 8
                 longName = getBinaryString( binary[byteOffset:], 32 ); byteOffset += 32
                 if BibleOrgSysGlobals.verbosityLevel > 3:
@@ -663,34 +614,23 @@ class PalmDBBible( Bible ):
                 #myFile.seek( mainDBIndex[bookRecordLocation] )
                 #binary = myFile.read( 102400 )
                 # Read the header record
-                binary = readRecord( bookRecordLocation, myFile )
+                binary = readRecord( bookRecordLocation )
                 #print( binary )
                 byteOffset = 0
-                numChapters, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+                numChapters, = struct.unpack_from( ">H",  binary, byteOffset ); byteOffset += 2
                 #print( longName, "numChapters", numChapters )
-                accumulatedVersesList = []
-                for c in range( 0, numChapters ):
-                    accumulatedVerses, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    accumulatedVersesList.append( accumulatedVerses )
-                    #print( c+1, accumulatedVerses, "accumulatedVerses" )
-                accumulatedTokensPerChapterList = []
-                for c in range( 0, numChapters ):
-                    accumulatedTokensPerChapter, = struct.unpack( ">I",  binary[byteOffset:byteOffset+4] ); byteOffset += 4
-                    #print( c+1, accumulatedTokensPerChapter, "accumulatedTokensPerChapter" )
-                    accumulatedTokensPerChapterList.append( accumulatedTokensPerChapter )
-                accumulatedTokensPerVerseList = []
-                totalAccumulatedVerses = 0
-                for n in range( 0, accumulatedVerses ):
-                    accumulatedTokensPerVerse, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    #print( n+1, accumulatedTokensPerVerse, "accumulatedTokensPerVerse" )
-                    accumulatedTokensPerVerseList.append( accumulatedTokensPerVerse )
-                    totalAccumulatedVerses += accumulatedTokensPerVerse
+                accumulatedVersesList = list( struct.unpack_from( ">{}H".format( numChapters ), binary, byteOffset ) )
+                byteOffset += 2 * numChapters
+                accumulatedVerses = accumulatedVersesList[-1]
+                accumulatedTokensPerChapterList = list( struct.unpack_from( ">{}I".format( numChapters ), binary, byteOffset ) )
+                byteOffset += 4 * numChapters
+                accumulatedTokensPerVerseList = list( struct.unpack_from( ">{}H".format( accumulatedVerses ), binary, byteOffset ) )
+                byteOffset += 2 * accumulatedVerses
                 if debuggingThisModule:
                     print( "accumulatedVerses", len(accumulatedVersesList), accumulatedVersesList )
                     print( "accumulatedTokensPerChapter", len(accumulatedTokensPerChapterList), accumulatedTokensPerChapterList )
-                    print( "accumulatedTokensPerVerse", len(accumulatedTokensPerVerseList), accumulatedTokensPerVerseList )
+                    print( "accumulatedTokensPerVerse", len(accumulatedTokensPerVerseList), accumulatedTokensPerVerseList, "total", sum( accumulatedTokensPerVerseList ) )
                 assert len(accumulatedTokensPerVerseList) == accumulatedVerses
-                #print( "Acc V & T", totalAccumulatedVerses, accumulatedTokensPerChapter )
                 assert byteOffset == len(binary)
 
                 # Find total characters
@@ -733,14 +673,23 @@ class PalmDBBible( Bible ):
                 thisBook.addLine( 'toc3', shortName )
                 hadP = False
 
+                # Get the following records (assumed here to be contiguous) and decode all the book tokens
+                numTokenBytes = (14*totalCharacters+15)//16 * 2 if byteShiftedFlag else 2*totalCharacters
+                bookRecords = []
+                numBookBytes = recordCount = 0
+                while numBookBytes < numTokenBytes and bookRecordLocation+recordCount+1 < len(mainDBIndex):
+                    bookRecords.append( readRecord( bookRecordLocation+recordCount+1 ) )
+                    numBookBytes += len( bookRecords[-1] )
+                    recordCount += 1
+                if debuggingThisModule:
+                    print( "Records {}/{} BibleWords {}={}…".format( recordCount, numBookRecords, numBookBytes, hexlify(bookRecords[0][:32]) ) )
+                bookTokens = getTokens( b''.join( bookRecords ), totalCharacters )
+                del bookRecords
+
                 C = V = 0
-                nextRecordNumber = bookRecordLocation+1
-                accumulatedVerseCount = verseCount = recordCount = 0
-                remainder14count = remainder14bits = 0
-                byteOffset = 0
-                binary = b''
+                accumulatedVerseCount = verseCount = 0
                 verse = ''
-                for j in range( 0, totalCharacters ):
+                for j, ix in enumerate( bookTokens ):
                     #if BBB=='EXO' and V==3: halt
                     #print( self.name )
                     #if (name == 'kjv' and BBB=='GAL' and V>5) \
@@ -750,25 +699,7 @@ class PalmDBBible( Bible ):
                         #loadErrors.append( _("PalmDBBible: Aborted book {} at {}:{} because of formatting issue").format( BBB, C, V ) )
                         #thisBook.addPriorityError( 50, C, V, _("Aborted load because of decoding issue") )
                         #break # WHY does it fail???
-                    if byteOffset+1 >= len(binary) + int(remainder14count/8) \
-                    and bookRecordLocation+recordCount+1 < len(mainDBIndex): # Need to continue to the next record
-                        #binary += myFile.read( 256 ) # These records are assumed here to be contiguous
-                        binary += readRecord( bookRecordLocation+recordCount+1, myFile )
-                        recordCount += 1
-                        if debuggingThisModule:
-                            print( "Record {}/{}".format( recordCount, numBookRecords ) )
-                            print( "BibleWords {}/{}={}…".format( byteOffset, len(binary), hexlify(binary[byteOffset:byteOffset+32]) ) )
-                        #byteOffset = 0
-                        #if j==0:
-                            #assert binary[byteOffset:byteOffset+2] == b'\xFF\xFF'
-                            #byteOffset = 2
-                    if byteShiftedFlag:
-                        #print( "offset", byteOffset, hexlify(binary[byteOffset:byteOffset+4]) )
-                        ix, bytesUsed = get14( binary[byteOffset:byteOffset+2] )
-                        byteOffset += bytesUsed
-                        if ix >= 0x3FF0: ix = ix | 0xC000 # To get it into the original range
-                    else: ix, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    if debuggingThisModule: print( "  here bO was {} ix={:04x}={}".format( byteOffset-2, ix, ix ) )
+                    if debuggingThisModule: print( "  here token {} ix={:04x}={}".format( j, ix, ix ) )
                     if ix > len(words):
                         #print( "Got HUGE ix {:04x} {}/{}".format( ix, ix, len(words) ) )
                         #ix = ix | 0xC000 # To get it into the original range
@@ -780,7 +711,7 @@ class PalmDBBible( Bible ):
                         #elif ix == 0xFFF4: word = '<44444>'
                         else:
                             if debuggingThisModule:
-                                print( "\n\n\nGot HUGE ix {:04x} {}/{} @ {}/{}".format( ix, ix, len(words), byteOffset, len(binary) ) )
+                                print( "\n\n\nGot HUGE ix {:04x} {}/{} @ {}/{}".format( ix, ix, len(words), j, totalCharacters ) )
                             word = '<UNKNOWN>'
                             if debuggingThisModule: halt
                             #if C==0: C = 1
@@ -884,6 +815,48 @@ def testPB( TUBfilename ):
 # end of testPB
 
 
+def benchmarkPB( TUBfolder, TUBfilename, numRuns=3 ):
+    """
+    Time the loading of a PalmDB Bible
+        and show how much of that is decoding the binary records (header, word lists and word tokens),
+        how much is assembling the verses from the words,
+        and how much is processing the loaded books.
+
+    Returns the average load time (in seconds).
+    """
+    import cProfile, pstats
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( _("Benchmarking the PDB Bible loader…") )
+    loadTimes = []
+    for run in range( numRuns ):
+        ub = PalmDBBible( TUBfolder, TUBfilename )
+        startTime = time.perf_counter()
+        ub.load()
+        loadTimes.append( time.perf_counter() - startTime )
+    averageLoadTime = sum(loadTimes) / len(loadTimes)
+
+    # Now do one more (slower) profiled load to see where the time goes
+    profiler = cProfile.Profile()
+    ub = PalmDBBible( TUBfolder, TUBfilename )
+    profiler.enable()
+    ub.load()
+    profiler.disable()
+    profileStats = pstats.Stats( profiler )
+    decodeTime = assembleTime = totalTime = 0
+    for (filename,lineNumber,functionName), (primitiveCalls,numCalls,ownTime,cumulativeTime,callers) in profileStats.stats.items():
+        if functionName in ('readRecord','getBinaryString','loadWordlists','getTokens','<genexpr>','<listcomp>') \
+        or 'struct' in functionName or 'from_bytes' in functionName: decodeTime += ownTime
+        elif filename == __file__: assembleTime += ownTime
+        totalTime += ownTime
+    if BibleOrgSysGlobals.verbosityLevel > 0:
+        print( "  Loaded {} in {:.3f} seconds (average of {} runs)".format( TUBfilename, averageLoadTime, numRuns ) )
+        print( "    Profiled load took {:.3f} seconds: {:.0%} decoding the records, {:.0%} assembling the verses, {:.0%} processing the books" \
+                .format( totalTime, decodeTime/totalTime, assembleTime/totalTime, (totalTime-decodeTime-assembleTime)/totalTime ) )
+        if BibleOrgSysGlobals.verbosityLevel > 2: profileStats.sort_stats( 'tottime' ).print_stats( 12 )
+    return averageLoadTime
+# end of benchmarkPB
+
+
 def demo():
     """
     Main program to handle command line parameters and then run what they want.
@@ -915,6 +888,12 @@ def demo():
             testPB( testFilename )
 
 
+    if 0: # benchmark the loading of a specified module
+        singleModule = 'kjv'
+        if BibleOrgSysGlobals.verbosityLevel > 1: print( "\nPDB B2/ Benchmarking {}".format( singleModule ) )
+        benchmarkPB( testFolder, singleModule )
+
+
     if 0: # all discovered modules in the test folder
         foundFolders, foundFiles = [], []
         for something in os.listdir( testFolder ):
@@ -47,10 +47,10 @@ NOTE: Unfortunately it seems that loading a very large pickled object
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "PickledBible"
 ProgName = "Pickle Bible handler"
-ProgVersion = '0.11'
+ProgVersion = '0.13'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -63,8 +63,9 @@ from collections import OrderedDict
 
 import BibleOrgSysGlobals
 from Bible import Bible
-from InternalBibleBook import InternalBibleBook
+from InternalBibleBook import InternalBibleBook, UNPICKLED_CACHE_ATTRIBUTES
 from InternalBibleInternals import InternalBibleIndex, InternalBibleEntryList
+from BibleFingerprints import VerseFingerprints
 
 
 
@@ -199,6 +200,9 @@ def createPickledBible( BibleObject, outputFolder=None, metadataDict=None, dataL
         assert BibleObject.abbreviation
         assert BibleObject.books
 
+    # Make sure that the verse fingerprints are saved with the Bible (see BibleFingerprints.py)
+    BibleObject.getVerseFingerprints()
+
     # First pickle the individual books
     createdFilenames = [] # Keep track so we know what to zip (and possibly to delete again later)
     for BBB,bookObject in BibleObject.books.items():
@@ -220,7 +224,8 @@ def createPickledBible( BibleObject, outputFolder=None, metadataDict=None, dataL
                         typeAsString = str(attributeType)
                         #print( "here4: typeAsString =", repr(typeAsString) )
                         #print( 'attrib', attributeName, typeAsString )
-                        if '__' not in attributeName and 'method' not in typeAsString:
+                        if '__' not in attributeName and 'method' not in typeAsString \
+                        and attributeName not in UNPICKLED_CACHE_ATTRIBUTES: # Caches get rebuilt as required
                             if (dataLevel==1 and attributeName in ('sourceFolder','sourceFilename','sourceFilepath',
                                                         '_processedFlag','_processedLines',
                                                         '_indexedFlag','_CVIndex')) \
@@ -260,7 +265,7 @@ def createPickledBible( BibleObject, outputFolder=None, metadataDict=None, dataL
                     if (dataLevel==1 and attributeName in ( 'sourceFolder','sourceFilename','sourceFilepath',
                                                 'abbreviation','givenName','shortName','name',
                                                 'description','version',
-                                                'genericBOS')) \
+                                                'genericBOS','verseFingerprints')) \
                     or (dataLevel==2 and attributeName not in ('books','discoveryResults',
                                                 'triedLoadingBook','bookNeedsReloading','preloadDone',
                                                 'errorDictionary','genericBRL',
@@ -334,7 +339,7 @@ def _loadObjectAttributes( pickleFileObject, BibleObject ):
         attributeValue = pickle.load( pickleFileObject )
         #print( "Attribute {}={!r}".format( attributeName, attributeValue ) )
         assert attributeValue is None \
-            or isinstance( attributeValue, (str,bool,InternalBibleIndex,InternalBibleEntryList) ) # Leave these asserts enabled for security
+            or isinstance( attributeValue, (str,bool,InternalBibleIndex,InternalBibleEntryList,VerseFingerprints) ) # Leave these asserts enabled for security
         if attributeName == 'objectNameString': attributeName = 'originalObjectNameString'
         elif attributeName == 'objectTypeString': attributeName = 'originalObjectTypeString'
         #print( "attribute: {} = {}".format( attributeName, attributeValue if attributeName!='discoveryResults' else '...' ) )
@@ -29,15 +29,20 @@ This is the interface module used to give a unified interface to either:
     2/ Our own (still primitive module that reads Sword files directly
         called SwordModules.py
 
-Currently only uses FTP.
+Currently only uses FTP (or a local folder laid out like an FTP repository,
+    e.g., for testing or benchmarking without a network connection).
+
+Files are fetched by SwordRepositoryFetcher using a pool of threads.
+    Files which are already downloaded (same size and timestamp) aren't fetched again,
+    and interrupted downloads are resumed from the partial (.part) file.
 """
 
 from gettext import gettext as _
 
-LastModifiedDate = '2017-10-19' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "SwordInstallManager"
 ProgName = "Sword download handler"
-ProgVersion = '0.11'
+ProgVersion = '0.13'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -50,6 +55,10 @@ import ftplib
 #import urllib.request
 import tempfile, tarfile
 import shutil
+import time, calendar
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from collections import OrderedDict
 
 import BibleOrgSysGlobals
@@ -79,6 +88,11 @@ DEFAULT_SWORD_INSTALL_FOLDERS = (
 
 DEFAULT_SWORD_CONF_ENCODING = 'iso-8859-1'
 
+SWORD_REPOSITORY_TYPES = ( 'FTP', 'Folder', ) # Folder is a local folder laid out like the FTP repositories
+MAX_DOWNLOAD_THREADS = 4 # Most servers limit the number of connections from one address
+PARTIAL_DOWNLOAD_EXTENSION = '.part'
+DOWNLOAD_BLOCK_SIZE = 65536
+
 
 
 def exp( messageString ):
@@ -129,6 +143,249 @@ SWORD_CONF_FIELD_NAMES_ALLOWED_DUPLICATES = ('Feature', 'GlobalOptionFilter', 'D
 
 
 
+class SwordRepositoryFetcher():
+    """
+    Fetches files from one remote repository (or local stand-in folder)
+        using a pool of threads (each with its own FTP connection).
+
+    A file isn't fetched again if the local copy has the same size and timestamp
+        (the timestamp of each downloaded file is set to match the remote one).
+    Downloads go into a .part file which is appended to (rather than restarted)
+        if the previous download was interrupted.
+    """
+    def __init__( self, repoType, repoSite, repoFolder, maxThreads=MAX_DOWNLOAD_THREADS ):
+        """
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordRepositoryFetcher.__init__( {}, {}, {}, {} )").format( repoType, repoSite, repoFolder, maxThreads ) )
+            assert repoType in SWORD_REPOSITORY_TYPES
+        if repoType == 'FTP' and repoFolder:
+            assert repoFolder[0] == '/'
+            assert repoFolder[-1] == '/'
+
+        self.repoType, self.repoSite, self.repoFolder, self.maxThreads = repoType, repoSite, repoFolder, maxThreads
+        self.threadData = threading.local()
+        self.FTPConnections, self.FTPConnectionsLock = [], threading.Lock()
+    # end of SwordRepositoryFetcher.__init__
+
+
+    def __getFTP( self ):
+        """
+        Returns this thread's FTP connection (opening it if necessary).
+        """
+        try: return self.threadData.ftp
+        except AttributeError: pass # Need to open one
+        ftp = ftplib.FTP( self.repoSite )
+        ftp.login() # anonymous:anonymous
+        if self.repoFolder: ftp.cwd( self.repoFolder ) # Can raise ftplib.error_perm
+        self.threadData.ftp = ftp
+        with self.FTPConnectionsLock: self.FTPConnections.append( ftp )
+        return ftp
+    # end of SwordRepositoryFetcher.__getFTP
+
+
+    def close( self ):
+        """
+        Close any FTP connections.
+        """
+        with self.FTPConnectionsLock:
+            for ftp in self.FTPConnections:
+                try: ftp.quit()
+                except (OSError, EOFError, ftplib.Error): ftp.close()
+            self.FTPConnections = []
+        self.threadData = threading.local()
+    # end of SwordRepositoryFetcher.close
+
+
+    def getFileInfo( self, relativeFilepath ):
+        """
+        Returns a 2-tuple with the size (int) and modification time (int seconds since the epoch)
+            of the remote file. Either can be None if the server doesn't tell us.
+        """
+        if self.repoType == 'Folder':
+            statResult = os.stat( os.path.join( self.repoFolder, relativeFilepath ) )
+            return statResult.st_size, int( statResult.st_mtime )
+        ftp = self.__getFTP()
+        try: size = ftp.size( relativeFilepath )
+        except ftplib.error_perm: size = None
+        try: modifyTime = getTimeFromFTPTimestamp( ftp.sendcmd( 'MDTM ' + relativeFilepath ).split()[-1] )
+        except (ftplib.error_perm, ValueError): modifyTime = None
+        return size, modifyTime
+    # end of SwordRepositoryFetcher.getFileInfo
+
+
+    def listFolder( self, relativeFolder ):
+        """
+        Returns a list of 3-tuples with the filename, size, and modification time
+            of each file in the remote folder.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordRepositoryFetcher.listFolder( {} )").format( relativeFolder ) )
+
+        results = []
+        if self.repoType == 'Folder':
+            for entry in os.scandir( os.path.join( self.repoFolder, relativeFolder ) ):
+                if entry.is_file():
+                    statResult = entry.stat()
+                    results.append( (entry.name, statResult.st_size, int( statResult.st_mtime )) )
+        else:
+            for filename,filedict in self.__getFTP().mlsd( relativeFolder ):
+                if filename in ( '.','..', ) or filedict.get( 'type' ) not in (None,'file',): continue # Ignore these
+                size = int( filedict['size'] ) if 'size' in filedict else None
+                modifyTime = getTimeFromFTPTimestamp( filedict['modify'] ) if 'modify' in filedict else None
+                results.append( (filename, size, modifyTime) )
+        return results
+    # end of SwordRepositoryFetcher.listFolder
+
+
+    def isUpToDate( self, saveFilepath, remoteSize, remoteTime ):
+        """
+        Returns True if we already have a copy of the file with the same size and timestamp.
+        """
+        if remoteSize is None or remoteTime is None: return False # Can't tell, so assume not
+        try: statResult = os.stat( saveFilepath )
+        except OSError: return False
+        return statResult.st_size == remoteSize and int( statResult.st_mtime ) == remoteTime
+    # end of SwordRepositoryFetcher.isUpToDate
+
+
+    def fetchFile( self, relativeFilepath, saveFilepath, remoteSize=None, remoteTime=None, expectedSHA256=None ):
+        """
+        Download one file (unless we already have it).
+
+        If the remote size and time aren't given, the server is asked for them.
+        If expectedSHA256 (a hex string) is given, the downloaded file must match it.
+
+        Returns True if the file was downloaded, False if it was already up to date.
+        Raises an exception (after removing any bad download) if it fails.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordRepositoryFetcher.fetchFile( {}, {}, {}, {} )").format( relativeFilepath, saveFilepath, remoteSize, remoteTime ) )
+
+        if remoteSize is None or remoteTime is None:
+            remoteSize, remoteTime = self.getFileInfo( relativeFilepath )
+        if self.isUpToDate( saveFilepath, remoteSize, remoteTime ) \
+        and (expectedSHA256 is None or getFileSHA256( saveFilepath ) == expectedSHA256):
+            if BibleOrgSysGlobals.verbosityLevel > 2: print( "    " + _("Already have {}").format( relativeFilepath ) )
+            return False
+
+        partFilepath = saveFilepath + PARTIAL_DOWNLOAD_EXTENSION
+        partSize = os.path.getsize( partFilepath ) if os.path.isfile( partFilepath ) else 0
+        if remoteSize is None or partSize >= remoteSize: partSize = 0 # Can't (or don't need to) resume
+
+        if BibleOrgSysGlobals.verbosityLevel > 2:
+            print( "    " + _("Downloading {}{}…").format( relativeFilepath, _(" (resuming from {:,} bytes)").format( partSize ) if partSize else '' ) )
+        with open( partFilepath, 'ab' if partSize else 'wb' ) as partFile:
+            if self.repoType == 'Folder':
+                with open( os.path.join( self.repoFolder, relativeFilepath ), 'rb' ) as sourceFile:
+                    sourceFile.seek( partSize )
+                    shutil.copyfileobj( sourceFile, partFile, DOWNLOAD_BLOCK_SIZE )
+            else:
+                ftp = self.__getFTP()
+                try: ftp.retrbinary( 'RETR ' + relativeFilepath, partFile.write, DOWNLOAD_BLOCK_SIZE, rest=partSize or None )
+                except (ftplib.error_reply, ftplib.error_perm): # Server might not resume so start again
+                    if not partSize: raise
+                    partFile.seek( 0 ); partFile.truncate()
+                    ftp.retrbinary( 'RETR ' + relativeFilepath, partFile.write, DOWNLOAD_BLOCK_SIZE )
+
+        # Check what we got
+        if remoteSize is not None and os.path.getsize( partFilepath ) != remoteSize:
+            os.remove( partFilepath )
+            raise IOError( _("Downloaded {} has the wrong size").format( relativeFilepath ) )
+        if expectedSHA256 is not None and getFileSHA256( partFilepath ) != expectedSHA256:
+            os.remove( partFilepath )
+            raise IOError( _("Downloaded {} has the wrong checksum").format( relativeFilepath ) )
+        os.replace( partFilepath, saveFilepath )
+        if remoteTime is not None: os.utime( saveFilepath, (remoteTime,remoteTime) ) # So we can tell next time if it's changed
+        return True
+    # end of SwordRepositoryFetcher.fetchFile
+
+
+    def fetchFiles( self, fileList ):
+        """
+        Download the files concurrently.
+
+        fileList is a list of 2-tuples (relativeFilepath, saveFilepath)
+            or 5-tuples (adding remoteSize, remoteTime, expectedSHA256).
+
+        Returns a 2-tuple with the number of files downloaded and the number that failed (errors are logged).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordRepositoryFetcher.fetchFiles( {} )").format( len(fileList) ) )
+
+        downloadCount = failCount = 0
+        with ThreadPoolExecutor( max_workers=max( 1, min( self.maxThreads, len(fileList) ) ) ) as executor:
+            futures = [(fileEntry[0],executor.submit( self.fetchFile, *fileEntry )) for fileEntry in fileList]
+            for relativeFilepath,future in futures:
+                try:
+                    if future.result(): downloadCount += 1
+                except Exception as err:
+                    logging.error( _("Unable to fetch {} from {} {}: {}").format( relativeFilepath, self.repoSite, self.repoFolder, err ) )
+                    failCount += 1
+        return downloadCount, failCount
+    # end of SwordRepositoryFetcher.fetchFiles
+# end of class SwordRepositoryFetcher
+
+
+
+def getTimeFromFTPTimestamp( timestampString ):
+    """
+    Convert an FTP (MLSD/MDTM) YYYYMMDDHHMMSS[.sss] UTC timestamp to seconds since the epoch.
+    """
+    return calendar.timegm( time.strptime( timestampString[:14], '%Y%m%d%H%M%S' ) )
+# end of getTimeFromFTPTimestamp
+
+
+def getFileSHA256( filepath ):
+    """
+    Returns the SHA-256 checksum of the file as a hex string.
+    """
+    fileHash = hashlib.sha256()
+    with open( filepath, 'rb' ) as someFile:
+        for block in iter( lambda: someFile.read( DOWNLOAD_BLOCK_SIZE ), b'' ):
+            fileHash.update( block )
+    return fileHash.hexdigest()
+# end of getFileSHA256
+
+
+def makeLocalRepository( swordFolder, repoFolder, moduleNames=None ):
+    """
+    Makes a local stand-in for a remote repository (for offline testing and benchmarking)
+        from an installed Sword folder (containing mods.d and modules folders).
+
+    Copies the modules (default is all of them) and makes the mods.d.tar.gz file.
+
+    Returns the number of modules copied.
+    """
+    if BibleOrgSysGlobals.verbosityLevel > 1:
+        print( _("Making local Sword repository in {} from {}…").format( repoFolder, swordFolder ) )
+
+    confFolder = os.path.join( swordFolder, 'mods.d/' )
+    os.makedirs( os.path.join( repoFolder, 'mods.d/' ), exist_ok=True )
+    count = 0
+    with tarfile.open( os.path.join( repoFolder, 'mods.d.tar.gz' ), mode='w:gz' ) as allConfigsTar:
+        for confFilename in sorted( os.listdir( confFolder ) ):
+            if not confFilename.lower().endswith( '.conf' ): continue
+            if moduleNames is not None and confFilename[:-5] not in moduleNames: continue
+            confPath = os.path.join( confFolder, confFilename )
+            confDict = OrderedDict()
+            with open( confPath, 'rt', encoding=DEFAULT_SWORD_CONF_ENCODING ) as confFile:
+                processConfLines( confFilename[:-5], confFile, confDict )
+            moduleRelativePath = confDict['DataPath']
+            if moduleRelativePath.startswith( './' ): moduleRelativePath = moduleRelativePath[2:]
+            moduleSourceFolder = os.path.join( swordFolder, moduleRelativePath )
+            if not os.path.isdir( moduleSourceFolder ): # Some modules put the filename on the end
+                moduleRelativePath = os.path.dirname( moduleRelativePath.rstrip( '/' ) )
+                moduleSourceFolder = os.path.join( swordFolder, moduleRelativePath )
+            shutil.copytree( moduleSourceFolder, os.path.join( repoFolder, moduleRelativePath ) )
+            shutil.copy2( confPath, os.path.join( repoFolder, 'mods.d/' ) )
+            allConfigsTar.add( confPath, arcname='mods.d/'+confFilename )
+            count += 1
+    return count
+# end of makeLocalRepository
+
+
+
 def processConfLines( abbreviation, openFile, confDict ):
     """
     Process a line from a Sword .conf file
@@ -245,6 +502,8 @@ class SwordInstallManager():
         self.currentInstallFolder = None
 
         self.availableModules = OrderedDict() # Contains a 2-tuple: confName (not including .conf) and confDict
+
+        self.maxDownloadThreads = MAX_DOWNLOAD_THREADS
     # end of SwordInstallManager.__init__
 
 
@@ -265,14 +524,14 @@ class SwordInstallManager():
         Adds a source to our ordered dict.
 
         The entry should contain four fields:
-            1/ type (FTP)
+            1/ type (FTP or Folder)
             2/ name (string)
             3/ Site url (not including folders)
-            4/ Site folders (starts with '/' )
+            4/ Site folders (starts with '/' ) -- or the local folder path for Folder type
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
             print( exp("SwordInstallManager.addSource( {}, {}, {}, {}, {} )").format( repoName, repoType, repoSite, repoFolder, setAsDefault ) )
-            assert repoType in ( 'FTP', )
+            assert repoType in SWORD_REPOSITORY_TYPES
 
         self.downloadSources[repoName] = (repoType,repoSite,repoFolder)
         if setAsDefault: source.currentRepoName = repoName
@@ -343,52 +602,78 @@ class SwordInstallManager():
 
         if clearFirst: self.availableModules = OrderedDict()
 
-        # Assume that we're good to go
-        repoType, repoSite, repoFolder = self.downloadSources[self.currentRepoName]
-        assert repoType == 'FTP'
-        if repoFolder:
-            assert repoFolder[0] == '/'
-            assert repoFolder[-1] == '/'
+        repoConfFolder = self._downloadRepoConfs( self.currentRepoName )
+        if repoConfFolder is None: return False
+        self._loadRepoConfs( self.currentRepoName, repoConfFolder )
+        return True
+    # end of SwordInstallManager.refreshRemoteSource
+
+
+    def _getRepoSaveFolder( self, repoName ):
+        """
+        Returns the (temporary) folder where we keep the downloaded files for the given repository.
+        """
+        return os.path.join( self.currentTempFolder, 'SwordRepositories', ''.join( char if char.isalnum() else '_' for char in repoName ) )
+    # end of SwordInstallManager._getRepoSaveFolder
+
+
+    def _downloadRepoConfs( self, repoName ):
+        """
+        Download the mods.d.tar.gz file (if it's changed since last time)
+            and extract the conf files from it.
 
+        Returns the folder containing the conf files (or None if it fails).
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordInstallManager._downloadRepoConfs( {} )").format( repoName ) )
+
+        repoType, repoSite, repoFolder = self.downloadSources[repoName]
         repoConfFolderName = 'mods.d'
         repoCompressedFilename = repoConfFolderName + '.tar.gz'
-        repoSaveFolder = self.currentTempFolder
+        repoSaveFolder = self._getRepoSaveFolder( repoName )
+        if not os.path.isdir( repoSaveFolder ): os.makedirs( repoSaveFolder )
         repoCompressedSaveFilepath = os.path.join( repoSaveFolder, repoCompressedFilename )
-        if os.path.isfile( repoCompressedSaveFilepath ): # delete file if it exists
-            #print( "Delete1", repoCompressedSaveFilepath )
-            os.remove( repoCompressedSaveFilepath )
         repoConfFolder = os.path.join( repoSaveFolder, repoConfFolderName )
-        if os.path.isdir( repoConfFolder ): # delete folder if it exists
-            #print( "Delete2", repoConfFolder )
-            shutil.rmtree( repoConfFolder )
 
         if BibleOrgSysGlobals.verbosityLevel > 1:
-            print( _("Refreshing/Downloading index files from {} repository…").format( self.currentRepoName ) )
+            print( _("Refreshing/Downloading index files from {} repository…").format( repoName ) )
 
         # Download the config files
-        ftp = ftplib.FTP( repoSite )
-        ftp.login() # anonymous:anonymous
-        if repoFolder:
-            assert repoFolder[0] == '/'
-            try: ftp.cwd( repoFolder )
-            except ftplib.error_perm as err:
-                #logging.error( "refreshRemoteSource: FTP error:", sys.exc_info()[0], err )
-                logging.error( "refreshRemoteSource: Unable to reach {} on {} with {!r}" \
-                                                .format( repoFolder, repoSite, err ) )
-                return False
-        ftp.retrbinary( 'RETR ' + repoCompressedFilename, open( repoCompressedSaveFilepath, 'wb' ).write )
-        ftp.quit()
-
-        # Extract the files from the compressed tar.gz file
-        if os.path.isfile( repoCompressedSaveFilepath ):
-            allConfigsTar = tarfile.open( repoCompressedSaveFilepath, mode='r:gz')
-            allConfigsTar.extractall( path=repoSaveFolder )
-        repoConfFolder = os.path.join( repoSaveFolder, repoConfFolderName )
+        fetcher = SwordRepositoryFetcher( repoType, repoSite, repoFolder )
+        try: downloadedFlag = fetcher.fetchFile( repoCompressedFilename, repoCompressedSaveFilepath )
+        except ftplib.error_perm as err:
+            #logging.error( "refreshRemoteSource: FTP error:", sys.exc_info()[0], err )
+            logging.error( "refreshRemoteSource: Unable to reach {} on {} with {!r}" \
+                                            .format( repoFolder, repoSite, err ) )
+            return None
+        except (OSError, EOFError, ftplib.Error) as err:
+            logging.error( "refreshRemoteSource: Unable to download {} from {} {} with {!r}" \
+                                            .format( repoCompressedFilename, repoSite, repoFolder, err ) )
+            return None
+        finally: fetcher.close()
+
+        # Extract the files from the compressed tar.gz file (unless we already have them)
+        if downloadedFlag or not os.path.isdir( repoConfFolder ):
+            if os.path.isdir( repoConfFolder ): # delete folder if it exists
+                #print( "Delete2", repoConfFolder )
+                shutil.rmtree( repoConfFolder )
+            with tarfile.open( repoCompressedSaveFilepath, mode='r:gz') as allConfigsTar:
+                allConfigsTar.extractall( path=repoSaveFolder )
         #print( 'repoConfFolder', repoConfFolder )
+        return repoConfFolder
+    # end of SwordInstallManager._downloadRepoConfs
+
+
+    def _loadRepoConfs( self, repoName, repoConfFolder ):
+        """
+        Place the information from the repository's conf files into self.availableModules.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordInstallManager._loadRepoConfs( {}, {} )").format( repoName, repoConfFolder ) )
 
         # Find the names of the .conf files
         confNames = []
-        for something in os.listdir( repoConfFolder ):
+        for something in sorted( os.listdir( repoConfFolder ) ):
             somepath = os.path.join( repoConfFolder, something )
             if os.path.isfile( somepath ):
                 if something.lower().endswith( '.conf' ):
@@ -430,17 +715,16 @@ class SwordInstallManager():
             confPath = os.path.join( repoConfFolder, confName+'.conf' )
             confDict = self._getConfFile( confName, confPath )
             moduleName = confDict['Name']
-            newTuple = (self.currentRepoName,confName,confDict)
+            newTuple = (repoName,confName,confDict)
             if moduleName in self.availableModules: # already
-                logging.warning( "refreshRemoteSource: {} module already in {}, now found in {}".format( moduleName, self.availableModules[moduleName][0], self.currentRepoName ) )
+                logging.warning( "refreshRemoteSource: {} module already in {}, now found in {}".format( moduleName, self.availableModules[moduleName][0], repoName ) )
                 existing = self.availableModules[moduleName]
                 if isinstance( existing, tuple): self.availableModules[moduleName] = [existing,newTuple]
                 else: self.availableModules[moduleName].append( newTuple )
             else: # add it
                 self.availableModules[moduleName] = newTuple
         #print( 'availableModules', len(self.availableModules), self.availableModules.keys() )
-        return True
-    # end of SwordInstallManager.refreshRemoteSource
+    # end of SwordInstallManager._loadRepoConfs
 
 
     def refreshAllRemoteSources( self ):
@@ -467,10 +751,12 @@ class SwordInstallManager():
         saveRepo = self.currentRepoName # Remember this
         self.availableModules = OrderedDict()
 
-        # Go through each repo and get the source list
-        for repoName in self.downloadSources:
-            self.currentRepoName = repoName
-            self.refreshRemoteSource( clearFirst=False )
+        # Download all the source lists at once, then go through each repo (in priority order)
+        with ThreadPoolExecutor( max_workers=self.maxDownloadThreads ) as executor:
+            repoConfFolders = list( executor.map( self._downloadRepoConfs, self.downloadSources ) )
+        for repoName,repoConfFolder in zip( self.downloadSources, repoConfFolders ):
+            if repoConfFolder is not None:
+                self._loadRepoConfs( repoName, repoConfFolder )
 
         self.currentRepoName = saveRepo
     # end of SwordInstallManager.refreshAllRemoteSources
@@ -494,12 +780,17 @@ class SwordInstallManager():
     # end of SwordInstallManager._getConfFile
 
 
-    def installModule( self, moduleName ):
+    def installModule( self, moduleName, checksums=None ):
         """
         Install the requested module from the remote repository.
+
+        Files that are already installed (with the same size and timestamp) aren't downloaded again.
+
+        checksums can be a dictionary of SHA-256 hex strings
+            with the repository relative filepaths (e.g., 'modules/texts/ztext/kjv/nt.bzz') as keys.
         """
         if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-            print( exp("SwordInstallManager.installModule( {} )").format( moduleName ) )
+            print( exp("SwordInstallManager.installModule( {}, {} )").format( moduleName, checksums ) )
 
         if not self.downloadSources:
             logging.critical( _("No remote Sword repository/repositories specified.") )
@@ -543,43 +834,43 @@ class SwordInstallManager():
 
         # Assume that we're good to go
         repoType, repoSite, repoFolder = self.downloadSources[repoName]
-        assert repoType == 'FTP'
-        if repoFolder:
-            assert repoFolder[0] == '/'
-            assert repoFolder[-1] == '/'
 
         if BibleOrgSysGlobals.verbosityLevel > 1:
             print( _("Downloading {!r} files from {} to {} …").format( moduleName, repoName, fileSaveFolder ) )
 
         # Download the files we need
-        ftp = ftplib.FTP( repoSite )
-        ftp.login() # anonymous:anonymous
-        if repoFolder:
-            assert repoFolder[0] == '/'
-            try: ftp.cwd( repoFolder )
-            except ftplib.error_perm as err:
-                #logging.error( "installModule: FTP error:", sys.exc_info()[0], err )
-                logging.error( "installModule: Unable to reach {} on {} with {!r}" \
-                                            .format( repoFolder, repoSite, err ) )
-                return False
-        for filename,filedict in ftp.mlsd( moduleRelativePath ):
-            #print( '  ff', repr(filename), filedict )
-            if filename not in ( '.','..', ): # Ignore these
+        if checksums is None: checksums = {}
+        fetcher = SwordRepositoryFetcher( repoType, repoSite, repoFolder, self.maxDownloadThreads )
+        try:
+            fileList = []
+            for filename,remoteSize,remoteTime in fetcher.listFolder( moduleRelativePath ):
                 #print( "    Need to download", filename )
+                relativeFilepath = moduleRelativePath + filename
                 fileSaveFilepath = os.path.join( fileSaveFolder, filename )
                 #print( "    Save filepath is", fileSaveFilepath )
-                ftp.retrbinary( 'RETR ' + moduleRelativePath + filename,
-                                    open( fileSaveFilepath, 'wb' ).write )
-
-        # Finally download and install the .conf file
-        confFullname = confName+'.conf'
-        confFolderPath = os.path.join( self.currentInstallFolder, 'mods.d/' )
-        if not os.path.isdir( confFolderPath): os.makedirs( confFolderPath )
-        confFilePath = os.path.join( confFolderPath, confFullname )
-        print( 'confFilePath', confFilePath )
-        ftp.retrbinary( 'RETR ' + 'mods.d/' + confFullname,
-                        open( confFilePath, 'wb' ).write ) # , encoding=DEFAULT_SWORD_CONF_ENCODING
-        ftp.quit()
+                fileList.append( (relativeFilepath, fileSaveFilepath, remoteSize, remoteTime, checksums.get( relativeFilepath )) )
+            downloadCount, failCount = fetcher.fetchFiles( fileList )
+            if failCount: return False
+
+            # Finally download and install the .conf file
+            confFullname = confName+'.conf'
+            confFolderPath = os.path.join( self.currentInstallFolder, 'mods.d/' )
+            if not os.path.isdir( confFolderPath): os.makedirs( confFolderPath )
+            confFilePath = os.path.join( confFolderPath, confFullname )
+            if BibleOrgSysGlobals.verbosityLevel > 2: print( 'confFilePath', confFilePath )
+            confRelativeFilepath = 'mods.d/' + confFullname
+            fetcher.fetchFile( confRelativeFilepath, confFilePath, expectedSHA256=checksums.get( confRelativeFilepath ) )
+        except ftplib.error_perm as err:
+            #logging.error( "installModule: FTP error:", sys.exc_info()[0], err )
+            logging.error( "installModule: Unable to reach {} on {} with {!r}" \
+                                        .format( repoFolder, repoSite, err ) )
+            return False
+        except (OSError, EOFError, ftplib.Error) as err:
+            logging.error( "installModule: Unable to download {!r} from {} with {!r}".format( moduleName, repoName, err ) )
+            return False
+        finally: fetcher.close()
+        if BibleOrgSysGlobals.verbosityLevel > 1:
+            print( "  " + _("Downloaded {} of {} {!r} files").format( downloadCount, len(fileList), moduleName ) )
         return True
     # end of SwordInstallManager.installModule
 # end of class SwordInstallManager
@@ -654,6 +945,23 @@ def demo():
                 if not swM.SwordModuleConfiguration.locked: swM.test()
 
 
+    if 0: # try a local stand-in repository (made from an installed Sword folder) for offline testing/benchmarking
+        localSwordFolder = os.path.join( os.path.expanduser('~'), '.sword/' )
+        localRepoFolder = os.path.join( im.currentTempFolder, 'LocalSwordRepository/' )
+        if os.path.isdir( localSwordFolder ):
+            if os.path.isdir( localRepoFolder ): shutil.rmtree( localRepoFolder )
+            makeLocalRepository( localSwordFolder, localRepoFolder )
+            im.addSource( 'Local', 'Folder', '', localRepoFolder )
+            im.currentRepoName = 'Local'
+            im.currentInstallFolder = os.path.join( im.currentTempFolder, 'LocalSwordInstall/' )
+            for attempt in ('first','second',): # The second time shouldn't need to download anything
+                startTime = time.perf_counter()
+                im.refreshRemoteSource()
+                for modName in im.availableModules: im.installModule( modName )
+                if BibleOrgSysGlobals.verbosityLevel > 0:
+                    print( "Demo: {} refresh and install of {} modules took {:.2f}s" \
+                                .format( attempt, len(im.availableModules), time.perf_counter() - startTime ) )
+
     if 0: # try refreshing all repositories
         if BibleOrgSysGlobals.verbosityLevel > 0: print( "\nDemo: Refresh all repositories…" )
         im.refreshAllRemoteSources()
@@ -54,17 +54,18 @@ TODO: I think this entire module is very messy and needs to be completely rewrit
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-03-01' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "SwordModules"
 ProgName = "Sword module handler"
-ProgVersion = '0.48'
+ProgVersion = '0.51'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import os, logging, time
+import os, logging, time, pickle
+import getpass
 #from singleton import singleton
 from collections import OrderedDict
 import multiprocessing
@@ -84,12 +85,21 @@ from SwordInstallManager import processConfLines, ALL_SWORD_CONF_FIELD_NAMES, \
 #   These should be the folders that contain mods.d and modules folders inside them
 DEFAULT_SWORD_SEARCH_FOLDERS = ( '/usr/share/sword/',
                         os.path.join( os.path.expanduser('~'), '.sword/'),
-                        'C:\\Users\\{}\\AppData\\Roaming\\Sword\\'.format( os.getlogin() ),
-                        'C:\\Users\\{}\\AppData\\Local\\VirtualStore\\Program Files\\BPBible\\resources\\'.format( os.getlogin() ),
+                        'C:\\Users\\{}\\AppData\\Roaming\\Sword\\'.format( getpass.getuser() ),
+                        'C:\\Users\\{}\\AppData\\Local\\VirtualStore\\Program Files\\BPBible\\resources\\'.format( getpass.getuser() ),
                         'C:\\Program Files\\BPBible\\resources\\', 'C:\\Program Files (x86)\\BPBible\\resources\\',
                         'TestData/', )
 SwordSearchFolders = list( DEFAULT_SWORD_SEARCH_FOLDERS )
 
+# The parsed .conf files and the module indexes are saved in the cache folder
+#   and reused if the Sword files haven't changed (set this to False to always reload everything)
+SwordRegistryCacheFlag = True
+SWORD_REGISTRY_FORMAT_VERSION = 1
+SWORD_CONFS_CACHE_FILENAME = 'SwordModuleConfs.pickle'
+SWORD_INDEX_CACHE_FILENAME_TEMPLATE = 'SwordModuleIndex.{}.pickle'
+# All of the possible index files for versified modules
+SWORD_INDEX_FILENAMES = ( 'ot.vss', 'nt.vss', 'ot.bzs', 'ot.bzv', 'nt.bzs', 'nt.bzv', 'ot.czs', 'ot.czv', 'nt.czs', 'nt.czv', )
+
 
 GENERIC_SWORD_MODULE_TYPE_NAMES = { 'RawText':'Biblical Texts', 'zText':'Biblical Texts',
                 'RawCom':'Commentaries', 'RawCom4':'Commentaries', 'zCom':'Commentaries',
@@ -115,6 +125,61 @@ def exp( messageString ):
 
 
 
+def getFileSignature( filepath ):
+    """
+    Returns a 2-tuple with the modification time and size of the file
+        (or None if the file doesn't exist).
+    """
+    try: statResult = os.stat( filepath )
+    except OSError: return None
+    return statResult.st_mtime_ns, statResult.st_size
+# end of getFileSignature
+
+
+def loadRegistryCache( cacheFilename ):
+    """
+    Load a cache dictionary (previously saved by saveRegistryCache) from the cache folder.
+
+    Returns an empty dictionary if it's missing, unreadable, or from an older version of this module.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( exp("loadRegistryCache( {!r} )").format( cacheFilename ) )
+
+    cacheFilepath = os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, cacheFilename )
+    if not os.path.isfile( cacheFilepath ): return {}
+    try:
+        with open( cacheFilepath, 'rb' ) as pickleInputFile:
+            formatVersion, cacheDict = pickle.load( pickleInputFile )
+    except Exception as err: # Could be any of several pickle, OS, or unpacking errors
+        logging.warning( _("Unable to load Sword registry cache {}: {}").format( cacheFilepath, err ) )
+        return {}
+    return cacheDict if formatVersion == SWORD_REGISTRY_FORMAT_VERSION else {}
+# end of loadRegistryCache
+
+
+def saveRegistryCache( cacheFilename, cacheDict ):
+    """
+    Save a cache dictionary into the cache folder.
+
+    The file is written under a temporary name and then renamed
+        so that other processes never see a half-written cache.
+    """
+    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        print( exp("saveRegistryCache( {!r}, ({}) )").format( cacheFilename, len(cacheDict) ) )
+
+    cacheFilepath = os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, cacheFilename )
+    tempFilepath = '{}.{}.tmp'.format( cacheFilepath, os.getpid() )
+    try:
+        os.makedirs( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, exist_ok=True )
+        with open( tempFilepath, 'wb' ) as pickleOutputFile:
+            pickle.dump( (SWORD_REGISTRY_FORMAT_VERSION,cacheDict), pickleOutputFile, pickle.HIGHEST_PROTOCOL )
+        os.replace( tempFilepath, cacheFilepath )
+    except (OSError, pickle.PicklingError) as err:
+        logging.warning( _("Unable to save Sword registry cache {}: {}").format( cacheFilepath, err ) )
+# end of saveRegistryCache
+
+
+
 class SwordModuleConfiguration:
     """
     A class that loads, processes, and stores a Sword .conf file.
@@ -959,9 +1024,24 @@ class SwordModule():
         self.versifiedFlag = True
         #if 'Versification' in self.SwordModuleConfiguration.confDict and self.SwordModuleConfiguration.confDict['Versification']!='KJV':
             #print( "Versification:", self.SwordModuleConfiguration.confDict['Versification'] )
-        self.createChapterOffsets( self.SwordModuleConfiguration.confDict['Versification'] if 'Versification' in self.SwordModuleConfiguration.confDict else 'KJV' )
+        versificationString = self.SwordModuleConfiguration.confDict['Versification'] if 'Versification' in self.SwordModuleConfiguration.confDict else 'KJV'
+        self.createChapterOffsets( versificationString )
         processTestaments = (('ot','OT',),('nt','NT',),)
 
+        # See if we saved this index last time
+        useIndexCache = SwordRegistryCacheFlag and not self.inMemoryFlag and not requestedBBB
+        if useIndexCache:
+            indexCacheFilename = SWORD_INDEX_CACHE_FILENAME_TEMPLATE.format( self.SwordModuleConfiguration.abbreviation )
+            indexCacheKey = ( self.dataFolder, versificationString, self.SwordModuleConfiguration.modType,
+                            tuple( (indexFilename,getFileSignature( os.path.join( self.dataFolder, indexFilename ) )) \
+                                                                                for indexFilename in SWORD_INDEX_FILENAMES ) )
+            indexCache = loadRegistryCache( indexCacheFilename )
+            if indexCache.get( 'key' ) == indexCacheKey:
+                self.swordIndex.update( indexCache['swordIndex'] )
+                if BibleOrgSysGlobals.verbosityLevel > 2:
+                    print( "    {} {} index entries reloaded from cache".format( len(self.swordIndex), self.SwordModuleConfiguration.modCategory ) )
+                return
+
         if requestedBBB:
             if requestedBBB not in self.chapterOffsets:
                 logging.critical( "No data available for {} book {}".format( self.SwordModuleConfiguration.name, requestedBBB ) )
@@ -989,32 +1069,23 @@ class SwordModule():
                 bookIndexFilepath = os.path.join( self.dataFolder, "{}.{}zs".format( testament, letter ) )
                 if os.path.isfile( bookIndexFilepath ):
                     with open( bookIndexFilepath, 'rb') as indexFile1: # These are book index entries
-                        while True:
-                            idxCount += 1
-                            binary12 = indexFile1.read(12)
-                            if not binary12: break # at the end of the file
-                            blockOffset, compressedLength, uncompressedLength = struct.unpack( "III", binary12 )
-                            #if count==1 and bookNum!=0:
-                            #    print( "Seem to be lacking booknum zero for {}".format( self.SwordModuleConfiguration.name ) ) # This will mess up our indexing
-                            #    vssData.append( (0, 0, 0) )
-                            bookData.append( (blockOffset, compressedLength, uncompressedLength) )
+                        # Each entry is blockOffset, compressedLength, uncompressedLength
+                        bookData = list( struct.iter_unpack( "III", indexFile1.read() ) )
+                    idxCount = len(bookData) + 1
                     if BibleOrgSysGlobals.verbosityLevel > 2: print( "    {} {} {} book index entries read".format( len(bookData), Testament, self.SwordModuleConfiguration.modCategory ) )
                     #assert len(bookData) == 1+39
                     totalIdxCount += idxCount
                 logging.info( "No {} data available for {} module".format( Testament, self.SwordModuleConfiguration.name ) )
                 if bookData:
-                    count, vssData = 0, []
+                    vssData = []
                     verseIndexFilepath = os.path.join( self.dataFolder, "{}.{}zv".format( testament, letter ) ) # These are verse index entries
                     minBN, maxBN = 99999, -1
                     with open( verseIndexFilepath, 'rb') as indexFile2:
-                        while True:
-                            count += 1
-                            binary10 = indexFile2.read(10)
-                            if not binary10: break # at the end of the file
-                            blockNumber, verseOffset, verseLength = struct.unpack( "iih", binary10 ) # Book block number sometimes starts at 0, 1 is usually Genesis for OT
-                            if blockNumber < minBN: minBN = blockNumber
-                            if blockNumber > maxBN: maxBN = blockNumber
-                            vssData.append( (blockNumber, verseOffset, verseLength) )
+                        # Each entry is blockNumber, verseOffset, verseLength
+                        vssData = list( struct.iter_unpack( "iih", indexFile2.read() ) ) # Book block number sometimes starts at 0, 1 is usually Genesis for OT
+                    if vssData:
+                        blockNumbers = [blockNumber for blockNumber,verseOffset,verseLength in vssData]
+                        minBN, maxBN = min( blockNumbers ), max( blockNumbers )
                     if BibleOrgSysGlobals.verbosityLevel > 2: print( "    {} {} {} verse index entries read".format( len(vssData), Testament, self.SwordModuleConfiguration.modCategory ) )
                     #print( self.SwordModuleConfiguration.abbreviation, testament, minBN, maxBN )
                     #self.SwordModuleConfiguration.confDict['MinimumBlockNumber'] = minBN
@@ -1149,12 +1220,9 @@ class SwordModule():
                 filepath = os.path.join( self.dataFolder, testament+'.vss' )
                 if os.path.isfile( filepath ):
                     with open( filepath, 'rb') as indexFile: # This file contains offset,verseLength indexes into the main data file
-                        while True:
-                            vssCount += 1
-                            binaryBlock = indexFile.read( 4+lengthsize) # Offset size is always 4
-                            if not binaryBlock: break # at the end of the file
-                            verseOffset, verseLength = struct.unpack( 'Ii' if self.SwordModuleConfiguration.modType=='RawCom4' else 'Ih', binaryBlock )
-                            vssData.append( (verseOffset, verseLength) )
+                        # Offset size is always 4
+                        vssData = list( struct.iter_unpack( 'Ii' if self.SwordModuleConfiguration.modType=='RawCom4' else 'Ih', indexFile.read() ) )
+                    vssCount = len(vssData) + 1
                     if BibleOrgSysGlobals.verbosityLevel > 2: print( "    {} {} {} index entries read".format( len(vssData), Testament, self.SwordModuleConfiguration.modCategory ) )
                     totalCount += vssCount
                 else:
@@ -1209,6 +1277,9 @@ class SwordModule():
                         if BibleOrgSysGlobals.verbosityLevel > 2: print( "    {} {} {} index entries loaded".format( j+1, Testament, self.SwordModuleConfiguration.modCategory ) )
             if not totalCount:
                 logging.critical( "No data available for {} module".format( self.SwordModuleConfiguration.name ) )
+
+        if useIndexCache and self.swordIndex: # Save it for next time
+            saveRegistryCache( indexCacheFilename, { 'key':indexCacheKey, 'swordIndex':self.swordIndex } )
     # end of SwordModule.loadVersifiedBibleData
 
 
@@ -1532,6 +1603,72 @@ class SwordModule():
     # end of SwordModule.getRawVersifiedData
 
 
+    def getRawVersifiedDataForReferences( self, references ):
+        """
+        Returns a list (in the same order) of the raw data for the given list of Bible references
+            (the same as calling getRawVersifiedData for each one).
+
+        The references are grouped so that each data file is only opened once
+            and each compressed (book or chapter) block is only decompressed and decoded once.
+        """
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            print( exp("SwordModule.getRawVersifiedDataForReferences( {} references )").format( len(references) ) )
+            assert self.versifiedFlag
+            assert self.SwordModuleConfiguration.modType in ('RawText','zText','RawCom','RawCom4','zCom','RawFiles',)
+
+        if self.inMemoryFlag: # it's easy -- we already have all the data
+            return [self.getRawVersifiedData( reference ) for reference in references]
+
+        results = [None] * len(references)
+        requestsByFile = OrderedDict()
+        for n,reference in enumerate( references ):
+            BBB, c, v = reference[:3]
+            if BBB not in self.swordIndex: continue # Leave the result as None
+            filepath,indexData = self.swordIndex[BBB]
+            try: indexInfo = indexData[(c,v,)]
+            except KeyError:
+                logging.error( "Reference {}:{} doesn't seem to exist in book {} of {} {}".format( c, v, BBB, self.SwordModuleConfiguration.name, self.SwordModuleConfiguration.modCategory ) )
+                continue
+            if filepath not in requestsByFile: requestsByFile[filepath] = []
+            requestsByFile[filepath].append( (n,BBB,indexInfo) )
+
+        encoding = self.SwordModuleConfiguration.encoding
+        for filepath,fileRequests in requestsByFile.items():
+            fileRequests.sort( key=lambda r: r[2][0] ) # So we read through the file in order
+            if 'CompressType' in self.SwordModuleConfiguration.confDict:
+                textChunks = {}
+                compressedTextFile = None # Only opened if we need to read a block (i.e., it's not cached)
+                try:
+                    for n,BBB,indexInfo in fileRequests:
+                        fileOffset, compressedLength, uncompressedLength, verseOffset, verseLength = indexInfo
+                        if not compressedLength or not verseLength: results[n] = ''; continue
+                        if fileOffset not in textChunks:
+                            if (BBB,fileOffset) in self.cache:
+                                uncompressedChunk, cachedTime = self.cache[(BBB,fileOffset)]
+                            else: # it's not cached
+                                if compressedTextFile is None: compressedTextFile = open( filepath, 'rb' )
+                                compressedTextFile.seek( fileOffset )
+                                uncompressedChunk = self.decompressChunk( compressedTextFile.read( compressedLength ) )
+                                self.cache[(BBB,fileOffset)] = (uncompressedChunk,time.time(),)
+                            assert len(uncompressedChunk) == uncompressedLength
+                            try: textChunks[fileOffset] = uncompressedChunk.decode( encoding )
+                            except UnicodeDecodeError:
+                                logging.warning( "Unable to properly decode {} {} {} book chunk #{} {}->{}".format( encoding, self.SwordModuleConfiguration.name, self.SwordModuleConfiguration.modCategory, fileOffset, compressedLength, uncompressedLength ) )
+                                textChunks[fileOffset] = uncompressedChunk.decode( encoding, 'replace' )
+                        results[n] = textChunks[fileOffset][verseOffset:verseOffset+verseLength]
+                finally:
+                    if compressedTextFile is not None: compressedTextFile.close()
+            else: # it's not compressed
+                with open( filepath, 'rt', encoding=encoding ) as textFile:
+                    for n,BBB,(verseOffset,verseLength) in fileRequests:
+                        if verseLength:
+                            textFile.seek( verseOffset )
+                            results[n] = textFile.read( verseLength )
+                        else: results[n] = ''
+        return results
+    # end of SwordModule.getRawVersifiedDataForReferences
+
+
     def getRawDictData( self, word ):
         """
         """
@@ -2175,6 +2312,10 @@ class SwordModules:
         self.modules = OrderedDict() # The SwordModule objects
         self.index, self.categories, self.modTypes, self.languages, self.features = {}, {}, {}, {}, {}
 
+        # Previously parsed conf files (key is the conf filepath, value is a 2-tuple with the file signature and the SwordModuleConfiguration)
+        self.confsCache = loadRegistryCache( SWORD_CONFS_CACHE_FILENAME ) if SwordRegistryCacheFlag else {}
+        self.confsCacheChanged = False
+
         # Go find them and load them all!
         totalFolders = totalCount = 0
         for folder in self.searchFolders:
@@ -2189,6 +2330,12 @@ class SwordModules:
         #print( len(self.confs) ); halt
         if BibleOrgSysGlobals.verbosityLevel > 2:
             print( "Loaded {} Sword .conf files from {} different folders".format( totalCount, totalFolders ) )
+
+        if SwordRegistryCacheFlag and self.confsCacheChanged:
+            for confFilepath in list( self.confsCache ): # Forget any deleted modules
+                if not os.path.isfile( confFilepath ): del self.confsCache[confFilepath]
+            saveRegistryCache( SWORD_CONFS_CACHE_FILENAME, self.confsCache )
+        del self.confsCache # Don't need it any more
     # end of SwordModules.__loadAllConfs
 
 
@@ -2214,8 +2361,16 @@ class SwordModules:
             #if moduleRoughName not in ('gerhfa2002','oxfordtr','personal','tagalog','tr',): continue # Used for testing specific modules
             count += 1
             if BibleOrgSysGlobals.verbosityLevel > 2: print( "#{}".format( count ), end='' )
-            swMC = SwordModuleConfiguration( moduleRoughName, loadFolder )
-            swMC.loadConf()
+            confFilepath = os.path.join( loadFolder, 'mods.d/', moduleConfFilename )
+            confSignature = getFileSignature( confFilepath )
+            try: cachedSignature, swMC = self.confsCache[confFilepath]
+            except KeyError: cachedSignature = None
+            if cachedSignature is None or cachedSignature != confSignature: # Nothing saved or the file has changed
+                swMC = SwordModuleConfiguration( moduleRoughName, loadFolder )
+                swMC.loadConf()
+                if SwordRegistryCacheFlag:
+                    self.confsCache[confFilepath] = (confSignature,swMC)
+                    self.confsCacheChanged = True
             if BibleOrgSysGlobals.verbosityLevel > 2: print( swMC )
             self.confs[moduleRoughName] = swMC
             self.confKeys[swMC.name] = moduleRoughName
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# AsyncVerseRetrievalTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing AsyncVerseRetrieval.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing AsyncVerseRetrieval.py
+    using fake (fast, slow, and broken) verse sources.
+"""
+
+ProgName = "Async verse retrieval tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, unittest
+import time, asyncio
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from AsyncVerseRetrieval import AsyncVerseRetriever
+from VerseReferences import SimpleVerseKey
+
+
+def makeSlowSource( delay ):
+    """ Returns a source which takes delay seconds for each lookup. """
+    def slowSource( key ):
+        time.sleep( delay )
+        return ['(slow) {}'.format( key.getShortText() )], ['context']
+    return slowSource
+# end of makeSlowSource
+
+def fastSource( key ): return ['(fast) {}'.format( key.getShortText() )], []
+def missingSource( key ): raise KeyError
+def brokenSource( key ): raise ValueError( "Something went wrong" )
+
+
+class AsyncVerseRetrieverTests( unittest.TestCase ):
+    """ Unit tests for the AsyncVerseRetriever object. """
+
+    def setUp( self ):
+        self.key = SimpleVerseKey( 'JHN', '3', '16' )
+
+    def makeRetriever( self, sources, **kwargs ):
+        retriever = AsyncVerseRetriever( sources, **kwargs )
+        self.addCleanup( retriever.close )
+        return retriever
+
+    def test_010_statuses( self ):
+        """ Test the results from the different kinds of sources. """
+        retriever = self.makeRetriever( (('Fast',fastSource), ('Slow',makeSlowSource( 0.1 )), ('Missing',missingSource),
+                                          ('NoBook',lambda key: None), ('Broken',brokenSource),) )
+        results = retriever.getContextVerseDataSync( self.key )
+        self.assertEqual( list( results ), ['Fast','Slow','Missing','NoBook','Broken'] )
+        self.assertEqual( results['Fast'], ('OK', ['(fast) JHN 3:16'], [], None) )
+        self.assertEqual( results['Slow'], ('OK', ['(slow) JHN 3:16'], ['context'], None) )
+        self.assertEqual( results['Missing'][0], 'NoVerse' )
+        self.assertEqual( results['NoBook'][0], 'NoBook' )
+        self.assertEqual( results['Broken'], ('Error', None, None, "Something went wrong") )
+        self.assertEqual( retriever.getContextVerseDataSync( self.key, ['Fast'] ), {'Fast':('OK', ['(fast) JHN 3:16'], [], None)} )
+    # end of test_010_statuses
+
+    def test_020_timeoutAndBusy( self ):
+        """ Test that a slow source times out, and is then busy until its lookup finishes. """
+        retriever = self.makeRetriever( (('Fast',fastSource),) )
+        retriever.addSource( 'Slow', makeSlowSource( 0.5 ), timeout=0.1 )
+        startTime = time.time()
+        results = retriever.getContextVerseDataSync( self.key )
+        self.assertLess( time.time() - startTime, 0.4 ) # Didn't wait for the slow one
+        self.assertEqual( results['Fast'][0], 'OK' )
+        self.assertEqual( results['Slow'], ('Timeout', None, None, None) )
+        results = retriever.getContextVerseDataSync( self.key ) # The first slow lookup is still running
+        self.assertEqual( results['Fast'][0], 'OK' )
+        self.assertEqual( results['Slow'], ('Busy', None, None, None) )
+        time.sleep( 0.5 )
+        self.assertEqual( retriever.getContextVerseDataSync( self.key, timeout=1 )['Slow'][0], 'OK' )
+    # end of test_020_timeoutAndBusy
+
+    def test_030_queuedLookups( self ):
+        """ Test that time waiting for a worker thread doesn't count towards the timeout. """
+        retriever = self.makeRetriever( [('Slow{}'.format( j ),makeSlowSource( 0.2 )) for j in range(3)], defaultTimeout=0.35, maxWorkers=1 )
+        startTime = time.time()
+        results = retriever.getContextVerseDataSync( self.key )
+        self.assertGreaterEqual( time.time() - startTime, 0.6 ) # They were done one at a time
+        self.assertEqual( [result[0] for result in results.values()], ['OK','OK','OK'] )
+    # end of test_030_queuedLookups
+
+    def test_040_asyncio( self ):
+        """ Test the coroutines from our own event loop. """
+        retriever = self.makeRetriever( {'Fast':fastSource, 'Broken':brokenSource} )
+        loop = asyncio.new_event_loop()
+        try:
+            verseDataLists = loop.run_until_complete( retriever.getVerseDataLists( self.key ) )
+        finally: loop.close()
+        self.assertEqual( verseDataLists, {'Fast':['(fast) JHN 3:16'], 'Broken':None} )
+    # end of test_040_asyncio
+# end of AsyncVerseRetrieverTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of AsyncVerseRetrievalTests.py
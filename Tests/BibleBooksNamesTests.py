@@ -26,9 +26,9 @@
 Module testing BibleBooksNamesConverter.py and BibleBooksNames.py.
 """
 
-LastModifiedDate = '2017-03-29' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ProgName = "Bible Books Names tests"
-ProgVersion = '0.32'
+ProgVersion = '0.33'
 ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
 
 
@@ -182,6 +182,59 @@ class BibleBooksNamesSystemsTests( unittest.TestCase ):
         self.assertFalse( '' in results )
         self.assertEqual( self.bbnss.getBooksNamesSystem('SomeName', sampleBookList), None )
     # end of test_2060_getBooksNamesSystem
+
+    def test_2070_getBBBFromText( self ):
+        """ Test the getBBBFromText function (using the merged trie). """
+        tests = ( ('GEN',('Genesis','GENESIS','Genèse','Génesis','Gênesis')), ('JN1',('1 John','I Jn','1Jn')), ('SA2',('II Sa','2Sam')), )
+        for BBB,inputs in tests:
+            for thisInput in inputs:
+                self.assertEqual( self.bbnss.getBBBFromText( thisInput ), BBB )
+        for badInput in ('XYZ','SomeName',):
+            self.assertEqual( self.bbnss.getBBBFromText( badInput ), None )
+        self.assertEqual( self.bbnss.getBBBFromText( 'Matthäus', languageCode='deu' ), 'MAT' )
+    # end of test_2070_getBBBFromText
+
+    def test_2075_getBBBFromTextPriority( self ):
+        """ Test that initial portions resolve to the first book in the highest priority system (as callers expect). """
+        for thisInput,BBB in ( ('Phil','PHP'), ('Ex','EXO'), ('Jud','JDG'), ('Jude','JDE'), ('Ju','JDG'),
+                                ('Jn','JNA'), ('John','JHN'), ('Mt','MAT'), ('Ps','PSA'), ('Gen','GEN'), ('Rev','REV'), ):
+            self.assertEqual( self.bbnss.getBBBFromText( thisInput ), BBB, thisInput )
+            self.assertEqual( self.bbnss.getBBBCandidatesFromText( thisInput )[0][0], BBB, thisInput )
+    # end of test_2075_getBBBFromTextPriority
+
+    def test_2080_getBBBCandidatesFromText( self ):
+        """ Test the getBBBCandidatesFromText function. """
+        results = self.bbnss.getBBBCandidatesFromText( 'Ju' )
+        self.assertTrue( isinstance( results, list ) )
+        self.assertTrue( len(results) > 2 )
+        BBBs = [BBB for BBB,systemNameList in results]
+        for BBB in ('JDE','JDG',): self.assertTrue( BBB in BBBs )
+        for BBB,systemNameList in results:
+            self.assertTrue( isinstance( systemNameList, list ) and systemNameList )
+        self.assertEqual( self.bbnss.getBBBCandidatesFromText( 'XYZ' ), [] )
+    # end of test_2080_getBBBCandidatesFromText
+
+    def test_2090_getAmbiguityReport( self ):
+        """ Test the getAmbiguityReport function. """
+        results = self.bbnss.getAmbiguityReport()
+        self.assertTrue( isinstance( results, dict ) )
+        for UCField,candidates in results.items():
+            self.assertEqual( UCField, UCField.upper() )
+            self.assertTrue( len(candidates) > 1 )
+    # end of test_2090_getAmbiguityReport
+
+    def test_2100_corruptTrieCache( self ):
+        """ Test that a truncated trie cache file is made again (rather than crashing). """
+        import os, pickle
+        triePickleFilepath = os.path.join( os.path.dirname(BibleBooksNames.__file__), "DataFiles", "DerivedFiles", "BibleBooksNames_Tables.trie.pickle" )
+        truncatedData = pickle.dumps( (BibleBooksNames.BOOKS_NAMES_TRIE_FORMAT_VERSION, ['eng_traditional'], [{}, ()], {}) )[:-10]
+        with open( triePickleFilepath, 'wb' ) as pickleFile: pickleFile.write( truncatedData )
+        self.bbnss._BibleBooksNamesSystems__trie = None # Force it to be loaded again
+        self.assertEqual( self.bbnss.getBBBFromText( 'Phil' ), 'PHP' )
+        with open( triePickleFilepath, 'rb' ) as pickleFile: savedData = pickleFile.read()
+        if savedData == truncatedData: os.remove( triePickleFilepath ) # It's not cached if the tables weren't loaded from their pickle
+        else: self.assertEqual( pickle.loads( savedData )[0], BibleBooksNames.BOOKS_NAMES_TRIE_FORMAT_VERSION )
+    # end of test_2100_corruptTrieCache
 # end of BibleBooksNamesSystemsTests class
 
 
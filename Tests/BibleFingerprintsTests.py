@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# BibleFingerprintsTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing BibleFingerprints.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing BibleFingerprints.py
+    and the verse fingerprints made by InternalBible/InternalBibleBook and saved by PickledBible.
+"""
+
+ProgName = "Bible fingerprints tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from BibleFingerprints import normalizeVerseText, makeVerseFingerprint, VerseFingerprints, \
+                                compareBookFingerprints, BibleFingerprintCorpus
+from USFMBible import USFMBible
+from USXXMLBible import USXXMLBible
+from PickledBible import PickledBible, createPickledBible
+
+
+USX_TEST_FOLDER = os.path.join( sourceFolder, 'Tests/DataFilesForTests/USXTest1/' ) # GEN, TH2, and REV
+USFM_TEST_FOLDER = os.path.join( sourceFolder, 'Tests/DataFilesForTests/USFMTest2/' ) # The same text (and more books)
+
+
+def makeFingerprints( workName, bookDict ):
+    """ Returns a VerseFingerprints table made from a dictionary of BBB: list of (C,V,verseText) 3-tuples. """
+    verseFingerprints = VerseFingerprints( workName )
+    for BBB,verseList in bookDict.items():
+        verseFingerprints.addBook( BBB, [(C,V) for C,V,verseText in verseList],
+                                    [makeVerseFingerprint( normalizeVerseText( verseText ) ) for C,V,verseText in verseList] )
+    return verseFingerprints
+# end of makeFingerprints
+
+def makeBookFingerprints( verseList ):
+    """ Returns a (CVKeys,fingerprints) 2-tuple for a list of (C,V,verseText) 3-tuples. """
+    return makeFingerprints( 'Book', {'JDE':verseList} ).books['JDE']
+# end of makeBookFingerprints
+
+
+JUDE_VERSES = [ ('1','1',"Jude, a servant of Jesus Christ."), ('1','2',"Mercy to you, and peace."),
+                ('1','3',"Beloved, I was very eager to write to you."), ('1','4',"For certain people have crept in."), ]
+
+
+class VerseFingerprintTests( unittest.TestCase ):
+    """ Unit tests for the fingerprint functions and tables. """
+
+    def test_010_normalizeVerseText( self ):
+        """ Test that the verse text is normalized before it's fingerprinted. """
+        self.assertEqual( normalizeVerseText( 'Cafe\u0301 ' ), 'Caf\u00e9' ) # NFC
+        self.assertEqual( normalizeVerseText( 'In the\u200b begin\u00adning\ufeff' ), 'In the beginning' ) # Zero-width characters and soft hyphens
+        self.assertEqual( normalizeVerseText( '  In the\n beginning\t\u00a0God  ' ), 'In the beginning God' ) # Whitespace
+        self.assertEqual( normalizeVerseText( '\u200d \n' ), '' )
+        fingerprint = makeVerseFingerprint( normalizeVerseText( 'In the beginning God created' ) )
+        for verseText in ( 'In the beginning God created', ' In  the begin\u200bning\nGod created ', ):
+            self.assertEqual( makeVerseFingerprint( normalizeVerseText( verseText ) ), fingerprint )
+        self.assertNotEqual( makeVerseFingerprint( normalizeVerseText( 'In the beginning God created.' ) ), fingerprint )
+        self.assertTrue( 0 <= fingerprint < 2**64 )
+    # end of test_010_normalizeVerseText
+
+    def test_020_sameVerseKeys( self ):
+        """ Test comparing two books which have the same verses. """
+        bookFingerprints1 = makeBookFingerprints( JUDE_VERSES )
+        self.assertEqual( compareBookFingerprints( 'JDE', bookFingerprints1, makeBookFingerprints( JUDE_VERSES ) ), (4,0,0,0) )
+        changedVerses = list( JUDE_VERSES )
+        changedVerses[1] = ('1','2',"Mercy to you, and peace, and love.")
+        changedVerses[3] = ('1','4',"For  certain\u200b people have crept in.") # Only normalization changes
+        differenceList = []
+        self.assertEqual( compareBookFingerprints( 'JDE', bookFingerprints1, makeBookFingerprints( changedVerses ), differenceList ), (3,1,0,0) )
+        self.assertEqual( differenceList, [('JDE','1','2','Different')] )
+    # end of test_020_sameVerseKeys
+
+    def test_030_differentVersifications( self ):
+        """ Test comparing two books which have different verses. """
+        otherVerses = [ ('1','1',"Jude, a servant of Jesus Christ."), ('1','2',"Mercy to you, and peace."),
+                        ('1','3',"Beloved, I was very eager to write to you!"), ('1','5',"Now I want to remind you."), ]
+        differenceList = []
+        self.assertEqual( compareBookFingerprints( 'JDE', makeBookFingerprints( JUDE_VERSES ), makeBookFingerprints( otherVerses ), differenceList ),
+                            (2,1,1,1) )
+        self.assertEqual( differenceList, [('JDE','1','3','Different'), ('JDE','1','5','Only2'), ('JDE','1','4','Only1')] )
+
+        differenceList = [] # Only in one of the works
+        self.assertEqual( compareBookFingerprints( 'JDE', None, makeBookFingerprints( otherVerses ), differenceList ), (0,0,0,4) )
+        self.assertEqual( [difference[3] for difference in differenceList], ['Only2']*4 )
+        self.assertEqual( compareBookFingerprints( 'JDE', makeBookFingerprints( JUDE_VERSES ), None ), (0,0,4,0) )
+    # end of test_030_differentVersifications
+
+    def test_040_corpus( self ):
+        """ Test finding identical and similar works. """
+        genesisVerses = [ ('1','1',"In the beginning"), ('1','2',"The earth was formless") ]
+        corpus = BibleFingerprintCorpus()
+        corpus.addWork( makeFingerprints( 'Original', {'GEN':genesisVerses, 'JDE':JUDE_VERSES} ) )
+        corpus.addWork( makeFingerprints( 'Reordered', {'JDE':JUDE_VERSES, 'GEN':genesisVerses} ) ) # Book order doesn't matter
+        corpus.addWork( makeFingerprints( 'Revised', {'GEN':genesisVerses, 'JDE':JUDE_VERSES[:3]+[('1','4',"Certain people crept in.")]} ) )
+        corpus.addWork( makeFingerprints( 'JudeOnly', {'JDE':JUDE_VERSES} ) )
+        self.assertEqual( len(corpus), 4 )
+        self.assertEqual( corpus.findIdenticalWorks(), [['Original','Reordered']] )
+        self.assertEqual( corpus.compareWorks( 'Original', 'Revised' ),
+                            {'Same':5, 'Different':1, 'Only1':0, 'Only2':0, 'Similarity':5/6} )
+        self.assertEqual( corpus.getVerseDifferences( 'Original', 'Revised' ), [('JDE','1','4','Different')] )
+        self.assertEqual( corpus.getVerseDifferences( 'JudeOnly', 'Original' ), [('GEN','1','1','Only2'), ('GEN','1','2','Only2')] )
+        self.assertEqual( corpus.findSimilarWorks( minimumSimilarity=0.8 ),
+                            [(1.0,'Original','Reordered'), (5/6,'Original','Revised'), (5/6,'Reordered','Revised')] )
+        self.assertEqual( [(workName1,workName2) for similarity,workName1,workName2 in corpus.findSimilarWorks( minimumSimilarity=0.5 )
+                                                    if 'JudeOnly' in (workName1,workName2)],
+                            [('Original','JudeOnly'), ('Reordered','JudeOnly'), ('Revised','JudeOnly')] ) # 4/6 of the verses
+    # end of test_040_corpus
+# end of VerseFingerprintTests class
+
+
+class BibleVerseFingerprintTests( unittest.TestCase ):
+    """ Unit tests for the verse fingerprints of loaded and pickled Bibles. """
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.USXBible = USXXMLBible( USX_TEST_FOLDER )
+        cls.USXBible.load()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+
+    def tearDown( self ):
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def test_010_getVerseFingerprints( self ):
+        """ Test the fingerprints for the books of a loaded Bible. """
+        verseFingerprints = self.USXBible.getVerseFingerprints()
+        self.assertIs( self.USXBible.getVerseFingerprints(), verseFingerprints ) # Cached
+        self.assertEqual( list( verseFingerprints.books ), ['GEN','TH2','REV'] )
+        for BBB,(CVKeys,fingerprints) in verseFingerprints.books.items():
+            self.assertEqual( (CVKeys,fingerprints), self.USXBible.books[BBB].getVerseFingerprints() )
+            self.assertEqual( len(CVKeys), len(fingerprints) )
+            self.assertEqual( len(set(CVKeys)), len(CVKeys) )
+            self.assertFalse( any( V=='0' for C,V in CVKeys ) ) # Only verses with verse text
+        self.assertEqual( len(verseFingerprints), 1972 )
+        self.assertIsNotNone( verseFingerprints.getVerseFingerprint( 'GEN', '1', '1' ) )
+        self.assertIsNone( verseFingerprints.getVerseFingerprint( 'GEN', '1', '0' ) )
+        self.assertIsNone( verseFingerprints.getVerseFingerprint( 'MAT', '1', '1' ) )
+    # end of test_010_getVerseFingerprints
+
+    def test_020_differentFormats( self ):
+        """ Test that the same text from USX and USFM gives the same fingerprints. """
+        USFMBibleObject = USFMBible( USFM_TEST_FOLDER )
+        USFMBibleObject.load()
+        corpus = BibleFingerprintCorpus()
+        corpus.addWork( self.USXBible, 'USX' )
+        corpus.addWork( USFMBibleObject, 'USFM' )
+        differenceTypes = set( difference[3] for difference in corpus.getVerseDifferences( 'USX', 'USFM' ) )
+        self.assertEqual( differenceTypes, {'Only2'} ) # Just the extra USFM books
+        USFMFingerprints = corpus.works['USFM']
+        for BBB in ('GEN','TH2','REV'):
+            self.assertEqual( corpus.works['USX'].getBookDigest( BBB ), USFMFingerprints.getBookDigest( BBB ) )
+        self.assertEqual( corpus.compareWorks( 'USX', 'USFM' )['Same'], 1972 )
+    # end of test_020_differentFormats
+
+    def test_030_pickledBible( self ):
+        """ Test that the fingerprints are saved with a (minimal) pickled Bible. """
+        verseFingerprints = self.USXBible.getVerseFingerprints()
+        createPickledBible( self.USXBible, self.tempFolder, dataLevel=1 )
+        pickledBible = PickledBible( self.tempFolder )
+        pickledBible.preload()
+        self.assertEqual( len(pickledBible.books), 0 ) # Not loaded
+        pickledFingerprints = pickledBible.getVerseFingerprints()
+        self.assertIsInstance( pickledFingerprints, VerseFingerprints )
+        self.assertEqual( len(pickledBible.books), 0 ) # Still not loaded
+        self.assertEqual( pickledFingerprints.getBibleDigest(), verseFingerprints.getBibleDigest() )
+        self.assertEqual( pickledFingerprints.books, verseFingerprints.books )
+    # end of test_030_pickledBible
+# end of BibleVerseFingerprintTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of BibleFingerprintsTests.py
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# BibleOrgSysGlobalsTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing BibleOrgSysGlobals.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing BibleOrgSysGlobals.py.
+"""
+
+ProgName = "Bible Organisational System globals tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, unittest
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+
+
+class RemoveAccentsTests( unittest.TestCase ):
+    """ Unit tests for the removeAccents function. """
+
+    def test_010_latin( self ):
+        """ Test Latin letters (from ACCENT_DICT and by decomposition). """
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'Señor Jesús' ), 'Senor Jesus' )
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'Việt Nam' ), 'Viet Nam' )
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'Ǖ' ), 'U' ) # LATIN CAPITAL LETTER U WITH DIAERESIS AND MACRON
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'plain text' ), 'plain text' )
+    # end of test_010_latin
+
+    def test_020_greek( self ):
+        """ Test Greek letters with accents and breathings. """
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'ἐν ἀρχῇ ἦν ὁ λόγος' ), 'εν αρχη ην ο λογος' )
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'ᾯ' ), 'Ω' )
+    # end of test_020_greek
+
+    def test_030_hebrew( self ):
+        """ Test that Hebrew points aren't removed (including from the presentation forms). """
+        for hebrewText in ( '\ufb2a', '\ufb2b', '\ufb35', '\ufb4b', 'בְּרֵאשִׁית' ): # SHIN WITH SHIN DOT, SHIN WITH SIN DOT, VAV WITH DAGESH, VAV WITH HOLAM
+            self.assertEqual( BibleOrgSysGlobals.removeAccents( hebrewText ), hebrewText )
+    # end of test_030_hebrew
+
+    def test_040_devanagari( self ):
+        """ Test that Devanagari letters with nukta are left unchanged. """
+        for devanagariText in ( '\u0958', '\u0959', '\u095b', '\u0929' ): # QA, KHHA, ZA, NNNA
+            self.assertEqual( BibleOrgSysGlobals.removeAccents( devanagariText ), devanagariText )
+    # end of test_040_devanagari
+
+    def test_050_cyrillic( self ):
+        """ Test that Cyrillic letters like й and ё are left unchanged. """
+        self.assertEqual( BibleOrgSysGlobals.removeAccents( 'йЙёЁ' ), 'йЙёЁ' )
+    # end of test_050_cyrillic
+# end of RemoveAccentsTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of BibleOrgSysGlobalsTests.py
@@ -261,6 +261,25 @@ class BibleReferencesTests( unittest.TestCase ):
                 self.assertTrue( 0 <= len(r4) <= 1 )
     # end of test_300_BibleReferenceList
 
+    def test_310_BibleReferenceListCache( self ):
+        """ Test that BibleReferenceList gives the same results for repeated (remembered) reference strings. """
+        BRL = BibleReferences.BibleReferenceList( self.BOS )
+        for refString in ("Mat 7:3","Mat. 7:3,7; 4:7","Mut 7:3","Mrk. 7:3a:7b,8",):
+            firstResult = BRL.parseReferenceString( refString )
+            firstResult = firstResult[0], firstResult[1], list( firstResult[2] )
+            BRL.parseReferenceString( "Heb. 2:2" ) # Something different in between
+            self.assertEqual( BRL.parseReferenceString( refString ), firstResult )
+            self.assertEqual( BRL.getReferenceList(), firstResult[2] )
+            self.assertEqual( BRL.parseReferenceString( refString, contextBBB='MAT' ), firstResult )
+        result = BRL.parseToOSIS( "Mat. 7:3,7; 4:7", contextBBB='MRK' )
+        self.assertEqual( result, BRL.parseToOSIS( "Mat. 7:3,7; 4:7" ) )
+        self.assertTrue( BRL.containsReference( 'MAT', '4', '7' ) )
+        self.assertEqual( BRL.parseBookReferenceStrings( 'MAT', ("Mat 7:3","Mat 7:3","Mat 7:4","",) ), 2 )
+        self.assertEqual( BRL.parseReferenceString( "Mat 7:4", contextBBB='MAT' ), (True, False, [('MAT','7','4','')]) )
+        BRL.clearParseCache()
+        self.assertEqual( BRL.parseReferenceString( "Mat 7:4", contextBBB='MAT' ), (True, False, [('MAT','7','4','')]) )
+    # end of test_310_BibleReferenceListCache
+
     def test_400_BibleAnchorReference( self ):
         """ Test the BibleAnchorReference function. """
         # Test ones that should work
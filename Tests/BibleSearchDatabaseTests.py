@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# BibleSearchDatabaseTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing BibleSearchDatabase.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing BibleSearchDatabase.py
+    by comparing the database search results with InternalBible.findText.
+"""
+
+ProgName = "Bible search database tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from USFMBible import USFMBible
+from BibleSearchDatabase import createSearchDatabase, BibleSearchDatabase
+
+
+TEST_USFM_BOOK = """\\id MAT Search database test book
+\\h Mateo
+\\c 1
+\\s1 El Señor
+\\p
+\\v 1 El Señor Jesús dijo.
+\\v 2 Y el senor Jesus también.
+\\v 3 Otro SEÑOR y la ciudad de Nazaret.
+"""
+
+TEST_FIND_TEXTS = ( 'senor', 'Señor', 'jesus', 'Jesús', 'también', 'tambien', 'el', 'regex:[Ss]e[nñ]or', )
+
+
+def getComparableResults( findTextResults ):
+    """
+    Returns the summary dict and the result list (with the SimpleVerseKeys as strings).
+    """
+    optionsDict, resultSummaryDict, resultList = findTextResults
+    return resultSummaryDict, [(str(result[0]),)+tuple(result[1:]) for result in resultList]
+# end of getComparableResults
+
+
+class BibleSearchDatabaseTests( unittest.TestCase ):
+    """ Unit tests comparing the BibleSearchDatabase with InternalBible.findText. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+        with open( os.path.join( self.tempFolder, '41MATtst.SFM' ), 'wt', encoding='utf-8' ) as bookFile:
+            bookFile.write( TEST_USFM_BOOK )
+        self.testBible = USFMBible( self.tempFolder, 'TST' )
+        self.testBible.load()
+
+    def tearDown( self ):
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def compareSearches( self, foldDiacritics ):
+        """ Compare the database and findText results for a number of searches. """
+        databaseFilepath = os.path.join( self.tempFolder, 'Search.sqlite' )
+        self.assertTrue( createSearchDatabase( self.testBible, databaseFilepath, foldDiacritics=foldDiacritics ) )
+        searchDatabase = BibleSearchDatabase( databaseFilepath )
+        try:
+            for findText in TEST_FIND_TEXTS:
+                for wordMode in ( 'Any', 'Whole', 'Begins', ):
+                    for caselessFlag in ( True, False, ):
+                        for ignoreDiacriticsFlag in ( False, True, ):
+                            optionsDict = { 'findText':findText, 'wordMode':wordMode,
+                                        'caselessFlag':caselessFlag, 'ignoreDiacriticsFlag':ignoreDiacriticsFlag }
+                            with self.subTest( optionsDict=optionsDict ):
+                                self.assertEqual( getComparableResults( searchDatabase.findText( dict(optionsDict) ) ),
+                                                  getComparableResults( self.testBible.findText( dict(optionsDict) ) ) )
+        finally: searchDatabase.close()
+    # end of compareSearches
+
+    def test_010_unfoldedDatabase( self ):
+        """ Test searches in a database exported without the folded text column. """
+        self.compareSearches( foldDiacritics=False )
+    # end of test_010_unfoldedDatabase
+
+    def test_020_foldedDatabase( self ):
+        """ Test searches in a database exported with the folded text column. """
+        self.compareSearches( foldDiacritics=True )
+    # end of test_020_foldedDatabase
+
+    def test_030_ignoreDiacritics( self ):
+        """ Test that accented words are found when ignoring diacritics in an unfolded database. """
+        databaseFilepath = os.path.join( self.tempFolder, 'Search.sqlite' )
+        self.assertTrue( createSearchDatabase( self.testBible, databaseFilepath, foldDiacritics=False ) )
+        searchDatabase = BibleSearchDatabase( databaseFilepath )
+        try:
+            self.assertEqual( len( searchDatabase.findText( {'findText':'senor', 'ignoreDiacriticsFlag':True} )[2] ), 4 )
+            self.assertEqual( len( searchDatabase.findText( {'findText':'jesus', 'ignoreDiacriticsFlag':True} )[2] ), 2 )
+        finally: searchDatabase.close()
+    # end of test_030_ignoreDiacritics
+# end of BibleSearchDatabaseTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of BibleSearchDatabaseTests.py
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# CompareBiblesTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing the word alignments in CompareBibles.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing the word alignments in CompareBibles.py
+    including that the NumPy and the plain Python co-occurrence counts give the same results.
+"""
+
+ProgName = "Compare Bibles tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, unittest
+import random
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+import CompareBibles
+from CompareBibles import findWordAlignments, makeTermSegmentArrays, _findCoOccurrences, _findCoOccurrencesNumpy
+
+
+TEST_SEGMENTS = [ (('1','1',''), ['God','created'], ['Dios','creó']),
+                  (('1','2',''), ['God','spoke'], ['Dios','habló']),
+                  (('1','3',''), ['god','saw','God'], ['Dios','vio']),
+                  (('1','4',''), ['light'], []), ]
+NO_OVERLAP_SEGMENTS = [ (('1','1',''), ['light','dark'], []), (('1','2',''), [], ['luz']), (('1','3',''), [], []), ]
+
+
+def makeRandomSegments( numSegments, seed ):
+    """ Returns a reproducible list of random segments (including some empty ones). """
+    randomGenerator = random.Random( seed )
+    words1, words2 = ['w{}'.format( j ) for j in range( 30 )], ['W{}'.format( j ) for j in range( 25 )]
+    return [ (('1',str(j+1),''), randomGenerator.sample( words1, randomGenerator.randint( 0, 8 ) ),
+                                 randomGenerator.sample( words2, randomGenerator.randint( 0, 8 ) )) for j in range( numSegments ) ]
+# end of makeRandomSegments
+
+
+class WordAlignmentTests( unittest.TestCase ):
+    """ Unit tests for findWordAlignments (with and without NumPy). """
+
+    def findWithoutNumpy( self, segmentList, **kwargs ):
+        """ Run findWordAlignments with the plain Python co-occurrence counts. """
+        savedNumpy, CompareBibles.numpy = CompareBibles.numpy, None
+        try: return findWordAlignments( segmentList, **kwargs )
+        finally: CompareBibles.numpy = savedNumpy
+    # end of findWithoutNumpy
+
+    def test_010_findWordAlignments( self ):
+        """ Test the alignments found for a few segments. """
+        alignments1, alignments2 = self.findWithoutNumpy( TEST_SEGMENTS, minimumCount=1, minimumDice=0.0 )
+        self.assertEqual( list( alignments1 ), ['god','created','spoke','saw'] ) # Most frequent first (and no 'light')
+        self.assertEqual( [(word,dice,count) for word,dice,PMI,count in alignments1['god']], [('dios',1.0,3), ('creó',0.5,1), ('habló',0.5,1)] )
+        self.assertEqual( alignments1['created'][0][0], 'creó' )
+        self.assertAlmostEqual( alignments1['created'][0][2], 1.3862943611198906 ) # log(4)
+        self.assertEqual( list( alignments2 ), ['dios','creó','habló','vio'] )
+        self.assertEqual( alignments2['vio'][0][:2], ('saw',1.0) )
+
+        alignments1, alignments2 = self.findWithoutNumpy( TEST_SEGMENTS ) # Default minimum count of two segments
+        self.assertEqual( alignments1, {'god':[('dios',1.0,alignments1['god'][0][2],3)]} )
+        self.assertEqual( list( alignments2 ), ['dios'] )
+        alignments1, alignments2 = self.findWithoutNumpy( TEST_SEGMENTS, caselessFlag=False, minimumCount=1, maxCandidates=1 )
+        self.assertEqual( list( alignments1 ), ['God','created','spoke','god','saw'] )
+        self.assertTrue( all( len(candidates)==1 for candidates in alignments1.values() ) )
+    # end of test_010_findWordAlignments
+
+    def test_020_noAlignments( self ):
+        """ Test segments which don't give any alignments. """
+        for segmentList in ( [], [(('1','1',''), [], [])], NO_OVERLAP_SEGMENTS, ):
+            self.assertEqual( self.findWithoutNumpy( segmentList, minimumCount=1, minimumDice=0.0 ), ({},{}) )
+    # end of test_020_noAlignments
+
+    @unittest.skipIf( CompareBibles.numpy is None, "NumPy isn't installed" )
+    def test_030_sameCoOccurrences( self ):
+        """ Test that the NumPy and the plain Python co-occurrence counts are the same. """
+        for segmentList in ( [], TEST_SEGMENTS, NO_OVERLAP_SEGMENTS, makeRandomSegments( 300, 1 ), makeRandomSegments( 50, 2 ), ):
+            segmentArrays1, segmentArrays2 = makeTermSegmentArrays( segmentList )
+            for minimumCount, minimumDice in ( (1,0.0), (2,0.1), (3,0.3), ):
+                self.assertEqual( _findCoOccurrencesNumpy( segmentArrays1, segmentArrays2, minimumCount, minimumDice ),
+                                  _findCoOccurrences( segmentArrays1, segmentArrays2, minimumCount, minimumDice ) )
+    # end of test_030_sameCoOccurrences
+
+    @unittest.skipIf( CompareBibles.numpy is None, "NumPy isn't installed" )
+    def test_040_sameAlignments( self ):
+        """ Test that findWordAlignments gives the same alignments with and without NumPy. """
+        for segmentList in ( [], TEST_SEGMENTS, NO_OVERLAP_SEGMENTS, makeRandomSegments( 300, 3 ), ):
+            for kwargs in ( {}, {'minimumCount':1, 'minimumDice':0.0}, {'caselessFlag':False, 'maxCandidates':2}, ):
+                self.assertEqual( findWordAlignments( segmentList, **kwargs ), self.findWithoutNumpy( segmentList, **kwargs ) )
+        self.assertTrue( findWordAlignments( makeRandomSegments( 300, 3 ) )[0] ) # Make sure that we actually compared something
+    # end of test_040_sameAlignments
+# end of WordAlignmentTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of CompareBiblesTests.py
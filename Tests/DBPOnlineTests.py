@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# DBPOnlineTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing DBPOnline.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing DBPOnline.py
+    using a local HTTP server which pretends to be the Digital Bible Platform
+    (so no network access or personal key is needed).
+"""
+
+ProgName = "DBP online tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, json, threading, time, sqlite3
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+import DBPOnline
+from DBPOnline import DBPBible, DBPResponseCache, fetchOnlineString
+from VerseReferences import SimpleVerseKey
+
+
+TEST_DAM_ROOT = 'ENGTST'
+TEST_BOOK_LIST = [ { 'dam_id':TEST_DAM_ROOT+'O', 'book_id':'Gen', 'book_name':'Genesis', 'chapters':'1,2,3' } ]
+
+
+class StubDBPServer( ThreadingMixIn, HTTPServer ):
+    """ Local server which answers the few DBP requests that DBPBible makes. """
+    daemon_threads = True
+
+    def __init__( self ):
+        HTTPServer.__init__( self, ('127.0.0.1',0), StubDBPHandler )
+        self.lock = threading.Lock()
+        self.requestPaths, self.clientAddresses = [], set()
+        self.idleTimeout = self.delay = None
+
+    def handle_error( self, request, client_address ): pass # e.g., when the client has timed out and gone away
+
+    def getResponse( self, path, query ):
+        """ Returns the Python object to be sent back (as JSON). """
+        if path.endswith( '/api/apiversion' ): return { 'Version':'2.0.0' }
+        if path.endswith( '/library/book' ): return TEST_BOOK_LIST
+        if path.endswith( '/text/verse' ):
+            C = query['chapter_id'][0]
+            return [ { 'book_id':'Gen', 'book_name':'Genesis', 'chapter_id':C, 'chapter_title':'Chapter '+C,
+                        'paragraph_number':'1', 'verse_id':V, 'verse_text':'Verse {}:{} text. '.format( C, V ), 'verse_info':'' }
+                     for V in ('1','2') ]
+    # end of StubDBPServer.getResponse
+# end of StubDBPServer class
+
+
+class StubDBPHandler( BaseHTTPRequestHandler ):
+    protocol_version = 'HTTP/1.1' # So that connections are kept open
+
+    def setup( self ):
+        if self.server.idleTimeout is not None: self.timeout = self.server.idleTimeout
+        BaseHTTPRequestHandler.setup( self )
+
+    def do_GET( self ):
+        URLBits = urlsplit( self.path )
+        with self.server.lock:
+            self.server.requestPaths.append( URLBits.path )
+            self.server.clientAddresses.add( self.client_address )
+        if self.server.delay: time.sleep( self.server.delay )
+        responseBytes = json.dumps( self.server.getResponse( URLBits.path, parse_qs( URLBits.query ) ) ).encode( 'utf-8' )
+        self.send_response( 200 )
+        self.send_header( 'Content-Type', 'application/json; charset=utf-8' )
+        self.send_header( 'Content-Length', str(len(responseBytes)) )
+        self.end_headers()
+        self.wfile.write( responseBytes )
+
+    def log_message( self, format, *args ): pass # Keep quiet
+# end of StubDBPHandler class
+
+
+
+class DBPOnlineTests( unittest.TestCase ):
+    """ Unit tests for fetching from a local stub of the Digital Bible Platform. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+        keyFilepath = os.path.join( self.tempFolder, DBPOnline.KEY_FILENAME )
+        with open( keyFilepath, 'wt' ) as keyFile: keyFile.write( 'TestKey' )
+
+        self.server = StubDBPServer()
+        threading.Thread( target=self.server.serve_forever, daemon=True ).start()
+
+        self.savedSettings = DBPOnline.URL_BASE, DBPOnline.KEY_SEARCH_PATHS, DBPOnline.HTTP_TIMEOUT, DBPOnline.responseCache
+        DBPOnline.URL_BASE = 'http://{}:{}/'.format( *self.server.server_address )
+        DBPOnline.KEY_SEARCH_PATHS = ( keyFilepath, )
+        self.cacheFilepath = os.path.join( self.tempFolder, DBPOnline.RESPONSE_CACHE_FILENAME )
+        DBPOnline.responseCache = DBPResponseCache( self.cacheFilepath )
+        DBPOnline.connectionData.connections = {} # Don't reuse connections from earlier tests
+
+    def tearDown( self ):
+        for connection in DBPOnline.connectionData.connections.values(): connection.close()
+        DBPOnline.connectionData.connections = {}
+        DBPOnline.responseCache.connection.close()
+        DBPOnline.URL_BASE, DBPOnline.KEY_SEARCH_PATHS, DBPOnline.HTTP_TIMEOUT, DBPOnline.responseCache = self.savedSettings
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def countRequests( self, pathEnd ):
+        with self.server.lock: return sum( 1 for path in self.server.requestPaths if path.endswith( pathEnd ) )
+
+    def makeBible( self ):
+        testBible = DBPBible( TEST_DAM_ROOT )
+        testBible.prefetchNextChapterFlag = False # So that we can count the requests
+        self.addCleanup( testBible.close )
+        return testBible
+
+    def test_010_fetchChapter( self ):
+        """ Test fetching the verses of a chapter. """
+        testBible = self.makeBible()
+        self.assertEqual( testBible.onlineVersion, '2.0.0' )
+        self.assertEqual( list( testBible.books ), ['GEN'] )
+        verseDataList = testBible.getVerseDataList( SimpleVerseKey( 'GEN', '2', '1' ) )
+        self.assertEqual( [entry[0] for entry in verseDataList], ['p#','c#','v','v~'] )
+        self.assertEqual( verseDataList[-1][2], 'Verse 2:1 text.' )
+        self.assertEqual( testBible.getVerseDataList( SimpleVerseKey( 'GEN', '2', '2' ) )[-1][2], 'Verse 2:2 text.' )
+        self.assertEqual( self.countRequests( '/text/verse' ), 1 ) # The whole chapter was fetched at once
+    # end of test_010_fetchChapter
+
+    def test_020_connectionReuse( self ):
+        """ Test that the one connection is used for all of our requests. """
+        testBible = self.makeBible()
+        for C in ('1','2','3'): testBible.getChapterData( 'GEN', C )
+        self.assertEqual( len(self.server.requestPaths), 5 ) # apiversion, book list, and three chapters
+        self.assertEqual( len(self.server.clientAddresses), 1 )
+    # end of test_020_connectionReuse
+
+    def test_030_closedConnection( self ):
+        """ Test that a request is retried on a new connection if the server closed the saved one. """
+        self.server.idleTimeout = 0.2 # seconds before the server closes an idle connection
+        self.assertTrue( fetchOnlineString( 'api/apiversion' ) )
+        time.sleep( 0.5 )
+        self.assertTrue( fetchOnlineString( 'api/apiversion' ) )
+        self.assertEqual( self.countRequests( '/api/apiversion' ), 2 )
+        self.assertEqual( len(self.server.clientAddresses), 2 )
+    # end of test_030_closedConnection
+
+    def test_040_timeoutNotRetried( self ):
+        """ Test that a request which times out isn't sent again. """
+        DBPOnline.HTTP_TIMEOUT = 0.2 # seconds
+        self.server.delay = 0.5 # seconds
+        self.assertIsNone( fetchOnlineString( 'api/apiversion' ) )
+        self.server.delay = None
+        time.sleep( 0.5 )
+        self.assertEqual( self.countRequests( '/api/apiversion' ), 1 )
+    # end of test_040_timeoutNotRetried
+
+    def test_050_prefetch( self ):
+        """ Test prefetching a whole book in the background. """
+        testBible = self.makeBible()
+        self.assertEqual( testBible.prefetch( 'GEN' ), 3 )
+        self.assertEqual( self.countRequests( '/text/verse' ), 3 )
+        self.assertEqual( set( testBible.cache ), { ('GEN','1'), ('GEN','2'), ('GEN','3') } )
+        self.assertEqual( testBible.prefetch( 'GEN' ), 0 ) # Already have them all
+        self.assertEqual( testBible.getChapterData( 'GEN', '3' )['2'][-1][2], 'Verse 3:2 text.' )
+        self.assertEqual( self.countRequests( '/text/verse' ), 3 )
+    # end of test_050_prefetch
+
+    def test_060_diskCache( self ):
+        """ Test that a second Bible object gets its data from the on-disk cache. """
+        self.makeBible().getChapterData( 'GEN', '1' )
+        testBible = self.makeBible() # Has an empty memory cache
+        self.assertEqual( testBible.getChapterData( 'GEN', '1' )['1'][-1][2], 'Verse 1:1 text.' )
+        self.assertEqual( self.countRequests( '/library/book' ), 1 )
+        self.assertEqual( self.countRequests( '/text/verse' ), 1 )
+        self.assertEqual( self.countRequests( '/api/apiversion' ), 2 ) # This one is never cached
+    # end of test_060_diskCache
+
+    def test_070_expiredResponses( self ):
+        """ Test that expired responses aren't used and are deleted. """
+        cache = DBPOnline.responseCache
+        cache.put( 'Old1', 'Old response' )
+        cache.put( 'Old2', 'Old response' )
+        cache.put( 'New', 'New response' )
+        with cache.connection:
+            cache.connection.execute( "UPDATE responses SET fetchTime=? WHERE request LIKE 'Old%'", (time.time()-2*cache.timeToLive,) )
+        self.assertIsNone( cache.get( 'Old1' ) )
+        self.assertEqual( cache.get( 'New' ), 'New response' )
+        countRows = lambda: sqlite3.connect( self.cacheFilepath ).execute( 'SELECT COUNT(*) FROM responses' ).fetchone()[0]
+        self.assertEqual( countRows(), 2 ) # Old1 was deleted when it was asked for
+        reopenedCache = DBPResponseCache( self.cacheFilepath )
+        self.assertEqual( countRows(), 1 ) # Old2 was deleted when the cache was opened
+        self.assertEqual( reopenedCache.get( 'New' ), 'New response' )
+        reopenedCache.connection.close()
+    # end of test_070_expiredResponses
+# end of DBPOnlineTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of DBPOnlineTests.py
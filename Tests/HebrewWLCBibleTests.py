@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# HebrewWLCBibleTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing the Hebrew glossing dictionary handling in HebrewWLCBible.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing the Hebrew glossing dictionary handling in HebrewWLCBible.py
+    checking that the SQLite glossing database gives the same results as the pickled dictionary.
+"""
+
+ProgName = "Hebrew WLC Bible tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, pickle
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from HebrewWLCBible import HebrewWLCBibleAddon, HebrewGlossingStore
+
+
+TEST_GLOSSING_DICT = {
+    'בְּ=רֵאשִׁית': ('in=beginning', [('GEN','1','1','1'),('JER','26','1','2')], {('JER','26','1','2'):'at=start'}),
+    'בָּרָא': ('he_created', [('GEN','1','1','2')], {}),
+    'אֱלֹהִים': ('God', [('GEN','1','1','3'),('GEN','1','2','9')], {}),
+    }
+
+
+class HebrewGlossingStoreTests( unittest.TestCase ):
+    """ Unit tests for the pickled and the SQLite Hebrew glossing dictionaries. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+        self.pickleFilepath = os.path.join( self.tempFolder, 'TestGlosses.pickle' )
+        self.DBFilepath = os.path.join( self.tempFolder, 'TestGlosses.sqlite' )
+        with open( self.pickleFilepath, 'wb' ) as pickleFile: pickle.dump( TEST_GLOSSING_DICT, pickleFile )
+
+    def tearDown( self ):
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def loadAddon( self, convertFlag ):
+        """ Returns a HebrewWLCBibleAddon with the test glosses loaded (and converted to a database if requested). """
+        addon = HebrewWLCBibleAddon()
+        addon.loadGlossingDict( self.pickleFilepath )
+        if convertFlag:
+            addon.convertGlossingDictToDatabase( self.DBFilepath )
+            self.addCleanup( addon.glossingStore.close )
+        return addon
+    # end of loadAddon
+
+    def test_010_convert( self ):
+        """ Test the explicit conversion of the pickled dictionary to a database. """
+        addon = self.loadAddon( False )
+        self.assertIsNone( addon.glossingStore )
+        addon.haveGlossingDictChanges = True
+        addon.convertGlossingDictToDatabase( self.DBFilepath )
+        self.addCleanup( addon.glossingStore.close )
+        self.assertIsInstance( addon.glossingStore, HebrewGlossingStore )
+        self.assertEqual( addon.glossingDictFilepath, self.DBFilepath )
+        self.assertTrue( addon.haveGlossingDictChanges ) # Still not saved
+        self.assertEqual( addon.loadedGlossEntryCount, len(TEST_GLOSSING_DICT) )
+        self.assertEqual( addon.glossingDict.copy(), TEST_GLOSSING_DICT )
+        for word,entry in TEST_GLOSSING_DICT.items():
+            self.assertEqual( addon.glossingDict[word], entry )
+        with open( self.pickleFilepath, 'rb' ) as pickleFile: # Left as it was
+            self.assertEqual( pickle.load( pickleFile ), TEST_GLOSSING_DICT )
+
+        # Loading the database again (by its extension) gives the same entries
+        otherAddon = HebrewWLCBibleAddon()
+        otherAddon.loadGlossingDict( self.DBFilepath )
+        self.addCleanup( otherAddon.glossingStore.close )
+        self.assertEqual( otherAddon.glossingDict.copy(), TEST_GLOSSING_DICT )
+    # end of test_010_convert
+
+    def test_020_setGlosses( self ):
+        """ Test that making the same changes to the pickled dictionary and to the database gives the same results. """
+        pickleAddon, DBAddon = self.loadAddon( False ), self.loadAddon( True )
+        for addon in (pickleAddon, DBAddon):
+            self.assertFalse( addon.haveGlossingDictChanges )
+            addon.setNewGenericGloss( 'בָּרָא', 'he_created', ('GEN','2','3','9') ) # New reference
+            addon.setNewGenericGloss( 'אֱלֹהִים', 'god(s)', ('GEN','1','1','3') ) # Changed gloss
+            addon.setNewGenericGloss( 'הַ=שָּׁמַיִם', 'the=heavens', ('GEN','1','1','5') ) # New word
+            addon.setNewSpecificGloss( 'אֱלֹהִים', 'God', ('GEN','1','2','9') )
+            addon.setNewSpecificGloss( 'בְּ=רֵאשִׁית', 'at=first', ('JER','26','1','2') ) # Changed specific gloss
+            addon.addNewGenericGlossingReference( 'הַ=שָּׁמַיִם', ('GEN','2','1','3') )
+            self.assertTrue( addon.haveGlossingDictChanges )
+        expectedDict = {
+            'בְּ=רֵאשִׁית': ('in=beginning', [('GEN','1','1','1'),('JER','26','1','2')], {('JER','26','1','2'):'at=first'}),
+            'בָּרָא': ('he_created', [('GEN','1','1','2'),('GEN','2','3','9')], {}),
+            'אֱלֹהִים': ('god(s)', [('GEN','1','1','3'),('GEN','1','2','9')], {('GEN','1','2','9'):'God'}),
+            'הַ=שָּׁמַיִם': ('the=heavens', [('GEN','1','1','5'),('GEN','2','1','3')], {}),
+            }
+        self.assertEqual( pickleAddon.glossingDict, expectedDict )
+        self.assertEqual( DBAddon.glossingDict.copy(), expectedDict )
+        with self.assertRaises( KeyError ): # Not a reference of that word
+            DBAddon.setNewSpecificGloss( 'בָּרָא', 'made', ('GEN','9','9','9') )
+
+        # Check that they were both saved
+        pickleAddon.saveAnyChangedGlosses()
+        DBAddon.saveAnyChangedGlosses()
+        self.assertFalse( DBAddon.haveGlossingDictChanges )
+        with open( self.pickleFilepath, 'rb' ) as pickleFile:
+            self.assertEqual( pickle.load( pickleFile ), expectedDict )
+        otherStore = HebrewGlossingStore( self.DBFilepath )
+        self.assertEqual( dict( otherStore.items() ), expectedDict )
+        otherStore.close()
+    # end of test_020_setGlosses
+
+    def test_030_replaceAll( self ):
+        """ Test replacing all of the database entries. """
+        store = HebrewGlossingStore( self.DBFilepath )
+        self.addCleanup( store.close )
+        store.replaceAll( TEST_GLOSSING_DICT )
+        self.assertEqual( dict( store.items() ), TEST_GLOSSING_DICT )
+        newDict = { 'בָּרָא': ('created', [('GEN','1','1','2')], {('GEN','1','1','2'):'made'}) }
+        store.replaceAll( newDict )
+        self.assertEqual( len(store), 1 )
+        self.assertFalse( 'אֱלֹהִים' in store )
+        self.assertEqual( store.getEntry( 'בָּרָא' ), newDict['בָּרָא'] )
+        self.assertEqual( dict( store.items() ), newDict )
+    # end of test_030_replaceAll
+
+    def test_040_checkConsistency( self ):
+        """ Test the database consistency checks. """
+        store = HebrewGlossingStore( self.DBFilepath )
+        self.addCleanup( store.close )
+        store.replaceAll( TEST_GLOSSING_DICT )
+        self.assertEqual( store.checkConsistency(), [] )
+
+        badDict = TEST_GLOSSING_DICT.copy()
+        badDict['בְּ/רֵאשִׁית'] = ('in=beginning', [('GEN','1','1','1')], {}) # Original morpheme break char
+        badDict['בָּרָא'] = ('he created', [('GEN','1','1','2')], {}) # Space in generic gloss
+        badDict['אֱלֹהִים'] = ('God', [('GEN','1','1','3')], {('GEN','1','1','3'):'God'}) # Specific gloss same as generic one
+        badDict['שָּׁמַיִם'] = ('heavens', [], {}) # No references
+        store.replaceAll( badDict )
+        with store.connection: # Add an orphaned reference
+            store.connection.execute( "INSERT INTO refs (word,BBB,C,V,W) VALUES ('אֶרֶץ','GEN','1','1','7')" )
+        with self.assertLogs( level='ERROR' ) as logContext:
+            problems = store.checkConsistency()
+        self.assertEqual( sorted( problem[0] for problem in problems ), sorted( ['בְּ/רֵאשִׁית','בָּרָא','שָּׁמַיִם'] ) )
+        self.assertEqual( len(logContext.output), 2 )
+        self.assertTrue( 'Orphaned' in logContext.output[0] and 'GEN 1:1#7' in logContext.output[0] )
+        self.assertTrue( 'Invalid specific gloss' in logContext.output[1] )
+
+        # The addon removes the problem entries
+        addon = HebrewWLCBibleAddon()
+        addon.loadGlossingDatabase( self.DBFilepath )
+        self.addCleanup( addon.glossingStore.close )
+        with self.assertLogs( level='ERROR' ):
+            addon._checkLoadedDict()
+        self.assertTrue( addon.haveGlossingDictChanges )
+        self.assertEqual( sorted( addon.glossingDict ), sorted( ['בְּ=רֵאשִׁית','אֱלֹהִים'] ) )
+    # end of test_040_checkConsistency
+# end of HebrewGlossingStoreTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of HebrewWLCBibleTests.py
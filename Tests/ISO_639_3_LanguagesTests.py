@@ -28,7 +28,7 @@ Module testing ISO_639_3_Languages.py.
 """
 
 ProgName = "ISO-639-3 language code tests"
-ProgVersion = '0.85'
+ProgVersion = '0.86'
 ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
 
 
@@ -216,6 +216,21 @@ class ISO_639_3_LanguagesTests( unittest.TestCase ):
         for badName in ('Deutschen','Francais','SomeName',):
             self.assertEqual( self.isoLgs.getNameMatches(badName), [] )
     # end of test_2090_getScope
+
+    def test_2095_getNameMatchesRanked( self ):
+        """ Test the ranking and maxResults of the getNameMatches function. """
+        result = self.isoLgs.getNameMatches( 'english' )
+        self.assertEqual( result[0], 'English' ) # Exact match comes first
+        self.assertTrue( result[1].startswith( 'English' ) ) # Then prefix matches
+        self.assertFalse( result[-1].startswith( 'English' ) )
+        self.assertEqual( len(self.isoLgs.getNameMatches( 'eng', maxResults=5 )), 5 )
+        self.assertEqual( self.isoLgs.getNameMatches( 'German', 2 ), ['German','German Sign Language'] )
+        self.assertEqual( self.isoLgs.getNameMatches( 'Manobo, Matigsalug' ), ['Manobo, Matigsalug'] )
+        allNames = self.isoLgs.getNameMatches( '' ) # Matches everything
+        self.assertTrue( len(allNames) >= len(self.isoLgs) )
+        self.assertTrue( 'English' in allNames and 'Manobo, Matigsalug' in allNames )
+        self.assertEqual( self.isoLgs.getNameMatches( '', maxResults=3 ), allNames[:3] )
+    # end of test_2095_getNameMatchesRanked
 # end of ISO_639_3_LanguagesTests class
 
 
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# InternalBibleTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing getting the verse data for many references in InternalBible.py and InternalBibleBook.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing getting the verse data for many references in InternalBible.py and InternalBibleBook.py
+    i.e., that it gives the same results as getting them one at a time.
+"""
+
+ProgName = "Internal Bible tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import random
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from USFMBible import USFMBible
+from VerseReferences import SimpleVerseKey
+
+
+TEST_USFM_FOLDER = os.path.join( sourceFolder, 'Tests/DataFilesForTests/USFMTest2/' )
+TEST_BOOKS = ( 'MAT', 'GEN', 'JN3', 'REV', )
+
+
+def getEntries( verseData ):
+    """ InternalBibleEntryLists don't compare equal, so compare the InternalBibleEntries instead. """
+    return None if verseData is None else verseData.data
+# end of getEntries
+
+
+class VerseDataForReferencesTests( unittest.TestCase ):
+    """ Unit tests for getting the verse data for lots of references at once. """
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.testBible = USFMBible( TEST_USFM_FOLDER )
+        cls.testBible.preload()
+        # Some references from each test book, in a random order
+        cls.references = []
+        for BBB in TEST_BOOKS:
+            cls.testBible.loadBookIfNecessary( BBB )
+            cls.references.extend( (BBB,C,V) for C,V in list( cls.testBible.books[BBB]._CVIndex )[::7] )
+        random.Random( 1 ).shuffle( cls.references )
+        cls.references += [('MAT','1','1'), SimpleVerseKey('REV','22','21')]
+
+    def getSingleVerseData( self, reference, contextFlag=False ):
+        """ Returns the verse data (or None) for the reference using getVerseDataList or getContextVerseData. """
+        try: return self.testBible.getContextVerseData( reference ) if contextFlag else self.testBible.getVerseDataList( reference )
+        except KeyError: return None
+    # end of getSingleVerseData
+
+    def test_010_getVerseDataForReferences( self ):
+        """ Test that the results are the same as calling getVerseDataList for each reference. """
+        self.assertTrue( len(self.references) > 100 )
+        results = self.testBible.getVerseDataForReferences( self.references )
+        self.assertEqual( len(results), len(self.references) )
+        self.assertTrue( all( results ) )
+        for reference,verseData in zip( self.references, results ):
+            self.assertEqual( getEntries( verseData ), getEntries( self.getSingleVerseData( reference ) ) )
+        self.assertEqual( self.testBible.getVerseDataForReferences( [] ), [] )
+    # end of test_010_getVerseDataForReferences
+
+    def test_020_withContext( self ):
+        """ Test that the results with the context are the same as calling getContextVerseData for each reference. """
+        results = self.testBible.getVerseDataForReferences( self.references, contextFlag=True )
+        for reference,(verseData,context) in zip( self.references, results ):
+            singleVerseData, singleContext = self.getSingleVerseData( reference, contextFlag=True )
+            self.assertEqual( getEntries( verseData ), getEntries( singleVerseData ) )
+            self.assertEqual( context, singleContext )
+    # end of test_020_withContext
+
+    def test_030_missingReferences( self ):
+        """ Test that None is returned for references which aren't found. """
+        references = [('MAT','99','1'), ('GEN','1','3'), ('JN3','1','99'), ('XXA','1','1'), ('GEN','1','3')]
+        with self.assertLogs( level='CRITICAL' ): # Can't find the XXA book
+            results = self.testBible.getVerseDataForReferences( references )
+            self.assertEqual( [getEntries( verseData ) for verseData in results],
+                              [getEntries( self.getSingleVerseData( reference ) ) for reference in references] )
+        self.assertEqual( [verseData is None for verseData in results], [True,False,True,True,False] )
+    # end of test_030_missingReferences
+
+    def test_040_getVerseDataForCVs( self ):
+        """ Test getting the verse data for lots of C:V references in one book. """
+        bookObject = self.testBible.books['GEN']
+        CVList = [(C,V) for C,V in bookObject._CVIndex][::-3] + [('1','99'), ('1','1')]
+        results = bookObject.getVerseDataForCVs( CVList )
+        for (C,V),verseData in zip( CVList, results ):
+            try: singleVerseData = bookObject.getContextVerseData( ('GEN',C,V) )[0]
+            except KeyError: singleVerseData = None
+            self.assertEqual( getEntries( verseData ), getEntries( singleVerseData ) )
+        self.assertIsNone( results[-2] )
+        self.assertEqual( [context for verseData,context in bookObject.getVerseDataForCVs( CVList[:5], contextFlag=True )],
+                          [bookObject.getContextVerseData( ('GEN',C,V) )[1] for C,V in CVList[:5]] )
+    # end of test_040_getVerseDataForCVs
+# end of VerseDataForReferencesTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of InternalBibleTests.py
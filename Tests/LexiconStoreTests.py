@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# LexiconStoreTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing LexiconStore.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing LexiconStore.py
+    using small made-up lexicon sections (so the real lexicon XML files aren't needed).
+"""
+
+ProgName = "Lexicon store tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, time
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from LexiconStore import LexiconStore, LexiconStoreSection, getLexiconStore
+
+
+TEST_STORE_FILENAME = 'TestLexicon.sqlite'
+TEST_SOURCE_FILENAME = 'TestLexicon.xml'
+TEST_SECTIONS = {
+    'Entries': { 'H1':{'word':'אָב','gloss':'father'}, 'H2':{'word':'אַב','gloss':'father'}, 'H3':('List','of',['things']) },
+    'Index': { 'a.ab.aa':'H1', 'a.ab.ab':'H2' },
+    }
+
+
+class LexiconStoreTests( unittest.TestCase ):
+    """ Unit tests for making and reading a lexicon store. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+        self.addCleanup( shutil.rmtree, self.tempFolder, ignore_errors=True )
+        self.sourceFolder = os.path.join( self.tempFolder, 'Source/' )
+        os.makedirs( self.sourceFolder )
+        self.sourceFilepath = os.path.join( self.sourceFolder, TEST_SOURCE_FILENAME )
+        with open( self.sourceFilepath, 'wt' ) as sourceFile: sourceFile.write( '<lexicon/>' )
+        os.utime( self.sourceFilepath, (time.time()-100,)*2 )
+
+        self.savedCacheFolder = BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER = os.path.join( self.tempFolder, 'Cache/' ) # Doesn't exist yet
+        self.storeFilepath = os.path.join( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, TEST_STORE_FILENAME )
+        self.madeFolders = []
+
+    def tearDown( self ):
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER = self.savedCacheFolder
+
+    def makeSections( self, sourceFolder ):
+        """ Used instead of parsing the lexicon XML files. """
+        self.madeFolders.append( sourceFolder )
+        return TEST_SECTIONS
+    # end of makeSections
+
+    def getStore( self, sourceFolder=None ):
+        """ Returns the open store (which is closed again after the test). """
+        lexiconStore = getLexiconStore( TEST_STORE_FILENAME, sourceFolder or self.sourceFolder, [TEST_SOURCE_FILENAME], self.makeSections )
+        self.assertIsInstance( lexiconStore, LexiconStore )
+        self.addCleanup( lexiconStore.close )
+        return lexiconStore
+    # end of getStore
+
+    def test_010_sections( self ):
+        """ Test that the sections can be used like the original dictionaries. """
+        lexiconStore = self.getStore()
+        self.assertEqual( self.madeFolders, [self.sourceFolder] )
+        self.assertTrue( os.path.isfile( self.storeFilepath ) )
+        self.assertEqual( sorted( lexiconStore.getSectionNames() ), ['Entries','Index'] )
+        entries = lexiconStore.getSection( 'Entries' )
+        self.assertIsInstance( entries, LexiconStoreSection )
+        self.assertIs( lexiconStore.getSection( 'Entries' ), entries )
+        self.assertEqual( len(entries), 3 )
+        self.assertEqual( entries['H1'], {'word':'אָב','gloss':'father'} )
+        self.assertEqual( entries['H3'], ('List','of',['things']) )
+        self.assertTrue( 'H2' in entries )
+        self.assertFalse( 'H4' in entries )
+        with self.assertRaises( KeyError ): entries['H4']
+        self.assertIsNone( entries.get( 'H4' ) )
+        self.assertEqual( sorted( entries ), ['H1','H2','H3'] )
+        self.assertEqual( dict( entries ), TEST_SECTIONS['Entries'] )
+        self.assertEqual( dict( lexiconStore.getSection( 'Index' ).items() ), TEST_SECTIONS['Index'] )
+        self.assertEqual( len(lexiconStore.getSection( 'Missing' )), 0 )
+    # end of test_010_sections
+
+    def test_020_reuse( self ):
+        """ Test that the store is only made again if it's out-of-date. """
+        self.getStore()
+        self.assertEqual( dict( self.getStore().getSection( 'Index' ) ), TEST_SECTIONS['Index'] )
+        self.assertEqual( len(self.madeFolders), 1 ) # Not made again
+
+        os.utime( self.storeFilepath, (time.time()-50,)*2 )
+        os.utime( self.sourceFilepath, (time.time()-10,)*2 ) # Source file is newer than the store
+        self.getStore()
+        self.assertEqual( len(self.madeFolders), 2 )
+        self.getStore()
+        self.assertEqual( len(self.madeFolders), 2 )
+
+        otherSourceFolder = os.path.join( self.tempFolder, 'OtherSource/' )
+        self.getStore( otherSourceFolder ) # Store was made from a different folder
+        self.assertEqual( self.madeFolders[-1], otherSourceFolder )
+        self.assertEqual( len(self.madeFolders), 3 )
+    # end of test_020_reuse
+
+    def test_030_badStore( self ):
+        """ Test that a damaged store is made again. """
+        os.makedirs( BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER )
+        with open( self.storeFilepath, 'wt' ) as storeFile: storeFile.write( 'This is not a database' )
+        with self.assertLogs( level='WARNING' ):
+            lexiconStore = self.getStore()
+        self.assertEqual( len(self.madeFolders), 1 )
+        self.assertEqual( lexiconStore.getSection( 'Entries' )['H2']['word'], 'אַב' )
+        self.assertFalse( os.path.exists( self.storeFilepath+'.tmp' ) )
+    # end of test_030_badStore
+# end of LexiconStoreTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of LexiconStoreTests.py
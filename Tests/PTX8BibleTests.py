@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# PTX8BibleTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing the metadata loading in PTX8Bible.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing the metadata loading in PTX8Bible.py
+    (with the different preload metadataLoading options)
+    using a small made-up Paratext 8 project.
+"""
+
+ProgName = "PTX8 Bible tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, threading, pickle
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from PTX8Bible import PTX8Bible, PTX8MetadataDict, PTX8_METADATA_LOADERS, PTX8_BOOKS_METADATA_KEYS
+
+
+TEST_PROJECT_FILES = {
+    'Settings.xml': '<ScriptureText><Name>TST</Name><FullName>Test project</FullName><Encoding>65001</Encoding>'
+                        '<Naming PrePart="" PostPart="TST.SFM" BookNameForm="41MAT" /></ScriptureText>\n',
+    'AutoCorrect.txt': '# Some autocorrects\n<<-->“\n>>-->”\n',
+    'unique.id': '0123abcd-0123-4567-89ab-0123456789ab',
+    '41MATTST.SFM': '\\id MAT Test project\n\\c 1\n\\p\n\\v 1 The book of the genealogy.\n\\v 2 Abraham was the father of Isaac.\n',
+    }
+TEST_AUTOCORRECTS = { '<<':'“', '>>':'”' }
+
+
+class PTX8MetadataLoadingTests( unittest.TestCase ):
+    """ Unit tests for loading the PTX8 metadata now, lazily, or in the background. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+        self.addCleanup( shutil.rmtree, self.tempFolder, ignore_errors=True )
+        for filename,contents in TEST_PROJECT_FILES.items():
+            with open( os.path.join( self.tempFolder, filename ), 'wt', encoding='utf-8' ) as projectFile:
+                projectFile.write( contents )
+
+    def preload( self, metadataLoading ):
+        """ Returns the preloaded PTX8Bible and its PTX8 metadata dictionary. """
+        testBible = PTX8Bible( self.tempFolder )
+        testBible.preload( metadataLoading )
+        metadata = testBible.suppliedMetadata['PTX8']
+        self.assertIsInstance( metadata, PTX8MetadataDict )
+        return testBible, metadata
+    # end of preload
+
+    def test_010_all( self ):
+        """ Test loading all of the metadata in preload. """
+        testBible, metadata = self.preload( 'all' )
+        self.assertEqual( metadata.triedLoaderNames, set( PTX8_METADATA_LOADERS.values() ) )
+        self.assertEqual( sorted( metadata ), ['Autocorrects','Settings','UniqueId'] )
+        self.assertEqual( metadata['Settings']['FullName'], 'Test project' )
+    # end of test_010_all
+
+    def test_020_lazy( self ):
+        """ Test loading each metadata section when it's first used. """
+        testBible, metadata = self.preload( 'lazy' )
+        self.assertEqual( list( metadata ), ['Settings'] )
+        self.assertEqual( metadata.triedLoaderNames, set() )
+        self.assertEqual( metadata['Autocorrects'], TEST_AUTOCORRECTS )
+        self.assertEqual( metadata.triedLoaderNames, {'loadPTX8Autocorrects'} )
+        self.assertTrue( 'UniqueId' in metadata )
+        self.assertEqual( metadata.get( 'UniqueId' ), TEST_PROJECT_FILES['unique.id'] )
+        self.assertFalse( 'Lexicon' in metadata ) # No file for it
+        self.assertIsNone( metadata.get( 'Lexicon' ) )
+        with self.assertRaises( KeyError ): metadata['Lexicon']
+        self.assertEqual( metadata.triedLoaderNames, {'loadPTX8Autocorrects','loadUniqueId','loadPTX8Lexicon'} )
+        with self.assertRaises( KeyError ): metadata['NotASection']
+        self.assertEqual( sorted( metadata ), ['Autocorrects','Settings','UniqueId'] )
+        self.assertEqual( testBible.filepathsNotYetLoaded, [os.path.join( self.tempFolder, '41MATTST.SFM' )] )
+    # end of test_020_lazy
+
+    def test_030_books( self ):
+        """ Test loading just the books-relevant metadata in preload. """
+        testBible, metadata = self.preload( 'books' )
+        self.assertEqual( metadata.triedLoaderNames, set( PTX8_METADATA_LOADERS[key] for key in PTX8_BOOKS_METADATA_KEYS ) )
+        self.assertEqual( sorted( metadata ), ['Settings','UniqueId'] )
+        self.assertEqual( metadata['Autocorrects'], TEST_AUTOCORRECTS ) # Still loaded when it's asked for
+    # end of test_030_books
+
+    def test_040_background( self ):
+        """ Test loading the rest of the metadata in a background thread while the books are loading. """
+        testBible, metadata = self.preload( 'background' )
+        testBible.loadBooks()
+        self.assertEqual( list( testBible.books ), ['MAT'] )
+        for thread in threading.enumerate():
+            if thread.name == 'PTX8MetadataLoader': thread.join( 10 )
+        self.assertEqual( metadata.triedLoaderNames, set( PTX8_METADATA_LOADERS.values() ) )
+        self.assertEqual( dict.get( metadata, 'Autocorrects' ), TEST_AUTOCORRECTS ) # Loaded without asking for it
+        self.assertEqual( sorted( metadata ), ['Autocorrects','Settings','UniqueId'] )
+        self.assertEqual( testBible.filepathsNotYetLoaded, [] )
+    # end of test_040_background
+
+    def test_050_pickle( self ):
+        """ Test that pickling the metadata (e.g., for multiprocessing) only includes what's loaded. """
+        testBible, metadata = self.preload( 'lazy' )
+        metadata['UniqueId']
+        unpickledMetadata = pickle.loads( pickle.dumps( metadata ) )
+        self.assertIsInstance( unpickledMetadata, PTX8MetadataDict )
+        self.assertEqual( sorted( unpickledMetadata ), ['Settings','UniqueId'] )
+        self.assertEqual( unpickledMetadata.triedLoaderNames, {'loadUniqueId'} )
+        self.assertEqual( unpickledMetadata['UniqueId'], TEST_PROJECT_FILES['unique.id'] )
+    # end of test_050_pickle
+# end of PTX8MetadataLoadingTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of PTX8BibleTests.py
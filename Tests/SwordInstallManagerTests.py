@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# SwordInstallManagerTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing SwordInstallManager.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing SwordInstallManager.py
+    using a local 'Folder' repository (so no network access is needed).
+"""
+
+ProgName = "Sword install manager tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, hashlib
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from SwordInstallManager import SwordRepositoryFetcher, SwordInstallManager, makeLocalRepository, PARTIAL_DOWNLOAD_EXTENSION
+
+
+TEST_MODULE_NAME = 'TestMod'
+TEST_MODULE_RELATIVE_PATH = 'modules/texts/ztext/testmod/'
+TEST_CONF_TEXT = """[{}]
+DataPath=./{}
+ModDrv=zText
+Description=Test module for SwordInstallManagerTests
+""".format( TEST_MODULE_NAME, TEST_MODULE_RELATIVE_PATH )
+TEST_MODULE_FILES = { # Filenames with contents (long enough to need several download blocks)
+    'nt.bzz': bytes( range(256) ) * 1000,
+    'nt.bzs': b'Some index data' * 100,
+    'nt.bzv': b'Some more index data' * 100,
+    }
+
+
+class SwordInstallManagerTests( unittest.TestCase ):
+    """ Unit tests for downloading from a local Sword repository. """
+
+    def setUp( self ):
+        # Make a folder laid out like an installed Sword folder
+        self.tempFolder = tempfile.mkdtemp()
+        swordFolder = os.path.join( self.tempFolder, 'Sword/' )
+        os.makedirs( os.path.join( swordFolder, 'mods.d/' ) )
+        with open( os.path.join( swordFolder, 'mods.d/', TEST_MODULE_NAME.lower()+'.conf' ), 'wt' ) as confFile:
+            confFile.write( TEST_CONF_TEXT )
+        moduleFolder = os.path.join( swordFolder, TEST_MODULE_RELATIVE_PATH )
+        os.makedirs( moduleFolder )
+        for filename,contents in TEST_MODULE_FILES.items():
+            with open( os.path.join( moduleFolder, filename ), 'wb' ) as moduleFile:
+                moduleFile.write( contents )
+
+        # Make the local repository from it
+        self.repoFolder = os.path.join( self.tempFolder, 'Repository/' )
+        self.assertEqual( makeLocalRepository( swordFolder, self.repoFolder ), 1 )
+        self.fetcher = SwordRepositoryFetcher( 'Folder', '', self.repoFolder )
+        self.saveFolder = os.path.join( self.tempFolder, 'Save/' )
+        os.makedirs( self.saveFolder )
+
+    def tearDown( self ):
+        self.fetcher.close()
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def test_010_makeLocalRepository( self ):
+        """ Test that the repository has the conf files and the module files. """
+        self.assertTrue( os.path.isfile( os.path.join( self.repoFolder, 'mods.d.tar.gz' ) ) )
+        self.assertTrue( os.path.isfile( os.path.join( self.repoFolder, 'mods.d/', TEST_MODULE_NAME.lower()+'.conf' ) ) )
+        self.assertEqual( sorted( entry[0] for entry in self.fetcher.listFolder( TEST_MODULE_RELATIVE_PATH ) ),
+                          sorted( TEST_MODULE_FILES ) )
+    # end of test_010_makeLocalRepository
+
+    def test_020_fetchUnchangedFile( self ):
+        """ Test that a file isn't downloaded again unless it's changed. """
+        relativeFilepath, saveFilepath = TEST_MODULE_RELATIVE_PATH+'nt.bzs', os.path.join( self.saveFolder, 'nt.bzs' )
+        self.assertTrue( self.fetcher.fetchFile( relativeFilepath, saveFilepath ) )
+        with open( saveFilepath, 'rb' ) as savedFile: self.assertEqual( savedFile.read(), TEST_MODULE_FILES['nt.bzs'] )
+        self.assertFalse( self.fetcher.fetchFile( relativeFilepath, saveFilepath ) )
+        os.utime( saveFilepath, (0,0) ) # Our copy now has a different timestamp
+        self.assertTrue( self.fetcher.fetchFile( relativeFilepath, saveFilepath ) )
+    # end of test_020_fetchUnchangedFile
+
+    def test_030_resumeDownload( self ):
+        """ Test that an interrupted download is resumed (rather than restarted). """
+        relativeFilepath, saveFilepath = TEST_MODULE_RELATIVE_PATH+'nt.bzz', os.path.join( self.saveFolder, 'nt.bzz' )
+        contents = TEST_MODULE_FILES['nt.bzz']
+        partLength = len(contents) // 3
+        with open( saveFilepath+PARTIAL_DOWNLOAD_EXTENSION, 'wb' ) as partFile:
+            partFile.write( b'X' * partLength ) # So we can tell that it wasn't downloaded again
+        self.assertTrue( self.fetcher.fetchFile( relativeFilepath, saveFilepath ) )
+        self.assertFalse( os.path.exists( saveFilepath+PARTIAL_DOWNLOAD_EXTENSION ) )
+        with open( saveFilepath, 'rb' ) as savedFile:
+            self.assertEqual( savedFile.read(), b'X' * partLength + contents[partLength:] )
+    # end of test_030_resumeDownload
+
+    def test_040_checkSize( self ):
+        """ Test that a download with the wrong size is rejected (and removed). """
+        relativeFilepath, saveFilepath = TEST_MODULE_RELATIVE_PATH+'nt.bzv', os.path.join( self.saveFolder, 'nt.bzv' )
+        remoteSize, remoteTime = self.fetcher.getFileInfo( relativeFilepath )
+        self.assertEqual( remoteSize, len( TEST_MODULE_FILES['nt.bzv'] ) )
+        with self.assertRaises( IOError ):
+            self.fetcher.fetchFile( relativeFilepath, saveFilepath, remoteSize+1, remoteTime )
+        self.assertFalse( os.path.exists( saveFilepath ) )
+        self.assertFalse( os.path.exists( saveFilepath+PARTIAL_DOWNLOAD_EXTENSION ) )
+    # end of test_040_checkSize
+
+    def test_050_checkSHA256( self ):
+        """ Test the SHA-256 checks (including of a bad resumed download). """
+        relativeFilepath, saveFilepath = TEST_MODULE_RELATIVE_PATH+'nt.bzz', os.path.join( self.saveFolder, 'nt.bzz' )
+        contents = TEST_MODULE_FILES['nt.bzz']
+        goodSHA256 = hashlib.sha256( contents ).hexdigest()
+        with open( saveFilepath+PARTIAL_DOWNLOAD_EXTENSION, 'wb' ) as partFile:
+            partFile.write( b'X' * 1000 ) # Corrupted partial download
+        with self.assertRaises( IOError ):
+            self.fetcher.fetchFile( relativeFilepath, saveFilepath, expectedSHA256=goodSHA256 )
+        self.assertFalse( os.path.exists( saveFilepath ) )
+        self.assertFalse( os.path.exists( saveFilepath+PARTIAL_DOWNLOAD_EXTENSION ) )
+        self.assertTrue( self.fetcher.fetchFile( relativeFilepath, saveFilepath, expectedSHA256=goodSHA256 ) )
+        self.assertFalse( self.fetcher.fetchFile( relativeFilepath, saveFilepath, expectedSHA256=goodSHA256 ) )
+        with open( saveFilepath, 'r+b' ) as savedFile: savedFile.write( b'X' ) # Same size and timestamp but changed
+        os.utime( saveFilepath, (self.fetcher.getFileInfo( relativeFilepath )[1],)*2 )
+        self.assertTrue( self.fetcher.fetchFile( relativeFilepath, saveFilepath, expectedSHA256=goodSHA256 ) )
+        with open( saveFilepath, 'rb' ) as savedFile: self.assertEqual( savedFile.read(), contents )
+    # end of test_050_checkSHA256
+
+    def test_060_installModule( self ):
+        """ Test installing a module (twice) from the local repository. """
+        im = SwordInstallManager()
+        im.clearSources()
+        im.addSource( 'Local', 'Folder', '', self.repoFolder )
+        im.setUserDisclaimerConfirmed()
+        im.currentRepoName = 'Local'
+        im.currentTempFolder = os.path.join( self.tempFolder, 'Temp/' )
+        im.currentInstallFolder = os.path.join( self.tempFolder, 'Install/' )
+        self.assertTrue( im.refreshRemoteSource() )
+        self.assertEqual( list( im.availableModules ), [TEST_MODULE_NAME] )
+        self.assertTrue( im.installModule( TEST_MODULE_NAME ) )
+        installedFolder = os.path.join( im.currentInstallFolder, TEST_MODULE_RELATIVE_PATH )
+        for filename,contents in TEST_MODULE_FILES.items():
+            with open( os.path.join( installedFolder, filename ), 'rb' ) as installedFile:
+                self.assertEqual( installedFile.read(), contents )
+        self.assertTrue( os.path.isfile( os.path.join( im.currentInstallFolder, 'mods.d/', TEST_MODULE_NAME.lower()+'.conf' ) ) )
+        # Nothing should be downloaded the second time (a downloaded file would replace the existing one)
+        fileInodes = { filename:os.stat( os.path.join( installedFolder, filename ) ).st_ino for filename in TEST_MODULE_FILES }
+        self.assertTrue( im.installModule( TEST_MODULE_NAME ) )
+        self.assertEqual( { filename:os.stat( os.path.join( installedFolder, filename ) ).st_ino for filename in TEST_MODULE_FILES }, fileInodes )
+        self.assertFalse( any( filename.endswith( PARTIAL_DOWNLOAD_EXTENSION ) for filename in os.listdir( installedFolder ) ) )
+    # end of test_060_installModule
+# end of SwordInstallManagerTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of SwordInstallManagerTests.py
@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# SwordModulesTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing the registry caches in SwordModules.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing the registry caches in SwordModules.py
+    (of the parsed .conf files and of the module indexes)
+    using a Sword module exported from the USFM test data.
+"""
+
+ProgName = "Sword modules tests"
+ProgVersion = '0.02'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil, struct, zlib, random, contextlib
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+import SwordModules
+from SwordModules import SwordModuleConfiguration, SwordModule, loadRegistryCache, saveRegistryCache
+from USFMBible import USFMBible
+
+
+TEST_USFM_FOLDER = os.path.join( sourceFolder, 'Tests/DataFilesForTests/USFMTest1/' )
+TEST_MODULE_NAME = 'unknown' # The name given by BibleWriter.toSwordModule
+OTHER_MODULE_NAME = 'other' # A copy of the conf file with a different name
+INDEX_CACHE_FILENAME = SwordModules.SWORD_INDEX_CACHE_FILENAME_TEMPLATE.format( TEST_MODULE_NAME )
+TEST_NUM_VERSES = { 'ot':120, 'nt':90 } # Only the first part of each testament
+
+
+def makeVerseText( testament, j ):
+    """ Returns the made-up text for the jth verse index entry (some are blank). """
+    return '' if j%7==3 else "{} verse {}.".format( testament.upper(), j )
+# end of makeVerseText
+
+
+def writeTestModule( swordFolder, moduleName, compressedFlag ):
+    """
+    Write a small RawText or zText (with chapter-sized blocks) Bible module with known verse texts.
+
+    (BibleWriter.toSwordModule can't be used for this because it writes zero verse lengths.)
+    """
+    dataPath = './modules/texts/{}/{}/'.format( 'ztext' if compressedFlag else 'rawtext', moduleName )
+    dataFolder = os.path.join( swordFolder, dataPath )
+    os.makedirs( dataFolder )
+    os.makedirs( os.path.join( swordFolder, 'mods.d/' ), exist_ok=True )
+    with open( os.path.join( swordFolder, 'mods.d/', moduleName+'.conf' ), 'wt', encoding='utf-8' ) as confFile:
+        confFile.write( '[{}]\nDataPath={}\nModDrv={}\nEncoding=UTF-8\nSourceType=OSIS\n' \
+                            .format( moduleName, dataPath, 'zText' if compressedFlag else 'RawText' ) )
+        if compressedFlag: confFile.write( 'CompressType=ZIP\nBlockType=CHAPTER\n' )
+
+    for testament,numVerses in TEST_NUM_VERSES.items():
+        verseTexts = [makeVerseText( testament, j ) for j in range( numVerses )]
+        if compressedFlag:
+            blocks, verseIndex = [], []
+            for j,verseText in enumerate( verseTexts ):
+                if j%10 == 0: blocks.append( '' )
+                verseIndex.append( (len(blocks)-1, len(blocks[-1]), len(verseText)) )
+                blocks[-1] += verseText
+            with open( os.path.join( dataFolder, testament+'.czz' ), 'wb' ) as textFile, \
+                 open( os.path.join( dataFolder, testament+'.czs' ), 'wb' ) as blockIndexFile:
+                for block in blocks:
+                    compressedBlock = zlib.compress( block.encode( 'utf-8' ) )
+                    blockIndexFile.write( struct.pack( 'III', textFile.tell(), len(compressedBlock), len(block.encode( 'utf-8' )) ) )
+                    textFile.write( compressedBlock )
+            with open( os.path.join( dataFolder, testament+'.czv' ), 'wb' ) as verseIndexFile:
+                for indexEntry in verseIndex: verseIndexFile.write( struct.pack( 'iih', *indexEntry ) )
+        else:
+            with open( os.path.join( dataFolder, testament ), 'wt', encoding='utf-8' ) as textFile, \
+                 open( os.path.join( dataFolder, testament+'.vss' ), 'wb' ) as verseIndexFile:
+                for verseText in verseTexts:
+                    verseIndexFile.write( struct.pack( 'Ih', textFile.tell(), len(verseText) ) )
+                    textFile.write( verseText )
+# end of writeTestModule
+
+
+class SwordRegistryCacheTests( unittest.TestCase ):
+    """ Unit tests for reusing the parsed .conf files and module indexes. """
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.tempFolder = tempfile.mkdtemp()
+        cls.swordFolder = os.path.join( cls.tempFolder, 'Sword/' )
+        testBible = USFMBible( TEST_USFM_FOLDER )
+        testBible.load()
+        testBible.toSwordModule( cls.swordFolder )
+        cls.confFolder = os.path.join( cls.swordFolder, 'mods.d/' )
+        with open( os.path.join( cls.confFolder, TEST_MODULE_NAME+'.conf' ), 'rt', encoding='utf-8' ) as confFile:
+            confText = confFile.read()
+        with open( os.path.join( cls.confFolder, OTHER_MODULE_NAME+'.conf' ), 'wt', encoding='utf-8' ) as confFile:
+            confFile.write( confText.replace( '['+TEST_MODULE_NAME+']', '['+OTHER_MODULE_NAME+']', 1 ) )
+
+    @classmethod
+    def tearDownClass( cls ):
+        shutil.rmtree( cls.tempFolder, ignore_errors=True )
+
+    def setUp( self ):
+        self.cacheFolder = tempfile.mkdtemp()
+        self.addCleanup( shutil.rmtree, self.cacheFolder, ignore_errors=True )
+        self.savedSettings = BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, SwordModules.SwordSearchFolders, \
+                            SwordModules.SWORD_REGISTRY_FORMAT_VERSION, SwordModuleConfiguration.loadConf
+        self.addCleanup( self.restoreSettings )
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER = self.cacheFolder
+        SwordModules.SwordSearchFolders = [ self.swordFolder ]
+
+        # Count the .conf files which are actually parsed
+        self.parsedConfs = []
+        originalLoadConf = SwordModuleConfiguration.loadConf
+        def countingLoadConf( swMC ):
+            self.parsedConfs.append( swMC.abbreviation )
+            return originalLoadConf( swMC )
+        SwordModuleConfiguration.loadConf = countingLoadConf
+
+    def restoreSettings( self ):
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER, SwordModules.SwordSearchFolders, \
+                            SwordModules.SWORD_REGISTRY_FORMAT_VERSION, SwordModuleConfiguration.loadConf = self.savedSettings
+
+    def loadConfs( self ):
+        """ Returns the sorted list of the .conf files parsed while finding the modules. """
+        self.parsedConfs = []
+        swordModules = SwordModules.SwordModules()
+        self.assertEqual( sorted( swordModules.confs ), [OTHER_MODULE_NAME,TEST_MODULE_NAME] )
+        return sorted( self.parsedConfs )
+    # end of loadConfs
+
+    def loadIndex( self ):
+        """ Returns the index of the test module (which isn't loaded into memory). """
+        swMC = SwordModuleConfiguration( TEST_MODULE_NAME, self.swordFolder )
+        swMC.loadConf()
+        swM = SwordModule( swMC )
+        swM.loadBooks( inMemoryFlag=False )
+        return swM.swordIndex
+    # end of loadIndex
+
+    def addIndexCacheMarker( self ):
+        """ Add an extra entry to the saved index so that we can tell if the cache was used. """
+        indexCache = loadRegistryCache( INDEX_CACHE_FILENAME )
+        self.assertTrue( indexCache )
+        indexCache['swordIndex']['Marker'] = 'From the cache'
+        saveRegistryCache( INDEX_CACHE_FILENAME, indexCache )
+    # end of addIndexCacheMarker
+
+    def test_010_confsCache( self ):
+        """ Test that .conf files are only parsed again if they (or the cache format) have changed. """
+        self.assertEqual( self.loadConfs(), [OTHER_MODULE_NAME,TEST_MODULE_NAME] )
+        self.assertTrue( os.path.isfile( os.path.join( self.cacheFolder, SwordModules.SWORD_CONFS_CACHE_FILENAME ) ) )
+        self.assertEqual( self.loadConfs(), [] ) # Unchanged signatures
+
+        otherConfFilepath = os.path.join( self.confFolder, OTHER_MODULE_NAME+'.conf' )
+        with open( otherConfFilepath, 'at', encoding='utf-8' ) as confFile: confFile.write( 'Feature=NoParagraphs\n' )
+        self.assertEqual( self.loadConfs(), [OTHER_MODULE_NAME] ) # Only the changed file
+        self.assertEqual( self.loadConfs(), [] )
+
+        SwordModules.SWORD_REGISTRY_FORMAT_VERSION += 1
+        self.assertEqual( self.loadConfs(), [OTHER_MODULE_NAME,TEST_MODULE_NAME] ) # Everything
+        self.assertEqual( self.loadConfs(), [] )
+    # end of test_010_confsCache
+
+    def test_020_indexCache( self ):
+        """ Test that a module index is only loaded again if the index files (or the cache format) have changed. """
+        originalIndex = self.loadIndex()
+        self.assertTrue( originalIndex )
+        self.addIndexCacheMarker()
+        cachedIndex = self.loadIndex() # Unchanged signatures
+        self.assertEqual( cachedIndex.pop( 'Marker' ), 'From the cache' )
+        self.assertEqual( cachedIndex, originalIndex )
+
+        indexFilepath = os.path.join( self.swordFolder, 'modules/texts/rawtext/', TEST_MODULE_NAME, 'nt.vss' )
+        fileStat = os.stat( indexFilepath )
+        os.utime( indexFilepath, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns-10**9) ) # Looks like a different file
+        self.assertEqual( self.loadIndex(), originalIndex ) # No marker
+        self.addIndexCacheMarker()
+        self.assertTrue( 'Marker' in self.loadIndex() )
+
+        SwordModules.SWORD_REGISTRY_FORMAT_VERSION += 1
+        self.assertEqual( self.loadIndex(), originalIndex ) # No marker
+    # end of test_020_indexCache
+# end of SwordRegistryCacheTests class
+
+
+class SwordVersifiedDataTests( unittest.TestCase ):
+    """ Unit tests for getting the raw data for lots of references at once. """
+
+    @classmethod
+    def setUpClass( cls ):
+        cls.tempFolder = tempfile.mkdtemp()
+        cls.savedCacheFolder = BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER = os.path.join( cls.tempFolder, 'Cache/' )
+        cls.swordFolder = os.path.join( cls.tempFolder, 'Sword/' )
+        writeTestModule( cls.swordFolder, 'raw', compressedFlag=False )
+        writeTestModule( cls.swordFolder, 'zip', compressedFlag=True )
+
+    @classmethod
+    def tearDownClass( cls ):
+        BibleOrgSysGlobals.DEFAULT_CACHE_FOLDER = cls.savedCacheFolder
+        shutil.rmtree( cls.tempFolder, ignore_errors=True )
+
+    def loadModule( self, moduleName, inMemoryFlag ):
+        """ Returns the loaded module and a shuffled list of references (including some repeated and missing ones). """
+        swMC = SwordModuleConfiguration( moduleName, self.swordFolder )
+        swMC.loadConf()
+        swM = SwordModule( swMC )
+        swM.loadBooks( inMemoryFlag=inMemoryFlag )
+        if inMemoryFlag: references = [(BBB,C,V) for BBB,bookData in swM.swordData.items() for C,V in bookData]
+        else: references = [(BBB,C,V) for BBB,(filepath,indexData) in swM.swordIndex.items() for C,V in indexData]
+        self.assertTrue( len(references) > 200 )
+        random.Random( 1 ).shuffle( references )
+        references += references[:5] + [('MAL','1','1'), ('GEN','50','1')] # Book not in the module, and verse not in the index
+        return swM, references
+    # end of loadModule
+
+    def assertLogsIfIndexed( self, swM ):
+        """ Missing verses are only logged if the module isn't loaded into memory. """
+        return contextlib.suppress() if swM.inMemoryFlag else self.assertLogs( level='ERROR' )
+    # end of assertLogsIfIndexed
+
+    def test_010_getRawVersifiedDataForReferences( self ):
+        """ Test that the results are the same as calling getRawVersifiedData for each reference. """
+        for moduleName in ( 'raw', 'zip', ):
+            for inMemoryFlag in ( False, True, ):
+                swM, references = self.loadModule( moduleName, inMemoryFlag )
+                with self.assertLogsIfIndexed( swM ): # For GEN 50:1
+                    expectedResults = [swM.getRawVersifiedData( reference ) for reference in references]
+                self.assertEqual( expectedResults[-2:], [None,None] )
+                self.assertTrue( '' in expectedResults ) # Blank verses
+                self.assertTrue( 'OT verse 119.' in expectedResults and 'NT verse 89.' in expectedResults )
+                swM.cache.clear()
+                with self.assertLogsIfIndexed( swM ):
+                    self.assertEqual( swM.getRawVersifiedDataForReferences( references ), expectedResults )
+                self.assertEqual( swM.getRawVersifiedDataForReferences( [] ), [] )
+    # end of test_010_getRawVersifiedDataForReferences
+# end of SwordVersifiedDataTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of SwordModulesTests.py
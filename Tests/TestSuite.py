@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 #
 # TestSuite.py
-#   Last modified: 2014-12-15 by RJH (also update ProgVersion below)
+#   Last modified: 2018-03-18 by RJH (also update ProgVersion below)
 #
 # Suite for testing BibleOrgSys
 #
@@ -28,7 +28,7 @@ Suite testing BibleOrgSys.
 """
 
 ProgName = "Bible Organisational System test suite"
-ProgVersion = '0.13'
+ProgVersion = '0.26'
 ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
 
 
@@ -44,6 +44,8 @@ import ISO_639_3_LanguagesTests, BiblePunctuationSystemsTests
 import BibleBooksNamesTests, BibleVersificationSystemsTests, BibleOrganizationalSystemsTests
 import BibleReferencesTests
 import USFMMarkersTests, USFMFilenamesTests, USXFilenamesTests
+import BibleOrgSysGlobalsTests, BibleSearchDatabaseTests, SwordInstallManagerTests, XMLBiblesTests
+import DBPOnlineTests, AsyncVerseRetrievalTests, HebrewWLCBibleTests, SwordModulesTests, BibleFingerprintsTests, CompareBiblesTests, LexiconStoreTests, PTX8BibleTests, InternalBibleTests
 
 
 # Handle command line parameters (for compatibility)
@@ -57,6 +59,8 @@ if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
 # Create the test suite
 suiteList = []
 
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleOrgSysGlobalsTests.RemoveAccentsTests ) )
+
 suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleBooksCodesTests.BibleBooksCodesConverterTests ) )
 suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleBooksCodesTests.BibleBooksCodesTests ) )
 
@@ -93,6 +97,34 @@ suiteList.append( unittest.TestLoader().loadTestsFromTestCase( USFMFilenamesTest
 suiteList.append( unittest.TestLoader().loadTestsFromTestCase( USXFilenamesTests.USXFilenamesTests1 ) )
 suiteList.append( unittest.TestLoader().loadTestsFromTestCase( USXFilenamesTests.USXFilenamesTests2 ) )
 
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleSearchDatabaseTests.BibleSearchDatabaseTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( SwordInstallManagerTests.SwordInstallManagerTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( XMLBiblesTests.TruncatedXMLBiblesTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( DBPOnlineTests.DBPOnlineTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( AsyncVerseRetrievalTests.AsyncVerseRetrieverTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( HebrewWLCBibleTests.HebrewGlossingStoreTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( SwordModulesTests.SwordRegistryCacheTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleFingerprintsTests.VerseFingerprintTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( BibleFingerprintsTests.BibleVerseFingerprintTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( CompareBiblesTests.WordAlignmentTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( LexiconStoreTests.LexiconStoreTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( PTX8BibleTests.PTX8MetadataLoadingTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( InternalBibleTests.VerseDataForReferencesTests ) )
+
+suiteList.append( unittest.TestLoader().loadTestsFromTestCase( SwordModulesTests.SwordVersifiedDataTests ) )
+
 
 # Now run all the tests in the suite
 allTests = unittest.TestSuite( suiteList )
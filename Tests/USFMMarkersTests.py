@@ -28,7 +28,7 @@ Module testing USFMMarkers.py.
 """
 
 ProgName = "USFM Markers tests"
-ProgVersion = '0.60'
+ProgVersion = '0.61'
 ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
 
 
@@ -541,6 +541,30 @@ class USFMMarkersTests( unittest.TestCase ):
         self.assertEqual( self.UMs.getMarkerListFromText('This \\bk book\\bk* is good'), \
                                 [('bk',5,' ','\\bk ',['bk'],1,'book'), ('bk',13,'*','\\bk*',[],None,' is good')] )
     #end of test_2210_getMarkerListFromText
+
+    def test_2220_getMarkerListFromText( self ):
+        """ Test the getMarkerListFromText function with nested markers and initial text. """
+        result1 = self.UMs.getMarkerListFromText( 'Some \\add added \\+nd Lord\\+nd*\\add* text' )
+        self.assertEqual( result1, [('add',5,' ','\\add ',['add'],3,'added '), ('nd',16,'+','\\+nd ',['add','nd'],2,'Lord'),
+                                    ('nd',25,'-','\\+nd*',['add'],None,''), ('add',30,'*','\\add*',[],None,' text')] )
+        self.assertEqual( self.UMs.getMarkerListFromText( 'Some \\add added \\+nd Lord\\+nd*\\add* text' ), result1 ) # Again (from the cache)
+        self.assertEqual( self.UMs.getMarkerListFromText( 'Start \\f + \\fr 1:2 \\ft Note\\f*', includeInitialText=True ),
+                                [(None,0,None,None,None,1,'Start '), ('f',6,' ','\\f ',['f'],2,'+ '), ('fr',11,' ','\\fr ',['fr'],3,'1:2 '),
+                                    ('ft',19,' ','\\ft ',['ft'],4,'Note'), ('f',27,'*','\\f*',[],None,'')] )
+        self.assertEqual( self.UMs.getMarkerListFromText( 'End \\' ), [('\\',4,'','\\',['\\'],None,'')] )
+    #end of test_2220_getMarkerListFromText
+
+    def test_2230_getMarkerListFromText( self ):
+        """ Test that changing a returned list doesn't change later results (from the cache). """
+        text = 'Cached \\add added \\+nd Lord\\+nd*\\add* text'
+        for j in range( 3 ): # The first call fills the cache
+            result = self.UMs.getMarkerListFromText( text )
+            self.assertEqual( result[1], ('nd',18,'+','\\+nd ',['add','nd'],2,'Lord') )
+            self.assertEqual( len(result), 4 )
+            result[1][4].append( 'wj' ) # Change the context list
+            result[1][4][0] = 'bd'
+            result.pop()
+    #end of test_2230_getMarkerListFromText
 # end of USFMMarkersTests class
 
 
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# XMLBiblesTests.py
+#   Last modified: 2018-03-18 (also update ProgVersion below)
+#
+# Module testing the incremental loading of ZefaniaXMLBible.py, OpenSongXMLBible.py, and VerseViewXMLBible.py
+#
+# Copyright (C) 2018 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing the incremental loading of ZefaniaXMLBible.py, OpenSongXMLBible.py, and VerseViewXMLBible.py
+    including what happens with truncated files.
+"""
+
+ProgName = "XML Bibles tests"
+ProgVersion = '0.01'
+ProgNameVersion = "{} v{}".format( ProgName, ProgVersion )
+
+
+import sys, os, unittest
+import tempfile, shutil
+
+sourceFolder = "."
+sys.path.append( sourceFolder )
+import BibleOrgSysGlobals
+from ZefaniaXMLBible import ZefaniaXMLBible
+from OpenSongXMLBible import OpenSongXMLBible
+from VerseViewXMLBible import VerseViewXMLBible
+
+
+TEST_FILENAME = 'Test.xml'
+ZEFANIA_TEST_TEXT = """<?xml version="1.0" encoding="utf-8"?>
+<XMLBIBLE biblename="Test" status="v" type="x-bible" revision="1" version="2.0.1.18">
+<BIBLEBOOK bnumber="1" bname="Genesis" bsname="Gen"><CHAPTER cnumber="1"><VERS vnumber="1">In the beginning God created.</VERS><VERS vnumber="2">And the earth was without form.</VERS></CHAPTER></BIBLEBOOK>
+<BIBLEBOOK bnumber="2" bname="Exodus" bsname="Exo"><CHAPTER cnumber="1"><VERS vnumber="1">Now these are the names.</VERS></CHAPTER></BIBLEBOOK>
+</XMLBIBLE>
+"""
+OPENSONG_TEST_TEXT = """<?xml version="1.0" encoding="UTF-8"?>
+<bible n="Test">
+<b n="Genesis"><c n="1"><v n="1">In the beginning God created.</v><v n="2">And the earth was without form.</v></c></b>
+<b n="Exodus"><c n="1"><v n="1">Now these are the names.</v></c></b>
+</bible>
+"""
+VERSEVIEW_TEST_TEXT = """<?xml version="1.0" encoding="utf-8"?>
+<bible>
+<fname>Test.xml</fname><revision>1</revision><title>Test Bible</title><font>Arial</font><copyright>None</copyright><sizefactor>1</sizefactor>
+<b n="Genesis"><c n="1"><v n="1">In the beginning God created.</v><v n="2">And the earth was without form.</v></c></b>
+<b n="Exodus"><c n="1"><v n="1">Now these are the names.</v></c></b>
+</bible>
+"""
+
+
+class TruncatedXMLBiblesTests( unittest.TestCase ):
+    """ Unit tests for loading complete and truncated XML Bible files. """
+
+    def setUp( self ):
+        self.tempFolder = tempfile.mkdtemp()
+
+    def tearDown( self ):
+        shutil.rmtree( self.tempFolder, ignore_errors=True )
+
+    def loadText( self, BibleClass, text ):
+        """ Save the text as a file and load it. """
+        with open( os.path.join( self.tempFolder, TEST_FILENAME ), 'wt', encoding='utf-8' ) as XMLFile:
+            XMLFile.write( text )
+        testBible = BibleClass( self.tempFolder, TEST_FILENAME )
+        testBible.load()
+        return testBible
+    # end of loadText
+
+    def checkLoads( self, BibleClass, text, secondBookStart ):
+        """
+        Check the complete text, the text truncated in the second book, and the text truncated in the root element.
+        """
+        testBible = self.loadText( BibleClass, text )
+        self.assertEqual( list( testBible.books ), ['GEN','EXO'] )
+        self.assertEqual( testBible.loadErrors, [] )
+        self.assertFalse( 'Load Errors' in testBible.errorDictionary )
+
+        testBible = self.loadText( BibleClass, text[:text.index(secondBookStart)+20] )
+        self.assertEqual( list( testBible.books ), ['GEN'] ) # The book before the error is still loaded
+        self.assertEqual( len(testBible.loadErrors), 1 )
+        self.assertTrue( 'after 1 books' in testBible.loadErrors[0] )
+        self.assertEqual( testBible.errorDictionary['Load Errors'], testBible.loadErrors )
+
+        testBible = self.loadText( BibleClass, text[:30] ) # Not even the root element
+        self.assertEqual( list( testBible.books ), [] )
+        self.assertEqual( len(testBible.loadErrors), 1 )
+        self.assertEqual( testBible.errorDictionary['Load Errors'], testBible.loadErrors )
+    # end of checkLoads
+
+    def test_010_Zefania( self ):
+        """ Test a truncated Zefania XML file. """
+        self.checkLoads( ZefaniaXMLBible, ZEFANIA_TEST_TEXT, '<BIBLEBOOK bnumber="2"' )
+    # end of test_010_Zefania
+
+    def test_020_OpenSong( self ):
+        """ Test a truncated OpenSong XML file. """
+        self.checkLoads( OpenSongXMLBible, OPENSONG_TEST_TEXT, '<b n="Exodus"' )
+    # end of test_020_OpenSong
+
+    def test_030_VerseView( self ):
+        """ Test a truncated VerseView XML file. """
+        self.checkLoads( VerseViewXMLBible, VERSEVIEW_TEST_TEXT, '<b n="Exodus"' )
+    # end of test_030_VerseView
+# end of TruncatedXMLBiblesTests class
+
+
+if __name__ == '__main__':
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( ProgName, ProgVersion )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    if BibleOrgSysGlobals.verbosityLevel > 1: print( ProgNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of XMLBiblesTests.py
@@ -36,17 +36,18 @@ Contains the singleton class: USFMMarkers
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-13' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "USFMMarkers"
 ProgName = "USFM Markers handler"
-ProgVersion = '0.70'
+ProgVersion = '0.72'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import os, logging
+import os, logging, time
+import re
 from collections import OrderedDict
 
 from singleton import singleton
@@ -70,6 +71,13 @@ USFM_BIBLE_PARAGRAPH_MARKERS = ( 'p','pc','pr', 'm','mi', 'pm','pmo','pmc','pmr'
                             'li','li1','li2','li3','li4' ) # (37) Doesn't include nb and qa -- WHY NOT???
                                                             #   but does include q, qm, li, pi, and ph
 
+# Matches a marker starting at a backslash, e.g., '\\bk ', '\\+nd*', or '\\v' at the end of a line
+#   (the first character can't be a space, asterisk, or plus, but after that, anything up to a space or asterisk is part of the marker)
+USFM_MARKER_REGEX = re.compile( r'\\(\+?)([^ *+][^ *]*)([ *]?)' )
+# The nextSignificantChar for (plus, terminator) from the above regex
+USFM_MARKER_NEXT_CHARS = { ('',' '):' ', ('','*'):'*', ('',''):'', ('+',' '):'+', ('+','*'):'-', ('+',''):'+', }
+MAX_MARKER_LIST_CACHE_SIZE = 500 # Number of (repeated) lines to remember in getMarkerListFromText
+
 USFM_PRECHAPTER_MARKERS = OFTEN_IGNORED_USFM_HEADER_MARKERS + USFM_TITLE_MARKERS + USFM_INTRODUCTION_MARKERS + ('ie',)
 USFM_PRINTABLE_MARKERS = ('v',) + USFM_TITLE_MARKERS + USFM_INTRODUCTION_MARKERS \
                             + USFM_SECTION_HEADING_MARKERS + USFM_BIBLE_PARAGRAPH_MARKERS
@@ -280,6 +288,8 @@ class USFMMarkers:
         Constructor:
         """
         self.__DataDict = None # We'll import into this in loadData
+        self.__newlineMarkersSet = None # Made by getMarkerListFromText the first time it's needed
+        self.__markerListCache = {}
     # end of USFMMarkers.__init__
 
 
@@ -562,52 +572,73 @@ class USFMMarkers:
         """
         #if BibleOrgSysGlobals.verbosityLevel > 2: print( "USFMMarkers.getMarkerListFromText( {}, {} )".format( repr(text), verifyMarkers ) )
         if not text: return []
+        try: # See if we've done this exact line recently
+            cachedResult = self.__markerListCache[(text,includeInitialText)]
+        except KeyError:
+            finalResult = self.__makeMarkerListFromText( text, includeInitialText )
+        else: # Make a new list (with new context lists) in case the caller changes it
+            finalResult = [(m, ix, x, mx, None if cx is None else list(cx), ixEnd, tx,) for m, ix, x, mx, cx, ixEnd, tx in cachedResult]
+
+        if verifyMarkers:
+            textLength = len( text )
+            for j, (m, ix, x, mx, cx, ixEnd, tx,) in enumerate(finalResult):
+                #print( 'verify', j, m, ix, repr(x), repr(mx), cx, ixEnd, repr(tx) )
+                assert ix < textLength
+                assert x in (' ','+','-','*','',) or ( includeInitialText and j==0 and x is None )
+                if m is None:
+                    assert j==0 and ix==0 and x is None
+                else:
+                    if j == 0:
+                        if not self.isNewlineMarker( m ): logging.error( _("USFMMarkers.getMarkerListFromText found possible invalid first marker {!r} in {!r}").format( m, text ) )
+                    elif not self.isInternalMarker( m ): logging.error( _("USFMMarkers.getMarkerListFromText found possible invalid marker {!r} at position {} in {!r}").format( m, j+1, text ) )
+
+        return finalResult
+    # end of USFMMarkers.getMarkerListFromText
+
+
+    def __makeMarkerListFromText( self, text, includeInitialText ):
+        """
+        Does the actual work for getMarkerListFromText (above)
+            using the compiled USFM_MARKER_REGEX at each backslash
+            (rather than building the marker up character by character).
+
+        Saves an unchangeable copy of the result in self.__markerListCache
+            (with tuples for the context lists) unless there were errors to log.
+        """
+        if self.__newlineMarkersSet is None:
+            self.__newlineMarkersSet = frozenset( marker for marker in self.__DataDict['combinedMarkerDict'] if self.isNewlineMarker( marker ) )
+        newlineMarkersSet = self.__newlineMarkersSet
+
         firstResult = [] # A list of 4-tuples containing ( 1, 2, 3, 4 ) above
+        haveErrors = False
         textLength = len( text )
         ixBS = text.find( '\\' )
         while ixBS != -1: # Find backslashes
-            #print( ixBS, firstResult )
-            marker = ''
-            iy = ixBS + 1
-            if iy<textLength:
-                c1 = text[iy]
-                if c1==' ': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\' in {!r}").format( text ) )
-                elif c1=='*': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\*' in {!r}").format( text ) )
-                elif c1=='+': # it's a nested USFM 2.4 marker
-                    iy += 1 # skip past the +
-                    if iy<textLength:
-                        c1 = text[iy]
-                        if c1==' ': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+' in {!r}").format( text ) )
-                        elif c1=='*': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+*' in {!r}").format( text ) )
-                        elif c1=='+': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\++' in {!r}").format( text ) )
-                        else: # it's probably a letter which is part of the actual marker
-                            marker += c1
-                            iy += 1
-                            while iy < textLength:
-                                c = text[iy]
-                                if c==' ': firstResult.append( (marker,ixBS,'+','\\+'+marker+' ') ); break
-                                elif c=='*': firstResult.append( (marker,ixBS,'-','\\+'+marker+'*') ); break
-                                else: # it's probably ok
-                                    marker += c
-                                iy += 1
-                            else: firstResult.append( (marker,ixBS,'+','\\+'+marker) ) # How do we indicate the end of line here?
-                    else: # it was a backslash then plus at the end of the line
-                        firstResult.append( ('\\',ixBS,'+','\\+') )
-                        logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+' at end of {!r}").format( text ) )
-                else: # it's probably a letter which is part of the actual marker
-                    marker += c1
-                    iy += 1
-                    while iy < textLength:
-                        c = text[iy]
-                        if c==' ': firstResult.append( (marker,ixBS,' ','\\'+marker+' ') ); break
-                        elif c=='*': firstResult.append( (marker,ixBS,'*','\\'+marker+'*') ); break
-                        else: # it's probably ok
-                            marker += c
-                        iy += 1
-                    else: firstResult.append( (marker,ixBS,'','\\'+marker) )
-            else: # it was a backslash at the end of the line
-                firstResult.append( ('\\',ixBS,'','\\') )
-                logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\' at end of {!r}").format( text ) )
+            match = USFM_MARKER_REGEX.match( text, ixBS )
+            if match: # the normal case
+                plus, marker, terminator = match.groups()
+                firstResult.append( (marker,ixBS,USFM_MARKER_NEXT_CHARS[(plus,terminator)],match.group()) )
+            else: # Something's wrong
+                haveErrors = True
+                iy = ixBS + 1
+                if iy<textLength:
+                    c1 = text[iy]
+                    if c1==' ': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\' in {!r}").format( text ) )
+                    elif c1=='*': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\*' in {!r}").format( text ) )
+                    else: # it's a nested USFM 2.4 marker
+                        assert c1 == '+'
+                        iy += 1 # skip past the +
+                        if iy<textLength:
+                            c1 = text[iy]
+                            if c1==' ': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+' in {!r}").format( text ) )
+                            elif c1=='*': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+*' in {!r}").format( text ) )
+                            elif c1=='+': logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\++' in {!r}").format( text ) )
+                        else: # it was a backslash then plus at the end of the line
+                            firstResult.append( ('\\',ixBS,'+','\\+') )
+                            logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\+' at end of {!r}").format( text ) )
+                else: # it was a backslash at the end of the line
+                    firstResult.append( ('\\',ixBS,'','\\') )
+                    logging.error( _("USFMMarkers.getMarkerListFromText found invalid '\\' at end of {!r}").format( text ) )
             ixBS = text.find( '\\', ixBS+1 )
 
         # Now that we have found all the markers and where they are, get the text fields between them
@@ -615,7 +646,7 @@ class USFMMarkers:
         secondResult = []  # A list of 6-tuples containing ( 1, 2, 3, 4, 5, 7 ) above
         cx = []
         for j, (m, ix, x, mx) in enumerate(firstResult):
-            if self.isNewlineMarker( m ): cx = [] #; print( "rst", cx )
+            if m in newlineMarkersSet: cx = [] #; print( "rst", cx )
             elif x==' ' or x=='': # Open marker in line or at end of line
                 cx = [m] #; print( "set", cx )
             elif x=='+': cx.append( m ) #; print( "add", m, cx )
@@ -654,20 +685,12 @@ class USFMMarkers:
                     finalResult.append( (m, ix, x, mx, cx[:], None if ixEnd is None else ixEnd+1, tx,) )
 
         #if finalResult: print( finalResult )
-        if verifyMarkers:
-            for j, (m, ix, x, mx, cx, ixEnd, tx,) in enumerate(finalResult):
-                #print( 'verify', j, m, ix, repr(x), repr(mx), cx, ixEnd, repr(tx) )
-                assert ix < textLength
-                assert x in (' ','+','-','*','',) or ( includeInitialText and j==0 and x is None )
-                if m is None:
-                    assert j==0 and ix==0 and x is None
-                else:
-                    if j == 0:
-                        if not self.isNewlineMarker( m ): logging.error( _("USFMMarkers.getMarkerListFromText found possible invalid first marker {!r} in {!r}").format( m, text ) )
-                    elif not self.isInternalMarker( m ): logging.error( _("USFMMarkers.getMarkerListFromText found possible invalid marker {!r} at position {} in {!r}").format( m, j+1, text ) )
-
+        if not haveErrors: # (so the errors still get logged every time)
+            if len(self.__markerListCache) >= MAX_MARKER_LIST_CACHE_SIZE: self.__markerListCache = {} # Just start again
+            self.__markerListCache[(text,includeInitialText)] = tuple( (m, ix, x, mx, None if cx is None else tuple(cx), ixEnd, tx,)
+                                                                for m, ix, x, mx, cx, ixEnd, tx in finalResult )
         return finalResult
-    # end of USFMMarkers.getMarkerListFromText
+    # end of USFMMarkers.__makeMarkerListFromText
 
 
     # This function is faulty and not actually used except in the demo below
@@ -763,6 +786,13 @@ def demo():
         #print( "         C-D {}".format( um.getMarkerDictFromText( text, includeInitialText=True, verifyMarkers=True ) ) )
 
 
+    # Time finding the markers in lines which are all different, and then in the same line repeated (which uses the cache)
+    text = '\\v 2 This \\it is\\it* \\bd more\\bd* complicated.\\f + \\fr 2 \\ft footnote.\\f*'
+    for description, texts in ( ("different", [text+str(j) for j in range( 20000 )]), ("repeated", [text]*20000), ):
+        startTime = time.perf_counter()
+        for line in texts: um.getMarkerListFromText( line )
+        print( "\nFound markers in {:,} {} lines in {:.3f} seconds".format( len(texts), description, time.perf_counter()-startTime ) )
+
     text = "\\v~ \\x - \\xo 12:13 \\xt Cross \wj \wj*reference text.\\x*Main \\add actual\\add* verse text.\\f + \\fr 12:13\\fr* \\ft with footnote.\\f*"
     print( "\nFor text: {!r}".format( text ) )
     print( "  remove whole xref = {!r}".format( removeUSFMCharacterField( 'x', text, closedFlag=True ) ) )
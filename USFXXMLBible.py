@@ -48,10 +48,10 @@ Module for defining and manipulating complete or partial USFX Bibles.
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-15' # by RJH
+LastModifiedDate = '2018-03-17' # by RJH
 ShortProgName = "USFXBible"
 ProgName = "USFX XML Bible handler"
-ProgVersion = '0.31'
+ProgVersion = '0.32'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
@@ -59,7 +59,7 @@ debuggingThisModule = False
 
 
 import os, sys, logging, multiprocessing
-from xml.etree.ElementTree import ElementTree, ParseError
+from xml.etree.ElementTree import ParseError
 
 import BibleOrgSysGlobals
 from Bible import Bible, BibleBook
@@ -278,19 +278,19 @@ class USFXXMLBible( Bible ):
         if BibleOrgSysGlobals.verbosityLevel > 1:
             print( _("USFXXMLBible.load: Loading {!r} from {!r}…").format( self.name, self.sourceFilepath ) )
 
-        try: self.XMLTree = ElementTree().parse( self.sourceFilepath )
+        # Parse the file incrementally so that each book element can be released as soon as it's processed
+        #   (rather than having the entire tree in memory)
+        elementEvents = BibleOrgSysGlobals.iterparseXMLElements( self.sourceFilepath )
+        try: event, depth, self.XMLTree, parentElement = next( elementEvents ) # Only the root tag and attributes are available yet
         except ParseError:
             errorString = sys.exc_info()[1]
             logging.critical( "USFXXMLBible.load: failed loading the xml file {}: {!r}.".format( self.sourceFilepath, errorString ) )
             return
-        if BibleOrgSysGlobals.debugFlag: assert len( self.XMLTree ) # Fail here if we didn't load anything at all
 
         # Find the main (osis) container
         prefix = self.XMLTree.tag[:-4] if self.XMLTree.tag[0]=='{' and self.XMLTree.tag[-5]=='}' else ''
         if self.XMLTree.tag == prefix + 'usfx':
             location = 'USFX file'
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
             # Process the attributes first
             self.schemaLocation = None
             for attrib,value in self.XMLTree.items():
@@ -301,33 +301,42 @@ class USFXXMLBible( Bible ):
                     logging.warning( "fv6g Unprocessed {} attribute ({}) in {}".format( attrib, value, location ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
             BBB = C = V = None
-            for element in self.XMLTree:
-                #print( "element", repr(element.tag) )
-                sublocation = element.tag + " " + location
-                if element.tag == 'languageCode':
-                    self.languageCode = element.text
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'cff3' )
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'des1' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'dwf2' )
-                elif element.tag == 'book':
-                    self.loadBook( element )
-                    ##BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, '54f2' )
-                    #BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'hd35' )
-                    ## Process the attributes
-                    #idField = bookStyle = None
-                    #for attrib,value in element.items():
-                        #if attrib=='id' or attrib=='code':
-                            #idField = value # Should be USFM bookcode (not like BBB which is BibleOrgSys BBB bookcode)
-                            ##if idField != BBB:
-                            ##    logging.warning( _("Unexpected book code ({}) in {}").format( idField, sublocation ) )
-                        #elif attrib=='style':
-                            #bookStyle = value
-                        #else:
-                            #logging.warning( _("gfw2 Unprocessed {} attribute ({}) in {}").format( attrib, value, sublocation ) )
-                else:
-                    logging.warning( _("dbw1 Unprocessed {} element after {} {}:{} in {}").format( element.tag, BBB, C, V, sublocation ) )
-                    #self.addPriorityError( 1, c, v, _("Unprocessed {} element").format( element.tag ) )
-                    if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+            try:
+                for event, depth, element, parentElement in elementEvents:
+                    if depth != 1: continue # ignore the end of the root element
+                    #print( "element", repr(element.tag) )
+                    sublocation = element.tag + " " + location
+                    if element.tag == 'languageCode':
+                        self.languageCode = element.text
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'cff3' )
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'des1' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'dwf2' )
+                    elif element.tag == 'book':
+                        self.loadBook( element )
+                        ##BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, '54f2' )
+                        #BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'hd35' )
+                        ## Process the attributes
+                        #idField = bookStyle = None
+                        #for attrib,value in element.items():
+                            #if attrib=='id' or attrib=='code':
+                                #idField = value # Should be USFM bookcode (not like BBB which is BibleOrgSys BBB bookcode)
+                                ##if idField != BBB:
+                                ##    logging.warning( _("Unexpected book code ({}) in {}").format( idField, sublocation ) )
+                            #elif attrib=='style':
+                                #bookStyle = value
+                            #else:
+                                #logging.warning( _("gfw2 Unprocessed {} attribute ({}) in {}").format( attrib, value, sublocation ) )
+                    else:
+                        logging.warning( _("dbw1 Unprocessed {} element after {} {}:{} in {}").format( element.tag, BBB, C, V, sublocation ) )
+                        #self.addPriorityError( 1, c, v, _("Unprocessed {} element").format( element.tag ) )
+                        if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
+                    parentElement.remove( element ) # Release the memory
+            except ParseError: # Any books before the error have been loaded
+                errorString = sys.exc_info()[1]
+                logging.critical( "USFXXMLBible.load: failed loading the xml file {}: {!r}.".format( self.sourceFilepath, errorString ) )
+            # The root text and tail are only available now
+            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
+            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
 
         if not self.books: # Didn't successfully load any regularly named books -- maybe the files have weird names??? -- try to be intelligent here
             if BibleOrgSysGlobals.verbosityLevel > 2:
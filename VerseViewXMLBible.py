@@ -59,18 +59,18 @@ Module reading and loading VerseView XML Bibles:
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-01-18' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "VerseViewBible"
 ProgName = "VerseView XML Bible format handler"
-ProgVersion = '0.17'
+ProgVersion = '0.19'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import logging, os
-from xml.etree.ElementTree import ElementTree
+import logging, os, sys
+from xml.etree.ElementTree import ParseError
 
 import BibleOrgSysGlobals
 from BibleOrganizationalSystems import BibleOrganizationalSystem
@@ -84,6 +84,22 @@ extensionsToIgnore = ( 'ASC', 'BAK', 'BAK2', 'BAK3', 'BAK4', 'BBLX', 'BC', 'CCT'
 
 
 
+def exp( messageString ):
+    """
+    Expands the message string in debug mode.
+    Prepends the module name to a error or warning message string
+        if we are in debug mode.
+    Returns the new string.
+    """
+    try: nameBit, errorBit = messageString.split( ': ', 1 )
+    except ValueError: nameBit, errorBit = '', messageString
+    if BibleOrgSysGlobals.debugFlag or debuggingThisModule:
+        nameBit = '{}{}{}'.format( ShortProgName, '.' if nameBit else '', nameBit )
+    return '{}{}'.format( nameBit+': ' if nameBit else '', errorBit )
+# end of exp
+
+
+
 def VerseViewXMLBibleFileCheck( givenFolderName, strictCheck=True, autoLoad=False, autoLoadBooks=False ):
     """
     Given a folder, search for VerseView XML Bible files or folders in the folder and in the next level down.
@@ -230,6 +246,7 @@ class VerseViewXMLBible( Bible ):
         self.sourceFilepath =  os.path.join( self.sourceFolder, self.givenName )
 
         self.XMLTree = self.header = None # Will hold the XML data
+        self.loadErrors = []
 
         # Get the data tables that we need for proper checking
         #self.ISOLanguages = ISO_639_3_Languages().loadData()
@@ -250,8 +267,15 @@ class VerseViewXMLBible( Bible ):
         Load a single source XML file and load book elements.
         """
         if BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {}…").format( self.sourceFilepath ) )
-        self.XMLTree = ElementTree().parse( self.sourceFilepath )
-        if BibleOrgSysGlobals.debugFlag: assert len( self.XMLTree ) # Fail here if we didn't load anything at all
+        # Parse the file incrementally so that each book element can be released as soon as it's processed
+        #   (rather than having the entire tree in memory)
+        elementEvents = BibleOrgSysGlobals.iterparseXMLElements( self.sourceFilepath )
+        try: event, depth, self.XMLTree, parentElement = next( elementEvents ) # Only the root tag and attributes are available yet
+        except ParseError as err:
+            logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.loadErrors.append( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.errorDictionary['Load Errors'] = self.loadErrors
+            return
 
         if self.suppliedMetadata is None: self.suppliedMetadata = {}
         self.suppliedMetadata['VerseView'] = {}
@@ -259,65 +283,73 @@ class VerseViewXMLBible( Bible ):
         # Find the main (bible) container
         if self.XMLTree.tag == VerseViewXMLBible.treeTag:
             location = "VerseView XML file"
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
             BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, location, 'js24' )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
 
             # Find the submain (various info and then book) containers
             bookNumber = 0
-            for element in self.XMLTree:
-                if element.tag == VerseViewXMLBible.filenameTag:
-                    sublocation = "filename in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    #self.filename = element.text
-                elif element.tag == VerseViewXMLBible.revisionTag:
-                    sublocation = "revision in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    self.suppliedMetadata['VerseView']['Revision'] = element.text
-                elif element.tag == VerseViewXMLBible.titleTag:
-                    sublocation = "title in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    self.suppliedMetadata['VerseView']['Title'] = element.text
-                elif element.tag == VerseViewXMLBible.fontTag:
-                    sublocation = "font in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    self.suppliedMetadata['VerseView']['Font'] = element.text
-                elif element.tag == VerseViewXMLBible.copyrightTag:
-                    sublocation = "copyright in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    self.suppliedMetadata['VerseView']['Copyright'] = element.text
-                elif element.tag == VerseViewXMLBible.sizefactorTag:
-                    sublocation = "sizefactor in " + location
-                    BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
-                    BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
-                    if BibleOrgSysGlobals.debugFlag: assert element.text == '1'
-                elif element.tag == VerseViewXMLBible.bookTag:
-                    sublocation = "book in " + location
-                    BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
-                    bookNumber += 1
-                    self.__validateAndExtractBook( element, bookNumber )
-                else: logging.error( "xk15 Expected to find {!r} but got {!r}".format( VerseViewXMLBible.bookTag, element.tag ) )
+            try:
+                for event, depth, element, parentElement in elementEvents:
+                    if depth != 1: continue # ignore the end of the root element
+                    if element.tag == VerseViewXMLBible.filenameTag:
+                        sublocation = "filename in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        #self.filename = element.text
+                    elif element.tag == VerseViewXMLBible.revisionTag:
+                        sublocation = "revision in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        self.suppliedMetadata['VerseView']['Revision'] = element.text
+                    elif element.tag == VerseViewXMLBible.titleTag:
+                        sublocation = "title in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        self.suppliedMetadata['VerseView']['Title'] = element.text
+                    elif element.tag == VerseViewXMLBible.fontTag:
+                        sublocation = "font in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        self.suppliedMetadata['VerseView']['Font'] = element.text
+                    elif element.tag == VerseViewXMLBible.copyrightTag:
+                        sublocation = "copyright in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        self.suppliedMetadata['VerseView']['Copyright'] = element.text
+                    elif element.tag == VerseViewXMLBible.sizefactorTag:
+                        sublocation = "sizefactor in " + location
+                        BibleOrgSysGlobals.checkXMLNoAttributes( element, sublocation, 'jk86' )
+                        BibleOrgSysGlobals.checkXMLNoSubelements( element, sublocation, 'hjk7' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'bh09' )
+                        if BibleOrgSysGlobals.debugFlag: assert element.text == '1'
+                    elif element.tag == VerseViewXMLBible.bookTag:
+                        sublocation = "book in " + location
+                        BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
+                        bookNumber += 1
+                        self.__validateAndExtractBook( element, bookNumber )
+                    else: logging.error( "xk15 Expected to find {!r} but got {!r}".format( VerseViewXMLBible.bookTag, element.tag ) )
+                    parentElement.remove( element ) # Release the memory
+            except ParseError as err: # Any books before the error have been loaded
+                logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+                self.loadErrors.append( exp("Loader parse error in xml file {} after {} books: {} {}").format( self.givenName, bookNumber, sys.exc_info()[0], err ) )
+            # The root text and tail are only available now
+            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
+            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
         else: logging.error( "Expected to load {!r} but got {!r}".format( VerseViewXMLBible.treeTag, self.XMLTree.tag ) )
+        if self.loadErrors: self.errorDictionary['Load Errors'] = self.loadErrors
 
         if BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.verbosityLevel > 2:
-            # These are all compulsory so they should all exist
+            # These are all compulsory so they should all exist (unless the file was truncated)
             #print( "Filename is {!r}".format( self.filename ) )
-            print( "Revision is {!r}".format( self.suppliedMetadata['VerseView']['Revision'] ) )
-            print( "Title is {!r}".format( self.suppliedMetadata['VerseView']['Title'] ) )
-            print( "Font is {!r}".format( self.suppliedMetadata['VerseView']['Font'] ) )
-            print( "Copyright is {!r}".format( self.suppliedMetadata['VerseView']['Copyright'] ) )
+            print( "Revision is {!r}".format( self.suppliedMetadata['VerseView'].get( 'Revision' ) ) )
+            print( "Title is {!r}".format( self.suppliedMetadata['VerseView'].get( 'Title' ) ) )
+            print( "Font is {!r}".format( self.suppliedMetadata['VerseView'].get( 'Font' ) ) )
+            print( "Copyright is {!r}".format( self.suppliedMetadata['VerseView'].get( 'Copyright' ) ) )
             #print( "SizeFactor is {!r}".format( self.sizeFactor ) )
 
         self.applySuppliedMetadata( 'VerseView' ) # Copy some to self.settingsDict
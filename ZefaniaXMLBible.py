@@ -64,18 +64,18 @@ or
 
 from gettext import gettext as _
 
-LastModifiedDate = '2018-02-08' # by RJH
+LastModifiedDate = '2018-03-18' # by RJH
 ShortProgName = "ZefaniaBible"
 ProgName = "Zefania XML Bible format handler"
-ProgVersion = '0.36'
+ProgVersion = '0.38'
 ProgNameVersion = '{} v{}'.format( ShortProgName, ProgVersion )
 ProgNameVersionDate = '{} {} {}'.format( ProgNameVersion, _("last modified"), LastModifiedDate )
 
 debuggingThisModule = False
 
 
-import logging, os
-from xml.etree.ElementTree import ElementTree
+import logging, os, sys
+from xml.etree.ElementTree import ParseError
 
 import BibleOrgSysGlobals
 from BibleOrganizationalSystems import BibleOrganizationalSystem
@@ -264,6 +264,7 @@ class ZefaniaXMLBible( Bible ):
         self.sourceFilepath =  os.path.join( self.sourceFolder, self.givenName )
 
         self.XMLTree = self.header = None # Will hold the XML data
+        self.loadErrors = []
 
         # Get the data tables that we need for proper checking
         #self.ISOLanguages = ISO_639_3_Languages().loadData()
@@ -284,14 +285,19 @@ class ZefaniaXMLBible( Bible ):
         Load a single source XML file and load book elements.
         """
         if BibleOrgSysGlobals.verbosityLevel > 2: print( _("Loading {}…").format( self.sourceFilepath ) )
-        self.XMLTree = ElementTree().parse( self.sourceFilepath )
-        if BibleOrgSysGlobals.debugFlag: assert len( self.XMLTree ) # Fail here if we didn't load anything at all
+        # Parse the file incrementally so that each book element can be released as soon as it's processed
+        #   (rather than having the entire tree in memory)
+        elementEvents = BibleOrgSysGlobals.iterparseXMLElements( self.sourceFilepath )
+        try: event, depth, self.XMLTree, parentElement = next( elementEvents ) # Only the root tag and attributes are available yet
+        except ParseError as err:
+            logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.loadErrors.append( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+            self.errorDictionary['Load Errors'] = self.loadErrors
+            return
 
         # Find the main (bible) container
         if self.XMLTree.tag == ZefaniaXMLBible.treeTag:
             location = "Zefania XML file"
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
 
             schema = name = status = BibleType = revision = version = lgid = None
             for attrib,value in self.XMLTree.items():
@@ -315,26 +321,31 @@ class ZefaniaXMLBible( Bible ):
             if revision: self.revision = revision
             if version: self.version = version
 
-            if self.XMLTree[0].tag == 'INFORMATION':
-                self.header = self.XMLTree[0]
-                self.XMLTree.remove( self.header )
-                self.__validateAndExtractHeader()
-            else: # Handle information records at the END of the file
-                ix = len(self.XMLTree) - 1
-                if self.XMLTree[ix].tag == 'INFORMATION':
-                    self.header = self.XMLTree[ix]
-                    self.XMLTree.remove( self.header )
-                    self.__validateAndExtractHeader()
-
-            # Find the submain (book) containers
-            for element in self.XMLTree:
-                if element.tag == ZefaniaXMLBible.bookTag:
-                    sublocation = "book in " + location
-                    BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
-                    BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
-                    self.__validateAndExtractBook( element )
-                else: logging.error( "Expected to find {!r} but got {!r}".format( ZefaniaXMLBible.bookTag, element.tag ) )
+            # Find the submain (book) containers -- also handles information records at the START or END of the file
+            bookCount = 0
+            try:
+                for event, depth, element, parentElement in elementEvents:
+                    if depth != 1: continue # ignore the end of the root element
+                    if element.tag == 'INFORMATION':
+                        self.header = element
+                        self.__validateAndExtractHeader()
+                    elif element.tag == ZefaniaXMLBible.bookTag:
+                        sublocation = "book in " + location
+                        BibleOrgSysGlobals.checkXMLNoText( element, sublocation, 'g3g5' )
+                        BibleOrgSysGlobals.checkXMLNoTail( element, sublocation, 'd3f6' )
+                        self.__validateAndExtractBook( element )
+                        bookCount += 1
+                    else: logging.error( "Expected to find {!r} but got {!r}".format( ZefaniaXMLBible.bookTag, element.tag ) )
+                    parentElement.remove( element ) # Release the memory
+            except ParseError as err: # Any books before the error have been loaded
+                logging.critical( exp("Loader parse error in xml file {}: {} {}").format( self.givenName, sys.exc_info()[0], err ) )
+                self.loadErrors.append( exp("Loader parse error in xml file {} after {} books: {} {}").format( self.givenName, bookCount, sys.exc_info()[0], err ) )
+            if BibleOrgSysGlobals.debugFlag: assert bookCount # Fail here if we didn't load anything at all
+            # The root text and tail are only available now
+            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, location, '4f6h' )
+            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, location, '1wk8' )
         else: logging.error( "Expected to load {!r} but got {!r}".format( ZefaniaXMLBible.treeTag, self.XMLTree.tag ) )
+        if self.loadErrors: self.errorDictionary['Load Errors'] = self.loadErrors
         self.doPostLoadProcessing()
     # end of ZefaniaXMLBible.load
 